@@ -0,0 +1,69 @@
+"""
+Benchmark de geração de projetos a partir de template.
+Autor: Patrick
+Data: Dezembro 2025
+
+Compara a criação sequencial (criar_estrutura_projeto, um projeto por vez)
+com criar_projetos_em_lote em um diretório temporário.
+
+Uso:
+    python benchmarks/benchmark_criar_projetos.py --quantidade 1000
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.projeto import criar_estrutura_projeto, criar_projetos_em_lote
+
+
+def medir(titulo: str, funcao) -> float:
+    """Executa a função e imprime o tempo gasto."""
+    inicio = time.perf_counter()
+    funcao()
+    duracao = time.perf_counter() - inicio
+    print(f"  {titulo:<32} {duracao:8.3f}s")
+    return duracao
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de criação de projetos em lote')
+    parser.add_argument('--quantidade', type=int, default=1000, help='Número de projetos')
+    parser.add_argument('--trabalhadores', type=int, default=8, help='Threads do modo em lote')
+    parser.add_argument('--template', type=str, default='padrao', help='Template usado')
+    args = parser.parse_args()
+
+    # O log por projeto do modo sequencial distorceria a medição
+    logging.disable(logging.INFO)
+    nomes = [f"servico-{i:05d}" for i in range(args.quantidade)]
+    base = tempfile.mkdtemp(prefix="bench_projetos_")
+    print(f"Gerando {args.quantidade} projetos em {base}")
+
+    try:
+        sequencial = os.path.join(base, "sequencial")
+        medir("sequencial", lambda: [
+            criar_estrutura_projeto(os.path.join(sequencial, nome), args.template) for nome in nomes
+        ])
+
+        lote = os.path.join(base, "lote")
+        resultado = {}
+        medir(
+            f"em lote ({args.trabalhadores} threads)",
+            lambda: resultado.update(criar_projetos_em_lote(
+                nomes, lote, args.template, trabalhadores=args.trabalhadores
+            ))
+        )
+        print(f"  Arquivos escritos no lote: {resultado['arquivos']}")
+    finally:
+        logging.disable(logging.NOTSET)
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
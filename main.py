@@ -6,9 +6,11 @@ Data: Dezembro 2025
 Script principal que integra os módulos e executa as operações.
 """
 
+import os
 import sys
 import json
 import argparse
+from datetime import datetime
 
 # Configurar encoding para Windows
 if sys.platform == "win32":
@@ -17,14 +19,29 @@ if sys.platform == "win32":
 
 # Importar módulos do projeto
 from utils.logger import configurar_logger
-from utils.backup import realizar_backup, listar_backups, limpar_backups_antigos
+from utils.backup import (
+    realizar_backup, listar_backups, limpar_backups_antigos, formatar_tamanho,
+    realizar_backup_git, restaurar_backup_git
+)
 from utils.sistema import (
     verificar_python_version,
     obter_informacoes_sistema,
     verificar_ferramentas_devops,
     monitorar_recursos
 )
-from utils.projeto import gerenciar_arquivos, criar_estrutura_projeto
+from utils.projeto import listar_arquivos_ordenados, criar_estrutura_projeto, criar_projetos_em_lote
+from utils.processos import monitorar_processos
+from utils.metricas import servir_metricas
+from utils.inventario import carregar_inventario, executar_em_hosts
+from utils.disco import analisar_uso_disco
+from utils.indice import atualizar_indice, consultar_indice
+from utils.duplicados import encontrar_duplicados
+from utils.busca import buscar_conteudo, EXCLUSOES_PADRAO
+from utils.snapshot import criar_snapshot, comparar_snapshots
+from utils.integridade import criar_linha_base, verificar_integridade
+from utils.git_workspace import descobrir_repositorios, executar_em_repositorios
+from utils.git_analise import analisar_hotspots
+from utils.docker_utils import selecionar_containers, operar_containers, planejar_build, build_imagem
 
 # Configurar logger principal
 logger = configurar_logger("main")
@@ -37,7 +54,11 @@ def main():
     )
     parser.add_argument(
         '--acao', 
-        choices=['info', 'ferramentas', 'criar-projeto', 'listar', 'monitorar', 'backup', 'listar-backups', 'limpar-backups'],
+        choices=['info', 'ferramentas', 'criar-projeto', 'criar-projetos', 'listar', 'monitorar', 'backup', 'restaurar-git', 'listar-backups', 'limpar-backups',
+                 'processos', 'servir-metricas', 'executar-hosts',
+                 'uso-disco', 'indexar', 'consultar', 'duplicados', 'buscar',
+                 'snapshot', 'diff', 'linha-base', 'verificar-integridade',
+                 'git-workspace', 'hotspots', 'containers', 'build'],
         default='info',
         help='Ação a ser executada'
     )
@@ -47,11 +68,22 @@ def main():
         default='meu_projeto',
         help='Nome do projeto (para criar-projeto)'
     )
+    parser.add_argument(
+        '--projetos',
+        type=str,
+        help='Nomes separados por vírgula ou arquivo com um nome por linha (para criar-projetos)'
+    )
+    parser.add_argument(
+        '--template',
+        type=str,
+        default='padrao',
+        help='Template embutido ou diretório de template (para criar-projeto, criar-projetos)'
+    )
     parser.add_argument(
         '--diretorio',
         type=str,
-        default='.',
-        help='Diretório de origem para operações'
+        help="Diretório de origem para operações (padrão: '.'); em restaurar-git, "
+             "o repositório a criar (obrigatório, não pode ter conteúdo)"
     )
     parser.add_argument(
         '--destino',
@@ -64,20 +96,223 @@ def main():
         action='store_true',
         help='Compactar backup em ZIP'
     )
+    parser.add_argument(
+        '--git',
+        action='store_true',
+        help='Backup incremental de repositório Git com bundles (para backup)'
+    )
     parser.add_argument(
         '--dias',
         type=int,
         default=30,
         help='Dias para manter backups (para limpar-backups)'
     )
+    parser.add_argument(
+        '--limite',
+        type=int,
+        default=10,
+        help='Quantidade de itens exibidos (para listar, processos, uso-disco, consultar)'
+    )
+    parser.add_argument(
+        '--host',
+        type=str,
+        default='127.0.0.1',
+        help='Endereço de escuta (para servir-metricas)'
+    )
+    parser.add_argument(
+        '--porta',
+        type=int,
+        default=9108,
+        help='Porta HTTP (para servir-metricas)'
+    )
+    parser.add_argument(
+        '--intervalo',
+        type=float,
+        default=15.0,
+        help='Intervalo entre amostras em segundos (para servir-metricas)'
+    )
+    parser.add_argument(
+        '--inventario',
+        type=str,
+        help='Arquivo de inventário de hosts (para executar-hosts)'
+    )
+    parser.add_argument(
+        '--comando',
+        type=str,
+        help='Comando a executar em cada host (para executar-hosts)'
+    )
+    parser.add_argument(
+        '--transporte',
+        choices=['ssh', 'local'],
+        default='ssh',
+        help='Transporte padrão dos hosts (para executar-hosts)'
+    )
+    parser.add_argument(
+        '--concorrencia',
+        type=int,
+        default=10,
+        help='Número máximo de operações simultâneas'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=int,
+        default=60,
+        help='Tempo máximo por operação em segundos'
+    )
+    parser.add_argument(
+        '--espera',
+        type=int,
+        help='Segundos até o SIGKILL em parar/reiniciar (para containers; padrão: '
+             'até 10, sempre menor que --timeout)'
+    )
+    parser.add_argument(
+        '--indice',
+        type=str,
+        help='Arquivo do índice SQLite (para indexar, consultar, listar; padrão: .cache/)'
+    )
+    parser.add_argument(
+        '--extensao',
+        type=str,
+        help="Filtrar por extensão, ex: .py (para listar, consultar, buscar; em listar o padrão é .py e '' lista tudo)"
+    )
+    parser.add_argument(
+        '--tamanho-min',
+        type=int,
+        help='Tamanho mínimo em bytes (para listar, consultar, duplicados)'
+    )
+    parser.add_argument(
+        '--tamanho-max',
+        type=int,
+        help='Tamanho máximo em bytes (para listar, consultar)'
+    )
+    parser.add_argument(
+        '--desde',
+        type=datetime.fromisoformat,
+        help='Modificados a partir da data ISO, ex: 2025-12-01 (para listar, consultar)'
+    )
+    parser.add_argument(
+        '--padrao',
+        type=str,
+        help="Padrão glob do nome, ex: 'test_*.py' (para consultar) ou 'ci-*' (para containers)"
+    )
+    parser.add_argument(
+        '--ordenar',
+        choices=['tamanho', 'modificado', 'nome'],
+        help='Critério de ordenação (para listar)'
+    )
+    parser.add_argument(
+        '--usar-indice',
+        action='store_true',
+        help='Listar a partir do índice SQLite, se existir (para listar; atualize com indexar)'
+    )
+    parser.add_argument(
+        '--hardlink',
+        action='store_true',
+        help='Substituir duplicados por hard links (para duplicados)'
+    )
+    parser.add_argument(
+        '--regex',
+        type=str,
+        help='Expressão regular procurada no conteúdo (para buscar)'
+    )
+    parser.add_argument(
+        '--excluir',
+        type=str,
+        default='',
+        help="Globs extras a ignorar separados por vírgula, ex: 'dist,*.min.js' (para buscar, snapshot, diff, linha-base, verificar-integridade)"
+    )
+    parser.add_argument(
+        '--ignorar-maiusculas',
+        action='store_true',
+        help='Não diferenciar maiúsculas/minúsculas (para buscar)'
+    )
+    parser.add_argument(
+        '--manifesto',
+        type=str,
+        help='Arquivo de manifesto gravado (snapshot) ou estado anterior (diff)'
+    )
+    parser.add_argument(
+        '--comparar',
+        type=str,
+        help='Manifesto ou diretório do estado atual (para diff; padrão: --diretorio)'
+    )
+    parser.add_argument(
+        '--hash',
+        action='store_true',
+        help='Incluir SHA-256 de cada arquivo no manifesto (para snapshot)'
+    )
+    parser.add_argument(
+        '--linha-base',
+        type=str,
+        help='Arquivo JSON da linha de base (para linha-base, verificar-integridade; padrão: .cache/)'
+    )
+    parser.add_argument(
+        '--completo',
+        action='store_true',
+        help='Recalcular todos os hashes (linha-base, verificar-integridade) ou gravar bundle completo (backup --git)'
+    )
+    parser.add_argument(
+        '--backup',
+        type=str,
+        help='Cadeia de bundles <nome>.git-backup criada por backup --git (para restaurar-git)'
+    )
+    parser.add_argument(
+        '--operacao',
+        type=str,
+        help='Operação em lote: status, fetch, pull ou log (para git-workspace); '
+             'iniciar, parar, reiniciar ou remover (para containers)'
+    )
+    parser.add_argument(
+        '--containers',
+        type=str,
+        help='IDs ou nomes de containers separados por vírgula (para containers)'
+    )
+    parser.add_argument(
+        '--rotulos',
+        type=str,
+        help="Rótulos exigidos separados por vírgula, ex: 'ci,job=build' (para containers)"
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Reaproveitar o cache por mtime de diretório (para uso-disco; '
+             'não percebe arquivos reescritos no lugar)'
+    )
+    parser.add_argument(
+        '--forcar',
+        action='store_true',
+        help='Remover também containers em execução (para containers --operacao remover) '
+             'ou construir mesmo com contexto inalterado (para build)'
+    )
+    parser.add_argument(
+        '--dockerfile',
+        type=str,
+        help='Caminho do Dockerfile (para build; padrão: <diretorio>/Dockerfile)'
+    )
+    parser.add_argument(
+        '--tag',
+        type=str,
+        help='Tag da imagem, ex: app:1.0 (para build; sem ela apenas planeja)'
+    )
+    parser.add_argument(
+        '--criterio',
+        type=str,
+        help='Ordenação dos hotspots: commits, linhas ou autores (para hotspots)'
+    )
     
     args = parser.parse_args()
+    # Restaurar sobre o diretório atual quase nunca é o desejado: exigir o destino
+    if args.acao == 'restaurar-git' and not (args.backup and args.diretorio):
+        parser.error("restaurar-git requer --backup e --diretorio")
+    if args.diretorio is None:
+        args.diretorio = '.'
     
     print("=" * 60)
     print("  AUTOMACAO DEVOPS COM PYTHON")
     print("=" * 60)
     
     verificar_python_version()
+    codigo_saida = 0
     
     if args.acao == 'info':
         info = obter_informacoes_sistema()
@@ -90,12 +325,45 @@ def main():
         
     elif args.acao == 'criar-projeto':
         print(f"\n[PROJECT] Criando projeto: {args.projeto}")
-        criar_estrutura_projeto(args.projeto)
+        criar_estrutura_projeto(args.projeto, template=args.template)
+        
+    elif args.acao == 'criar-projetos':
+        if not args.projetos:
+            parser.error("criar-projetos requer --projetos")
+        if os.path.isfile(args.projetos):
+            with open(args.projetos, encoding='utf-8') as arquivo:
+                nomes = [linha.strip() for linha in arquivo if linha.strip() and not linha.startswith('#')]
+        else:
+            nomes = [nome.strip() for nome in args.projetos.split(',') if nome.strip()]
+        print(f"\n[PROJECT] Criando {len(nomes)} projetos em: {args.diretorio}")
+        resultado = criar_projetos_em_lote(
+            nomes,
+            args.diretorio,
+            template=args.template,
+            trabalhadores=args.concorrencia
+        )
+        if resultado["erro"]:
+            print(f"[ERRO] Erro: {resultado['erro']}")
+        else:
+            print(f"[OK] Criados: {len(resultado['criados'])} projetos "
+                  f"({resultado['arquivos']} arquivos em {resultado['duracao']}s)")
+            for nome, erro in resultado["falhas"].items():
+                print(f"  [ERRO] {nome}: {erro}")
         
     elif args.acao == 'listar':
         print(f"\n[FILES] Listando arquivos em: {args.diretorio}")
-        arquivos = gerenciar_arquivos(args.diretorio, '.py')
-        for arq in arquivos[:10]:
+        arquivos = listar_arquivos_ordenados(
+            args.diretorio,
+            ordenar=args.ordenar,
+            limite=args.limite,
+            extensao=(args.extensao or None) if args.extensao is not None else '.py',
+            tamanho_min=args.tamanho_min,
+            tamanho_max=args.tamanho_max,
+            modificado_desde=args.desde,
+            usar_indice=args.usar_indice,
+            banco=args.indice
+        )
+        for arq in arquivos:
             print(f"  - {arq['nome']} ({arq['tamanho']} bytes)")
             
     elif args.acao == 'monitorar':
@@ -103,6 +371,323 @@ def main():
         recursos = monitorar_recursos()
         print(json.dumps(recursos, indent=2))
         
+    elif args.acao == 'processos':
+        print(f"\n[PROCESS] Top {args.limite} processos:")
+        processos = monitorar_processos(limite=args.limite)
+        print(json.dumps(processos, indent=2, ensure_ascii=False))
+        
+    elif args.acao == 'servir-metricas':
+        print(f"\n[METRICS] Servindo http://{args.host}:{args.porta}/metrics (Ctrl+C para sair)")
+        servir_metricas(host=args.host, porta=args.porta, intervalo=args.intervalo)
+        
+    elif args.acao == 'executar-hosts':
+        if not args.inventario or not args.comando:
+            parser.error("executar-hosts requer --inventario e --comando")
+        print(f"\n[HOSTS] Executando '{args.comando}' (concorrencia: {args.concorrencia})")
+        try:
+            hosts = carregar_inventario(args.inventario)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"[ERRO] Erro: {e}")
+            codigo_saida = 1
+        else:
+            resultado = executar_em_hosts(
+                hosts,
+                args.comando,
+                concorrencia=args.concorrencia,
+                timeout=args.timeout,
+                transporte=args.transporte
+            )
+            for host, saida in resultado["resultados"].items():
+                status = "OK" if saida.get("sucesso") else "ERRO"
+                detalhe = saida.get("stdout") or saida.get("erro") or saida.get("stderr", "")
+                print(f"  [{status}] {host} ({saida['duracao']}s): {detalhe}")
+            print(f"  Total: {resultado['sucessos']}/{resultado['total']} OK em {resultado['duracao']}s")
+        
+    elif args.acao == 'uso-disco':
+        print(f"\n[DISK] Analisando uso de disco em: {args.diretorio}")
+        resultado = analisar_uso_disco(args.diretorio, limite=args.limite, usar_cache=args.cache)
+        if resultado["sucesso"]:
+            print(f"  Total: {formatar_tamanho(resultado['tamanho_total'])} "
+                  f"em {resultado['arquivos']} arquivos ({resultado['duracao']}s)")
+            print("  Maiores diretorios:")
+            for item in resultado["maiores_diretorios"]:
+                print(f"    {formatar_tamanho(item['tamanho']):>12}  {item['caminho']}")
+            print(f"  Arquivos na raiz: {formatar_tamanho(resultado['tamanho_arquivos_raiz'])}")
+            print("  Maiores arquivos:")
+            for item in resultado["maiores_arquivos"]:
+                print(f"    {formatar_tamanho(item['tamanho']):>12}  {item['caminho']}")
+        else:
+            print(f"[ERRO] Erro: {resultado['erro']}")
+        
+    elif args.acao == 'indexar':
+        print(f"\n[INDEX] Atualizando indice de: {args.diretorio}")
+        resultado = atualizar_indice(args.diretorio, banco=args.indice)
+        if resultado["sucesso"]:
+            print(f"[OK] Indice: {resultado['indice']}")
+            print(f"  Arquivos: {resultado['arquivos']}")
+            print(f"  Diretorios relidos: {resultado['diretorios_relidos']}/{resultado['diretorios']}")
+        else:
+            print(f"[ERRO] Erro: {resultado['erro']}")
+            
+    elif args.acao == 'consultar':
+        print(f"\n[INDEX] Consultando indice de: {args.diretorio}")
+        arquivos = consultar_indice(
+            args.diretorio,
+            banco=args.indice,
+            extensao=args.extensao,
+            tamanho_min=args.tamanho_min,
+            tamanho_max=args.tamanho_max,
+            modificado_desde=args.desde,
+            padrao=args.padrao,
+            limite=args.limite
+        )
+        for arq in arquivos:
+            print(f"  - {arq['caminho']} ({arq['tamanho']} bytes)")
+            
+    elif args.acao == 'duplicados':
+        print(f"\n[DUP] Procurando arquivos duplicados em: {args.diretorio}")
+        resultado = encontrar_duplicados(
+            args.diretorio,
+            tamanho_min=args.tamanho_min or 1,
+            criar_hardlinks=args.hardlink
+        )
+        if resultado["sucesso"]:
+            for grupo in resultado["grupos"][:args.limite]:
+                print(f"  {len(grupo['arquivos'])} x {formatar_tamanho(grupo['tamanho'])}:")
+                for caminho in grupo["arquivos"]:
+                    print(f"    - {caminho}")
+            print(f"  Grupos: {len(resultado['grupos'])}")
+            print(f"  Espaco desperdicado: {formatar_tamanho(resultado['bytes_desperdicados'])}")
+            if args.hardlink:
+                print(f"  Hard links criados: {resultado['hardlinks_criados']} "
+                      f"({formatar_tamanho(resultado['bytes_recuperados'])} recuperados)")
+        else:
+            print(f"[ERRO] Erro: {resultado['erro']}")
+            
+    elif args.acao == 'buscar':
+        if not args.regex:
+            parser.error("buscar requer --regex")
+        print(f"\n[SEARCH] Procurando '{args.regex}' em: {args.diretorio}")
+        excluir = EXCLUSOES_PADRAO + tuple(p for p in args.excluir.split(',') if p)
+        total = 0
+        for ocorrencia in buscar_conteudo(
+            args.diretorio,
+            args.regex,
+            extensao=args.extensao,
+            excluir=excluir,
+            ignorar_maiusculas=args.ignorar_maiusculas
+        ):
+            total += 1
+            print(f"  {ocorrencia['caminho']}:{ocorrencia['linha']}: {ocorrencia['texto']}")
+        print(f"  Ocorrencias: {total}")
+            
+    elif args.acao == 'snapshot':
+        if not args.manifesto:
+            parser.error("snapshot requer --manifesto")
+        print(f"\n[SNAP] Gravando manifesto de: {args.diretorio}")
+        resultado = criar_snapshot(
+            args.diretorio,
+            args.manifesto,
+            com_hash=args.hash,
+            excluir=[p for p in args.excluir.split(',') if p]
+        )
+        if resultado["sucesso"]:
+            print(f"[OK] Manifesto salvo em: {resultado['manifesto']}")
+            print(f"  Arquivos: {resultado['arquivos']} ({formatar_tamanho(resultado['tamanho_total'])})")
+        else:
+            print(f"[ERRO] Erro: {resultado['erro']}")
+            
+    elif args.acao == 'diff':
+        if not args.manifesto:
+            parser.error("diff requer --manifesto")
+        depois = args.comparar or args.diretorio
+        print(f"\n[DIFF] Comparando {args.manifesto} com {depois}")
+        resultado = comparar_snapshots(
+            args.manifesto,
+            depois,
+            excluir=[p for p in args.excluir.split(',') if p]
+        )
+        if resultado["sucesso"]:
+            for prefixo, chave in (("+", "adicionados"), ("-", "removidos"), ("~", "modificados")):
+                for caminho in resultado[chave]:
+                    print(f"  {prefixo} {caminho}")
+            print(f"  Adicionados: {len(resultado['adicionados'])}, "
+                  f"removidos: {len(resultado['removidos'])}, "
+                  f"modificados: {len(resultado['modificados'])}, "
+                  f"inalterados: {resultado['inalterados']}")
+        else:
+            print(f"[ERRO] Erro: {resultado['erro']}")
+            
+    elif args.acao == 'linha-base':
+        print(f"\n[INTEGRITY] Gravando linha de base de integridade de: {args.diretorio}")
+        resultado = criar_linha_base(
+            args.diretorio,
+            arquivo=args.linha_base,
+            excluir=[p for p in args.excluir.split(',') if p],
+            trabalhadores=args.concorrencia,
+            completo=args.completo
+        )
+        if resultado["sucesso"]:
+            print(f"[OK] Linha de base salva em: {resultado['linha_base']}")
+            print(f"  Arquivos: {resultado['arquivos']} ({resultado['recalculados']} hashes calculados)")
+            for caminho, erro in resultado["erros"].items():
+                print(f"  [AVISO] {caminho}: {erro}")
+        else:
+            print(f"[ERRO] Erro: {resultado['erro']}")
+            codigo_saida = 2
+            
+    elif args.acao == 'verificar-integridade':
+        print(f"\n[INTEGRITY] Verificando integridade de: {args.diretorio}")
+        resultado = verificar_integridade(
+            args.diretorio,
+            arquivo=args.linha_base,
+            excluir=[p for p in args.excluir.split(',') if p],
+            trabalhadores=args.concorrencia,
+            completo=args.completo
+        )
+        if resultado["sucesso"]:
+            for rotulo, chave in (("ADICIONADO", "adicionados"), ("REMOVIDO", "removidos"),
+                                  ("MODIFICADO", "modificados")):
+                for caminho in resultado[chave]:
+                    print(f"  {rotulo}: {caminho}")
+            for caminho, erro in resultado["erros"].items():
+                print(f"  ILEGIVEL: {caminho} ({erro})")
+            status = "[ALERTA] Alteracoes detectadas" if resultado["alterado"] else "[OK] Nenhuma alteracao"
+            print(f"{status} ({resultado['verificados']} verificados, "
+                  f"{resultado['recalculados']} hashes calculados em {resultado['duracao']}s)")
+            codigo_saida = 1 if resultado["alterado"] else 0
+        else:
+            print(f"[ERRO] Erro: {resultado['erro']}")
+            codigo_saida = 2
+            
+    elif args.acao == 'git-workspace':
+        operacao = args.operacao or 'status'
+        repositorios = descobrir_repositorios(args.diretorio)
+        print(f"\n[GIT] {operacao} em {len(repositorios)} repositorios sob: {args.diretorio} "
+              f"(concorrencia: {args.concorrencia})")
+        try:
+            resultado = executar_em_repositorios(
+                repositorios,
+                operacao,
+                concorrencia=args.concorrencia,
+                timeout=args.timeout,
+                limite=args.limite
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        for repositorio, saida in resultado["resultados"].items():
+            nome = os.path.relpath(repositorio, args.diretorio)
+            if not saida["sucesso"]:
+                print(f"  [ERRO] {nome} ({saida['duracao']}s): {saida['erro']}")
+            elif operacao == 'status':
+                alteracoes = sum(len(saida[chave]) for chave in ('preparados', 'nao_preparados', 'novos', 'conflitos'))
+                estado = "limpo" if saida["limpo"] else f"{alteracoes} alteracoes"
+                sincronia = f" +{saida['a_frente']}/-{saida['atras']}" if saida["upstream"] else ""
+                print(f"  [OK] {nome} [{saida['branch'] or 'HEAD destacado'}{sincronia}]: {estado}")
+            elif operacao == 'log':
+                print(f"  [OK] {nome}:")
+                for commit in saida["commits"]:
+                    print(f"      {commit['hash'][:8]} {commit['data'][:10]} {commit['mensagem']}")
+            else:
+                print(f"  [OK] {nome} ({saida['duracao']}s)")
+        print(f"  Total: {resultado['sucessos']}/{resultado['total']} OK em {resultado['duracao']}s")
+        if not resultado["sucesso"]:
+            codigo_saida = 1
+            
+    elif args.acao == 'hotspots':
+        print(f"\n[HOTSPOTS] Arquivos mais alterados em: {args.diretorio}")
+        try:
+            resultado = analisar_hotspots(args.diretorio, limite=args.limite, ordenar=args.criterio or 'commits')
+        except ValueError as e:
+            parser.error(str(e))
+        if resultado["sucesso"]:
+            print(f"  {'COMMITS':>8} {'+LINHAS':>8} {'-LINHAS':>8} {'AUTORES':>7}  ARQUIVO")
+            for hotspot in resultado["hotspots"]:
+                print(f"  {hotspot['commits']:>8} {hotspot['linhas_adicionadas']:>8} "
+                      f"{hotspot['linhas_removidas']:>8} {hotspot['autores']:>7}  {hotspot['caminho']}")
+            print(f"  Total: {resultado['commits_total']} commits ({resultado['commits_processados']} novos), "
+                  f"{resultado['arquivos']} arquivos, {resultado['autores']} autores em {resultado['duracao']}s")
+        else:
+            print(f"[ERRO] Erro: {resultado['erro']}")
+            codigo_saida = 1
+
+    elif args.acao == 'containers':
+        if not (args.containers or args.padrao or args.rotulos):
+            parser.error("informe --containers, --padrao ou --rotulos")
+        operacao = args.operacao or 'parar'
+        ids = selecionar_containers(
+            ids=[c for c in (args.containers or '').split(',') if c],
+            padrao=args.padrao,
+            rotulos=[r for r in (args.rotulos or '').split(',') if r]
+        )
+        print(f"\n[DOCKER] {operacao} em {len(ids)} containers (concorrencia: {args.concorrencia})")
+        # O stop precisa terminar (espera + SIGKILL) antes do timeout da requisição
+        espera = args.espera if args.espera is not None else max(0, min(10, args.timeout - 5))
+        try:
+            resultado = operar_containers(
+                ids, operacao, concorrencia=args.concorrencia, espera=espera,
+                timeout=args.timeout, forcar=args.forcar
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        for container, saida in resultado["resultados"].items():
+            if saida["sucesso"]:
+                print(f"  [OK] {container} ({saida['duracao']}s)")
+            else:
+                print(f"  [ERRO] {container} ({saida['duracao']}s): {saida['erro']}")
+        print(f"  Total: {resultado['sucessos']}/{resultado['total']} OK em {resultado['duracao']}s")
+        if not resultado["sucesso"]:
+            codigo_saida = 1
+
+    elif args.acao == 'build':
+        print(f"\n[BUILD] Planejando build do contexto: {args.diretorio}")
+        plano = planejar_build(args.diretorio, args.dockerfile, limite=args.limite)
+        if not plano["sucesso"]:
+            print(f"[ERRO] Erro: {plano['erro']}")
+            codigo_saida = 1
+        else:
+            print(f"  Hash: {plano['hash']}")
+            print(f"  Contexto: {plano['arquivos']} arquivos, {plano['tamanho_total'] / 1024:.2f} KB "
+                  f"({plano['recalculados']} hashes calculados em {plano['duracao']}s)")
+            print("  Maiores diretórios:")
+            for item in plano["maiores_diretorios"]:
+                print(f"    {item['tamanho'] / 1024:>10.2f} KB  {item['caminho']}")
+            print("  Maiores arquivos:")
+            for item in plano["maiores_arquivos"]:
+                print(f"    {item['tamanho'] / 1024:>10.2f} KB  {item['caminho']}")
+            if plano["imagem"]:
+                print(f"  Imagem existente com o mesmo contexto: {plano['imagem'][:19]}")
+            if args.tag:
+                dockerfile = args.dockerfile or os.path.join(args.diretorio, 'Dockerfile')
+                if build_imagem(dockerfile, args.tag, contexto=args.diretorio, pular_inalterado=not args.forcar):
+                    print(f"[OK] Imagem pronta: {args.tag}")
+                else:
+                    print(f"[ERRO] Falha no build de {args.tag}")
+                    codigo_saida = 1
+
+    elif args.acao == 'backup' and args.git:
+        print(f"\n[BACKUP] Realizando backup Git de: {args.diretorio}")
+        resultado = realizar_backup_git(args.diretorio, args.destino, completo=args.completo)
+        if not resultado["sucesso"]:
+            print(f"[ERRO] Erro: {resultado['erro']}")
+            codigo_saida = 1
+        elif resultado["bundle"]:
+            print(f"[OK] Bundle {resultado['tipo']} salvo em: {resultado['bundle']}")
+            print(f"  Refs alterados: {resultado['refs_alterados']}")
+            print(f"  Tamanho: {resultado['tamanho_total'] / 1024:.2f} KB")
+        else:
+            print(f"[OK] Nenhum commit novo; refs registrados em: {resultado['destino']}"
+                  if resultado["tipo"] else "[OK] Nenhuma alteração desde o último backup")
+
+    elif args.acao == 'restaurar-git':
+        print(f"\n[RESTORE] Restaurando {args.backup} em: {args.diretorio}")
+        resultado = restaurar_backup_git(args.backup, args.diretorio)
+        if resultado["sucesso"]:
+            print(f"[OK] {resultado['bundles_aplicados']} bundles aplicados, {resultado['refs']} refs")
+        else:
+            print(f"[ERRO] Erro: {resultado['erro']}")
+            codigo_saida = 1
+
     elif args.acao == 'backup':
         print(f"\n[BACKUP] Realizando backup de: {args.diretorio}")
         resultado = realizar_backup(
@@ -136,7 +721,7 @@ def main():
     print("  Execucao finalizada!")
     print("=" * 60)
     
-    return 0
+    return codigo_saida
 
 
 if __name__ == "__main__":
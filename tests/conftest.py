@@ -25,4 +25,10 @@ def temp_dir():
     temp = tempfile.mkdtemp()
     yield temp
     if os.path.exists(temp):
-        shutil.rmtree(temp)
\ No newline at end of file
+        shutil.rmtree(temp)
+
+
+@pytest.fixture(autouse=True)
+def cache_isolado(tmp_path, monkeypatch):
+    """Direciona o cache da ferramenta para um diretório temporário."""
+    monkeypatch.setenv("DEVOPS_CACHE_DIR", str(tmp_path / "cache"))
@@ -4,6 +4,7 @@ Testes para o módulo de backup.
 
 import os
 import shutil
+import subprocess
 import tempfile
 import time
 from pathlib import Path
@@ -16,7 +17,9 @@ from utils.backup import (
     limpar_backups_antigos,
     contar_arquivos,
     calcular_tamanho,
-    formatar_tamanho
+    formatar_tamanho,
+    realizar_backup_git,
+    restaurar_backup_git
 )
 
 
@@ -66,6 +69,16 @@ class TestRealizarBackup:
         assert resultado["tamanho_total"] > 0
         assert Path(resultado["destino"]).exists()
     
+    def test_backup_registra_metricas(self, diretorio_com_arquivos, diretorio_teste):
+        """Testa que o backup atualiza as métricas Prometheus."""
+        from utils.metricas import renderizar_metricas
+        
+        realizar_backup(diretorio_com_arquivos, str(Path(diretorio_teste) / "backups"))
+        texto = renderizar_metricas()
+        
+        assert 'devops_backups_total{sucesso="true"}' in texto
+        assert "devops_backup_arquivos_por_segundo" in texto
+    
     def test_backup_compactado_sucesso(self, diretorio_com_arquivos, diretorio_teste):
         """Testa backup com compactação ZIP."""
         destino = Path(diretorio_teste) / "backups"
@@ -252,4 +265,123 @@ class TestFuncoesAuxiliares:
     
     def test_formatar_tamanho_gigabytes(self):
         """Testa formatação de tamanho em GB."""
-        assert "GB" in formatar_tamanho(2 * 1024 * 1024 * 1024)
\ No newline at end of file
+        assert "GB" in formatar_tamanho(2 * 1024 * 1024 * 1024)
+
+
+def _git(repo, *argumentos):
+    """Executa git no repositório de teste com identidade fixa."""
+    env = os.environ.copy()
+    env.update({
+        "GIT_AUTHOR_NAME": "Teste", "GIT_AUTHOR_EMAIL": "teste@exemplo.com",
+        "GIT_COMMITTER_NAME": "Teste", "GIT_COMMITTER_EMAIL": "teste@exemplo.com",
+    })
+    return subprocess.run(
+        ["git", *argumentos], cwd=repo, env=env, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repositorio_git(diretorio_teste):
+    """Cria um repositório Git com um commit na branch main."""
+    repo = Path(diretorio_teste) / "app"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    (repo / "README.md").write_text("# App\n")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "Primeiro commit")
+    return repo
+
+
+def _commit(repo, nome, conteudo):
+    (repo / nome).write_text(conteudo)
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", f"Altera {nome}")
+
+
+class TestBackupGit:
+    """Testes para backup incremental de repositórios com bundles."""
+
+    def test_completo_e_incremental(self, repositorio_git, diretorio_teste):
+        """Testa que o segundo backup contém só os objetos novos."""
+        destino = Path(diretorio_teste) / "backups"
+        (repositorio_git / "grande.bin").write_bytes(os.urandom(200_000))
+        _git(repositorio_git, "add", ".")
+        _git(repositorio_git, "commit", "-q", "-m", "Binário")
+
+        primeiro = realizar_backup_git(str(repositorio_git), str(destino))
+        assert primeiro["sucesso"] is True
+        assert primeiro["tipo"] == "completo"
+
+        _commit(repositorio_git, "novo.txt", "novo\n")
+        segundo = realizar_backup_git(str(repositorio_git), str(destino))
+        assert segundo["sucesso"] is True
+        assert segundo["tipo"] == "incremental"
+        assert segundo["tamanho_total"] < primeiro["tamanho_total"] / 10
+        assert segundo["destino"] == primeiro["destino"]
+
+    def test_sem_alteracoes(self, repositorio_git, diretorio_teste):
+        """Testa que nada é gravado quando os refs não mudaram."""
+        destino = Path(diretorio_teste) / "backups"
+        realizar_backup_git(str(repositorio_git), str(destino))
+        resultado = realizar_backup_git(str(repositorio_git), str(destino))
+        assert resultado["sucesso"] is True
+        assert resultado["bundle"] is None
+        assert len(list(Path(resultado["destino"]).glob("*.bundle"))) == 1
+
+    def test_restaurar_cadeia(self, repositorio_git, diretorio_teste):
+        """Testa restauração encadeando bundles, refs removidos e tags leves."""
+        destino = Path(diretorio_teste) / "backups"
+        realizar_backup_git(str(repositorio_git), str(destino))
+        _git(repositorio_git, "checkout", "-q", "-b", "feature")
+        _commit(repositorio_git, "feature.txt", "f\n")
+        _git(repositorio_git, "checkout", "-q", "main")
+        realizar_backup_git(str(repositorio_git), str(destino))
+        _commit(repositorio_git, "README.md", "# App v2\n")
+        _git(repositorio_git, "branch", "-D", "feature")
+        _git(repositorio_git, "tag", "v1", "HEAD~1")
+        ultimo = realizar_backup_git(str(repositorio_git), str(destino))
+
+        restaurado = Path(diretorio_teste) / "restaurado"
+        resultado = restaurar_backup_git(ultimo["destino"], str(restaurado))
+        assert resultado["sucesso"] is True, resultado["erro"]
+        assert resultado["bundles_aplicados"] == 3
+        assert _git(restaurado, "for-each-ref") == _git(repositorio_git, "for-each-ref")
+        assert _git(restaurado, "branch", "--show-current") == "main"
+        assert (restaurado / "README.md").read_text() == "# App v2\n"
+        assert _git(restaurado, "fsck", "--no-dangling") == ""
+
+    def test_restaurar_ponto_anterior(self, repositorio_git, diretorio_teste):
+        """Testa restaurar apenas até um backup intermediário."""
+        destino = Path(diretorio_teste) / "backups"
+        primeiro = realizar_backup_git(str(repositorio_git), str(destino))
+        commit_inicial = _git(repositorio_git, "rev-parse", "HEAD")
+        _commit(repositorio_git, "novo.txt", "novo\n")
+        realizar_backup_git(str(repositorio_git), str(destino))
+
+        restaurado = Path(diretorio_teste) / "restaurado"
+        resultado = restaurar_backup_git(primeiro["destino"], str(restaurado), ate=1, bare=True)
+        assert resultado["sucesso"] is True
+        assert _git(restaurado, "rev-parse", "main") == commit_inicial
+
+    def test_historico_reescrito(self, repositorio_git, diretorio_teste):
+        """Testa incremental após amend seguido de gc."""
+        destino = Path(diretorio_teste) / "backups"
+        _commit(repositorio_git, "a.txt", "a\n")
+        realizar_backup_git(str(repositorio_git), str(destino))
+        _git(repositorio_git, "commit", "-q", "--amend", "-m", "Reescrito")
+        _git(repositorio_git, "reflog", "expire", "--expire=now", "--all")
+        _git(repositorio_git, "gc", "-q", "--prune=now")
+        resultado = realizar_backup_git(str(repositorio_git), str(destino))
+        assert resultado["sucesso"] is True, resultado["erro"]
+
+        restaurado = Path(diretorio_teste) / "restaurado"
+        assert restaurar_backup_git(resultado["destino"], str(restaurado))["sucesso"] is True
+        assert _git(restaurado, "log", "-1", "--format=%s") == "Reescrito"
+
+    def test_erros(self, diretorio_teste, repositorio_git):
+        """Testa origem que não é repositório e destino ocupado."""
+        assert realizar_backup_git(diretorio_teste + "/nada", diretorio_teste)["sucesso"] is False
+        backup = realizar_backup_git(str(repositorio_git), str(Path(diretorio_teste) / "b"))
+        resultado = restaurar_backup_git(backup["destino"], str(repositorio_git))
+        assert resultado["sucesso"] is False
+        assert "não está vazio" in resultado["erro"]
@@ -0,0 +1,84 @@
+"""
+Testes para o módulo de busca em conteúdo.
+"""
+
+from pathlib import Path
+import pytest
+
+from utils import busca
+from utils.busca import buscar_conteudo
+
+
+@pytest.fixture
+def arvore(temp_dir):
+    """Cria arquivos de texto, binários e diretórios excluídos."""
+    raiz = Path(temp_dir)
+    (raiz / "app.py").write_text("import os\n# TODO: revisar\nx = 1  # todo minusculo\n")
+    (raiz / "leia.txt").write_text("nada aqui\nTODO no texto\n")
+    (raiz / "dados.bin").write_bytes(b"\0\1\2TODO\0")
+    git = raiz / ".git"
+    git.mkdir()
+    (git / "config").write_text("TODO dentro do .git\n")
+    return raiz
+
+
+class TestBuscarConteudo:
+    """Testes para a função buscar_conteudo."""
+    
+    def test_encontra_ocorrencias(self, arvore):
+        """Testa busca simples com número da linha."""
+        resultados = sorted(
+            (Path(r["caminho"]).name, r["linha"]) for r in buscar_conteudo(str(arvore), "TODO", processos=2)
+        )
+        
+        assert resultados == [("app.py", 2), ("leia.txt", 2)]
+    
+    def test_ignora_binarios_e_exclusoes(self, arvore):
+        """Testa que binários e .git são ignorados."""
+        caminhos = {Path(r["caminho"]).name for r in buscar_conteudo(str(arvore), "TODO", processos=1)}
+        
+        assert "dados.bin" not in caminhos
+        assert "config" not in caminhos
+    
+    def test_sem_exclusoes(self, arvore):
+        """Testa que as exclusões padrão podem ser desativadas."""
+        caminhos = {Path(r["caminho"]).name for r in buscar_conteudo(str(arvore), "TODO", excluir=None)}
+        
+        assert "config" in caminhos
+    
+    def test_ignorar_maiusculas(self, arvore):
+        """Testa busca sem diferenciar maiúsculas."""
+        resultados = list(buscar_conteudo(str(arvore), "todo", extensao=".py", ignorar_maiusculas=True))
+        
+        assert sorted(r["linha"] for r in resultados) == [2, 3]
+    
+    def test_texto_da_linha(self, arvore):
+        """Testa o texto retornado."""
+        resultado = next(buscar_conteudo(str(arvore), r"^x = \d", extensao=".py"))
+        
+        assert resultado["texto"] == "x = 1  # todo minusculo"
+    
+    def test_arquivo_grande_via_mmap(self, temp_dir):
+        """Testa busca em arquivo acima do limite de mmap."""
+        quantidade = busca.LIMITE_MMAP // 10 + 1
+        linhas = ["linha comum"] * quantidade + ["ALVO encontrado"] + ["fim"] * 10
+        (Path(temp_dir) / "grande.log").write_text("\n".join(linhas))
+        
+        resultados = list(buscar_conteudo(temp_dir, "ALVO", processos=1))
+        
+        assert [r["linha"] for r in resultados] == [quantidade + 1]
+    
+    def test_muitos_arquivos_em_lotes(self, temp_dir):
+        """Testa vários lotes distribuídos entre processos."""
+        for i in range(300):
+            (Path(temp_dir) / f"f{i}.txt").write_text(f"valor {i}\n")
+        
+        resultados = list(buscar_conteudo(temp_dir, r"valor \d+", processos=2, tamanho_lote=16))
+        
+        assert len(resultados) == 300
+    
+    def test_regex_invalida(self, arvore):
+        """Testa erro para expressão inválida."""
+        import re
+        with pytest.raises(re.error):
+            list(buscar_conteudo(str(arvore), "(sem fechar"))
@@ -0,0 +1,111 @@
+"""
+Testes para o módulo de uso de disco.
+"""
+
+import os
+from pathlib import Path
+import pytest
+
+from utils.disco import analisar_uso_disco
+
+
+@pytest.fixture
+def arvore(temp_dir):
+    """Cria uma árvore com tamanhos conhecidos."""
+    raiz = Path(temp_dir)
+    (raiz / "a.bin").write_bytes(b"x" * 100)
+    grande = raiz / "grande"
+    grande.mkdir()
+    (grande / "g1.bin").write_bytes(b"x" * 5000)
+    (grande / "g2.bin").write_bytes(b"x" * 3000)
+    profundo = raiz / "pequeno" / "profundo"
+    profundo.mkdir(parents=True)
+    (profundo / "p.bin").write_bytes(b"x" * 10)
+    return raiz
+
+
+class TestAnalisarUsoDisco:
+    """Testes para a função analisar_uso_disco."""
+    
+    def test_totais(self, arvore):
+        """Testa tamanho total, arquivos e diretórios."""
+        resultado = analisar_uso_disco(str(arvore), usar_cache=False)
+        
+        assert resultado["sucesso"] is True
+        assert resultado["tamanho_total"] == 8110
+        assert resultado["arquivos"] == 4
+        assert resultado["diretorios"] == 4
+    
+    def test_maiores_diretorios(self, arvore):
+        """Testa ranking de diretórios com totais de subárvore."""
+        resultado = analisar_uso_disco(str(arvore), limite=2, usar_cache=False)
+        
+        maiores = resultado["maiores_diretorios"]
+        assert len(maiores) == 2
+        assert Path(maiores[0]["caminho"]).name == "grande"
+        assert maiores[0]["tamanho"] == 8000
+        assert maiores[1]["tamanho"] == 10
+    
+    def test_maiores_arquivos(self, arvore):
+        """Testa ranking de arquivos."""
+        resultado = analisar_uso_disco(str(arvore), limite=2, usar_cache=False)
+        
+        tamanhos = [item["tamanho"] for item in resultado["maiores_arquivos"]]
+        assert tamanhos == [5000, 3000]
+    
+    @pytest.mark.skipif(not hasattr(os, "link"), reason="Requer hard links")
+    def test_hardlink_contado_uma_vez(self, arvore):
+        """Testa que hard links não duplicam o tamanho."""
+        os.link(arvore / "grande" / "g1.bin", arvore / "pequeno" / "g1_link.bin")
+        
+        resultado = analisar_uso_disco(str(arvore), usar_cache=False)
+        
+        assert resultado["tamanho_total"] == 8110
+        assert resultado["hardlinks_repetidos"] == 1
+    
+    def test_sem_cache_por_padrao(self, arvore):
+        """Testa que arquivos reescritos no lugar são vistos sem usar_cache."""
+        analisar_uso_disco(str(arvore))
+        mtime = (arvore / "grande").stat().st_mtime_ns
+        (arvore / "grande" / "g1.bin").write_bytes(b"x" * 6000)
+        os.utime(arvore / "grande", ns=(mtime, mtime))
+        
+        resultado = analisar_uso_disco(str(arvore))
+        
+        assert resultado["cache_hits"] == 0
+        assert resultado["tamanho_total"] == 9110
+    
+    def test_arquivos_da_raiz_separados(self, arvore):
+        """Testa que arquivos soltos na raiz não entram como diretórios."""
+        resultado = analisar_uso_disco(str(arvore), limite=10)
+        
+        assert resultado["tamanho_arquivos_raiz"] == 100
+        assert all(Path(item["caminho"]).is_dir() for item in resultado["maiores_diretorios"])
+    
+    def test_cache_reaproveitado(self, arvore):
+        """Testa que a segunda execução usa o cache."""
+        primeira = analisar_uso_disco(str(arvore), usar_cache=True)
+        segunda = analisar_uso_disco(str(arvore), usar_cache=True)
+        
+        assert primeira["cache_hits"] == 0
+        assert segunda["cache_hits"] == segunda["diretorios"]
+        assert segunda["tamanho_total"] == primeira["tamanho_total"]
+    
+    def test_cache_invalidado_por_mudanca(self, arvore):
+        """Testa que um novo arquivo invalida apenas o seu diretório."""
+        analisar_uso_disco(str(arvore), usar_cache=True)
+        novo = arvore / "grande" / "novo.bin"
+        novo.write_bytes(b"x" * 1000)
+        os.utime(arvore / "grande", ns=(0, 1))
+        
+        resultado = analisar_uso_disco(str(arvore), usar_cache=True)
+        
+        assert resultado["tamanho_total"] == 9110
+        assert resultado["cache_hits"] == resultado["diretorios"] - 1
+    
+    def test_diretorio_inexistente(self):
+        """Testa erro para diretório inexistente."""
+        resultado = analisar_uso_disco("/diretorio/inexistente")
+        
+        assert resultado["sucesso"] is False
+        assert resultado["erro"] is not None
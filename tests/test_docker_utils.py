@@ -0,0 +1,610 @@
+"""
+Testes para o módulo de utilitários Docker.
+"""
+
+import copy
+import json
+import queue
+import socket
+import socketserver
+import time
+import threading
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, unquote
+import pytest
+
+from utils import docker_utils
+from utils.docker_utils import (
+    ClienteDocker,
+    MonitorDocker,
+    iniciar_monitor_docker,
+    parar_monitor_docker,
+    selecionar_containers,
+    operar_containers,
+    listar_containers,
+    listar_imagens,
+    build_imagem,
+    planejar_build,
+    ler_dockerignore,
+    ROTULO_HASH_CONTEXTO,
+    parar_container,
+    remover_container
+)
+from utils.docker_utils import _ignorado, _tamanho_cli
+
+CONTAINERS = [
+    {
+        "Id": "a1b2c3d4e5f6" + "0" * 52,
+        "Names": ["/web"],
+        "Image": "nginx:latest",
+        "Command": "nginx -g 'daemon off;'",
+        "Created": 1735689600,
+        "State": "running",
+        "Status": "Up 2 hours",
+        "Ports": [{"IP": "0.0.0.0", "PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"}],
+        "Labels": {"app": "web"},
+    },
+    {
+        "Id": "f6e5d4c3b2a1" + "0" * 52,
+        "Names": ["/job"],
+        "Image": "python:3.11",
+        "Command": "python job.py",
+        "Created": 1735689600,
+        "State": "exited",
+        "Status": "Exited (0) 1 hour ago",
+        "Ports": [],
+        "Labels": {},
+    },
+]
+
+IMAGENS = [
+    {
+        "Id": "sha256:" + "ab" * 32,
+        "RepoTags": ["nginx:latest", "nginx:1.27"],
+        "RepoDigests": ["nginx@sha256:" + "cd" * 32],
+        "Created": 1735689600,
+        "Size": 13_300_000,
+    },
+]
+
+
+class _Docker(BaseHTTPRequestHandler):
+    """Daemon falso: responde às rotas usadas pelo cliente."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.conexoes += 1
+
+    def log_message(self, *args):
+        pass
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            # Cliente desistiu (timeout) antes da resposta: fim normal da conexão
+            self.close_connection = True
+
+    def _responder(self, status, corpo=None):
+        dados = json.dumps(corpo).encode() if corpo is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        if dados:
+            self.wfile.write(dados)
+
+    def _rota(self, metodo):
+        url = urlsplit(self.path)
+        consulta = parse_qs(url.query)
+        self.server.requisicoes.append((metodo, url.path, consulta))
+        if self.server.derrubar:
+            # Fecha sem responder, como um daemon que reinicia no meio da requisição
+            self.server.derrubar -= 1
+            self.close_connection = True
+            return
+        partes = url.path.strip("/").split("/")
+        if (metodo, url.path) == ("GET", "/_ping"):
+            return self._responder(200, "OK")
+        if (metodo, url.path) == ("GET", "/events"):
+            return self._eventos()
+        if (metodo, url.path) == ("GET", "/containers/json"):
+            ids = json.loads(consulta.get("filters", ["{}"])[0]).get("id")
+            containers = [
+                c for c in self.server.containers
+                if ("all" in consulta or c["State"] == "running") and (not ids or c["Id"] in ids)
+            ]
+            return self._responder(200, containers)
+        if (metodo, url.path) == ("GET", "/images/json"):
+            rotulos = json.loads(consulta.get("filters", ["{}"])[0]).get("label", [])
+            imagens = [
+                i for i in self.server.imagens
+                if all(dict([r.split("=", 1)]).items() <= i.get("Labels", {}).items() for r in rotulos)
+            ]
+            return self._responder(200, imagens)
+        if metodo == "POST" and partes[0] == "images" and partes[2:] == ["tag"]:
+            imagem = next((i for i in self.server.imagens if i["Id"] == unquote(partes[1])), None)
+            if imagem is None:
+                return self._responder(404, {"message": f"No such image: {partes[1]}"})
+            imagem["RepoTags"].append(f"{consulta['repo'][0]}:{consulta['tag'][0]}")
+            return self._responder(201)
+        if partes[0] == "containers" and len(partes) >= 2:
+            container = next((
+                c for c in self.server.containers
+                if c["Id"].startswith(partes[1]) or "/" + partes[1] in c["Names"]
+            ), None)
+            if container is None:
+                return self._responder(404, {"message": f"No such container: {partes[1]}"})
+            if metodo == "POST" and partes[2:] in (["stop"], ["restart"]):
+                time.sleep(self.server.atraso_stop)
+                if partes[2] == "stop" and container["State"] != "running":
+                    return self._responder(304)
+                container["State"] = "running" if partes[2] == "restart" else "exited"
+                return self._responder(204)
+            if metodo == "POST" and partes[2:] == ["start"]:
+                container["State"] = "running"
+                return self._responder(204)
+            if metodo == "DELETE":
+                if container["State"] == "running" and "force" not in consulta:
+                    return self._responder(409, {"message": "container is running"})
+                self.server.containers.remove(container)
+                return self._responder(204)
+        return self._responder(404, {"message": "page not found"})
+
+    def _eventos(self):
+        """Stream chunked de eventos; None na fila encerra a conexão."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self.wfile.flush()
+        while True:
+            evento = self.server.eventos.get()
+            if evento is None:
+                self.close_connection = True
+                return
+            dados = (json.dumps(evento) + "\n").encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(dados), dados))
+            self.wfile.flush()
+
+    def do_GET(self):
+        self._rota("GET")
+
+    def do_POST(self):
+        self._rota("POST")
+
+    def do_DELETE(self):
+        self._rota("DELETE")
+
+
+class _Servidor(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    """Sobe o daemon falso em um socket unix e aponta DOCKER_HOST para ele."""
+    caminho = str(tmp_path / "docker.sock")
+    servidor = _Servidor(caminho, _Docker)
+    servidor.conexoes = 0
+    servidor.requisicoes = []
+    servidor.containers = copy.deepcopy(CONTAINERS)
+    servidor.imagens = copy.deepcopy(IMAGENS)
+    servidor.eventos = queue.Queue()
+    servidor.atraso_stop = 0
+    servidor.derrubar = 0
+    thread = threading.Thread(target=servidor.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    monkeypatch.setenv("DOCKER_HOST", f"unix://{caminho}")
+    monkeypatch.delenv("DOCKER_CONTEXT", raising=False)
+    yield servidor
+    parar_monitor_docker()
+    servidor.eventos.put(None)
+    for cliente in docker_utils._clientes.values():
+        cliente.fechar()
+    docker_utils._clientes.clear()
+    servidor.shutdown()
+    servidor.server_close()
+
+
+class TestClienteDocker:
+    """Testes para o cliente da API pelo socket."""
+
+    def test_conexao_reutilizada(self, daemon):
+        """Testa várias requisições na mesma conexão keep-alive."""
+        with ClienteDocker(daemon.server_address) as cliente:
+            assert cliente.ping() is True
+            assert len(cliente.listar_containers()) == 2
+            assert len(cliente.listar_containers(apenas_ativos=True)) == 1
+            assert len(cliente.listar_imagens()) == 1
+        assert daemon.conexoes == 1
+
+    def test_reconecta_apos_fechamento(self, daemon):
+        """Testa reabertura quando a conexão foi fechada."""
+        cliente = ClienteDocker(daemon.server_address)
+        cliente.ping()
+        cliente._conexao.sock.close()
+        cliente._conexao.sock = None
+        assert cliente.ping() is True
+        cliente.fechar()
+
+    def test_repete_apenas_leituras(self, daemon):
+        """Testa que só GET é reenviado quando a conexão cai após o envio."""
+        with ClienteDocker(daemon.server_address) as cliente:
+            daemon.derrubar = 1
+            assert len(cliente.listar_containers()) == 2
+
+            daemon.derrubar = 1
+            with pytest.raises(ConnectionResetError):
+                cliente.parar_container("web")
+        assert [r[:2] for r in daemon.requisicoes] == [
+            ("GET", "/containers/json"), ("GET", "/containers/json"),
+            ("POST", "/containers/web/stop"),
+        ]
+        assert daemon.containers[0]["State"] == "running"
+
+    def test_tamanho_cli(self):
+        """Testa o arredondamento antes da troca de unidade."""
+        assert _tamanho_cli(999) == "999B"
+        assert _tamanho_cli(13_300_000) == "13.3MB"
+        assert _tamanho_cli(999_499) == "999kB"
+        assert _tamanho_cli(999_500) == "1MB"
+        assert _tamanho_cli(999_999) == "1MB"
+
+    def test_erro_da_api(self, daemon):
+        """Testa que status >= 400 vira RuntimeError com a mensagem do daemon."""
+        with ClienteDocker(daemon.server_address) as cliente:
+            with pytest.raises(RuntimeError, match="No such container"):
+                cliente.inspecionar_container("nao-existe")
+
+    def test_socket_inexistente(self, tmp_path):
+        """Testa ping sem daemon."""
+        assert ClienteDocker(str(tmp_path / "nada.sock")).ping() is False
+
+
+class TestFuncoesDocker:
+    """Testes para as funções do módulo usando o socket."""
+
+    def test_listar_containers_formato_cli(self, daemon):
+        """Testa conversão para o formato de docker ps --format json."""
+        containers = listar_containers()
+        assert containers[0]["ID"] == "a1b2c3d4e5f6"
+        assert containers[0]["Names"] == "web"
+        assert containers[0]["Ports"] == "0.0.0.0:8080->80/tcp"
+        assert containers[0]["Labels"] == "app=web"
+        assert containers[0]["CreatedAt"] == "2025-01-01 00:00:00 +0000 UTC"
+        assert [c["Names"] for c in listar_containers(apenas_ativos=True)] == ["web"]
+
+    def test_listar_imagens_uma_linha_por_tag(self, daemon):
+        """Testa conversão para o formato de docker images --format json."""
+        imagens = listar_imagens()
+        assert [(i["Repository"], i["Tag"]) for i in imagens] == [("nginx", "latest"), ("nginx", "1.27")]
+        assert imagens[0]["ID"] == "ab" * 6
+        assert imagens[0]["Size"] == "13.3MB"
+
+    def test_parar_e_remover(self, daemon):
+        """Testa stop (inclusive de container já parado) e rm."""
+        assert remover_container("web") is False
+        assert parar_container("web") is True
+        assert parar_container("job") is True
+        assert parar_container("nao-existe") is False
+        assert remover_container("web", force=True) is True
+        assert ("DELETE", "/containers/web", {"force": ["1"]}) in daemon.requisicoes
+
+    def test_acao_enviada_nao_repetida_pelo_cli(self, daemon, monkeypatch):
+        """Testa que queda após o envio é erro, sem refazer a ação pelo CLI."""
+        chamadas = []
+        monkeypatch.setattr(docker_utils, "_docker", lambda *argumentos: chamadas.append(argumentos))
+        daemon.derrubar = 1
+        
+        assert remover_container("job") is False
+        assert chamadas == []
+        assert [r[:2] for r in daemon.requisicoes] == [("DELETE", "/containers/job")]
+    
+    def test_socket_recusado_usa_cli(self, tmp_path, monkeypatch):
+        """Testa que falha ao conectar (antes do envio) cai no CLI."""
+        caminho = str(tmp_path / "parado.sock")
+        with socket.socket(socket.AF_UNIX) as abandonado:
+            abandonado.bind(caminho)
+        monkeypatch.setenv("DOCKER_HOST", f"unix://{caminho}")
+        monkeypatch.setattr(docker_utils, "_clientes", {})
+        chamadas = []
+        monkeypatch.setattr(docker_utils, "_docker", lambda *argumentos: chamadas.append(argumentos) or type(
+            "Resultado", (), {"returncode": 0}
+        )())
+        
+        assert parar_container("web") is True
+        assert chamadas == [("stop", "web")]
+    
+    def test_funcoes_compartilham_conexao(self, daemon):
+        """Testa que chamadas sucessivas não abrem novas conexões."""
+        for _ in range(5):
+            listar_containers()
+        assert daemon.conexoes == 1
+
+    def test_alternativa_cli(self, tmp_path, monkeypatch):
+        """Testa uso do CLI quando não há socket."""
+        monkeypatch.setenv("DOCKER_HOST", f"unix://{tmp_path}/nada.sock")
+        chamadas = []
+
+        def docker_falso(*argumentos):
+            chamadas.append(argumentos)
+            return type("Resultado", (), {"stdout": '{"ID": "abc"}\n', "returncode": 0})()
+
+        monkeypatch.setattr(docker_utils, "_docker", docker_falso)
+        assert listar_containers() == [{"ID": "abc"}]
+        assert parar_container("abc") is True
+        assert chamadas == [("ps", "-a", "--format", "{{json .}}"), ("stop", "abc")]
+
+
+def _esperar(condicao, timeout=5.0):
+    """Espera a condição ficar verdadeira (eventos são assíncronos)."""
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if condicao():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestMonitorDocker:
+    """Testes para o cache de containers mantido por eventos."""
+
+    def test_sincroniza_e_aplica_eventos(self, daemon):
+        """Testa sincronização inicial e atualização por evento."""
+        with MonitorDocker(daemon.server_address) as monitor:
+            assert monitor.aguardar() is True
+            assert monitor.obter_container("web")["State"] == "running"
+
+            daemon.containers[1]["State"] = "running"
+            daemon.eventos.put({"Type": "container", "Action": "start", "Actor": {"ID": daemon.containers[1]["Id"]}})
+            assert _esperar(lambda: monitor.obter_container("job")["State"] == "running")
+
+            daemon.containers.pop(0)
+            daemon.eventos.put({"Type": "container", "Action": "destroy", "Actor": {"ID": CONTAINERS[0]["Id"]}})
+            assert _esperar(lambda: monitor.obter_container("web") is None)
+            assert [c["Names"] for c in monitor.listar_containers()] == [["/job"]]
+
+    def test_consultas_nao_tocam_o_daemon(self, daemon):
+        """Testa que listar_containers responde pelo cache."""
+        assert iniciar_monitor_docker() is not None
+        antes = len(daemon.requisicoes)
+        for _ in range(20):
+            assert len(listar_containers()) == 2
+            assert len(listar_imagens()) == 2
+        assert len(daemon.requisicoes) == antes
+
+    def test_evento_de_imagem_invalida_lista(self, daemon):
+        """Testa que eventos de imagem fazem as imagens serem relidas uma vez."""
+        iniciar_monitor_docker()
+        daemon.eventos.put({"Type": "image", "Action": "delete", "Actor": {"ID": "sha256:x"}})
+        assert _esperar(lambda: docker_utils._monitor._imagens is None)
+        listar_imagens()
+        listar_imagens()
+        assert [r[1] for r in daemon.requisicoes].count("/images/json") == 2
+
+    def test_reconecta_e_ressincroniza(self, daemon):
+        """Testa nova sincronização completa após queda do stream."""
+        with MonitorDocker(daemon.server_address, max_idade=60) as monitor:
+            monitor.aguardar()
+            daemon.containers[0]["State"] = "exited"
+            daemon.eventos.put(None)
+            assert _esperar(lambda: monitor.obter_container("web")["State"] == "exited")
+            assert monitor.valido() is True
+
+    def test_limite_de_idade_sem_conexao(self, daemon):
+        """Testa que o cache expira quando o daemon some."""
+        monitor = iniciar_monitor_docker(max_idade=0.1)
+        daemon.shutdown()
+        daemon.server_close()
+        daemon.eventos.put(None)
+        assert _esperar(lambda: not monitor.conectado)
+        assert _esperar(lambda: not monitor.valido())
+
+
+def _container(numero, estado="running", rotulos=None):
+    """Container extra para os testes de lote."""
+    return {
+        "Id": f"{numero:012x}" + "0" * 52, "Names": [f"/ci-{numero}"], "Image": "alpine",
+        "Command": "sleep", "Created": 1735689600, "State": estado, "Status": "",
+        "Ports": [], "Labels": rotulos or {},
+    }
+
+
+class TestOperacoesEmLote:
+    """Testes para seleção e operações concorrentes em containers."""
+
+    def test_selecionar(self, daemon):
+        """Testa seleção por padrão de nome, rótulo e IDs."""
+        daemon.containers += [
+            _container(1, rotulos={"ci": "true", "job": "a"}),
+            _container(2, "exited", rotulos={"ci": "true", "job": "b"}),
+        ]
+        assert selecionar_containers(padrao="ci-*") == ["000000000001", "000000000002"]
+        assert selecionar_containers(padrao="ci-*", apenas_ativos=True) == ["000000000001"]
+        assert selecionar_containers(rotulos=["ci", "job=b"]) == ["000000000002"]
+        assert selecionar_containers(ids=["web", "ci-2"], rotulos=["ci"]) == ["000000000002"]
+        assert selecionar_containers(ids=["qualquer"]) == ["qualquer"]
+
+    def test_selecionar_ids_sem_casamento_amplo(self, daemon):
+        """Testa que nome exato vence e prefixos curtos ou ambíguos não casam."""
+        daemon.containers += [_container(n, rotulos={"ci": "true"}) for n in (1, 2)]
+        daemon.containers[0]["Labels"]["ci"] = "true"
+        assert selecionar_containers(ids=["0000"], rotulos=["ci"]) == []
+        assert selecionar_containers(ids=["a1b"], rotulos=["ci"]) == []
+        assert selecionar_containers(ids=["a1b2"], rotulos=["ci"]) == ["a1b2c3d4e5f6"]
+        assert selecionar_containers(ids=["000000000002"], rotulos=["ci"]) == ["000000000002"]
+        assert selecionar_containers(ids=["ci-1", "/ci-2"], rotulos=["ci"]) == [
+            "000000000001", "000000000002"
+        ]
+
+    def test_rotulos_com_virgula(self, daemon, monkeypatch):
+        """Testa rótulos cujo valor contém vírgula, pela API e pelo CLI."""
+        daemon.containers.append(_container(1, rotulos={"hosts": "a,b", "ci": "true"}))
+        assert selecionar_containers(rotulos=["hosts=a,b"]) == ["000000000001"]
+        assert selecionar_containers(rotulos=["hosts=a"]) == []
+
+        monkeypatch.setenv("DOCKER_HOST", "unix:///nada.sock")
+        linha = {"ID": "b" * 64, "Names": "ci-cli", "Labels": "hosts=a,b,ci=true"}
+        monkeypatch.setattr(docker_utils, "_docker", lambda *argumentos: type(
+            "Resultado", (), {"stdout": json.dumps(linha) + "\n"}
+        )())
+        assert selecionar_containers(rotulos=["hosts=a,b", "ci=true"]) == ["b" * 12]
+
+    def test_parar_em_paralelo(self, daemon):
+        """Testa que o tempo total não é a soma dos stops."""
+        daemon.containers += [_container(n) for n in range(1, 11)]
+        daemon.atraso_stop = 0.3
+        ids = selecionar_containers(padrao="ci-*")
+
+        resultado = operar_containers(ids, "parar", concorrencia=10)
+
+        assert resultado["sucesso"] is True
+        assert resultado["sucessos"] == 10
+        assert resultado["duracao"] < 1.5
+        assert all(c["State"] == "exited" for c in daemon.containers[2:])
+        stops = [r for r in daemon.requisicoes if r[1].endswith("/stop")]
+        assert all(r[2] == {"t": ["10"]} for r in stops)
+
+    def test_falhas_e_timeout_por_container(self, daemon):
+        """Testa agregação de erros e timeout individual."""
+        resultado = operar_containers(["web", "job", "nao-existe"], "remover")
+        assert resultado["sucessos"] == 1
+        assert "container is running" in resultado["resultados"]["web"]["erro"]
+        assert "No such container" in resultado["resultados"]["nao-existe"]["erro"]
+
+        daemon.atraso_stop = 1
+        resultado = operar_containers(["web"], "reiniciar", espera=0, timeout=0.2)
+        assert resultado["resultados"]["web"]["erro"] == "Timeout"
+        with pytest.raises(ValueError, match="espera"):
+            operar_containers(["web"], "parar", espera=10, timeout=10)
+
+        assert operar_containers(["web"], "remover", forcar=True)["sucesso"] is True
+        with pytest.raises(ValueError):
+            operar_containers(["web"], "pausar")
+
+    def test_alternativa_cli(self, tmp_path, monkeypatch):
+        """Testa o lote pelo CLI quando não há socket."""
+        monkeypatch.setenv("DOCKER_HOST", f"unix://{tmp_path}/nada.sock")
+        chamadas = []
+
+        def docker_falso(*argumentos, timeout=None):
+            chamadas.append((argumentos, timeout))
+            return type("Resultado", (), {"stdout": "", "stderr": "", "returncode": 0})()
+
+        monkeypatch.setattr(docker_utils, "_docker", docker_falso)
+        resultado = operar_containers(["a", "b"], "parar", espera=3, timeout=20)
+        assert resultado["sucesso"] is True
+        assert sorted(chamadas) == [
+            (("stop", "-t", "3", "a"), 20), (("stop", "-t", "3", "b"), 20)
+        ]
+
+
+@pytest.fixture
+def contexto(tmp_path):
+    """Contexto de build com Dockerfile, código, dependências e .dockerignore."""
+    raiz = tmp_path / "app"
+    (raiz / "src").mkdir(parents=True)
+    (raiz / "node_modules" / "pacote").mkdir(parents=True)
+    (raiz / "Dockerfile").write_text("FROM python:3.11\nCOPY . /app\n")
+    (raiz / "src" / "main.py").write_text("print('ok')\n" * 100)
+    (raiz / "src" / "util.py").write_text("x = 1\n")
+    (raiz / "node_modules" / "pacote" / "index.js").write_text("0" * 5000)
+    (raiz / "debug.log").write_text("log")
+    (raiz / ".dockerignore").write_text("# dependências\nnode_modules\n*.log\n")
+    return raiz
+
+
+class TestDockerignore:
+    """Testes para as regras do .dockerignore."""
+
+    def test_padroes_e_excecoes(self, tmp_path):
+        """Testa curingas, ** e exceções com !."""
+        (tmp_path / ".dockerignore").write_text(
+            "/build\n**/*.pyc\ndocs/*.md\n!docs/LEIAME.md\n# comentário\n\n"
+        )
+        regras = ler_dockerignore(str(tmp_path))
+        assert _ignorado("build/saida.bin", regras) is True
+        assert _ignorado("src/build.py", regras) is False
+        assert _ignorado("a/b/c/modulo.pyc", regras) is True
+        assert _ignorado("modulo.pyc", regras) is True
+        assert _ignorado("docs/guia.md", regras) is True
+        assert _ignorado("docs/LEIAME.md", regras) is False
+        assert _ignorado("docs/sub/guia.md", regras) is False
+
+    def test_arquivo_do_dockerfile_tem_prioridade(self, tmp_path):
+        """Testa <Dockerfile>.dockerignore no lugar do .dockerignore."""
+        (tmp_path / ".dockerignore").write_text("*.txt\n")
+        (tmp_path / "Dockerfile.dev.dockerignore").write_text("*.md\n")
+        regras = ler_dockerignore(str(tmp_path), str(tmp_path / "Dockerfile.dev"))
+        assert _ignorado("notas.md", regras) is True
+        assert _ignorado("notas.txt", regras) is False
+        assert ler_dockerignore(str(tmp_path / "vazio")) == []
+
+
+class TestPlanejarBuild:
+    """Testes para o hash incremental do contexto de build."""
+
+    def test_contexto_efetivo_e_cache(self, daemon, contexto):
+        """Testa exclusões, maiores contribuintes e reaproveitamento dos hashes."""
+        plano = planejar_build(str(contexto), limite=2)
+        assert plano["sucesso"] is True
+        assert plano["imagem"] is None
+        # Dockerfile, .dockerignore e os dois arquivos de src
+        assert plano["arquivos"] == 4
+        assert plano["recalculados"] == 4
+        assert plano["maiores_diretorios"][0]["caminho"] == "src"
+        assert plano["maiores_arquivos"][0]["caminho"] == "src/main.py"
+        assert len(plano["maiores_arquivos"]) == 2
+
+        repetido = planejar_build(str(contexto))
+        assert repetido["hash"] == plano["hash"]
+        assert repetido["recalculados"] == 0
+
+    def test_hash_muda_com_conteudo_e_dockerfile(self, daemon, contexto):
+        """Testa que só mudanças no contexto efetivo alteram o hash."""
+        original = planejar_build(str(contexto))["hash"]
+
+        (contexto / "node_modules" / "pacote" / "index.js").write_text("1" * 5000)
+        (contexto / "outro.log").write_text("novo")
+        assert planejar_build(str(contexto))["hash"] == original
+
+        (contexto / "src" / "util.py").write_text("x = 2\n")
+        alterado = planejar_build(str(contexto))
+        assert alterado["hash"] != original
+        assert alterado["recalculados"] == 1
+
+        (contexto / "Dockerfile").write_text("FROM python:3.12\nCOPY . /app\n")
+        assert planejar_build(str(contexto))["hash"] != alterado["hash"]
+
+    def test_erros(self, daemon, tmp_path):
+        """Testa contexto e Dockerfile inexistentes."""
+        assert planejar_build(str(tmp_path / "nada"))["erro"]
+        assert "Dockerfile" in planejar_build(str(tmp_path))["erro"]
+
+    def test_build_pulado_quando_imagem_existe(self, daemon, contexto, monkeypatch):
+        """Testa que a imagem rotulada com o hash só recebe a tag."""
+        plano = planejar_build(str(contexto))
+        daemon.imagens[0]["Labels"] = {ROTULO_HASH_CONTEXTO: plano["hash"]}
+        monkeypatch.setattr(docker_utils.subprocess, "run", lambda *a, **k: pytest.fail("build executado"))
+
+        assert planejar_build(str(contexto))["imagem"] == IMAGENS[0]["Id"]
+        assert build_imagem(str(contexto / "Dockerfile"), "app:dev", contexto=str(contexto)) is True
+        assert "app:dev" in daemon.imagens[0]["RepoTags"]
+
+    def test_build_rotula_imagem_nova(self, daemon, contexto, monkeypatch):
+        """Testa que o docker build recebe o rótulo com o hash do contexto."""
+        chamadas = []
+        monkeypatch.setattr(
+            docker_utils.subprocess, "run",
+            lambda argumentos, **k: chamadas.append(argumentos) or type("R", (), {"returncode": 0})()
+        )
+        plano = planejar_build(str(contexto))
+        assert build_imagem(str(contexto / "Dockerfile"), "app:dev", contexto=str(contexto)) is True
+        assert f"{ROTULO_HASH_CONTEXTO}={plano['hash']}" in chamadas[0]
+        assert chamadas[0][-1] == str(contexto)
+
+        build_imagem(str(contexto / "Dockerfile"), "app:dev", contexto=str(contexto), pular_inalterado=False)
+        assert "--label" not in chamadas[1]
@@ -0,0 +1,119 @@
+"""
+Testes para o módulo de arquivos duplicados.
+"""
+
+import os
+from pathlib import Path
+import pytest
+
+from utils.duplicados import encontrar_duplicados
+
+
+@pytest.fixture
+def arvore(temp_dir):
+    """Cria arquivos duplicados, parecidos e únicos."""
+    raiz = Path(temp_dir)
+    grande = os.urandom(20000)
+    (raiz / "a").mkdir()
+    (raiz / "b").mkdir()
+    (raiz / "a" / "grande.bin").write_bytes(grande)
+    (raiz / "b" / "grande_copia.bin").write_bytes(grande)
+    # Mesmo tamanho, mesmo início e fim, meio diferente
+    diferente = bytearray(grande)
+    diferente[10000] ^= 0xFF
+    (raiz / "b" / "grande_quase.bin").write_bytes(bytes(diferente))
+    (raiz / "pequeno1.txt").write_text("conteudo igual")
+    (raiz / "pequeno2.txt").write_text("conteudo igual")
+    (raiz / "unico.txt").write_text("unico")
+    return raiz
+
+
+class TestEncontrarDuplicados:
+    """Testes para a função encontrar_duplicados."""
+    
+    def test_grupos_encontrados(self, arvore):
+        """Testa que encontra exatamente os grupos idênticos."""
+        resultado = encontrar_duplicados(str(arvore))
+        
+        grupos = sorted(sorted(Path(c).name for c in g["arquivos"]) for g in resultado["grupos"])
+        assert resultado["sucesso"] is True
+        assert grupos == [
+            ["grande.bin", "grande_copia.bin"],
+            ["pequeno1.txt", "pequeno2.txt"]
+        ]
+    
+    def test_bytes_desperdicados(self, arvore):
+        """Testa o cálculo do espaço desperdiçado."""
+        resultado = encontrar_duplicados(str(arvore))
+        
+        assert resultado["bytes_desperdicados"] == 20000 + len("conteudo igual")
+    
+    def test_hash_completo_so_para_candidatos(self, arvore):
+        """Testa que tamanhos únicos não chegam ao hash completo."""
+        resultado = encontrar_duplicados(str(arvore))
+        
+        # Apenas os três arquivos grandes passam da etapa de amostra
+        assert resultado["arquivos_analisados"] == 6
+        assert resultado["hashes_completos"] == 3
+    
+    def test_tamanho_minimo(self, arvore):
+        """Testa que arquivos pequenos podem ser ignorados."""
+        resultado = encontrar_duplicados(str(arvore), tamanho_min=1000)
+        
+        assert len(resultado["grupos"]) == 1
+    
+    @pytest.mark.skipif(not hasattr(os, "link"), reason="Requer hard links")
+    def test_criar_hardlinks(self, arvore):
+        """Testa substituição de duplicados por hard links."""
+        resultado = encontrar_duplicados(str(arvore), criar_hardlinks=True)
+        
+        assert resultado["hardlinks_criados"] == 2
+        original = (arvore / "a" / "grande.bin").stat()
+        copia = (arvore / "b" / "grande_copia.bin").stat()
+        assert original.st_ino == copia.st_ino
+        
+        # Hard links existentes não contam como desperdício
+        assert encontrar_duplicados(str(arvore))["grupos"] == []
+    
+    @pytest.mark.skipif(not hasattr(os, "link"), reason="Requer hard links")
+    def test_hardlink_existente_religado(self, arvore, temp_dir):
+        """Testa que todos os links do inode duplicado são religados."""
+        os.link(arvore / "b" / "grande_copia.bin", arvore / "b" / "grande_link.bin")
+        externo = Path(temp_dir).parent / f"{Path(temp_dir).name}-externo.txt"
+        os.link(arvore / "pequeno2.txt", externo)
+        try:
+            resultado = encontrar_duplicados(str(arvore), criar_hardlinks=True)
+        finally:
+            externo.unlink()
+        
+        original = (arvore / "a" / "grande.bin").stat()
+        assert original.st_nlink == 3
+        assert (arvore / "b" / "grande_link.bin").stat().st_ino == original.st_ino
+        assert resultado["hardlinks_criados"] == 3
+        # pequeno2.txt continua ocupando espaço pelo link externo
+        assert resultado["bytes_recuperados"] == 20000
+    
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="Requer links simbólicos")
+    def test_links_simbolicos_ignorados(self, arvore, temp_dir):
+        """Testa que links simbólicos não entram nos grupos nem são religados."""
+        externo = Path(temp_dir).parent / f"{Path(temp_dir).name}-segredo.bin"
+        externo.write_bytes((arvore / "a" / "grande.bin").read_bytes())
+        os.symlink(externo, arvore / "a" / "0link.bin")
+        os.symlink("../pequeno1.txt", arvore / "b" / "interno.txt")
+        try:
+            resultado = encontrar_duplicados(str(arvore), criar_hardlinks=True)
+            assert externo.stat().st_nlink == 1
+        finally:
+            externo.unlink()
+        
+        assert resultado["arquivos_analisados"] == 6
+        assert resultado["hardlinks_criados"] == 2
+        assert resultado["bytes_recuperados"] == 20000 + len("conteudo igual")
+        assert (arvore / "a" / "0link.bin").is_symlink()
+        assert (arvore / "b" / "interno.txt").is_symlink()
+    
+    def test_diretorio_inexistente(self):
+        """Testa erro para diretório inexistente."""
+        resultado = encontrar_duplicados("/diretorio/inexistente")
+        
+        assert resultado["sucesso"] is False
@@ -0,0 +1,108 @@
+"""
+Testes para o módulo de análise de histórico Git.
+"""
+
+import os
+import subprocess
+import pytest
+
+from utils.git_analise import analisar_hotspots
+
+
+def _git(repo, *argumentos, autor="Teste"):
+    """Executa git no repositório de teste com o autor indicado."""
+    env = os.environ.copy()
+    env.update({
+        "GIT_AUTHOR_NAME": autor, "GIT_AUTHOR_EMAIL": f"{autor.lower()}@exemplo.com",
+        "GIT_COMMITTER_NAME": autor, "GIT_COMMITTER_EMAIL": f"{autor.lower()}@exemplo.com",
+    })
+    return subprocess.run(
+        ["git", *argumentos], cwd=repo, env=env, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _commit(repo, arquivos, autor="Teste"):
+    """Grava os arquivos ({caminho: conteúdo}) e faz um commit."""
+    for caminho, conteudo in arquivos.items():
+        destino = repo / caminho
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(conteudo, bytes):
+            destino.write_bytes(conteudo)
+        else:
+            destino.write_text(conteudo)
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", f"Altera {', '.join(arquivos)}", autor=autor)
+
+
+@pytest.fixture
+def repositorio(tmp_path):
+    """Repositório em que app.py é o arquivo mais alterado."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    _commit(repo, {"app.py": "a\n", "README.md": "# Projeto\n"})
+    _commit(repo, {"app.py": "a\nb\n"}, autor="Maria")
+    _commit(repo, {"app.py": "a\nb\nc\n", "src/util com espaço.py": "x\n"}, autor="Joao")
+    _commit(repo, {"logo.png": b"\x89PNG\0\0binario"})
+    return repo
+
+
+class TestAnalisarHotspots:
+    """Testes para analisar_hotspots."""
+
+    def test_contadores(self, repositorio):
+        """Testa commits, linhas e autores por arquivo."""
+        resultado = analisar_hotspots(str(repositorio))
+        assert resultado["sucesso"] is True, resultado["erro"]
+        assert resultado["commits_total"] == 4
+        assert resultado["autores"] == 3
+
+        hotspots = {h["caminho"]: h for h in resultado["hotspots"]}
+        assert resultado["hotspots"][0]["caminho"] == "app.py"
+        assert hotspots["app.py"]["commits"] == 3
+        assert hotspots["app.py"]["linhas_adicionadas"] == 3
+        assert hotspots["app.py"]["autores"] == 3
+        assert hotspots["src/util com espaço.py"]["commits"] == 1
+        assert hotspots["logo.png"]["linhas_adicionadas"] == 0
+        assert sum(m["commits"] for m in resultado["meses"]) == 4
+
+    def test_incremental(self, repositorio):
+        """Testa que execuções seguintes leem só os commits novos."""
+        assert analisar_hotspots(str(repositorio))["commits_processados"] == 4
+        assert analisar_hotspots(str(repositorio))["commits_processados"] == 0
+
+        _commit(repositorio, {"README.md": "# Projeto\nnovo\n"})
+        resultado = analisar_hotspots(str(repositorio))
+        assert resultado["commits_processados"] == 1
+        assert resultado["commits_total"] == 5
+        readme = next(h for h in resultado["hotspots"] if h["caminho"] == "README.md")
+        assert readme["commits"] == 2
+
+    def test_historico_reescrito(self, repositorio):
+        """Testa recálculo completo quando o último commit não é mais ancestral."""
+        analisar_hotspots(str(repositorio))
+        _git(repositorio, "reset", "-q", "--hard", "HEAD~2")
+        _commit(repositorio, {"outro.py": "y\n"})
+        resultado = analisar_hotspots(str(repositorio))
+        assert resultado["commits_processados"] == 3
+        assert resultado["commits_total"] == 3
+
+    def test_ordenacao_e_arquivos_apagados(self, repositorio):
+        """Testa critérios de ordenação e exclusão de arquivos removidos."""
+        _git(repositorio, "rm", "-q", "logo.png")
+        _git(repositorio, "commit", "-q", "-m", "Remove logo")
+        _commit(repositorio, {"README.md": "".join(f"{i}\n" for i in range(10))})
+        resultado = analisar_hotspots(str(repositorio), ordenar="linhas", limite=2)
+        assert [h["caminho"] for h in resultado["hotspots"]] == ["README.md", "app.py"]
+        resultado = analisar_hotspots(str(repositorio), ordenar="autores", limite=1)
+        assert resultado["hotspots"][0]["caminho"] == "app.py"
+        todos = analisar_hotspots(str(repositorio), apenas_existentes=False, limite=10)
+        assert "logo.png" in {h["caminho"] for h in todos["hotspots"]}
+        with pytest.raises(ValueError):
+            analisar_hotspots(str(repositorio), ordenar="tamanho")
+
+    def test_fora_de_repositorio(self, tmp_path):
+        """Testa erro fora de um repositório."""
+        resultado = analisar_hotspots(str(tmp_path))
+        assert resultado["sucesso"] is False
+        assert resultado["erro"]
@@ -0,0 +1,565 @@
+"""
+Testes para o módulo de utilitários Git.
+"""
+
+import os
+import time
+import subprocess
+import threading
+from pathlib import Path
+import pytest
+
+from utils.git_utils import (
+    RepositorioGit,
+    LOTE_CAT_FILE,
+    obter_status,
+    iterar_status,
+    FluxoGit,
+    localizar_git,
+    ler_head,
+    resolver_ref_local,
+    verificar_repositorio,
+    obter_branch_atual,
+    iterar_log,
+    obter_log,
+    obter_log_pagina,
+    escrever_commit_graph,
+    caminho_espelho,
+    atualizar_espelho,
+    clonar,
+    buscar
+)
+
+
+def _git(repo, *argumentos, check=True):
+    """Executa git no repositório de teste com identidade fixa."""
+    env = os.environ.copy()
+    env.update({
+        "GIT_AUTHOR_NAME": "Teste", "GIT_AUTHOR_EMAIL": "teste@exemplo.com",
+        "GIT_COMMITTER_NAME": "Teste", "GIT_COMMITTER_EMAIL": "teste@exemplo.com",
+    })
+    return subprocess.run(
+        ["git", *argumentos], cwd=repo, env=env, check=check, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repositorio(tmp_path):
+    """Cria um repositório com dois commits na branch main."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    (repo / "README.md").write_text("# Projeto\n")
+    _git(repo, "add", "README.md")
+    _git(repo, "commit", "-q", "-m", "Primeiro commit")
+    (repo / "app.py").write_text("print('ola')\n")
+    _git(repo, "add", "app.py")
+    _git(repo, "commit", "-q", "-m", "Adiciona app\n\nCorpo da mensagem.")
+    return repo
+
+
+class TestRepositorioGit:
+    """Testes para a sessão RepositorioGit."""
+    
+    def test_resolver(self, repositorio):
+        """Testa resolução de referências."""
+        with RepositorioGit(str(repositorio)) as repo:
+            assert repo.resolver("HEAD") == _git(repositorio, "rev-parse", "HEAD")
+            assert repo.resolver("main~1") == _git(repositorio, "rev-parse", "HEAD~1")
+            assert repo.resolver("nao-existe") is None
+    
+    def test_resolver_varios_em_lotes(self, repositorio):
+        """Testa consultas acima do tamanho do lote na mesma sessão."""
+        refs = ["HEAD", "HEAD~1", "nao existe"] * (LOTE_CAT_FILE // 2)
+        with RepositorioGit(str(repositorio)) as repo:
+            resultado = repo.resolver_varios(refs)
+            processo = repo._verificacao.processo
+            repo.resolver("HEAD")
+            
+            assert repo._verificacao.processo is processo
+        assert resultado["HEAD"] == _git(repositorio, "rev-parse", "HEAD")
+        assert resultado["nao existe"] is None
+    
+    def test_lote_maior_que_o_pipe_com_objetos_grandes(self, repositorio):
+        """Testa consultas longas contra um blob grande sem travar nos pipes."""
+        caminho = Path("d" * 200) / ("f" * 220)
+        (repositorio / caminho).parent.mkdir()
+        (repositorio / caminho).write_bytes(b"x" * 300_000)
+        _git(repositorio, "add", ".")
+        _git(repositorio, "commit", "-q", "-m", "grande")
+        
+        ref = f"HEAD:{caminho.as_posix()}"
+        with RepositorioGit(str(repositorio)) as repo:
+            respostas = repo._consultar_varios(repo._objetos, [ref] * LOTE_CAT_FILE, ler_conteudo=True)
+        
+        assert len(respostas) == LOTE_CAT_FILE
+        assert all(r[2] == 300_000 for r in respostas)
+    
+    def test_ler_arquivo(self, repositorio):
+        """Testa leitura de arquivos em revisões diferentes."""
+        with RepositorioGit(str(repositorio)) as repo:
+            assert repo.ler_arquivo("app.py") == b"print('ola')\n"
+            assert repo.ler_arquivo("app.py", "HEAD~1") is None
+            assert repo.ler_arquivo("README.md", "HEAD~1") == b"# Projeto\n"
+    
+    def test_ler_commit(self, repositorio):
+        """Testa interpretação de commits."""
+        with RepositorioGit(str(repositorio)) as repo:
+            commit = repo.ler_commit("HEAD")
+            
+            assert commit["mensagem"] == "Adiciona app\n\nCorpo da mensagem."
+            assert commit["autor"] == "Teste"
+            assert commit["email"] == "teste@exemplo.com"
+            assert commit["pais"] == [repo.resolver("HEAD~1")]
+            assert repo.ler_commit("HEAD~1")["pais"] == []
+    
+    def test_info_objeto(self, repositorio):
+        """Testa tipo e tamanho sem ler o conteúdo."""
+        with RepositorioGit(str(repositorio)) as repo:
+            info = repo.info_objeto("HEAD:app.py")
+            
+            assert info["tipo"] == "blob"
+            assert info["tamanho"] == len("print('ola')\n")
+    
+    def test_branch_e_verificacao(self, repositorio, tmp_path):
+        """Testa branch atual e detecção de repositório."""
+        with RepositorioGit(str(repositorio)) as repo:
+            assert repo.verificar_repositorio() is True
+            assert repo.obter_branch_atual() == "main"
+        
+        fora = tmp_path / "fora"
+        fora.mkdir()
+        assert RepositorioGit(str(fora)).verificar_repositorio() is False
+    
+    def test_fechar_encerra_processos(self, repositorio):
+        """Testa que fechar() termina os processos auxiliares."""
+        repo = RepositorioGit(str(repositorio))
+        repo.resolver("HEAD")
+        processo = repo._verificacao.processo
+        
+        repo.fechar()
+        
+        assert processo.poll() is not None
+        assert repo._verificacao.processo is None
+    
+    def test_reinicia_processo_encerrado(self, repositorio):
+        """Testa recuperação quando o processo auxiliar morre."""
+        with RepositorioGit(str(repositorio)) as repo:
+            repo.resolver("HEAD")
+            repo._verificacao.processo.kill()
+            repo._verificacao.processo.wait()
+            
+            assert repo.resolver("HEAD") is not None
+
+
+class TestObterStatus:
+    """Testes para obter_status e iterar_status."""
+    
+    def test_limpo(self, repositorio):
+        """Testa repositório sem alterações."""
+        status = obter_status(str(repositorio))
+        
+        assert status["limpo"] is True
+        assert status["branch"] == "main"
+        assert status["erro"] is None
+    
+    def test_preparado_e_nao_preparado(self, repositorio):
+        """Testa que 'AM' conta como adicionado e modificado."""
+        (repositorio / "novo.py").write_text("x = 1\n")
+        _git(repositorio, "add", "novo.py")
+        (repositorio / "novo.py").write_text("x = 2\n")
+        (repositorio / "app.py").write_text("print('alterado')\n")
+        
+        status = obter_status(str(repositorio))
+        
+        assert status["adicionados"] == ["novo.py"]
+        assert sorted(status["modificados"]) == ["app.py", "novo.py"]
+        assert status["preparados"] == ["novo.py"]
+        assert sorted(status["nao_preparados"]) == ["app.py", "novo.py"]
+        assert status["limpo"] is False
+    
+    def test_renomeado_e_deletado(self, repositorio):
+        """Testa renomeações e remoções."""
+        _git(repositorio, "mv", "app.py", "principal.py")
+        (repositorio / "README.md").unlink()
+        
+        status = obter_status(str(repositorio))
+        
+        assert status["renomeados"] == [{"de": "app.py", "para": "principal.py"}]
+        assert status["deletados"] == ["README.md"]
+    
+    def test_caminhos_com_espaco_e_quebra_de_linha(self, repositorio):
+        """Testa nomes que quebravam o parser por linhas."""
+        (repositorio / "com espaco.txt").write_text("a")
+        (repositorio / "com\nquebra.txt").write_text("b")
+        
+        status = obter_status(str(repositorio))
+        
+        assert sorted(status["novos"]) == sorted(["com espaco.txt", "com\nquebra.txt"])
+    
+    def test_conflito(self, repositorio):
+        """Testa detecção de conflitos de merge."""
+        _git(repositorio, "checkout", "-q", "-b", "outra")
+        (repositorio / "app.py").write_text("print('outra')\n")
+        _git(repositorio, "commit", "-q", "-am", "Outra")
+        _git(repositorio, "checkout", "-q", "main")
+        (repositorio / "app.py").write_text("print('main')\n")
+        _git(repositorio, "commit", "-q", "-am", "Main")
+        _git(repositorio, "merge", "outra", check=False)
+        
+        status = obter_status(str(repositorio))
+        
+        assert status["conflitos"] == ["app.py"]
+    
+    def test_pathspec_e_sem_nao_rastreados(self, repositorio):
+        """Testa limitação por pathspec e desligar não rastreados."""
+        (repositorio / "app.py").write_text("print('alterado')\n")
+        (repositorio / "README.md").write_text("alterado\n")
+        (repositorio / "solto.txt").write_text("x")
+        
+        status = obter_status(str(repositorio), pathspecs=["app.py"], nao_rastreados=False)
+        
+        assert status["modificados"] == ["app.py"]
+        assert status["novos"] == []
+    
+    def test_opcoes_de_desempenho(self, repositorio):
+        """Testa que untracked_cache/fsmonitor não alteram o resultado."""
+        (repositorio / "solto.txt").write_text("x")
+        
+        status = obter_status(str(repositorio), untracked_cache=True)
+        
+        assert status["novos"] == ["solto.txt"]
+    
+    def test_fora_de_repositorio(self, tmp_path):
+        """Testa erro fora de um repositório."""
+        status = obter_status(str(tmp_path))
+        
+        assert status["limpo"] is False
+        assert status["erro"]
+    
+    def test_iterar_status_streaming(self, repositorio):
+        """Testa entradas entregues pelo gerador."""
+        (repositorio / "solto.txt").write_text("x")
+        
+        entradas = [e for e in iterar_status(str(repositorio)) if e["tipo"] != "branch"]
+        
+        assert entradas == [{"tipo": "nao_rastreado", "caminho": "solto.txt"}]
+    
+    def test_fluxo_nao_trava_com_muitos_avisos(self):
+        """Testa que um stderr volumoso não bloqueia a leitura do stdout."""
+        import sys
+        
+        codigo = "import sys; sys.stderr.write('aviso\\n' * 50000); print('fim')"
+        with FluxoGit([sys.executable, "-c", codigo]) as fluxo:
+            assert fluxo.stdout.read() == b"fim\n"
+            fluxo.concluir()
+        
+        with FluxoGit([sys.executable, "-c", "import sys; sys.exit('falhou')"]) as fluxo:
+            fluxo.stdout.read()
+            with pytest.raises(RuntimeError, match="falhou"):
+                fluxo.concluir()
+
+
+class TestAtalhosNativos:
+    """Testes para a leitura de HEAD e refs sem executar o git."""
+    
+    def test_localizar_em_subdiretorio(self, repositorio):
+        """Testa localização subindo a partir de um subdiretório."""
+        (repositorio / "src" / "pacote").mkdir(parents=True)
+        
+        info = localizar_git(str(repositorio / "src" / "pacote"))
+        
+        assert info["raiz"] == str(repositorio)
+        assert info["git_dir"] == str(repositorio / ".git")
+        assert verificar_repositorio(str(repositorio / "src")) is True
+    
+    def test_fora_de_repositorio(self, tmp_path):
+        """Testa diretório fora de qualquer repositório."""
+        fora = tmp_path / "fora"
+        fora.mkdir()
+        
+        assert localizar_git(str(fora)) is None
+        assert verificar_repositorio(str(fora)) is False
+        assert obter_branch_atual(str(fora)) is None
+    
+    def test_head_e_branch_como_o_git(self, repositorio):
+        """Testa que os atalhos concordam com o git."""
+        head = ler_head(str(repositorio))
+        
+        assert head == {"ref": "refs/heads/main", "hash": _git(repositorio, "rev-parse", "HEAD")}
+        assert obter_branch_atual(str(repositorio)) == "main"
+    
+    def test_cache_invalidado_ao_trocar_branch(self, repositorio):
+        """Testa que checkout é percebido apesar do cache."""
+        assert obter_branch_atual(str(repositorio)) == "main"
+        _git(repositorio, "checkout", "-q", "-b", "dev1")
+        
+        assert obter_branch_atual(str(repositorio)) == "dev1"
+        
+        _git(repositorio, "checkout", "-q", "--detach")
+        assert obter_branch_atual(str(repositorio)) == ""
+        assert ler_head(str(repositorio))["ref"] is None
+    
+    def test_refs_empacotados_e_tags(self, repositorio):
+        """Testa refs em packed-refs e nomes curtos."""
+        _git(repositorio, "tag", "-a", "v1.0", "-m", "Versão 1.0", "HEAD~1")
+        _git(repositorio, "pack-refs", "--all")
+        
+        assert not (repositorio / ".git" / "refs" / "heads" / "main").exists()
+        assert resolver_ref_local("main", str(repositorio)) == _git(repositorio, "rev-parse", "main")
+        assert resolver_ref_local("v1.0", str(repositorio)) == _git(repositorio, "rev-parse", "v1.0")
+        assert resolver_ref_local("HEAD", str(repositorio)) == _git(repositorio, "rev-parse", "HEAD")
+        assert resolver_ref_local("nao-existe", str(repositorio)) is None
+    
+    def test_worktree(self, repositorio, tmp_path):
+        """Testa worktree com arquivo .git (gitdir:) e commondir."""
+        arvore = tmp_path / "arvore"
+        _git(repositorio, "worktree", "add", "-q", "-b", "recurso", str(arvore))
+        
+        info = localizar_git(str(arvore))
+        
+        assert info["raiz"] == str(arvore)
+        assert info["comum"] == str(repositorio / ".git")
+        assert obter_branch_atual(str(arvore)) == "recurso"
+        assert ler_head(str(arvore))["hash"] == _git(repositorio, "rev-parse", "main")
+    
+    def test_variavel_git_dir_usa_cli(self, repositorio, tmp_path, monkeypatch):
+        """Testa fallback para o git quando GIT_DIR está definido."""
+        fora = tmp_path / "fora"
+        fora.mkdir()
+        monkeypatch.setenv("GIT_DIR", str(repositorio / ".git"))
+        
+        assert verificar_repositorio(str(fora)) is True
+    
+    def test_rapido(self, repositorio):
+        """Testa que mil consultas não criam processos (bem abaixo de 1s)."""
+        inicio = time.perf_counter()
+        for _ in range(1000):
+            obter_branch_atual(str(repositorio))
+        
+        assert time.perf_counter() - inicio < 1
+
+
+class TestLog:
+    """Testes para o histórico em fluxo e paginado."""
+
+    def _commits(self, repo, quantidade):
+        for i in range(quantidade):
+            (repo / f"arquivo{i}.txt").write_text(f"{i}\n")
+            _git(repo, "add", ".")
+            _git(repo, "commit", "-q", "-m", f"Commit {i} | com barra")
+
+    def test_campos_com_separadores(self, repositorio):
+        """Testa que "|" na mensagem não quebra a interpretação."""
+        self._commits(repositorio, 1)
+        commits = obter_log(5, caminho=str(repositorio))
+        assert [c["mensagem"] for c in commits] == [
+            "Commit 0 | com barra", "Adiciona app", "Primeiro commit"
+        ]
+        assert commits[0]["hash"] == _git(repositorio, "rev-parse", "HEAD")
+        assert commits[0]["autor"] == "Teste"
+        assert commits[0]["email"] == "teste@exemplo.com"
+
+    def test_iterar_log_pais_e_timestamp(self, repositorio):
+        """Testa campos extras do iterador."""
+        recente, primeiro = list(iterar_log(str(repositorio)))
+        assert recente["pais"] == [primeiro["hash"]]
+        assert primeiro["pais"] == []
+        assert isinstance(recente["timestamp"], int)
+
+    def test_parar_cedo_encerra_processo(self, repositorio):
+        """Testa interromper o iterador no meio do histórico."""
+        self._commits(repositorio, 5)
+        iterador = iterar_log(str(repositorio))
+        assert next(iterador)["mensagem"].startswith("Commit 4")
+        iterador.close()
+
+    def test_paginacao(self, repositorio):
+        """Testa percorrer o histórico página a página."""
+        self._commits(repositorio, 5)
+        vistos = []
+        apos = None
+        while True:
+            pagina = obter_log_pagina(str(repositorio), limite=3, apos=apos)
+            assert pagina["erro"] is None
+            vistos += [c["hash"] for c in pagina["commits"]]
+            apos = pagina["proximo"]
+            if apos is None:
+                break
+        assert vistos == _git(repositorio, "log", "--format=%H").split()
+
+    def test_paginacao_com_merges(self, repositorio):
+        """Testa que o cursor retoma a caminhada sem perder ramos paralelos."""
+        # Datas crescentes depois dos commits do fixture (sem desvio de relógio)
+        datas = iter(range(int(time.time()) + 10, int(time.time()) + 1000, 10))
+
+        def commit(arquivo, mensagem, *extra):
+            data = f"@{next(datas)} +0000"
+            (repositorio / arquivo).write_text(mensagem)
+            _git(repositorio, "add", arquivo)
+            subprocess.run(
+                ["git", "commit", "-q", "-m", mensagem, *extra], cwd=repositorio, check=True,
+                env={**os.environ, "GIT_AUTHOR_NAME": "Teste", "GIT_AUTHOR_EMAIL": "t@e.com",
+                     "GIT_COMMITTER_NAME": "Teste", "GIT_COMMITTER_EMAIL": "t@e.com",
+                     "GIT_AUTHOR_DATE": data, "GIT_COMMITTER_DATE": data}
+            )
+
+        _git(repositorio, "checkout", "-q", "-b", "lateral")
+        for i in range(3):
+            commit("lateral.txt" if i % 2 else "app.py", f"lateral {i}")
+        _git(repositorio, "checkout", "-q", "main")
+        for i in range(3):
+            commit("app.py" if i % 2 else "main.txt", f"main {i}")
+        _git(repositorio, "merge", "-q", "--no-ff", "--no-commit", "lateral", check=False)
+        (repositorio / "app.py").write_text("merge")
+        commit("app.py", "merge")
+
+        for caminhos in (None, ["app.py"]):
+            esperado = [c["hash"] for c in iterar_log(str(repositorio), caminhos=caminhos)]
+            for limite in (1, 2, 3):
+                vistos, apos = [], None
+                while True:
+                    pagina = obter_log_pagina(
+                        str(repositorio), limite=limite, apos=apos, caminhos=caminhos
+                    )
+                    assert pagina["erro"] is None
+                    vistos += [c["hash"] for c in pagina["commits"]]
+                    apos = pagina["proximo"]
+                    if apos is None:
+                        break
+                assert vistos == esperado
+
+    def test_cursor_invalido(self, repositorio):
+        """Testa que um cursor inexistente é erro, e não página vazia."""
+        pagina = obter_log_pagina(str(repositorio), apos="0" * 40)
+        assert pagina["commits"] == []
+        assert "Cursor" in pagina["erro"]
+        with pytest.raises(ValueError):
+            list(iterar_log(str(repositorio), apos="0" * 40))
+
+    def test_cache_com_data_relativa(self, repositorio, monkeypatch):
+        """Testa que a chave do cache usa o timestamp absoluto de `desde`."""
+        chaves = []
+        import utils.git_utils as git_utils
+        original = git_utils.chave_cache
+        monkeypatch.setattr(git_utils, "chave_cache", lambda texto: chaves.append(texto) or original(texto))
+
+        pagina = obter_log_pagina(str(repositorio), desde="1 year ago")
+        assert pagina["erro"] is None
+        assert len(pagina["commits"]) == 2
+        assert "year" not in chaves[0]
+
+    def test_filtro_de_caminho(self, repositorio):
+        """Testa filtrar commits que alteram um caminho."""
+        self._commits(repositorio, 2)
+        pagina = obter_log_pagina(str(repositorio), caminhos=["app.py"])
+        assert [c["mensagem"] for c in pagina["commits"]] == ["Adiciona app"]
+
+    def test_cache_invalidado_por_novo_commit(self, repositorio):
+        """Testa que a página vem do cache até o HEAD mudar."""
+        primeira = obter_log_pagina(str(repositorio), limite=10)
+        assert primeira["do_cache"] is False
+        assert obter_log_pagina(str(repositorio), limite=10)["do_cache"] is True
+
+        self._commits(repositorio, 1)
+        nova = obter_log_pagina(str(repositorio), limite=10)
+        assert nova["do_cache"] is False
+        assert len(nova["commits"]) == 3
+
+    def test_erro_fora_de_repositorio(self, tmp_path):
+        """Testa que o erro é reportado sem exceção."""
+        assert obter_log_pagina(str(tmp_path))["erro"]
+        assert obter_log(caminho=str(tmp_path)) == []
+
+    def test_commit_graph(self, repositorio):
+        """Testa gravação do commit-graph."""
+        assert escrever_commit_graph(str(repositorio)) is True
+        graph = repositorio / ".git" / "objects" / "info"
+        assert (graph / "commit-graph").exists() or (graph / "commit-graphs").exists()
+        pagina = obter_log_pagina(str(repositorio), commit_graph=True, usar_cache=False)
+        assert len(pagina["commits"]) == 2
+
+
+class TestEspelho:
+    """Testes para clone e fetch via espelho local."""
+
+    @pytest.fixture
+    def url(self, repositorio):
+        return f"file://{repositorio}"
+
+    def test_espelho_criado_e_reaproveitado(self, url):
+        """Testa criação do espelho e max_idade."""
+        primeiro = atualizar_espelho(url)
+        assert primeiro["sucesso"] is True
+        assert primeiro["atualizado"] is True
+        assert primeiro["espelho"] == str(caminho_espelho(url))
+        assert (caminho_espelho(url) / "refs" / "heads" / "main").exists() or \
+            "refs/heads/main" in (caminho_espelho(url) / "packed-refs").read_text()
+
+        assert atualizar_espelho(url, max_idade=3600)["atualizado"] is False
+        assert atualizar_espelho(url)["atualizado"] is True
+
+    def test_clone_referencia(self, repositorio, url, tmp_path):
+        """Testa clone com alternates apontando para o espelho."""
+        destino = tmp_path / "clone"
+        resultado = clonar(url, str(destino))
+        assert resultado["sucesso"] is True, resultado["erro"]
+        alternates = (destino / ".git" / "objects" / "info" / "alternates").read_text()
+        assert str(caminho_espelho(url)) in alternates
+        assert _git(destino, "rev-parse", "HEAD") == _git(repositorio, "rev-parse", "HEAD")
+        assert _git(destino, "remote", "get-url", "origin") == url
+
+    def test_clone_hardlink(self, repositorio, url, tmp_path):
+        """Testa clone local com objetos compartilhados por hard link."""
+        destino = tmp_path / "clone"
+        resultado = clonar(url, str(destino), modo="hardlink")
+        assert resultado["sucesso"] is True, resultado["erro"]
+        assert _git(destino, "remote", "get-url", "origin") == url
+        objetos = [p for p in (destino / ".git" / "objects").rglob("*") if p.is_file()]
+        assert any(p.stat().st_nlink > 1 for p in objetos)
+        assert (destino / "app.py").exists()
+
+    def test_clone_independente_e_branch(self, repositorio, url, tmp_path):
+        """Testa --dissociate e checkout de branch."""
+        _git(repositorio, "branch", "feature", "HEAD~1")
+        destino = tmp_path / "clone"
+        resultado = clonar(url, str(destino), branch="feature", modo="independente")
+        assert resultado["sucesso"] is True, resultado["erro"]
+        assert not (destino / ".git" / "objects" / "info" / "alternates").exists()
+        assert _git(destino, "branch", "--show-current") == "feature"
+
+    def test_buscar_via_espelho(self, repositorio, url, tmp_path):
+        """Testa fetch de commits novos do remoto através do espelho."""
+        destino = tmp_path / "clone"
+        clonar(url, str(destino))
+        _git(destino, "tag", "local")
+        (repositorio / "novo.txt").write_text("novo\n")
+        _git(repositorio, "add", ".")
+        _git(repositorio, "commit", "-q", "-m", "Novo")
+        _git(repositorio, "tag", "v2")
+
+        resultado = buscar(str(destino))
+        assert resultado["sucesso"] is True, resultado["erro"]
+        assert _git(destino, "rev-parse", "origin/main") == _git(repositorio, "rev-parse", "HEAD")
+        assert _git(destino, "tag", "--list") == "local\nv2"
+
+    def test_atualizacoes_simultaneas(self, url):
+        """Testa que a trava serializa atualizações concorrentes."""
+        resultados = []
+        threads = [
+            threading.Thread(target=lambda: resultados.append(atualizar_espelho(url, max_idade=3600)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(r["sucesso"] for r in resultados)
+        assert sum(r["atualizado"] for r in resultados) == 1
+
+    def test_remoto_invalido(self, tmp_path):
+        """Testa erro ao clonar URL inexistente."""
+        resultado = clonar(f"file://{tmp_path}/nao-existe", str(tmp_path / "clone"))
+        assert resultado["sucesso"] is False
+        assert resultado["erro"]
+        assert not caminho_espelho(f"file://{tmp_path}/nao-existe").exists()
@@ -0,0 +1,166 @@
+"""
+Testes para o módulo de operações Git em vários repositórios.
+"""
+
+import os
+import sys
+import time
+import subprocess
+from pathlib import Path
+import pytest
+
+from utils import git_workspace
+from utils.git_workspace import descobrir_repositorios, executar_em_repositorios
+
+
+def _git(cwd, *argumentos):
+    """Executa git com identidade fixa."""
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME="Teste", GIT_AUTHOR_EMAIL="teste@exemplo.com",
+        GIT_COMMITTER_NAME="Teste", GIT_COMMITTER_EMAIL="teste@exemplo.com",
+    )
+    return subprocess.run(
+        ["git", *argumentos], cwd=cwd, env=env, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Cria remotos bare, clones em uma raiz e um clone externo para publicar."""
+    remotos = tmp_path / "remotos"
+    raiz = tmp_path / "servicos"
+    externo = tmp_path / "externo"
+    for nome in ("api", "worker"):
+        origem = remotos / f"{nome}.git"
+        _git(tmp_path, "init", "-q", "--bare", "-b", "main", str(origem))
+        _git(tmp_path, "clone", "-q", str(origem), str(externo / nome))
+        (externo / nome / "README.md").write_text(f"# {nome}\n")
+        _git(externo / nome, "add", "README.md")
+        _git(externo / nome, "commit", "-q", "-m", "Inicial")
+        _git(externo / nome, "push", "-q", "origin", "main")
+    (raiz / "backend").mkdir(parents=True)
+    _git(tmp_path, "clone", "-q", str(remotos / "api.git"), str(raiz / "backend" / "api"))
+    _git(tmp_path, "clone", "-q", str(remotos / "worker.git"), str(raiz / "worker"))
+    (raiz / "nao_e_repo").mkdir()
+    return {"raiz": raiz, "externo": externo, "remotos": remotos}
+
+
+@pytest.fixture
+def operacao_lenta(monkeypatch):
+    """Registra uma operação que apenas dorme, para medir concorrência."""
+    def argumentos(opcoes):
+        return [sys.executable, "-c", f"import time; time.sleep({opcoes.get('espera', 0.3)})"]
+    monkeypatch.setitem(git_workspace.OPERACOES_GIT, "dormir", (argumentos, lambda saida, opcoes: {}))
+
+
+class TestDescobrirRepositorios:
+    """Testes para a função descobrir_repositorios."""
+    
+    def test_encontra_clones(self, workspace):
+        """Testa que encontra repositórios em níveis diferentes."""
+        repositorios = descobrir_repositorios(str(workspace["raiz"]))
+        
+        nomes = [os.path.relpath(r, workspace["raiz"]) for r in repositorios]
+        assert nomes == [os.path.join("backend", "api"), "worker"]
+    
+    def test_profundidade(self, workspace):
+        """Testa o limite de profundidade."""
+        repositorios = descobrir_repositorios(str(workspace["raiz"]), profundidade_max=1)
+        
+        assert [Path(r).name for r in repositorios] == ["worker"]
+    
+    def test_encontra_repositorios_bare(self, workspace):
+        """Testa que remotos bare locais também são descobertos."""
+        repositorios = descobrir_repositorios(str(workspace["remotos"]))
+        
+        assert [Path(r).name for r in repositorios] == ["api.git", "worker.git"]
+        resultado = executar_em_repositorios(repositorios, "log", limite=1)
+        assert resultado["sucesso"] is True
+        assert resultado["resultados"][repositorios[0]]["commits"][0]["mensagem"] == "Inicial"
+
+
+class TestExecutarEmRepositorios:
+    """Testes para a função executar_em_repositorios."""
+    
+    def test_status(self, workspace):
+        """Testa status agregado e lista de repositórios sujos."""
+        (workspace["raiz"] / "worker" / "solto.txt").write_text("x")
+        repositorios = descobrir_repositorios(str(workspace["raiz"]))
+        
+        resultado = executar_em_repositorios(repositorios, "status")
+        
+        assert resultado["sucesso"] is True
+        assert resultado["total"] == 2
+        assert resultado["sujos"] == [str(workspace["raiz"] / "worker")]
+        assert resultado["resultados"][repositorios[0]]["branch"] == "main"
+    
+    def test_fetch_e_pull_de_remoto_bare(self, workspace):
+        """Testa fetch/pull trazendo commits publicados no remoto."""
+        externo = workspace["externo"] / "api"
+        (externo / "novo.txt").write_text("novo")
+        _git(externo, "add", "novo.txt")
+        _git(externo, "commit", "-q", "-m", "Novo arquivo")
+        _git(externo, "push", "-q", "origin", "main")
+        repositorios = descobrir_repositorios(str(workspace["raiz"]))
+        
+        assert executar_em_repositorios(repositorios, "fetch")["sucesso"] is True
+        status = executar_em_repositorios(repositorios, "status")["resultados"]
+        assert status[repositorios[0]]["atras"] == 1
+        
+        assert executar_em_repositorios(repositorios, "pull")["sucesso"] is True
+        assert (workspace["raiz"] / "backend" / "api" / "novo.txt").exists()
+    
+    def test_log(self, workspace):
+        """Testa o log por repositório."""
+        repositorios = descobrir_repositorios(str(workspace["raiz"]))
+        
+        resultado = executar_em_repositorios(repositorios, "log", limite=1)
+        
+        commits = resultado["resultados"][repositorios[1]]["commits"]
+        assert [c["mensagem"] for c in commits] == ["Inicial"]
+        assert len(commits[0]["hash"]) == 40
+    
+    def test_falha_isolada(self, workspace, tmp_path):
+        """Testa que um diretório inválido não derruba os demais."""
+        fora = tmp_path / "fora"
+        fora.mkdir()
+        repositorios = descobrir_repositorios(str(workspace["raiz"])) + [str(fora)]
+        
+        resultado = executar_em_repositorios(repositorios, "status")
+        
+        assert resultado["sucessos"] == 2
+        assert resultado["falhas"] == 1
+        assert resultado["resultados"][str(fora)]["erro"]
+    
+    def test_tempo_limitado_pela_concorrencia(self, operacao_lenta, tmp_path):
+        """Testa que o tempo total depende do limite de concorrência."""
+        repositorios = [str(tmp_path / f"r{i}") for i in range(6)]
+        for caminho in repositorios:
+            os.mkdir(caminho)
+        
+        inicio = time.monotonic()
+        resultado = executar_em_repositorios(repositorios, "dormir", concorrencia=6)
+        paralelo = time.monotonic() - inicio
+        
+        inicio = time.monotonic()
+        executar_em_repositorios(repositorios, "dormir", concorrencia=2)
+        limitado = time.monotonic() - inicio
+        
+        assert resultado["sucessos"] == 6
+        # 6 x 0.3s: ~0.3s com 6 simultâneos, ~0.9s com 2
+        assert paralelo < limitado
+        assert limitado >= 0.85
+    
+    def test_timeout_por_repositorio(self, operacao_lenta, tmp_path):
+        """Testa que o timeout encerra apenas o repositório lento."""
+        inicio = time.monotonic()
+        resultado = executar_em_repositorios([str(tmp_path)], "dormir", timeout=0.3, espera=10)
+        
+        assert time.monotonic() - inicio < 5
+        assert resultado["resultados"][str(tmp_path)]["erro"] == "Timeout"
+    
+    def test_operacao_desconhecida(self):
+        """Testa erro para operação não registrada."""
+        with pytest.raises(ValueError):
+            executar_em_repositorios([], "rebase")
@@ -0,0 +1,158 @@
+"""
+Testes para o módulo de índice de arquivos.
+"""
+
+import os
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+import pytest
+
+from utils.indice import atualizar_indice, consultar_indice
+from utils.projeto import gerenciar_arquivos, listar_arquivos_ordenados
+
+
+@pytest.fixture
+def arvore(temp_dir):
+    """Cria uma árvore com arquivos variados."""
+    raiz = Path(temp_dir) / "dados"
+    (raiz / "src").mkdir(parents=True)
+    (raiz / "logs").mkdir()
+    (raiz / "src" / "main.py").write_text("x" * 100)
+    (raiz / "src" / "test_main.py").write_text("x" * 50)
+    (raiz / "logs" / "app.log").write_text("x" * 5000)
+    (raiz / "README.md").write_text("x")
+    return raiz
+
+
+class TestAtualizarIndice:
+    """Testes para a função atualizar_indice."""
+    
+    def test_criar_indice(self, arvore):
+        """Testa criação do índice."""
+        resultado = atualizar_indice(str(arvore))
+        
+        assert resultado["sucesso"] is True
+        assert resultado["arquivos"] == 4
+        assert resultado["diretorios"] == 3
+        assert Path(resultado["indice"]).exists()
+    
+    def test_atualizacao_incremental(self, arvore):
+        """Testa que só diretórios alterados são relidos."""
+        atualizar_indice(str(arvore))
+        (arvore / "logs" / "novo.log").write_text("x")
+        os.utime(arvore / "logs", ns=(0, 1))
+        
+        resultado = atualizar_indice(str(arvore))
+        
+        assert resultado["diretorios_relidos"] == 1
+        assert resultado["arquivos"] == 5
+    
+    def test_diretorio_removido(self, arvore):
+        """Testa remoção de diretórios que sumiram."""
+        atualizar_indice(str(arvore))
+        shutil.rmtree(arvore / "logs")
+        
+        resultado = atualizar_indice(str(arvore))
+        
+        assert resultado["diretorios_removidos"] == 1
+        assert resultado["arquivos"] == 3
+    
+    def test_indice_em_arquivo_explicito(self, arvore, temp_dir):
+        """Testa índice em caminho informado."""
+        banco = Path(temp_dir) / "meu_indice.db"
+        
+        atualizar_indice(str(arvore), banco=str(banco))
+        
+        assert banco.exists()
+        assert len(consultar_indice(str(arvore), banco=str(banco))) == 4
+    
+    def test_diretorio_inexistente(self):
+        """Testa erro para diretório inexistente."""
+        resultado = atualizar_indice("/diretorio/inexistente")
+        
+        assert resultado["sucesso"] is False
+
+
+class TestConsultarIndice:
+    """Testes para a função consultar_indice."""
+    
+    @pytest.fixture(autouse=True)
+    def indexar(self, arvore):
+        atualizar_indice(str(arvore))
+    
+    def test_por_extensao(self, arvore):
+        """Testa consulta por extensão."""
+        arquivos = consultar_indice(str(arvore), extensao=".py")
+        
+        assert sorted(a["nome"] for a in arquivos) == ["main.py", "test_main.py"]
+    
+    def test_por_tamanho(self, arvore):
+        """Testa consulta por faixa de tamanho."""
+        arquivos = consultar_indice(str(arvore), tamanho_min=50, tamanho_max=100)
+        
+        assert sorted(a["tamanho"] for a in arquivos) == [50, 100]
+    
+    def test_por_padrao(self, arvore):
+        """Testa consulta por glob no nome."""
+        arquivos = consultar_indice(str(arvore), padrao="test_*")
+        
+        assert [a["nome"] for a in arquivos] == ["test_main.py"]
+    
+    def test_modificado_desde(self, arvore):
+        """Testa consulta por data de modificação."""
+        futuro = datetime.fromtimestamp(time.time() + 3600).isoformat()
+        
+        assert consultar_indice(str(arvore), modificado_desde=futuro) == []
+        assert len(consultar_indice(str(arvore), modificado_desde="2000-01-01")) == 4
+    
+    def test_limite(self, arvore):
+        """Testa limite de resultados."""
+        assert len(consultar_indice(str(arvore), limite=2)) == 2
+    
+    def test_estrutura_resultado(self, arvore):
+        """Testa que o formato é o mesmo de gerenciar_arquivos."""
+        for arquivo in consultar_indice(str(arvore)):
+            assert set(arquivo) == {"nome", "caminho", "tamanho", "modificado"}
+    
+    def test_ordenar(self, arvore):
+        """Testa ordenação feita pelo SQLite."""
+        arquivos = consultar_indice(str(arvore), ordenar="tamanho", limite=2)
+        
+        assert [a["nome"] for a in arquivos] == ["app.log", "main.py"]
+        with pytest.raises(ValueError):
+            consultar_indice(str(arvore), ordenar="cor")
+    
+    def test_indice_inexistente(self, temp_dir):
+        """Testa consulta sem índice criado."""
+        assert consultar_indice(temp_dir) == []
+
+
+class TestListagemPeloIndice:
+    """Testes para listar_arquivos_ordenados/gerenciar_arquivos com usar_indice."""
+    
+    def test_listar_usa_indice(self, arvore):
+        """Testa que a listagem reflete o índice e não a árvore atual."""
+        atualizar_indice(str(arvore))
+        (arvore / "src" / "novo.py").write_text("x" * 9999)
+        
+        arquivos = listar_arquivos_ordenados(str(arvore), ordenar="tamanho", limite=2, usar_indice=True)
+        
+        assert [a["nome"] for a in arquivos] == ["app.log", "main.py"]
+        assert listar_arquivos_ordenados(str(arvore), ordenar="tamanho", limite=1)[0]["nome"] == "novo.py"
+    
+    def test_gerenciar_usa_indice(self, arvore):
+        """Testa gerenciar_arquivos servido pelo índice."""
+        atualizar_indice(str(arvore))
+        shutil.rmtree(arvore / "logs")
+        
+        arquivos = gerenciar_arquivos(str(arvore), extensao=".log", usar_indice=True)
+        
+        assert [a["nome"] for a in arquivos] == ["app.log"]
+    
+    def test_sem_indice_varre_arvore(self, arvore):
+        """Testa que, sem índice, a árvore é percorrida normalmente."""
+        arquivos = gerenciar_arquivos(str(arvore), extensao=".py", usar_indice=True)
+        
+        assert sorted(a["nome"] for a in arquivos) == ["main.py", "test_main.py"]
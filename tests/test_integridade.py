@@ -0,0 +1,139 @@
+"""
+Testes para o módulo de integridade de arquivos.
+"""
+
+import os
+from pathlib import Path
+import pytest
+
+from utils.integridade import criar_linha_base, verificar_integridade, caminho_linha_base
+
+
+@pytest.fixture
+def arvore(temp_dir):
+    """Cria uma árvore de configuração."""
+    raiz = Path(temp_dir) / "etc"
+    (raiz / "ssh").mkdir(parents=True)
+    (raiz / "hosts").write_text("127.0.0.1 localhost\n")
+    (raiz / "ssh" / "sshd_config").write_text("PermitRootLogin no\n")
+    (raiz / "motd").write_text("bem-vindo\n")
+    return raiz
+
+
+class TestCriarLinhaBase:
+    """Testes para a função criar_linha_base."""
+    
+    def test_cria_no_cache(self, arvore):
+        """Testa gravação da linha de base no local padrão."""
+        resultado = criar_linha_base(str(arvore))
+        
+        assert resultado["sucesso"] is True
+        assert resultado["arquivos"] == 3
+        assert resultado["recalculados"] == 3
+        assert Path(resultado["linha_base"]) == caminho_linha_base(str(arvore))
+    
+    def test_reaproveita_hashes(self, arvore):
+        """Testa que aceitar de novo só recalcula arquivos alterados."""
+        criar_linha_base(str(arvore))
+        (arvore / "motd").write_text("nova mensagem\n")
+        
+        resultado = criar_linha_base(str(arvore))
+        
+        assert resultado["recalculados"] == 1
+    
+    def test_diretorio_inexistente(self, temp_dir):
+        """Testa erro para diretório inexistente."""
+        resultado = criar_linha_base(os.path.join(temp_dir, "nao_existe"))
+        
+        assert resultado["sucesso"] is False
+
+
+class TestVerificarIntegridade:
+    """Testes para a função verificar_integridade."""
+    
+    def test_sem_alteracoes_so_stat(self, arvore):
+        """Testa que arquivos inalterados não são relidos."""
+        criar_linha_base(str(arvore))
+        
+        resultado = verificar_integridade(str(arvore))
+        
+        assert resultado["sucesso"] is True
+        assert resultado["alterado"] is False
+        assert resultado["verificados"] == 3
+        assert resultado["recalculados"] == 0
+    
+    def test_detecta_alteracoes(self, arvore):
+        """Testa relatório de adicionados, removidos e modificados."""
+        criar_linha_base(str(arvore))
+        (arvore / "ssh" / "sshd_config").write_text("PermitRootLogin yes\n")
+        (arvore / "motd").unlink()
+        (arvore / "cron.d").mkdir()
+        (arvore / "cron.d" / "backdoor").write_text("* * * * * root nc -e /bin/sh\n")
+        
+        resultado = verificar_integridade(str(arvore))
+        
+        assert resultado["alterado"] is True
+        assert resultado["modificados"] == ["ssh/sshd_config"]
+        assert resultado["removidos"] == ["motd"]
+        assert resultado["adicionados"] == ["cron.d/backdoor"]
+        assert resultado["recalculados"] == 2
+    
+    def test_mtime_restaurado_detectado(self, arvore):
+        """Testa alteração com mtime restaurado (detectada via ctime)."""
+        criar_linha_base(str(arvore))
+        arquivo = arvore / "hosts"
+        stat = arquivo.stat()
+        arquivo.write_text("10.0.0.1 localhost\n")
+        os.utime(arquivo, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        
+        resultado = verificar_integridade(str(arvore))
+        
+        assert resultado["modificados"] == ["hosts"]
+    
+    def test_alteracao_continua_reportada(self, arvore):
+        """Testa que a alteração persiste até nova linha de base."""
+        criar_linha_base(str(arvore))
+        (arvore / "hosts").write_text("alterado\n")
+        (arvore / "motd").unlink()
+        verificar_integridade(str(arvore))
+        
+        segunda = verificar_integridade(str(arvore))
+        assert segunda["modificados"] == ["hosts"]
+        assert segunda["removidos"] == ["motd"]
+        assert segunda["recalculados"] == 0
+        
+        criar_linha_base(str(arvore))
+        assert verificar_integridade(str(arvore))["alterado"] is False
+    
+    def test_touch_sem_mudar_conteudo(self, arvore):
+        """Testa que mudança só de metadados não é alteração."""
+        criar_linha_base(str(arvore))
+        os.utime(arvore / "motd", (1_700_000_000, 1_700_000_000))
+        
+        resultado = verificar_integridade(str(arvore))
+        
+        assert resultado["alterado"] is False
+        assert resultado["recalculados"] == 1
+    
+    def test_completo_recalcula_tudo(self, arvore):
+        """Testa o modo de verificação completa."""
+        criar_linha_base(str(arvore))
+        
+        resultado = verificar_integridade(str(arvore), completo=True)
+        
+        assert resultado["recalculados"] == 3
+        assert resultado["alterado"] is False
+    
+    def test_linha_base_em_arquivo(self, arvore, temp_dir):
+        """Testa linha de base em arquivo explícito."""
+        arquivo = os.path.join(temp_dir, "base.json")
+        criar_linha_base(str(arvore), arquivo=arquivo)
+        
+        assert verificar_integridade(str(arvore), arquivo=arquivo)["sucesso"] is True
+    
+    def test_sem_linha_base(self, arvore):
+        """Testa erro quando não há linha de base."""
+        resultado = verificar_integridade(str(arvore))
+        
+        assert resultado["sucesso"] is False
+        assert resultado["erro"] is not None
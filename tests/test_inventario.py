@@ -0,0 +1,144 @@
+"""
+Testes para o módulo de inventário.
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+import pytest
+
+from utils import inventario
+from utils.inventario import carregar_inventario, executar_em_hosts
+
+
+@pytest.fixture
+def transporte_falso(monkeypatch):
+    """Registra um transporte local que simula latência por host."""
+    chamadas = []
+
+    def transporte(host, comando, timeout):
+        chamadas.append(host["host"])
+        time.sleep(float(host.get("espera", 0.2)))
+        if host.get("falhar"):
+            return {"sucesso": False, "erro": "falha simulada"}
+        return {"sucesso": True, "stdout": f"{host['host']}: {comando}"}
+
+    monkeypatch.setitem(inventario.TRANSPORTES, "falso", transporte)
+    return chamadas
+
+
+class TestCarregarInventario:
+    """Testes para a função carregar_inventario."""
+    
+    def test_inventario_texto(self, temp_dir):
+        """Testa inventário em texto com atributos e comentários."""
+        arquivo = Path(temp_dir) / "hosts.txt"
+        arquivo.write_text("# servidores\nweb01 usuario=deploy porta=2222\n\nweb02\n")
+        
+        hosts = carregar_inventario(str(arquivo))
+        
+        assert hosts == [
+            {"host": "web01", "usuario": "deploy", "porta": "2222"},
+            {"host": "web02"}
+        ]
+    
+    def test_inventario_json(self, temp_dir):
+        """Testa inventário em JSON."""
+        arquivo = Path(temp_dir) / "hosts.json"
+        arquivo.write_text(json.dumps([{"host": "db01", "transporte": "local"}]))
+        
+        assert carregar_inventario(str(arquivo))[0]["transporte"] == "local"
+    
+    def test_atributo_invalido(self, temp_dir):
+        """Testa erro para atributo sem '='."""
+        arquivo = Path(temp_dir) / "hosts.txt"
+        arquivo.write_text("web01 deploy\n")
+        
+        with pytest.raises(ValueError):
+            carregar_inventario(str(arquivo))
+    
+    def test_host_duplicado(self, temp_dir):
+        """Testa erro para o mesmo host listado duas vezes."""
+        arquivo = Path(temp_dir) / "hosts.txt"
+        arquivo.write_text("web01\nweb02\nweb01 porta=2222\n")
+        
+        with pytest.raises(ValueError, match="web01"):
+            carregar_inventario(str(arquivo))
+        with pytest.raises(ValueError):
+            executar_em_hosts([{"host": "a"}, {"host": "a"}], "true")
+    
+    def test_cerquilha_dentro_de_valor(self, temp_dir):
+        """Testa que "#" só é comentário no início de um campo."""
+        arquivo = Path(temp_dir) / "hosts.txt"
+        arquivo.write_text("web#1 rotulo=a#b  # comentário com 'aspas\n  # recuado\n")
+        
+        assert carregar_inventario(str(arquivo)) == [{"host": "web#1", "rotulo": "a#b"}]
+    
+    def test_json_que_nao_e_lista(self, temp_dir):
+        """Testa erro claro para JSON fora do formato."""
+        arquivo = Path(temp_dir) / "hosts.json"
+        arquivo.write_text(json.dumps({"host": "db01"}))
+        
+        with pytest.raises(ValueError, match="lista"):
+            carregar_inventario(str(arquivo))
+        arquivo.write_text(json.dumps(["db01"]))
+        with pytest.raises(ValueError, match="sem 'host'"):
+            carregar_inventario(str(arquivo))
+    
+    def test_inventario_inexistente(self):
+        """Testa erro para arquivo inexistente."""
+        with pytest.raises(FileNotFoundError):
+            carregar_inventario("/inventario/inexistente.txt")
+
+
+class TestExecutarEmHosts:
+    """Testes para a função executar_em_hosts."""
+    
+    def test_agrega_resultados(self, transporte_falso):
+        """Testa agregação de sucessos e falhas."""
+        hosts = [{"host": "a"}, {"host": "b", "falhar": "1"}, {"host": "c"}]
+        
+        resultado = executar_em_hosts(hosts, "uptime", transporte="falso")
+        
+        assert resultado["total"] == 3
+        assert resultado["sucessos"] == 2
+        assert resultado["falhas"] == 1
+        assert resultado["sucesso"] is False
+        assert resultado["resultados"]["a"]["stdout"] == "a: uptime"
+    
+    def test_tempo_limitado_pela_concorrencia(self, transporte_falso):
+        """Testa que o tempo total depende da concorrência e não do número de hosts."""
+        hosts = [{"host": f"h{i}"} for i in range(20)]
+        
+        inicio = time.monotonic()
+        executar_em_hosts(hosts, "true", concorrencia=10, transporte="falso")
+        duracao = time.monotonic() - inicio
+        
+        # 20 hosts x 0.2s com 10 em paralelo ~ 0.4s (sequencial seria 4s)
+        assert duracao < 2
+        assert len(transporte_falso) == 20
+    
+    def test_transporte_desconhecido(self):
+        """Testa erro para transporte não registrado."""
+        resultado = executar_em_hosts([{"host": "a"}], "true", transporte="inexistente")
+        
+        assert resultado["resultados"]["a"]["sucesso"] is False
+    
+    def test_transporte_local(self):
+        """Testa o transporte local com comando real."""
+        resultado = executar_em_hosts(
+            [{"host": "local1"}, {"host": "local2"}], "echo ok", transporte="local"
+        )
+        
+        assert resultado["sucesso"] is True
+        assert resultado["resultados"]["local2"]["stdout"] == "ok"
+    
+    @pytest.mark.skipif(sys.platform == "win32", reason="Usa o comando sleep")
+    def test_timeout_por_host(self):
+        """Testa timeout individual de um host."""
+        resultado = executar_em_hosts(
+            [{"host": "lento", "timeout": "1"}], "sleep 5", transporte="local"
+        )
+        
+        assert resultado["resultados"]["lento"]["erro"] == "Timeout"
@@ -53,6 +53,188 @@ class TestMainScript:
         assert resultado.returncode == 0
         assert "Listando arquivos" in resultado.stdout
     
+    def test_executar_acao_processos(self):
+        """Testa execução da ação processos."""
+        resultado = self._run_main("--acao", "processos", "--limite", "3")
+        
+        assert resultado.returncode == 0
+        assert "Top 3 processos" in resultado.stdout
+    
+    def test_executar_acao_executar_hosts(self, tmp_path):
+        """Testa execução da ação executar-hosts com transporte local."""
+        inventario = tmp_path / "hosts.txt"
+        inventario.write_text("local1\nlocal2\n")
+        
+        resultado = self._run_main(
+            "--acao", "executar-hosts", "--inventario", str(inventario),
+            "--comando", "echo ok", "--transporte", "local"
+        )
+        
+        assert resultado.returncode == 0
+        assert "Total: 2/2 OK" in resultado.stdout
+    
+    def test_executar_hosts_inventario_inexistente(self, tmp_path):
+        """Testa que inventário inválido gera erro sem traceback."""
+        resultado = self._run_main(
+            "--acao", "executar-hosts", "--inventario", str(tmp_path / "nada.txt"),
+            "--comando", "echo ok"
+        )
+        
+        assert resultado.returncode == 1
+        assert "[ERRO]" in resultado.stdout
+        assert "Traceback" not in resultado.stderr
+    
+    def test_executar_acao_uso_disco(self):
+        """Testa execução da ação uso-disco."""
+        resultado = self._run_main("--acao", "uso-disco", "--diretorio", "utils", "--limite", "3")
+        
+        assert resultado.returncode == 0
+        assert "Maiores arquivos" in resultado.stdout
+    
+    def test_desde_invalido(self):
+        """Testa que data inválida em --desde é erro de uso, sem traceback."""
+        resultado = self._run_main("--acao", "listar", "--diretorio", "utils", "--desde", "ontem")
+        
+        assert resultado.returncode == 2
+        assert "--desde" in resultado.stderr
+        assert "Traceback" not in resultado.stderr
+    
+    def test_containers_espera_maior_que_timeout(self):
+        """Testa que espera >= timeout é erro de uso antes de operar."""
+        resultado = self._run_main(
+            "--acao", "containers", "--containers", "web", "--espera", "10", "--timeout", "10"
+        )
+        
+        assert resultado.returncode == 2
+        assert "espera" in resultado.stderr
+    
+    def test_executar_acao_listar_ordenado(self):
+        """Testa listar com ordenação e limite."""
+        resultado = self._run_main(
+            "--acao", "listar", "--diretorio", "utils", "--ordenar", "tamanho", "--limite", "2"
+        )
+        
+        assert resultado.returncode == 0
+        assert resultado.stdout.count("  - ") == 2
+    
+    def test_executar_acao_snapshot_diff(self, tmp_path):
+        """Testa snapshot seguido de diff contra a árvore."""
+        (tmp_path / "app").mkdir()
+        (tmp_path / "app" / "a.txt").write_text("a")
+        manifesto = str(tmp_path / "antes.snap.gz")
+        resultado = self._run_main(
+            "--acao", "snapshot", "--diretorio", str(tmp_path / "app"), "--manifesto", manifesto
+        )
+        assert resultado.returncode == 0
+        
+        (tmp_path / "app" / "b.txt").write_text("b")
+        resultado = self._run_main(
+            "--acao", "diff", "--diretorio", str(tmp_path / "app"), "--manifesto", manifesto
+        )
+        assert resultado.returncode == 0
+        assert "+ b.txt" in resultado.stdout
+    
+    def test_executar_acao_criar_projetos(self, tmp_path):
+        """Testa criação de projetos em lote pela CLI."""
+        resultado = self._run_main(
+            "--acao", "criar-projetos", "--projetos", "api,worker", "--diretorio", str(tmp_path)
+        )
+        
+        assert resultado.returncode == 0
+        assert (tmp_path / "api" / "Dockerfile").exists()
+        assert (tmp_path / "worker" / ".github" / "workflows" / "ci.yml").exists()
+    
+    def test_executar_acao_verificar_integridade(self, tmp_path):
+        """Testa o código de saída da verificação de integridade."""
+        (tmp_path / "etc").mkdir()
+        (tmp_path / "etc" / "hosts").write_text("127.0.0.1 localhost")
+        base = str(tmp_path / "base.json")
+        argumentos = ["--diretorio", str(tmp_path / "etc"), "--linha-base", base]
+        
+        assert self._run_main("--acao", "linha-base", *argumentos).returncode == 0
+        assert self._run_main("--acao", "verificar-integridade", *argumentos).returncode == 0
+        
+        (tmp_path / "etc" / "hosts").write_text("10.0.0.1 localhost")
+        resultado = self._run_main("--acao", "verificar-integridade", *argumentos)
+        assert resultado.returncode == 1
+        assert "MODIFICADO: hosts" in resultado.stdout
+    
+    def test_executar_acao_git_workspace(self, tmp_path):
+        """Testa status em vários repositórios pela CLI."""
+        for nome in ("api", "worker"):
+            subprocess.run(["git", "init", "-q", str(tmp_path / nome)], check=True)
+        
+        resultado = self._run_main("--acao", "git-workspace", "--diretorio", str(tmp_path))
+        
+        assert resultado.returncode == 0
+        assert "2/2 OK" in resultado.stdout
+    
+    def test_executar_acao_backup_git(self, tmp_path):
+        """Testa backup Git e restauração pela CLI."""
+        repo = tmp_path / "app"
+        subprocess.run(["git", "init", "-q", str(repo)], check=True)
+        (repo / "README.md").write_text("# App")
+        subprocess.run(["git", "add", "."], cwd=repo, check=True)
+        subprocess.run(
+            ["git", "-c", "user.name=Teste", "-c", "user.email=t@t", "commit", "-q", "-m", "Inicial"],
+            cwd=repo, check=True
+        )
+        
+        resultado = self._run_main(
+            "--acao", "backup", "--git", "--diretorio", str(repo), "--destino", str(tmp_path / "backups")
+        )
+        assert resultado.returncode == 0
+        assert "Bundle completo" in resultado.stdout
+        
+        resultado = self._run_main(
+            "--acao", "restaurar-git", "--backup", str(tmp_path / "backups" / "app.git-backup"),
+            "--diretorio", str(tmp_path / "restaurado")
+        )
+        assert resultado.returncode == 0
+        assert (tmp_path / "restaurado" / "README.md").read_text() == "# App"
+        
+        # Sem destino explícito não restaura sobre o diretório atual
+        resultado = self._run_main(
+            "--acao", "restaurar-git", "--backup", str(tmp_path / "backups" / "app.git-backup")
+        )
+        assert resultado.returncode == 2
+        assert "--diretorio" in resultado.stderr
+    
+    def test_executar_acao_hotspots(self, tmp_path):
+        """Testa ranking de hotspots pela CLI."""
+        repo = tmp_path / "app"
+        subprocess.run(["git", "init", "-q", str(repo)], check=True)
+        for conteudo in ("a", "b"):
+            (repo / "app.py").write_text(conteudo)
+            subprocess.run(["git", "add", "."], cwd=repo, check=True)
+            subprocess.run(
+                ["git", "-c", "user.name=Teste", "-c", "user.email=t@t", "commit", "-q", "-m", conteudo],
+                cwd=repo, check=True
+            )
+        
+        resultado = self._run_main("--acao", "hotspots", "--diretorio", str(repo))
+        
+        assert resultado.returncode == 0
+        assert "app.py" in resultado.stdout
+        assert "Total: 2 commits" in resultado.stdout
+    
+    def test_executar_acao_containers_exige_selecao(self):
+        """Testa que a ação containers exige algum critério de seleção."""
+        resultado = self._run_main("--acao", "containers", "--operacao", "parar")
+        
+        assert resultado.returncode == 2
+        assert "--containers" in resultado.stderr
+    
+    def test_executar_acao_build_planeja_contexto(self, tmp_path):
+        """Testa o relatório do contexto de build sem --tag."""
+        (tmp_path / "Dockerfile").write_text("FROM scratch\n")
+        (tmp_path / "dados.bin").write_bytes(b"0" * 4096)
+        resultado = self._run_main("--acao", "build", "--diretorio", str(tmp_path))
+        
+        assert resultado.returncode == 0
+        assert "Contexto: 2 arquivos" in resultado.stdout
+        assert "dados.bin" in resultado.stdout
+    
     def test_argumento_help(self):
         """Testa argumento --help."""
         resultado = self._run_main("--help")
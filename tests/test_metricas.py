@@ -0,0 +1,121 @@
+"""
+Testes para o módulo de métricas.
+"""
+
+import threading
+import urllib.request
+import urllib.error
+import pytest
+
+from utils.metricas import (
+    incrementar,
+    definir,
+    observar,
+    limpar_metricas,
+    renderizar_metricas,
+    obter_exposicao,
+    criar_servidor_metricas,
+    parar_servidor_metricas
+)
+from utils.sistema import executar_comando
+
+
+@pytest.fixture(autouse=True)
+def metricas_limpas():
+    """Garante registro de métricas vazio em cada teste."""
+    limpar_metricas()
+    yield
+    limpar_metricas()
+
+
+class TestRegistroMetricas:
+    """Testes para o registro e renderização de métricas."""
+    
+    def test_contador(self):
+        """Testa incremento de contador com rótulos."""
+        incrementar("devops_backups_total", rotulos={"sucesso": "true"})
+        incrementar("devops_backups_total", rotulos={"sucesso": "true"})
+        
+        texto = renderizar_metricas()
+        
+        assert "# TYPE devops_backups_total counter" in texto
+        assert 'devops_backups_total{sucesso="true"} 2' in texto
+    
+    def test_gauge(self):
+        """Testa definição de gauge."""
+        definir("devops_backup_bytes", 1024)
+        
+        assert "devops_backup_bytes 1024" in renderizar_metricas()
+    
+    def test_histograma_cumulativo(self):
+        """Testa buckets cumulativos, soma e contagem do histograma."""
+        observar("devops_comando_duracao_segundos", 0.2, {"programa": "git"})
+        observar("devops_comando_duracao_segundos", 3, {"programa": "git"})
+        
+        texto = renderizar_metricas()
+        
+        assert 'devops_comando_duracao_segundos_bucket{programa="git",le="0.25"} 1' in texto
+        assert 'devops_comando_duracao_segundos_bucket{programa="git",le="5"} 2' in texto
+        assert 'devops_comando_duracao_segundos_bucket{programa="git",le="+Inf"} 2' in texto
+        assert 'devops_comando_duracao_segundos_count{programa="git"} 2' in texto
+    
+    def test_escape_rotulos(self):
+        """Testa escape de aspas em valores de rótulos."""
+        incrementar("devops_comando_falhas_total", rotulos={"programa": 'a"b'})
+        
+        assert 'programa="a\\"b"' in renderizar_metricas()
+    
+    def test_metrica_desconhecida(self):
+        """Testa erro ao usar métrica não registrada."""
+        with pytest.raises(ValueError):
+            incrementar("metrica_inexistente")
+    
+    def test_exposicao_em_cache(self):
+        """Testa que a exposição só é renderizada novamente após mudanças."""
+        definir("devops_backup_bytes", 1)
+        primeira = obter_exposicao()
+        
+        assert obter_exposicao() is primeira
+        
+        definir("devops_backup_bytes", 2)
+        assert obter_exposicao() is not primeira
+    
+    def test_executar_comando_registra_latencia(self):
+        """Testa que executar_comando alimenta o histograma de latência."""
+        executar_comando("echo teste")
+        
+        assert 'devops_comando_duracao_segundos_count{programa="echo"} 1' in renderizar_metricas()
+
+
+class TestServidorMetricas:
+    """Testes para o servidor HTTP de métricas."""
+    
+    @pytest.fixture
+    def servidor(self):
+        """Inicia o servidor em uma porta livre."""
+        servidor = criar_servidor_metricas(porta=0, intervalo=60)
+        thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+        thread.start()
+        yield servidor
+        parar_servidor_metricas(servidor)
+    
+    def test_endpoint_metrics(self, servidor):
+        """Testa resposta de /metrics."""
+        porta = servidor.server_address[1]
+        definir("devops_backup_bytes", 10)
+        
+        with urllib.request.urlopen(f"http://127.0.0.1:{porta}/metrics") as resposta:
+            corpo = resposta.read().decode("utf-8")
+            tipo = resposta.headers["Content-Type"]
+        
+        assert tipo.startswith("text/plain")
+        assert "devops_backup_bytes 10" in corpo
+    
+    def test_caminho_inexistente(self, servidor):
+        """Testa 404 para caminhos diferentes de /metrics."""
+        porta = servidor.server_address[1]
+        
+        with pytest.raises(urllib.error.HTTPError) as erro:
+            urllib.request.urlopen(f"http://127.0.0.1:{porta}/outro")
+        
+        assert erro.value.code == 404
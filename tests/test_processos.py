@@ -0,0 +1,77 @@
+"""
+Testes para o módulo de processos.
+"""
+
+import os
+import sys
+import pytest
+
+from utils.processos import monitorar_processos, _varrer_processos
+
+
+pytestmark = pytest.mark.skipif(
+    not os.path.isdir("/proc"), reason="Requer /proc (Linux)"
+)
+
+
+class TestVarrerProcessos:
+    """Testes para a função _varrer_processos."""
+    
+    def test_encontra_processo_atual(self):
+        """Testa que o próprio processo aparece na varredura."""
+        processos = _varrer_processos()
+        
+        assert str(os.getpid()) in processos
+    
+    def test_dados_do_processo(self):
+        """Testa os campos coletados do processo atual."""
+        inicio, nome, ticks, rss, io = _varrer_processos()[str(os.getpid())]
+        
+        assert nome
+        assert ticks >= 0
+        assert rss > 0
+    
+    def test_sem_io(self):
+        """Testa varredura sem leitura de /proc/[pid]/io."""
+        processos = _varrer_processos(incluir_io=False)
+        
+        assert all(p[4] is None for p in processos.values())
+
+
+class TestMonitorarProcessos:
+    """Testes para a função monitorar_processos."""
+    
+    def test_estrutura_resultado(self):
+        """Testa as chaves do resultado."""
+        resultado = monitorar_processos(limite=5, intervalo=0.1)
+        
+        for chave in ["total_processos", "cpu", "memoria", "io", "duracao_varredura_ms"]:
+            assert chave in resultado
+        assert resultado["total_processos"] > 0
+    
+    def test_respeita_limite(self):
+        """Testa que cada ranking tem no máximo `limite` itens."""
+        resultado = monitorar_processos(limite=3, intervalo=0.1)
+        
+        assert len(resultado["cpu"]) <= 3
+        assert len(resultado["memoria"]) <= 3
+        assert len(resultado["io"]) <= 3
+    
+    def test_ranking_memoria_ordenado(self):
+        """Testa que o ranking de memória está em ordem decrescente."""
+        resultado = monitorar_processos(limite=5, intervalo=0.1)
+        
+        rss = [p["memoria_rss"] for p in resultado["memoria"]]
+        assert rss == sorted(rss, reverse=True)
+    
+    def test_detecta_consumo_cpu(self):
+        """Testa que um processo ocupado aparece no ranking de CPU."""
+        import subprocess
+        ocupado = subprocess.Popen([sys.executable, "-c", "while True: pass"])
+        try:
+            resultado = monitorar_processos(limite=5, intervalo=0.5)
+        finally:
+            ocupado.kill()
+            ocupado.wait()
+        
+        assert ocupado.pid in [p["pid"] for p in resultado["cpu"]]
@@ -11,7 +11,12 @@ import pytest
 
 from utils.projeto import (
     gerenciar_arquivos,
-    criar_estrutura_projeto
+    iterar_arquivos,
+    listar_arquivos_ordenados,
+    calcular_hash_arquivo,
+    criar_estrutura_projeto,
+    criar_projetos_em_lote,
+    carregar_template
 )
 
 
@@ -109,6 +114,144 @@ class TestGerenciarArquivos:
             assert Path(arquivo["caminho"]).is_absolute() or os.path.exists(arquivo["caminho"])
 
 
+class TestIterarArquivos:
+    """Testes para a função iterar_arquivos."""
+    
+    def test_mesmos_arquivos_que_gerenciar(self, diretorio_com_arquivos):
+        """Testa que o gerador encontra os mesmos arquivos."""
+        caminhos = {a["caminho"] for a in iterar_arquivos(diretorio_com_arquivos)}
+        
+        assert len(caminhos) == 5
+    
+    def test_parada_antecipada(self, diretorio_com_arquivos):
+        """Testa que é possível parar a iteração no meio."""
+        from itertools import islice
+        
+        arquivos = list(islice(iterar_arquivos(diretorio_com_arquivos), 2))
+        
+        assert len(arquivos) == 2
+    
+    def test_limite_gerenciar_arquivos(self, diretorio_com_arquivos):
+        """Testa o parâmetro limite."""
+        arquivos = gerenciar_arquivos(diretorio_com_arquivos, ".py", limite=1)
+        
+        assert len(arquivos) == 1
+    
+    def test_paralelo(self, diretorio_com_arquivos):
+        """Testa que a varredura paralela encontra os mesmos arquivos."""
+        sequencial = {a["caminho"] for a in iterar_arquivos(diretorio_com_arquivos)}
+        paralelo = {a["caminho"] for a in iterar_arquivos(diretorio_com_arquivos, paralelo=True)}
+        
+        assert paralelo == sequencial
+    
+    def test_paralelo_arvore_grande(self, diretorio_teste):
+        """Testa a varredura paralela com muitos diretórios e arquivos."""
+        for i in range(20):
+            subdir = Path(diretorio_teste) / f"d{i}" / "interno"
+            subdir.mkdir(parents=True)
+            for j in range(30):
+                (subdir / f"f{j}.py").write_text("x")
+        
+        arquivos = list(iterar_arquivos(diretorio_teste, ".py", paralelo=True, trabalhadores=4))
+        
+        assert len(arquivos) == 600
+    
+    def test_paralelo_parada_antecipada(self, diretorio_teste):
+        """Testa parada antecipada no modo paralelo."""
+        from itertools import islice
+        for i in range(10):
+            subdir = Path(diretorio_teste) / f"d{i}"
+            subdir.mkdir()
+            for j in range(300):
+                (subdir / f"f{j}.txt").write_text("x")
+        
+        arquivos = list(islice(iterar_arquivos(diretorio_teste, paralelo=True), 5))
+        
+        assert len(arquivos) == 5
+    
+    def test_extensao_sem_ponto_no_nome(self, diretorio_teste):
+        """Testa que arquivos ocultos sem extensão não casam com '.py'."""
+        (Path(diretorio_teste) / ".py").write_text("x")
+        
+        assert list(iterar_arquivos(diretorio_teste, ".py")) == []
+    
+    def test_diretorio_inexistente(self):
+        """Testa gerador vazio para diretório inexistente."""
+        assert list(iterar_arquivos("/diretorio/inexistente")) == []
+
+
+class TestListarArquivosOrdenados:
+    """Testes para a função listar_arquivos_ordenados."""
+    
+    @pytest.fixture
+    def arquivos_variados(self, diretorio_teste):
+        """Cria arquivos com tamanhos e datas conhecidos."""
+        base = Path(diretorio_teste)
+        for i, (nome, tamanho) in enumerate([("c.log", 300), ("a.log", 100), ("b.txt", 200), ("d.log", 50)]):
+            arquivo = base / nome
+            arquivo.write_text("x" * tamanho)
+            os.utime(arquivo, (1_700_000_000 + i * 1000, 1_700_000_000 + i * 1000))
+        return diretorio_teste
+    
+    def test_ordenar_tamanho(self, arquivos_variados):
+        """Testa top-K por tamanho."""
+        arquivos = listar_arquivos_ordenados(arquivos_variados, ordenar="tamanho", limite=2)
+        
+        assert [a["nome"] for a in arquivos] == ["c.log", "b.txt"]
+    
+    def test_ordenar_modificado(self, arquivos_variados):
+        """Testa mais recentes primeiro."""
+        arquivos = listar_arquivos_ordenados(arquivos_variados, ordenar="modificado", limite=1)
+        
+        assert arquivos[0]["nome"] == "d.log"
+    
+    def test_ordenar_nome(self, arquivos_variados):
+        """Testa ordem alfabética."""
+        arquivos = listar_arquivos_ordenados(arquivos_variados, ordenar="nome", limite=None)
+        
+        assert [a["nome"] for a in arquivos] == ["a.log", "b.txt", "c.log", "d.log"]
+    
+    def test_filtros(self, arquivos_variados):
+        """Testa filtros de extensão, tamanho e data."""
+        arquivos = listar_arquivos_ordenados(
+            arquivos_variados,
+            ordenar="tamanho",
+            extensao=".log",
+            tamanho_min=60,
+            tamanho_max=299,
+        )
+        assert [a["nome"] for a in arquivos] == ["a.log"]
+        
+        recentes = listar_arquivos_ordenados(arquivos_variados, modificado_desde=1_700_001_500)
+        assert sorted(a["nome"] for a in recentes) == ["b.txt", "d.log"]
+    
+    def test_criterio_invalido(self, arquivos_variados):
+        """Testa erro para critério desconhecido."""
+        with pytest.raises(ValueError):
+            listar_arquivos_ordenados(arquivos_variados, ordenar="cor")
+
+
+class TestCalcularHashArquivo:
+    """Testes para a função calcular_hash_arquivo."""
+    
+    def test_hash_igual_hashlib(self, diretorio_teste):
+        """Testa que o hash via mmap é igual ao do hashlib."""
+        import hashlib
+        conteudo = os.urandom(3 * 1024 * 1024 + 7)
+        arquivo = Path(diretorio_teste) / "dados.bin"
+        arquivo.write_bytes(conteudo)
+        
+        assert calcular_hash_arquivo(str(arquivo)) == hashlib.sha256(conteudo).hexdigest()
+    
+    def test_arquivo_vazio(self, diretorio_teste):
+        """Testa hash de arquivo vazio."""
+        import hashlib
+        arquivo = Path(diretorio_teste) / "vazio"
+        arquivo.write_bytes(b"")
+        
+        assert calcular_hash_arquivo(str(arquivo), "blake2b") == hashlib.blake2b().hexdigest()
+
+
 class TestCriarEstruturaProjeto:
     """Testes para a função criar_estrutura_projeto."""
     
@@ -180,4 +323,56 @@ class TestCriarEstruturaProjeto:
         gitignore = Path("meu_projeto/.gitignore").read_text()
         
         assert "__pycache__" in gitignore
-        assert ".env" in gitignore
\ No newline at end of file
+        assert ".env" in gitignore
+    
+    def test_template_personalizado(self, diretorio_teste):
+        """Testa template em diretório próprio com variáveis no nome."""
+        template = Path(diretorio_teste) / "tpl"
+        (template / "pacote").mkdir(parents=True)
+        (template / "pacote" / "${projeto}.py").write_text("NOME = '${projeto}'\n")
+        destino = Path(diretorio_teste) / "api"
+        
+        assert criar_estrutura_projeto(str(destino), template=str(template)) is True
+        assert (destino / "pacote" / "api.py").read_text() == "NOME = 'api'\n"
+    
+    def test_template_inexistente(self, diretorio_teste):
+        """Testa falha com template inexistente."""
+        os.chdir(diretorio_teste)
+        
+        assert criar_estrutura_projeto("meu_projeto", template="nao_existe") is False
+
+
+class TestCriarProjetosEmLote:
+    """Testes para a função criar_projetos_em_lote."""
+    
+    def test_cria_todos(self, diretorio_teste):
+        """Testa criação de vários projetos com o template padrão."""
+        resultado = criar_projetos_em_lote(["api", "worker", "api"], diretorio_teste)
+        
+        assert resultado["sucesso"] is True
+        assert resultado["criados"] == ["api", "worker"]
+        for nome in ("api", "worker"):
+            assert (Path(diretorio_teste) / nome / "src").is_dir()
+            assert nome in (Path(diretorio_teste) / nome / "README.md").read_text()
+        assert resultado["arquivos"] == 2 * len(carregar_template()[1])
+    
+    def test_variaveis_extras(self, diretorio_teste):
+        """Testa substituição de variáveis extras."""
+        criar_projetos_em_lote(["api"], diretorio_teste, variaveis={"python_versao": "3.12"})
+        
+        dockerfile = (Path(diretorio_teste) / "api" / "Dockerfile").read_text()
+        assert "python:3.12-slim" in dockerfile
+    
+    def test_template_compilado_uma_vez(self, diretorio_teste):
+        """Testa que o template fica em cache entre chamadas."""
+        assert carregar_template() is carregar_template("padrao")
+    
+    def test_falha_parcial(self, diretorio_teste):
+        """Testa que falha em um projeto não impede os demais."""
+        (Path(diretorio_teste) / "ocupado").write_text("arquivo no lugar do diretório")
+        
+        resultado = criar_projetos_em_lote(["ocupado", "livre"], diretorio_teste)
+        
+        assert resultado["sucesso"] is False
+        assert resultado["criados"] == ["livre"]
+        assert "ocupado" in resultado["falhas"]
@@ -9,6 +9,8 @@ from utils.sistema import (
     verificar_python_version,
     obter_informacoes_sistema,
     executar_comando,
+    executar_comando_stream,
+    executar_comando_limitado,
     verificar_ferramentas_devops,
     monitorar_recursos
 )
@@ -117,6 +119,118 @@ class TestExecutarComando:
         assert "Timeout" in resultado.get("erro", "")
 
 
+class TestExecutarComandoStream:
+    """Testes para as funções executar_comando_stream e executar_comando_limitado."""
+    
+    def test_entrega_linhas_e_codigo(self):
+        """Testa linhas de stdout/stderr e o item final com o código."""
+        itens = list(executar_comando_stream(
+            f'{sys.executable} -c "import sys; print(1); print(2, file=sys.stderr); sys.exit(3)"'
+        ))
+        
+        assert ("stdout", "1") in itens
+        assert ("stderr", "2") in itens
+        assert itens[-1] == ("fim", 3)
+    
+    def test_linha_longa_dividida(self):
+        """Testa que linhas maiores que o limite chegam em partes."""
+        itens = list(executar_comando_stream(
+            f'{sys.executable} -c "print(\'x\' * 100)"', tamanho_max_linha=40
+        ))
+        
+        partes = [linha for fluxo, linha in itens if fluxo == "stdout"]
+        assert len(partes) == 3
+        assert "".join(partes) == "x" * 100
+    
+    def test_timeout_stream(self):
+        """Testa que o timeout encerra o comando."""
+        if sys.platform == "win32":
+            comando = "ping -n 10 localhost"
+        else:
+            comando = "sleep 10"
+        
+        itens = list(executar_comando_stream(comando, timeout=1))
+        
+        assert itens[-1] == ("timeout", None)
+    
+    @pytest.mark.skipif(sys.platform == "win32", reason="Usa grupos de processos POSIX")
+    def test_timeout_mata_grupo(self):
+        """Testa que processos filhos também são encerrados no timeout."""
+        import os
+        import time
+        
+        itens = list(executar_comando_stream("sleep 30 & echo $!; wait", timeout=1))
+        neto = int(itens[0][1])
+        time.sleep(0.2)
+        
+        try:
+            with open(f"/proc/{neto}/stat") as arquivo:
+                estado = arquivo.read().rsplit(")", 1)[1].split()[0]
+        except FileNotFoundError:
+            estado = "X"
+        assert estado in ("X", "Z")
+    
+    @pytest.mark.skipif(sys.platform == "win32", reason="Usa grupos de processos POSIX")
+    def test_timeout_com_neto_em_segundo_plano(self):
+        """Testa o prazo quando um neto mantém a saída aberta após o shell sair."""
+        import time
+        
+        inicio = time.monotonic()
+        itens = list(executar_comando_stream("echo hi; sleep 8 &", timeout=1))
+        
+        assert time.monotonic() - inicio < 4
+        assert itens == [("stdout", "hi"), ("timeout", None)]
+    
+    def test_parar_iteracao_encerra_processo(self):
+        """Testa que interromper o consumo encerra o comando."""
+        import time
+        
+        gerador = executar_comando_stream(
+            f'{sys.executable} -c "import time\nwhile True: print(1, flush=True); time.sleep(0.01)"'
+        )
+        inicio = time.monotonic()
+        assert next(gerador)[0] == "stdout"
+        gerador.close()
+        
+        assert time.monotonic() - inicio < 5
+    
+    def test_limitado_mantem_inicio_e_fim(self):
+        """Testa retenção de início/fim com linhas omitidas."""
+        resultado = executar_comando_limitado(
+            f'{sys.executable} -c "[print(i) for i in range(1000)]"',
+            manter_inicio=3,
+            manter_fim=2
+        )
+        linhas = resultado["stdout"].split("\n")
+        
+        assert resultado["sucesso"] is True
+        assert linhas[:3] == ["0", "1", "2"]
+        assert linhas[-2:] == ["998", "999"]
+        assert resultado["linhas_descartadas"]["stdout"] == 995
+    
+    def test_limitado_callback(self):
+        """Testa que o callback recebe todas as linhas."""
+        recebidas = []
+        executar_comando_limitado(
+            f'{sys.executable} -c "[print(i) for i in range(50)]"',
+            manter_inicio=1,
+            manter_fim=1,
+            ao_receber=lambda fluxo, linha: recebidas.append(linha)
+        )
+        
+        assert len(recebidas) == 50
+    
+    def test_limitado_timeout(self):
+        """Testa resultado de timeout no modo limitado."""
+        if sys.platform == "win32":
+            resultado = executar_comando_limitado("ping -n 10 localhost", timeout=1)
+        else:
+            resultado = executar_comando_limitado("sleep 10", timeout=1)
+        
+        assert resultado["sucesso"] is False
+        assert resultado["erro"] == "Timeout"
+
+
 class TestVerificarFerramentasDevops:
     """Testes para a função verificar_ferramentas_devops."""
     
@@ -0,0 +1,120 @@
+"""
+Testes para o módulo de snapshots de diretórios.
+"""
+
+import os
+import gzip
+import json
+from pathlib import Path
+import pytest
+
+from utils.snapshot import criar_snapshot, ler_manifesto, comparar_snapshots
+
+
+@pytest.fixture
+def arvore(temp_dir):
+    """Cria uma pequena árvore de deploy."""
+    raiz = Path(temp_dir) / "app"
+    (raiz / "conf").mkdir(parents=True)
+    (raiz / "app.py").write_text("print('v1')")
+    (raiz / "conf" / "app.ini").write_text("[app]\nporta=80\n")
+    (raiz / "antigo.txt").write_text("remover")
+    return raiz
+
+
+class TestCriarSnapshot:
+    """Testes para a função criar_snapshot."""
+    
+    def test_manifesto_ordenado(self, arvore, temp_dir):
+        """Testa que o manifesto é gzip com entradas ordenadas."""
+        manifesto = os.path.join(temp_dir, "antes.snap.gz")
+        resultado = criar_snapshot(str(arvore), manifesto)
+        
+        assert resultado["sucesso"] is True
+        assert resultado["arquivos"] == 3
+        with gzip.open(manifesto, "rt", encoding="utf-8") as arquivo:
+            linhas = arquivo.read().splitlines()
+        assert json.loads(linhas[0])["hash"] is False
+        caminhos = [json.loads(linha)[0] for linha in linhas[1:]]
+        assert caminhos == ["antigo.txt", "app.py", "conf/app.ini"]
+    
+    def test_com_hash(self, arvore, temp_dir):
+        """Testa que os hashes são gravados quando pedidos."""
+        manifesto = os.path.join(temp_dir, "antes.snap.gz")
+        criar_snapshot(str(arvore), manifesto, com_hash=True)
+        
+        cabecalho, entradas = ler_manifesto(manifesto)
+        assert cabecalho["hash"] is True
+        assert all(len(entrada[3]) == 64 for entrada in entradas)
+    
+    def test_diretorio_inexistente(self, temp_dir):
+        """Testa erro para diretório inexistente."""
+        resultado = criar_snapshot(os.path.join(temp_dir, "nao_existe"), os.path.join(temp_dir, "x.gz"))
+        
+        assert resultado["sucesso"] is False
+        assert resultado["erro"] is not None
+
+
+class TestCompararSnapshots:
+    """Testes para a função comparar_snapshots."""
+    
+    def _alterar(self, arvore):
+        """Adiciona, remove e modifica arquivos."""
+        (arvore / "antigo.txt").unlink()
+        (arvore / "novo.txt").write_text("novo")
+        (arvore / "app.py").write_text("print('versao 2')")
+    
+    def test_manifesto_contra_arvore(self, arvore, temp_dir):
+        """Testa comparação com a árvore atual."""
+        manifesto = os.path.join(temp_dir, "antes.snap.gz")
+        criar_snapshot(str(arvore), manifesto)
+        self._alterar(arvore)
+        
+        resultado = comparar_snapshots(manifesto, str(arvore))
+        
+        assert resultado["sucesso"] is True
+        assert resultado["adicionados"] == ["novo.txt"]
+        assert resultado["removidos"] == ["antigo.txt"]
+        assert resultado["modificados"] == ["app.py"]
+        assert resultado["inalterados"] == 1
+    
+    def test_dois_manifestos(self, arvore, temp_dir):
+        """Testa comparação entre dois manifestos."""
+        antes = os.path.join(temp_dir, "antes.snap.gz")
+        depois = os.path.join(temp_dir, "depois.snap.gz")
+        criar_snapshot(str(arvore), antes)
+        self._alterar(arvore)
+        criar_snapshot(str(arvore), depois)
+        
+        resultado = comparar_snapshots(antes, depois)
+        
+        assert resultado["adicionados"] == ["novo.txt"]
+        assert resultado["removidos"] == ["antigo.txt"]
+        assert resultado["modificados"] == ["app.py"]
+    
+    def test_hash_ignora_mudanca_so_de_mtime(self, arvore, temp_dir):
+        """Testa que touch sem mudar conteúdo não conta com hashes."""
+        manifesto = os.path.join(temp_dir, "antes.snap.gz")
+        criar_snapshot(str(arvore), manifesto, com_hash=True)
+        os.utime(arvore / "app.py", (1_700_000_000, 1_700_000_000))
+        
+        resultado = comparar_snapshots(manifesto, str(arvore))
+        
+        assert resultado["modificados"] == []
+        assert resultado["inalterados"] == 3
+    
+    def test_sem_hash_mudanca_de_mtime(self, arvore, temp_dir):
+        """Testa que sem hashes a mudança de mtime conta como modificação."""
+        manifesto = os.path.join(temp_dir, "antes.snap.gz")
+        criar_snapshot(str(arvore), manifesto)
+        os.utime(arvore / "app.py", (1_700_000_000, 1_700_000_000))
+        
+        resultado = comparar_snapshots(manifesto, str(arvore))
+        
+        assert resultado["modificados"] == ["app.py"]
+    
+    def test_manifesto_inexistente(self, temp_dir):
+        """Testa erro para manifesto inexistente."""
+        resultado = comparar_snapshots(os.path.join(temp_dir, "nao.gz"), temp_dir)
+        
+        assert resultado["sucesso"] is False
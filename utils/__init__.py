@@ -3,20 +3,50 @@ Módulo de utilitários para automação DevOps.
 """
 
 from .git_utils import (
+    RepositorioGit,
     verificar_repositorio,
     obter_branch_atual,
     obter_status,
+    iterar_status,
+    localizar_git,
+    ler_head,
+    resolver_ref_local,
     fazer_commit,
     fazer_push,
     fazer_pull,
     listar_branches,
-    obter_log
+    obter_log,
+    iterar_log,
+    obter_log_pagina,
+    escrever_commit_graph,
+    atualizar_espelho,
+    clonar,
+    buscar
 )
 
+from .git_workspace import (
+    descobrir_repositorios,
+    executar_em_repositorios,
+    executar_em_repositorios_async,
+    OPERACOES_GIT
+)
+
+from .git_analise import analisar_hotspots
+
 from .docker_utils import (
+    ClienteDocker,
+    MonitorDocker,
+    iniciar_monitor_docker,
+    parar_monitor_docker,
+    selecionar_containers,
+    operar_containers,
+    OPERACOES_CONTAINER,
     listar_containers,
     listar_imagens,
     build_imagem,
+    planejar_build,
+    ler_dockerignore,
+    ROTULO_HASH_CONTEXTO,
     executar_container,
     parar_container,
     remover_container
@@ -34,36 +64,122 @@ from .backup import (
     restaurar_backup,
     listar_backups,
     limpar_backups_antigos,
-    formatar_tamanho
+    formatar_tamanho,
+    realizar_backup_git,
+    restaurar_backup_git
 )
 
 from .sistema import (
     verificar_python_version,
     obter_informacoes_sistema,
     executar_comando,
+    executar_comando_stream,
+    executar_comando_limitado,
     verificar_ferramentas_devops,
     monitorar_recursos
 )
 
 from .projeto import (
     gerenciar_arquivos,
-    criar_estrutura_projeto
+    iterar_arquivos,
+    iterar_entradas,
+    listar_arquivos_ordenados,
+    varrer_diretorio,
+    converter_timestamp,
+    calcular_hash_arquivo,
+    criar_estrutura_projeto,
+    criar_projetos_em_lote,
+    carregar_template
+)
+
+from .processos import (
+    monitorar_processos
+)
+
+from .inventario import (
+    carregar_inventario,
+    executar_em_hosts,
+    TRANSPORTES
+)
+
+from .disco import (
+    analisar_uso_disco
+)
+
+from .indice import (
+    atualizar_indice,
+    consultar_indice
+)
+
+from .duplicados import (
+    encontrar_duplicados
+)
+
+from .busca import (
+    buscar_conteudo
+)
+
+from .snapshot import (
+    criar_snapshot,
+    ler_manifesto,
+    comparar_snapshots
+)
+
+from .integridade import (
+    criar_linha_base,
+    verificar_integridade
+)
+
+from .metricas import (
+    renderizar_metricas,
+    obter_exposicao,
+    criar_servidor_metricas,
+    parar_servidor_metricas,
+    servir_metricas
 )
 
 __all__ = [
     # Git
+    'RepositorioGit',
     'verificar_repositorio',
     'obter_branch_atual',
     'obter_status',
+    'iterar_status',
+    'localizar_git',
+    'ler_head',
+    'resolver_ref_local',
     'fazer_commit',
     'fazer_push',
     'fazer_pull',
     'listar_branches',
     'obter_log',
+    'iterar_log',
+    'obter_log_pagina',
+    'escrever_commit_graph',
+    'atualizar_espelho',
+    'clonar',
+    'buscar',
+    # Git em vários repositórios
+    'descobrir_repositorios',
+    'executar_em_repositorios',
+    'executar_em_repositorios_async',
+    'OPERACOES_GIT',
+    # Análise de histórico Git
+    'analisar_hotspots',
     # Docker
+    'ClienteDocker',
+    'MonitorDocker',
+    'iniciar_monitor_docker',
+    'parar_monitor_docker',
+    'selecionar_containers',
+    'operar_containers',
+    'OPERACOES_CONTAINER',
     'listar_containers',
     'listar_imagens',
     'build_imagem',
+    'planejar_build',
+    'ler_dockerignore',
+    'ROTULO_HASH_CONTEXTO',
     'executar_container',
     'parar_container',
     'remover_container',
@@ -78,13 +194,53 @@ __all__ = [
     'listar_backups',
     'limpar_backups_antigos',
     'formatar_tamanho',
+    'realizar_backup_git',
+    'restaurar_backup_git',
     # Sistema
     'verificar_python_version',
     'obter_informacoes_sistema',
     'executar_comando',
+    'executar_comando_stream',
+    'executar_comando_limitado',
     'verificar_ferramentas_devops',
     'monitorar_recursos',
     # Projeto
     'gerenciar_arquivos',
-    'criar_estrutura_projeto'
+    'iterar_arquivos',
+    'iterar_entradas',
+    'listar_arquivos_ordenados',
+    'varrer_diretorio',
+    'converter_timestamp',
+    'calcular_hash_arquivo',
+    'criar_estrutura_projeto',
+    'criar_projetos_em_lote',
+    'carregar_template',
+    # Processos
+    'monitorar_processos',
+    # Inventário
+    'carregar_inventario',
+    'executar_em_hosts',
+    'TRANSPORTES',
+    # Disco
+    'analisar_uso_disco',
+    # Índice
+    'atualizar_indice',
+    'consultar_indice',
+    # Duplicados
+    'encontrar_duplicados',
+    # Busca
+    'buscar_conteudo',
+    # Snapshots
+    'criar_snapshot',
+    'ler_manifesto',
+    'comparar_snapshots',
+    # Integridade
+    'criar_linha_base',
+    'verificar_integridade',
+    # Métricas
+    'renderizar_metricas',
+    'obter_exposicao',
+    'criar_servidor_metricas',
+    'parar_servidor_metricas',
+    'servir_metricas'
 ]
\ No newline at end of file
@@ -3,16 +3,21 @@ Módulo de backup para automação DevOps.
 Autor: Patrick
 Data: Dezembro 2025
 
-Contém funções para realizar backup de diretórios.
+Contém funções para realizar backup de diretórios e backup incremental
+de repositórios Git com bundles.
 """
 
 import os
+import time
 import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from .logger import configurar_logger, log_operacao
+from .cache import carregar_json, salvar_json
+from .git_utils import RepositorioGit, localizar_git, ler_head, executar_git
+from . import metricas
 
 # Logger do módulo
 logger = configurar_logger("backup")
@@ -45,6 +50,7 @@ def realizar_backup(
         "timestamp": datetime.now().isoformat(),
         "erro": None
     }
+    inicio = time.perf_counter()
     
     try:
         # Validar diretório de origem
@@ -109,9 +115,29 @@ def realizar_backup(
         resultado["erro"] = str(e)
         log_operacao(logger, "BACKUP", sucesso=False, detalhes=str(e))
     
+    _registrar_metricas_backup(resultado, time.perf_counter() - inicio)
     return resultado
 
 
+def _registrar_metricas_backup(resultado: dict, duracao: float):
+    """Atualiza as métricas Prometheus de um backup finalizado."""
+    metricas.incrementar(
+        "devops_backups_total",
+        rotulos={"sucesso": "true" if resultado["sucesso"] else "false"}
+    )
+    if not resultado["sucesso"]:
+        return
+    metricas.incrementar("devops_backup_bytes_total", resultado["tamanho_total"])
+    metricas.definir("devops_backup_duracao_segundos", duracao)
+    metricas.definir("devops_backup_bytes", resultado["tamanho_total"])
+    if "arquivos_copiados" in resultado:
+        metricas.definir(
+            "devops_backup_arquivos_por_segundo",
+            resultado["arquivos_copiados"] / duracao if duracao > 0 else 0.0
+        )
+    metricas.definir("devops_backup_ultimo_timestamp_segundos", time.time())
+
+
 def restaurar_backup(
     arquivo_backup: str,
     diretorio_destino: str,
@@ -168,6 +194,235 @@ def restaurar_backup(
     return resultado
 
 
+VERSAO_MANIFESTO_GIT = 1
+
+
+def _refs_repositorio(caminho: str) -> Dict[str, str]:
+    """Lista os refs do repositório (sem refs simbólicos) como {nome: hash}."""
+    resultado = executar_git(
+        "for-each-ref", "--format=%(objectname) %(refname) %(symref)", cwd=caminho
+    )
+    if resultado.returncode != 0:
+        raise RuntimeError(resultado.stderr.strip() or "git for-each-ref falhou")
+    refs = {}
+    for linha in resultado.stdout.splitlines():
+        objeto, nome, simbolico = (linha.split(" ", 2) + [""])[:3]
+        if not simbolico:
+            refs[nome] = objeto
+    return refs
+
+
+def realizar_backup_git(
+    repositorio: str,
+    diretorio_destino: str,
+    completo: bool = False
+) -> dict:
+    """
+    Realiza backup incremental de um repositório Git com `git bundle`.
+
+    A primeira execução grava um bundle com todo o histórico; as seguintes
+    gravam apenas os objetos novos desde os refs registrados na execução
+    anterior (que viram pré-requisitos do bundle). Os bundles e o
+    manifesto ficam em <destino>/<nome>.git-backup. Alterações não
+    commitadas da árvore de trabalho não fazem parte do backup.
+
+    Args:
+        repositorio: Caminho do repositório (ou de um diretório dentro dele)
+        diretorio_destino: Diretório onde a cadeia de bundles é mantida
+        completo: Se True, grava um bundle completo mesmo havendo anteriores
+
+    Returns:
+        Dicionário com informações do backup (bundle é None quando nada mudou)
+    """
+    resultado = {
+        "sucesso": False,
+        "origem": repositorio,
+        "destino": None,
+        "bundle": None,
+        "tipo": None,
+        "refs_alterados": 0,
+        "tamanho_total": 0,
+        "timestamp": datetime.now().isoformat(),
+        "erro": None
+    }
+    inicio = time.perf_counter()
+
+    try:
+        git = localizar_git(repositorio)
+        if git is None:
+            raise FileNotFoundError(f"Repositório Git não encontrado: {repositorio}")
+        raiz = git["raiz"]
+
+        cadeia = Path(diretorio_destino) / f"{Path(raiz).name}.git-backup"
+        cadeia.mkdir(parents=True, exist_ok=True)
+        resultado["destino"] = str(cadeia)
+        arquivo_manifesto = cadeia / "manifesto.json"
+        manifesto = carregar_json(arquivo_manifesto) or {
+            "versao": VERSAO_MANIFESTO_GIT, "repositorio": raiz, "bundles": []
+        }
+
+        refs = _refs_repositorio(raiz)
+        if not refs:
+            raise ValueError(f"Repositório sem commits: {raiz}")
+        head = ler_head(raiz)
+        head = head["ref"] or head["hash"]
+
+        anteriores = {} if completo or not manifesto["bundles"] else manifesto["bundles"][-1]["refs"]
+        ultimo_head = manifesto["bundles"][-1]["head"] if manifesto["bundles"] else None
+        resultado["refs_alterados"] = len(set(refs.items()) ^ set(anteriores.items()))
+        resultado["tipo"] = "incremental" if anteriores else "completo"
+
+        if anteriores == refs and ultimo_head == head:
+            resultado["tipo"] = None
+            logger.info(f"Nenhuma alteração em '{raiz}' desde o último backup")
+        else:
+            # Commits antigos que sumiram (rebase + gc) não podem ser pré-requisitos
+            with RepositorioGit(raiz) as sessao:
+                existentes = sessao.resolver_varios(set(anteriores.values()))
+            revisoes = "\n".join(
+                list(refs) + [f"^{objeto}" for objeto, info in existentes.items() if info]
+            ) + "\n"
+
+            entrada = {
+                "arquivo": None,
+                "tipo": resultado["tipo"],
+                "criado": resultado["timestamp"],
+                "head": head,
+                "refs": refs,
+                "tamanho": 0
+            }
+            novos = executar_git("rev-list", "--objects", "--max-count=1", "--stdin", cwd=raiz, entrada=revisoes)
+            if novos.returncode != 0:
+                raise RuntimeError(novos.stderr.strip())
+            if novos.stdout.strip():
+                numero = len(manifesto["bundles"]) + 1
+                nome = f"{numero:04d}-{resultado['tipo']}-{datetime.now().strftime('%Y%m%d_%H%M%S')}.bundle"
+                temporario = cadeia / f"{nome}.tmp"
+                criado = executar_git(
+                    "bundle", "create", "--quiet", str(temporario.resolve()), "--stdin",
+                    cwd=raiz, entrada=revisoes
+                )
+                if criado.returncode != 0:
+                    temporario.unlink(missing_ok=True)
+                    raise RuntimeError(criado.stderr.strip() or "git bundle create falhou")
+                os.replace(temporario, cadeia / nome)
+                entrada["arquivo"] = nome
+                entrada["tamanho"] = (cadeia / nome).stat().st_size
+                resultado["bundle"] = str(cadeia / nome)
+                resultado["tamanho_total"] = entrada["tamanho"]
+            # Sem objetos novos (ref removido ou criado sobre commit antigo):
+            # a entrada guarda só os refs, aplicados na restauração
+
+            manifesto["bundles"].append(entrada)
+            salvar_json(arquivo_manifesto, manifesto)
+
+        resultado["sucesso"] = True
+        log_operacao(
+            logger, "BACKUP_GIT",
+            sucesso=True,
+            detalhes=f"{raiz}: {resultado['tipo'] or 'sem alterações'}, "
+                     f"{resultado['refs_alterados']} refs alterados, "
+                     f"Tamanho: {formatar_tamanho(resultado['tamanho_total'])}"
+        )
+
+    except Exception as e:
+        resultado["erro"] = str(e)
+        log_operacao(logger, "BACKUP_GIT", sucesso=False, detalhes=str(e))
+
+    _registrar_metricas_backup(resultado, time.perf_counter() - inicio)
+    return resultado
+
+
+def restaurar_backup_git(
+    diretorio_backup: str,
+    diretorio_destino: str,
+    ate: Optional[int] = None,
+    bare: bool = False
+) -> dict:
+    """
+    Restaura um repositório aplicando a cadeia de bundles em ordem.
+
+    Args:
+        diretorio_backup: Diretório <nome>.git-backup criado por realizar_backup_git
+        diretorio_destino: Onde criar o repositório (não pode existir com conteúdo)
+        ate: Restaurar só até o N-ésimo backup (padrão: o mais recente)
+        bare: Se True, cria um repositório bare (sem árvore de trabalho)
+
+    Returns:
+        Dicionário com informações da restauração
+    """
+    resultado = {
+        "sucesso": False,
+        "origem": diretorio_backup,
+        "destino": diretorio_destino,
+        "bundles_aplicados": 0,
+        "refs": 0,
+        "timestamp": datetime.now().isoformat(),
+        "erro": None
+    }
+
+    try:
+        cadeia = Path(diretorio_backup)
+        manifesto = carregar_json(cadeia / "manifesto.json")
+        if not manifesto or manifesto.get("versao") != VERSAO_MANIFESTO_GIT:
+            raise FileNotFoundError(f"Manifesto de backup Git não encontrado ou inválido: {cadeia}")
+        entradas = manifesto["bundles"][:ate]
+        if not entradas:
+            raise ValueError("Nenhum backup a restaurar")
+
+        destino = Path(diretorio_destino)
+        if destino.exists() and any(destino.iterdir()):
+            raise FileExistsError(f"Destino já existe e não está vazio: {diretorio_destino}")
+        destino.mkdir(parents=True, exist_ok=True)
+
+        def executar(*argumentos, entrada=None):
+            saida = executar_git(*argumentos, cwd=str(destino), entrada=entrada)
+            if saida.returncode != 0:
+                raise RuntimeError(saida.stderr.strip() or f"git {argumentos[0]} falhou")
+            return saida.stdout
+
+        executar("init", "-q", *(["--bare"] if bare else []))
+        logger.info(f"Restaurando {len(entradas)} backups Git de '{cadeia}' em '{destino}'")
+        for entrada in entradas:
+            if entrada["arquivo"]:
+                executar(
+                    "fetch", "-q", "--update-head-ok",
+                    str((cadeia / entrada["arquivo"]).resolve()), "+refs/*:refs/*"
+                )
+                resultado["bundles_aplicados"] += 1
+
+        # Refs exatamente como no backup escolhido (inclui removidos e
+        # refs criados sem objetos novos)
+        refs = entradas[-1]["refs"]
+        comandos = [f"update {nome} {objeto}" for nome, objeto in refs.items()]
+        comandos += [
+            f"delete {nome}" for nome in _refs_repositorio(str(destino)) if nome not in refs
+        ]
+        executar("update-ref", "--stdin", entrada="\n".join(comandos) + "\n")
+
+        head = entradas[-1]["head"]
+        if head.startswith("refs/"):
+            executar("symbolic-ref", "HEAD", head)
+        else:
+            executar("update-ref", "--no-deref", "HEAD", head)
+        if not bare:
+            executar("reset", "-q", "--hard")
+
+        resultado["refs"] = len(refs)
+        resultado["sucesso"] = True
+        log_operacao(
+            logger, "RESTAURAR_GIT",
+            sucesso=True,
+            detalhes=f"{resultado['bundles_aplicados']} bundles, {len(refs)} refs em: {diretorio_destino}"
+        )
+
+    except Exception as e:
+        resultado["erro"] = str(e)
+        log_operacao(logger, "RESTAURAR_GIT", sucesso=False, detalhes=str(e))
+
+    return resultado
+
+
 def listar_backups(diretorio: str, padrao: str = "*_backup_*") -> list:
     """
     Lista todos os backups em um diretório.
@@ -0,0 +1,164 @@
+"""
+Módulo de busca em conteúdo de arquivos para automação DevOps.
+Autor: Patrick
+Data: Dezembro 2025
+
+Contém funções para procurar uma expressão regular dentro dos arquivos
+de uma árvore usando vários processos (alternativa ao grep/ripgrep).
+"""
+
+import os
+import re
+import mmap
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .logger import configurar_logger
+from .projeto import iterar_entradas
+
+# Logger do módulo
+logger = configurar_logger("busca")
+
+# Diretórios e arquivos ignorados por padrão
+EXCLUSOES_PADRAO = (
+    ".git", ".hg", ".svn", "__pycache__", "node_modules",
+    ".venv", "venv", ".tox", ".mypy_cache", ".pytest_cache", ".cache"
+)
+
+# Arquivos maiores que isso são lidos via mmap
+LIMITE_MMAP = 1024 * 1024
+
+# Bytes inspecionados para detectar arquivos binários
+AMOSTRA_BINARIO = 8192
+
+# Tamanho máximo do trecho de linha retornado em cada resultado
+TAMANHO_MAX_TEXTO = 500
+
+# Expressão compilada uma vez por processo (ver _inicializar)
+_regex = None
+
+
+def _inicializar(padrao: bytes, flags: int):
+    """Compila a expressão regular no processo de trabalho."""
+    global _regex
+    _regex = re.compile(padrao, flags)
+
+
+def _buscar_em_dados(caminho: str, dados) -> List[Tuple[str, int, str]]:
+    """Procura a expressão em um buffer, reportando cada linha uma única vez."""
+    resultados = []
+    numero = 1
+    posicao = 0
+    ultima_linha = -1
+    for ocorrencia in _regex.finditer(dados):
+        inicio_linha = dados.rfind(b"\n", 0, ocorrencia.start()) + 1
+        if inicio_linha == ultima_linha:
+            continue
+        # mmap não tem count(): contar sobre a fatia (cada trecho é copiado uma vez)
+        numero += dados[posicao:inicio_linha].count(b"\n")
+        posicao = inicio_linha
+        ultima_linha = inicio_linha
+
+        fim_linha = dados.find(b"\n", ocorrencia.end())
+        if fim_linha == -1:
+            fim_linha = len(dados)
+        texto = bytes(dados[inicio_linha:min(fim_linha, inicio_linha + TAMANHO_MAX_TEXTO)])
+        resultados.append((caminho, numero, texto.decode("utf-8", errors="replace").rstrip("\r")))
+    return resultados
+
+
+def _buscar_em_arquivo(caminho: str) -> List[Tuple[str, int, str]]:
+    """Procura a expressão em um arquivo, pulando binários."""
+    try:
+        with open(caminho, "rb") as arquivo:
+            inicio = arquivo.read(AMOSTRA_BINARIO)
+            if b"\0" in inicio:
+                return []
+            if os.fstat(arquivo.fileno()).st_size <= LIMITE_MMAP:
+                return _buscar_em_dados(caminho, inicio + arquivo.read())
+            with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+                return _buscar_em_dados(caminho, dados)
+    except (OSError, ValueError):
+        return []
+
+
+def _buscar_em_lote(caminhos: List[str]) -> List[Tuple[str, int, str]]:
+    """Procura a expressão em um lote de arquivos (executado no pool)."""
+    resultados = []
+    for caminho in caminhos:
+        resultados.extend(_buscar_em_arquivo(caminho))
+    return resultados
+
+
+def buscar_conteudo(
+    diretorio: str,
+    padrao: str,
+    extensao: Optional[str] = None,
+    excluir: Optional[Iterable[str]] = EXCLUSOES_PADRAO,
+    ignorar_maiusculas: bool = False,
+    processos: Optional[int] = None,
+    tamanho_lote: int = 64
+) -> Iterator[dict]:
+    """
+    Procura uma expressão regular no conteúdo dos arquivos de uma árvore.
+
+    Os arquivos são distribuídos em lotes para um pool de processos e os
+    resultados são entregues assim que cada lote termina (a ordem entre
+    arquivos não é garantida). Arquivos com byte nulo no início são
+    tratados como binários e ignorados.
+
+    Args:
+        diretorio: Diretório onde procurar
+        padrao: Expressão regular (sintaxe do módulo re)
+        extensao: Filtrar por extensão (ex: '.py')
+        excluir: Padrões glob de nomes de arquivos/diretórios a ignorar
+        ignorar_maiusculas: Se True, busca sem diferenciar maiúsculas
+        processos: Número de processos (padrão: número de CPUs)
+        tamanho_lote: Arquivos enviados por tarefa
+
+    Yields:
+        Dicionários com caminho, linha e texto de cada ocorrência
+    """
+    flags = re.MULTILINE | (re.IGNORECASE if ignorar_maiusculas else 0)
+    padrao_bytes = padrao.encode("utf-8")
+    # Validar a expressão antes de iniciar os processos
+    re.compile(padrao_bytes, flags)
+
+    if not os.path.isdir(diretorio):
+        logger.error(f"Diretório não encontrado: {diretorio}")
+        return
+
+    processos = processos or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(
+        max_workers=processos,
+        initializer=_inicializar,
+        initargs=(padrao_bytes, flags)
+    )
+
+    def converter(resultados):
+        for caminho, numero, texto in resultados:
+            yield {"caminho": caminho, "linha": numero, "texto": texto}
+
+    pendentes = set()
+    try:
+        lote = []
+        for caminho, _ in iterar_entradas(diretorio, extensao, excluir=excluir):
+            lote.append(caminho)
+            if len(lote) < tamanho_lote:
+                continue
+            pendentes.add(executor.submit(_buscar_em_lote, lote))
+            lote = []
+            # Limitar tarefas em andamento e entregar resultados já prontos
+            if len(pendentes) >= 2 * processos:
+                concluidos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                for futuro in concluidos:
+                    yield from converter(futuro.result())
+        if lote:
+            pendentes.add(executor.submit(_buscar_em_lote, lote))
+
+        while pendentes:
+            concluidos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                yield from converter(futuro.result())
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,59 @@
+"""
+Módulo de cache em disco para automação DevOps.
+Autor: Patrick
+Data: Dezembro 2025
+
+Contém funções para localizar o diretório de cache e persistir estado
+em JSON de forma atômica.
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Any
+
+
+def diretorio_cache(subdiretorio: str = "") -> Path:
+    """
+    Retorna (e cria) o diretório de cache da ferramenta.
+
+    Usa a variável de ambiente DEVOPS_CACHE_DIR se definida; caso
+    contrário, .cache/ na raiz do projeto (ao lado de logs/).
+
+    Args:
+        subdiretorio: Subdiretório dentro do cache
+
+    Returns:
+        Caminho do diretório de cache
+    """
+    base = os.environ.get("DEVOPS_CACHE_DIR")
+    caminho = Path(base) if base else Path(__file__).parent.parent / ".cache"
+    if subdiretorio:
+        caminho = caminho / subdiretorio
+    caminho.mkdir(parents=True, exist_ok=True)
+    return caminho
+
+
+def chave_cache(texto: str) -> str:
+    """Gera um nome de arquivo estável para uma chave (ex: caminho absoluto)."""
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+
+def carregar_json(caminho: Path, padrao: Any = None) -> Any:
+    """Carrega um JSON, retornando `padrao` se não existir ou estiver corrompido."""
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return padrao
+
+
+def salvar_json(caminho: Path, dados: Any):
+    """Salva um JSON de forma atômica (arquivo temporário + rename)."""
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_name(f"{caminho.name}.{os.getpid()}.tmp")
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temporario, caminho)
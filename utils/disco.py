@@ -0,0 +1,243 @@
+"""
+Módulo de análise de uso de disco para automação DevOps.
+Autor: Patrick
+Data: Dezembro 2025
+
+Contém funções para calcular o uso de disco de uma árvore de diretórios
+(substituto do du) com varredura paralela e cache por diretório.
+"""
+
+import os
+import time
+import heapq
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from .logger import configurar_logger, log_operacao
+from .cache import diretorio_cache, chave_cache, carregar_json, salvar_json
+
+# Logger do módulo
+logger = configurar_logger("disco")
+
+# Quantidade mínima de maiores arquivos guardados por diretório no cache
+MAIORES_POR_DIRETORIO = 20
+
+
+def _em_disco(stat: os.stat_result) -> int:
+    """Bytes efetivamente alocados (st_blocks quando disponível)."""
+    blocos = getattr(stat, "st_blocks", None)
+    return blocos * 512 if blocos is not None else stat.st_size
+
+
+def _varrer_diretorio(caminho: str, anterior: Optional[dict], k: int) -> tuple:
+    """
+    Varre as entradas diretas de um diretório.
+
+    Se o mtime do diretório for igual ao do cache, reaproveita a entrada
+    anterior sem chamar scandir nem stat nos arquivos.
+
+    Returns:
+        Tupla (caminho, entrada, veio_do_cache)
+    """
+    try:
+        mtime = os.stat(caminho).st_mtime_ns
+    except OSError:
+        return caminho, {"erro": True, "subdiretorios": []}, False
+
+    if anterior and anterior.get("mtime_ns") == mtime and anterior.get("k", 0) >= k:
+        return caminho, anterior, True
+
+    entrada = {
+        "mtime_ns": mtime,
+        "k": k,
+        "tamanho": 0,
+        "em_disco": 0,
+        "arquivos": 0,
+        "links": [],
+        "maiores": [],
+        "subdiretorios": []
+    }
+    maiores = []
+    try:
+        with os.scandir(caminho) as itens:
+            for item in itens:
+                try:
+                    if item.is_dir(follow_symlinks=False):
+                        entrada["subdiretorios"].append(item.name)
+                        continue
+                    stat = item.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+
+                if stat.st_nlink > 1:
+                    # Hard links são deduplicados na agregação
+                    entrada["links"].append(
+                        [stat.st_dev, stat.st_ino, stat.st_size, _em_disco(stat), item.name]
+                    )
+                    continue
+
+                entrada["arquivos"] += 1
+                entrada["tamanho"] += stat.st_size
+                entrada["em_disco"] += _em_disco(stat)
+                if len(maiores) < k:
+                    heapq.heappush(maiores, (stat.st_size, item.name))
+                elif stat.st_size > maiores[0][0]:
+                    heapq.heapreplace(maiores, (stat.st_size, item.name))
+    except OSError:
+        entrada["erro"] = True
+
+    entrada["maiores"] = [list(par) for par in maiores]
+    return caminho, entrada, False
+
+
+def analisar_uso_disco(
+    diretorio: str,
+    limite: int = 10,
+    trabalhadores: int = 8,
+    usar_cache: bool = False
+) -> dict:
+    """
+    Calcula o uso de disco de uma árvore e lista os maiores itens.
+
+    A varredura usa os.scandir em um pool de threads (um diretório por
+    tarefa). Arquivos com vários hard links são contados uma única vez.
+    O cache é opcional: diretórios cujo mtime não mudou não são relidos,
+    mas como o mtime de um diretório só muda quando entradas são criadas,
+    removidas ou renomeadas, arquivos reescritos ou que cresceram no lugar
+    continuam com o tamanho antigo. Use apenas em árvores onde isso é
+    aceitável (ex: snapshots, diretórios de artefatos imutáveis).
+
+    Os arquivos soltos na raiz não aparecem em maiores_diretorios; o
+    total deles fica em tamanho_arquivos_raiz.
+
+    Args:
+        diretorio: Diretório raiz da análise
+        limite: Quantidade de maiores diretórios e arquivos no relatório
+        trabalhadores: Número de threads de varredura
+        usar_cache: Se True, reaproveita e atualiza o cache por diretório
+            (pode reportar tamanhos desatualizados, ver acima)
+
+    Returns:
+        Dicionário com totais e os maiores diretórios e arquivos
+    """
+    resultado = {
+        "sucesso": False,
+        "diretorio": diretorio,
+        "tamanho_total": 0,
+        "tamanho_arquivos_raiz": 0,
+        "em_disco_total": 0,
+        "arquivos": 0,
+        "diretorios": 0,
+        "hardlinks_repetidos": 0,
+        "erros": 0,
+        "cache_hits": 0,
+        "duracao": 0.0,
+        "maiores_diretorios": [],
+        "maiores_arquivos": [],
+        "erro": None
+    }
+    inicio = time.monotonic()
+
+    try:
+        raiz = os.path.abspath(diretorio)
+        if not os.path.isdir(raiz):
+            raise NotADirectoryError(f"Diretório não encontrado: {diretorio}")
+
+        k = max(limite, MAIORES_POR_DIRETORIO)
+        arquivo_cache = diretorio_cache("uso_disco") / f"{chave_cache(raiz)}.json"
+        anteriores = {}
+        if usar_cache:
+            anteriores = carregar_json(arquivo_cache, {}).get("diretorios", {})
+
+        # Varredura paralela: cada diretório concluído agenda seus filhos
+        entradas = {}
+        concluidos = queue.Queue()
+        with ThreadPoolExecutor(max_workers=max(1, trabalhadores)) as executor:
+            def agendar(caminho):
+                futuro = executor.submit(_varrer_diretorio, caminho, anteriores.get(caminho), k)
+                futuro.add_done_callback(concluidos.put)
+
+            agendar(raiz)
+            pendentes = 1
+            while pendentes:
+                caminho, entrada, do_cache = concluidos.get().result()
+                pendentes -= 1
+                entradas[caminho] = entrada
+                resultado["cache_hits"] += do_cache
+                for nome in entrada["subdiretorios"]:
+                    agendar(os.path.join(caminho, nome))
+                    pendentes += 1
+
+        # Agregação em ordem determinística, contando hard links uma vez
+        vistos = set()
+        totais = {}
+        maiores_arquivos = []
+        for caminho in sorted(entradas):
+            entrada = entradas[caminho]
+            if entrada.get("erro"):
+                resultado["erros"] += 1
+            tamanho = entrada.get("tamanho", 0)
+            resultado["em_disco_total"] += entrada.get("em_disco", 0)
+            resultado["arquivos"] += entrada.get("arquivos", 0)
+            candidatos = [(t, nome) for t, nome in entrada.get("maiores", [])]
+
+            for dispositivo, inode, t, em_disco, nome in entrada.get("links", []):
+                if (dispositivo, inode) in vistos:
+                    resultado["hardlinks_repetidos"] += 1
+                    continue
+                vistos.add((dispositivo, inode))
+                tamanho += t
+                resultado["em_disco_total"] += em_disco
+                resultado["arquivos"] += 1
+                candidatos.append((t, nome))
+
+            totais[caminho] = tamanho
+            for t, nome in candidatos:
+                item = (t, os.path.join(caminho, nome))
+                if len(maiores_arquivos) < limite:
+                    heapq.heappush(maiores_arquivos, item)
+                elif t > maiores_arquivos[0][0]:
+                    heapq.heapreplace(maiores_arquivos, item)
+
+        resultado["tamanho_arquivos_raiz"] = totais.get(raiz, 0)
+
+        # Totais de subárvore: somar dos mais profundos para os pais
+        for caminho in sorted(totais, key=lambda c: c.count(os.sep), reverse=True):
+            if caminho != raiz:
+                pai = os.path.dirname(caminho)
+                if pai in totais:
+                    totais[pai] += totais[caminho]
+
+        resultado["tamanho_total"] = totais.get(raiz, 0)
+        resultado["diretorios"] = len(entradas)
+        resultado["maiores_diretorios"] = [
+            {"caminho": caminho, "tamanho": tamanho}
+            for caminho, tamanho in heapq.nlargest(
+                limite,
+                ((c, t) for c, t in totais.items() if c != raiz),
+                key=lambda par: par[1]
+            )
+        ]
+        resultado["maiores_arquivos"] = [
+            {"caminho": caminho, "tamanho": tamanho}
+            for tamanho, caminho in sorted(maiores_arquivos, reverse=True)
+        ]
+
+        if usar_cache:
+            salvar_json(arquivo_cache, {"raiz": raiz, "diretorios": entradas})
+
+        resultado["sucesso"] = True
+        resultado["duracao"] = round(time.monotonic() - inicio, 3)
+        log_operacao(
+            logger, "USO_DISCO",
+            sucesso=True,
+            detalhes=f"{resultado['arquivos']} arquivos em {resultado['diretorios']} "
+                     f"diretórios ({resultado['cache_hits']} do cache) em {resultado['duracao']}s"
+        )
+
+    except Exception as e:
+        resultado["erro"] = str(e)
+        log_operacao(logger, "USO_DISCO", sucesso=False, detalhes=str(e))
+
+    return resultado
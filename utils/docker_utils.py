@@ -2,78 +2,649 @@
 Utilitários para automação Docker.
 """
 
-import subprocess
+import os
+import re
+import sys
 import json
-from typing import Optional, List, Dict
+import heapq
+import fnmatch
+import hashlib
+import socket
+import subprocess
+import time
+import threading
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from .cache import diretorio_cache, chave_cache, carregar_json, salvar_json
+from .projeto import calcular_hash_arquivo
+
+# Socket padrão do Docker Engine (sobreposto por DOCKER_HOST=unix://...)
+SOCKET_DOCKER = "/var/run/docker.sock"
+
+# Erros que indicam conexão keep-alive fechada pelo daemon (vale reabrir uma vez)
+ERROS_CONEXAO = (
+    http.client.RemoteDisconnected, http.client.CannotSendRequest,
+    BrokenPipeError, ConnectionResetError
+)
+
+# Métodos que podem ser reenviados se a conexão cair depois do envio
+METODOS_IDEMPOTENTES = ("GET", "HEAD")
+
+# Falhas ao abrir o socket: a requisição nem saiu, então o CLI pode assumir
+ERROS_SEM_ENVIO = (FileNotFoundError, ConnectionRefusedError, PermissionError)
+
+# Prefixo mínimo de ID aceito em selecionar_containers (evita "a" casar com vários)
+PREFIXO_MINIMO_ID = 4
+
+# Rótulo gravado nas imagens com o hash do contexto de build
+ROTULO_HASH_CONTEXTO = "devops.contexto.hash"
+
+# Ações de container que não alteram o que o docker ps mostra
+ACOES_IGNORADAS = ("exec_", "attach", "resize", "top", "archive-path", "extract-to-dir", "export")
+
+# Operações em lote: nome -> (método, caminho da API, parâmetros(opcoes), argumentos do CLI(opcoes))
+OPERACOES_CONTAINER: Dict[str, Tuple[str, str, Callable[[dict], dict], Callable[[dict], List[str]]]] = {
+    "iniciar": ("POST", "/containers/{}/start", lambda o: {}, lambda o: ["start"]),
+    "parar": (
+        "POST", "/containers/{}/stop",
+        lambda o: {"t": str(o["espera"])}, lambda o: ["stop", "-t", str(o["espera"])]
+    ),
+    "reiniciar": (
+        "POST", "/containers/{}/restart",
+        lambda o: {"t": str(o["espera"])}, lambda o: ["restart", "-t", str(o["espera"])]
+    ),
+    "remover": (
+        "DELETE", "/containers/{}",
+        lambda o: {"force": "1"} if o["forcar"] else {}, lambda o: ["rm", "-f"] if o["forcar"] else ["rm"]
+    ),
+}
+
+# caminho do socket -> cliente compartilhado pelas funções do módulo
+_clientes: Dict[str, "ClienteDocker"] = {}
+_clientes_lock = threading.Lock()
+
+# Monitor de eventos ativo (ver iniciar_monitor_docker)
+_monitor: Optional["MonitorDocker"] = None
+
+
+class _ConexaoUnix(http.client.HTTPConnection):
+    """HTTPConnection sobre um socket unix em vez de TCP."""
+
+    def __init__(self, caminho: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.caminho = caminho
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.caminho)
+
+
+class ClienteDocker:
+    """
+    Cliente da API HTTP do Docker Engine pelo socket unix.
+
+    Mantém uma única conexão keep-alive para todas as requisições da
+    sessão (reaberta automaticamente se o daemon a fechar), evitando
+    iniciar o binário `docker` a cada consulta. Pode ser usado como
+    context manager.
+
+    Exemplo:
+        with ClienteDocker() as docker:
+            ativos = docker.listar_containers(apenas_ativos=True)
+    """
+
+    def __init__(self, caminho: str = SOCKET_DOCKER, timeout: float = 60):
+        self.caminho = caminho
+        self.timeout = timeout
+        self._conexao: Optional[_ConexaoUnix] = None
+        self._lock = threading.Lock()
+
+    def requisitar(
+        self,
+        metodo: str,
+        caminho: str,
+        parametros: Optional[dict] = None,
+        corpo: Any = None
+    ) -> Any:
+        """
+        Executa uma requisição na API e retorna o JSON da resposta.
+
+        Se a conexão keep-alive tiver sido fechada pelo daemon, ela é reaberta
+        e a requisição repetida uma vez; POST e DELETE só são repetidos se
+        a falha aconteceu antes do envio, para não executar a ação duas vezes.
+
+        Args:
+            metodo: Método HTTP (GET, POST, DELETE)
+            caminho: Caminho da API (ex: /containers/json)
+            parametros: Parâmetros de query string
+            corpo: Objeto enviado como JSON no corpo
+
+        Returns:
+            JSON decodificado (None para respostas sem corpo)
+
+        Raises:
+            RuntimeError: Se a API responder com erro (status >= 400)
+            OSError: Se o socket não puder ser usado
+        """
+        if parametros:
+            caminho = f"{caminho}?{urlencode(parametros)}"
+        cabecalhos = {}
+        dados = None
+        if corpo is not None:
+            dados = json.dumps(corpo).encode("utf-8")
+            cabecalhos["Content-Type"] = "application/json"
+
+        with self._lock:
+            for tentativa in range(2):
+                if self._conexao is None:
+                    self._conexao = _ConexaoUnix(self.caminho, self.timeout)
+                enviada = False
+                try:
+                    self._conexao.request(metodo, caminho, body=dados, headers=cabecalhos)
+                    enviada = True
+                    resposta = self._conexao.getresponse()
+                    conteudo = resposta.read()
+                    break
+                except ERROS_CONEXAO:
+                    self._conexao.close()
+                    self._conexao = None
+                    # Um POST/DELETE já enviado pode ter sido executado pelo daemon
+                    if tentativa or (enviada and metodo not in METODOS_IDEMPOTENTES):
+                        raise
+                except Exception:
+                    self._conexao.close()
+                    self._conexao = None
+                    raise
+
+        if resposta.status >= 400:
+            try:
+                mensagem = json.loads(conteudo).get("message", "")
+            except ValueError:
+                mensagem = conteudo.decode("utf-8", errors="replace")
+            raise RuntimeError(f"Docker API {resposta.status}: {mensagem.strip()}")
+        if not conteudo:
+            return None
+        return json.loads(conteudo)
+
+    def ping(self) -> bool:
+        """Verifica se o daemon responde."""
+        try:
+            self.requisitar("GET", "/_ping")
+            return True
+        except (OSError, ValueError, RuntimeError, http.client.HTTPException):
+            return False
+
+    def listar_containers(self, apenas_ativos: bool = False) -> List[dict]:
+        """Lista containers (formato da API)."""
+        return self.requisitar("GET", "/containers/json", {} if apenas_ativos else {"all": "1"})
+
+    def listar_imagens(self) -> List[dict]:
+        """Lista imagens (formato da API)."""
+        return self.requisitar("GET", "/images/json")
+
+    def inspecionar_container(self, container_id: str) -> dict:
+        """Retorna os detalhes de um container (docker inspect)."""
+        return self.requisitar("GET", f"/containers/{quote(container_id, safe='')}/json")
+
+    def parar_container(self, container_id: str, timeout: Optional[int] = None) -> None:
+        """Para um container (já parado não é erro)."""
+        parametros = {"t": str(timeout)} if timeout is not None else None
+        self.requisitar("POST", f"/containers/{quote(container_id, safe='')}/stop", parametros)
+
+    def remover_container(self, container_id: str, force: bool = False) -> None:
+        """Remove um container."""
+        self.requisitar(
+            "DELETE", f"/containers/{quote(container_id, safe='')}",
+            {"force": "1"} if force else None
+        )
+
+    def fechar(self):
+        """Fecha a conexão com o daemon."""
+        with self._lock:
+            if self._conexao is not None:
+                self._conexao.close()
+                self._conexao = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+
+class MonitorDocker:
+    """
+    Cache em memória de containers e imagens mantido pelo stream de eventos.
+
+    Uma thread assina GET /events (containers e imagens), faz uma
+    sincronização completa ao conectar e, a cada evento de container,
+    busca só aquele container. Eventos de imagem apenas marcam a lista de
+    imagens para ser relida na próxima consulta. Se o stream cair, a
+    thread reconecta (com espera crescente) e sincroniza tudo de novo.
+
+    Enquanto conectado, o cache é sempre atual; desconectado, ele só é
+    usado por até `max_idade` segundos após a última sincronização.
+
+    Exemplo:
+        with MonitorDocker() as monitor:
+            monitor.aguardar()
+            web = monitor.obter_container("web")
+    """
+
+    def __init__(self, caminho: str = SOCKET_DOCKER, max_idade: float = 5.0):
+        self.caminho = caminho
+        self.max_idade = max_idade
+        self.conectado = False
+        self.sincronizado_em = 0.0
+        self._cliente = ClienteDocker(caminho)
+        self._containers: Dict[str, dict] = {}
+        self._nomes: Dict[str, str] = {}
+        self._imagens: Optional[List[dict]] = None
+        self._lock = threading.Lock()
+        self._pronto = threading.Event()
+        self._parar = threading.Event()
+        self._stream: Optional[_ConexaoUnix] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def iniciar(self) -> "MonitorDocker":
+        """Inicia a thread de eventos (não bloqueia; ver aguardar)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._executar, name="monitor-docker", daemon=True)
+            self._thread.start()
+        return self
+
+    def aguardar(self, timeout: float = 10.0) -> bool:
+        """Espera a primeira sincronização completa."""
+        return self._pronto.wait(timeout)
+
+    def parar(self):
+        """Encerra a thread e as conexões."""
+        self._parar.set()
+        stream = self._stream
+        if stream is not None and stream.sock is not None:
+            try:
+                stream.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._cliente.fechar()
+        self.conectado = False
+
+    def valido(self) -> bool:
+        """Indica se o cache pode responder consultas."""
+        if not self._pronto.is_set():
+            return False
+        return self.conectado or time.monotonic() - self.sincronizado_em <= self.max_idade
+
+    def listar_containers(self, apenas_ativos: bool = False) -> List[dict]:
+        """Containers em cache (formato da API)."""
+        with self._lock:
+            containers = list(self._containers.values())
+        if apenas_ativos:
+            containers = [c for c in containers if c.get("State") == "running"]
+        return containers
+
+    def listar_imagens(self) -> List[dict]:
+        """Imagens em cache (relidas só depois de um evento de imagem)."""
+        with self._lock:
+            imagens = self._imagens
+        if imagens is None:
+            imagens = self._cliente.listar_imagens()
+            with self._lock:
+                self._imagens = imagens
+        return list(imagens)
+
+    def obter_container(self, id_ou_nome: str) -> Optional[dict]:
+        """Busca um container em cache pelo ID completo ou nome (O(1))."""
+        with self._lock:
+            chave = self._nomes.get(id_ou_nome.lstrip("/"), id_ou_nome)
+            return self._containers.get(chave)
+
+    def _guardar(self, container: dict):
+        self._containers[container["Id"]] = container
+        for nome in container.get("Names") or []:
+            self._nomes[nome.lstrip("/")] = container["Id"]
+
+    def _descartar(self, container_id: str):
+        container = self._containers.pop(container_id, None)
+        for nome in (container or {}).get("Names") or []:
+            if self._nomes.get(nome.lstrip("/")) == container_id:
+                del self._nomes[nome.lstrip("/")]
+
+    def _sincronizar(self):
+        """Relê todos os containers e imagens."""
+        containers = self._cliente.listar_containers()
+        imagens = self._cliente.listar_imagens()
+        with self._lock:
+            self._containers.clear()
+            self._nomes.clear()
+            for container in containers:
+                self._guardar(container)
+            self._imagens = imagens
+        self.sincronizado_em = time.monotonic()
+
+    def _aplicar(self, evento: dict):
+        """Atualiza o cache a partir de um evento."""
+        tipo = evento.get("Type")
+        acao = evento.get("Action") or evento.get("status") or ""
+        if tipo == "image" or acao == "commit":
+            with self._lock:
+                self._imagens = None
+        if tipo != "container" or acao.startswith(ACOES_IGNORADAS):
+            return
+        container_id = (evento.get("Actor") or {}).get("ID") or evento.get("id")
+        if not container_id:
+            return
+        atual = [] if acao == "destroy" else self._cliente.requisitar(
+            "GET", "/containers/json",
+            {"all": "1", "filters": json.dumps({"id": [container_id]})}
+        )
+        with self._lock:
+            self._descartar(container_id)
+            for container in atual:
+                self._guardar(container)
+        self.sincronizado_em = time.monotonic()
+
+    def _executar(self):
+        espera = 0.1
+        while not self._parar.is_set():
+            try:
+                self._stream = _ConexaoUnix(self.caminho, timeout=None)
+                self._stream.request(
+                    "GET", "/events?" + urlencode({"filters": json.dumps({"type": ["container", "image"]})})
+                )
+                resposta = self._stream.getresponse()
+                if resposta.status != 200:
+                    raise RuntimeError(f"Docker API {resposta.status} em /events")
+                # Assinar antes de listar: eventos durante a leitura não se perdem
+                self._sincronizar()
+                self.conectado = True
+                self._pronto.set()
+                espera = 0.1
+                while not self._parar.is_set():
+                    linha = resposta.readline()
+                    if not linha:
+                        break
+                    if linha.strip():
+                        self._aplicar(json.loads(linha))
+            except (OSError, ValueError, RuntimeError, http.client.HTTPException):
+                pass
+            finally:
+                if self.conectado:
+                    # O cache estava atual até este instante
+                    self.sincronizado_em = time.monotonic()
+                self.conectado = False
+                if self._stream is not None:
+                    self._stream.close()
+            if self._parar.wait(espera):
+                break
+            espera = min(espera * 2, 5.0)
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *args):
+        self.parar()
+
+
+def iniciar_monitor_docker(max_idade: float = 5.0, aguardar: bool = True) -> Optional[MonitorDocker]:
+    """
+    Passa listar_containers/listar_imagens a responder pelo cache de eventos.
+
+    Args:
+        max_idade: Segundos que o cache vale após perder a conexão
+        aguardar: Se True, espera a primeira sincronização
+
+    Returns:
+        O monitor iniciado, ou None se não houver socket do Docker
+    """
+    global _monitor
+    caminho = _caminho_socket()
+    if caminho is None or not os.path.exists(caminho):
+        return None
+    parar_monitor_docker()
+    _monitor = MonitorDocker(caminho, max_idade).iniciar()
+    if aguardar:
+        _monitor.aguardar()
+    return _monitor
+
+
+def parar_monitor_docker():
+    """Encerra o monitor de eventos (as funções voltam a consultar o daemon)."""
+    global _monitor
+    if _monitor is not None:
+        _monitor.parar()
+        _monitor = None
+
+
+def _caminho_socket() -> Optional[str]:
+    """
+    Socket a usar, ou None quando a configuração exige o CLI.
+
+    DOCKER_HOST tcp:// ou ssh:// e contextos (DOCKER_CONTEXT) ficam com
+    o binário docker, que já sabe tratá-los.
+    """
+    if sys.platform == "win32" or os.environ.get("DOCKER_CONTEXT"):
+        return None
+    host = os.environ.get("DOCKER_HOST")
+    if host:
+        return host[len("unix://"):] if host.startswith("unix://") else None
+    return SOCKET_DOCKER
+
+
+def _cliente() -> Optional[ClienteDocker]:
+    """Cliente compartilhado do socket configurado (None se não houver socket)."""
+    caminho = _caminho_socket()
+    if caminho is None or not os.path.exists(caminho):
+        return None
+    with _clientes_lock:
+        if caminho not in _clientes:
+            _clientes[caminho] = ClienteDocker(caminho)
+        return _clientes[caminho]
+
+
+def _chamar_api(operacao: str, *argumentos) -> Any:
+    """
+    Executa um método do cliente; levanta LookupError se a API não estiver disponível.
+
+    Consultas que o monitor de eventos sabe responder saem do cache.
+    Falhas ao conectar (daemon parado, sem permissão no socket) resultam
+    em LookupError para que o chamador use o CLI. Depois que uma ação
+    (POST/DELETE) foi enviada, uma queda ou timeout vira RuntimeError:
+    o daemon pode tê-la executado e repeti-la pelo CLI daria outro
+    resultado (ex: 404 de um container já removido).
+    """
+    monitor = _monitor
+    if monitor is not None and monitor.valido() and operacao.startswith("listar_"):
+        try:
+            return getattr(monitor, operacao)(*argumentos)
+        except (OSError, http.client.HTTPException):
+            pass
+    cliente = _cliente()
+    if cliente is None:
+        raise LookupError("Socket do Docker indisponível")
+    try:
+        return getattr(cliente, operacao)(*argumentos)
+    except ERROS_SEM_ENVIO as e:
+        raise LookupError(str(e)) from e
+    except (OSError, http.client.HTTPException) as e:
+        if _somente_leitura(operacao, argumentos):
+            raise LookupError(str(e)) from e
+        raise RuntimeError(f"Docker API sem resposta após o envio: {e}") from e
+
+
+def _somente_leitura(operacao: str, argumentos: tuple) -> bool:
+    """Se a chamada só consulta o daemon (pode ser repetida pelo CLI)."""
+    if operacao == "requisitar":
+        return argumentos[0] in METODOS_IDEMPOTENTES
+    return operacao.startswith(("listar_", "inspecionar_"))
+
+
+def _docker(*argumentos: str, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+    """Executa o CLI do docker sem passar pelo shell."""
+    return subprocess.run(["docker", *argumentos], capture_output=True, text=True, timeout=timeout)
+
+
+def _json_linhas(saida: str) -> List[dict]:
+    """Interpreta a saída de --format '{{json .}}' (um objeto por linha)."""
+    return [json.loads(linha) for linha in saida.splitlines() if linha.strip()]
+
+
+def _data_cli(timestamp: int) -> str:
+    """Data no formato exibido pelo CLI (ex: 2025-01-31 12:00:00 +0000 UTC)."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d %H:%M:%S +0000 UTC")
+
+
+def _tamanho_cli(tamanho: int) -> str:
+    """Tamanho no formato do CLI (base 1000, 3 algarismos: 13.3MB)."""
+    unidades = ("B", "kB", "MB", "GB", "TB")
+    for unidade in unidades:
+        # Arredonda antes de escolher a unidade: 999.7kB vira 1MB, não 1e+03kB
+        texto = f"{tamanho:.3g}"
+        if float(texto) < 1000 or unidade == unidades[-1]:
+            break
+        tamanho /= 1000
+    return f"{texto}{unidade}"
+
+
+def _container_formato_cli(container: dict) -> dict:
+    """Converte um container da API para o formato de `docker ps --format '{{json .}}'`."""
+    portas = []
+    for porta in container.get("Ports") or []:
+        privada = f"{porta['PrivatePort']}/{porta.get('Type', 'tcp')}"
+        if porta.get("PublicPort"):
+            portas.append(f"{porta.get('IP', '')}:{porta['PublicPort']}->{privada}")
+        else:
+            portas.append(privada)
+    return {
+        "ID": container["Id"][:12],
+        "Names": ",".join(nome.lstrip("/") for nome in container.get("Names") or []),
+        "Image": container.get("Image", ""),
+        "Command": f"\"{container.get('Command', '')}\"",
+        "CreatedAt": _data_cli(container.get("Created", 0)),
+        "State": container.get("State", ""),
+        "Status": container.get("Status", ""),
+        "Ports": ", ".join(portas),
+        "Labels": ",".join(f"{k}={v}" for k, v in (container.get("Labels") or {}).items()),
+    }
+
+
+def _imagens_formato_cli(imagem: dict) -> List[dict]:
+    """Converte uma imagem da API para as linhas de `docker images --format '{{json .}}'`."""
+    base = {
+        "ID": imagem["Id"].split(":", 1)[-1][:12],
+        "CreatedAt": _data_cli(imagem.get("Created", 0)),
+        "Size": _tamanho_cli(imagem.get("Size", 0)),
+        "Digest": "<none>",
+    }
+    digests = imagem.get("RepoDigests") or []
+    if digests:
+        base["Digest"] = digests[0].split("@", 1)[-1]
+    linhas = []
+    for tag in imagem.get("RepoTags") or ["<none>:<none>"]:
+        repositorio, _, versao = tag.rpartition(":")
+        linhas.append(dict(base, Repository=repositorio, Tag=versao))
+    return linhas
 
 
 def listar_containers(apenas_ativos: bool = False) -> List[Dict]:
-    """Lista containers Docker."""
-    comando = "docker ps --format '{{json .}}'"
+    """Lista containers Docker (API pelo socket, CLI como alternativa)."""
+    try:
+        return [_container_formato_cli(c) for c in _chamar_api("listar_containers", apenas_ativos)]
+    except LookupError:
+        pass
+    except RuntimeError as e:
+        print(f"Erro ao listar containers: {e}")
+        return []
+
+    argumentos = ["ps", "--format", "{{json .}}"]
     if not apenas_ativos:
-        comando = "docker ps -a --format '{{json .}}'"
-    
+        argumentos.insert(1, "-a")
     try:
-        resultado = subprocess.run(
-            comando,
-            shell=True,
-            capture_output=True,
-            text=True
-        )
-        
-        containers = []
-        for linha in resultado.stdout.strip().split('\n'):
-            if linha:
-                containers.append(json.loads(linha))
-        return containers
+        return _json_linhas(_docker(*argumentos).stdout)
     except Exception as e:
         print(f"Erro ao listar containers: {e}")
         return []
 
 
 def listar_imagens() -> List[Dict]:
-    """Lista imagens Docker."""
+    """Lista imagens Docker (API pelo socket, CLI como alternativa)."""
     try:
-        resultado = subprocess.run(
-            "docker images --format '{{json .}}'",
-            shell=True,
-            capture_output=True,
-            text=True
-        )
-        
-        imagens = []
-        for linha in resultado.stdout.strip().split('\n'):
-            if linha:
-                imagens.append(json.loads(linha))
-        return imagens
+        return [
+            linha for imagem in _chamar_api("listar_imagens")
+            for linha in _imagens_formato_cli(imagem)
+        ]
+    except LookupError:
+        pass
+    except RuntimeError as e:
+        print(f"Erro ao listar imagens: {e}")
+        return []
+
+    try:
+        return _json_linhas(_docker("images", "--format", "{{json .}}").stdout)
     except Exception as e:
         print(f"Erro ao listar imagens: {e}")
         return []
 
 
-def build_imagem(dockerfile_path: str, tag: str) -> bool:
-    """Constrói uma imagem Docker."""
-    comando = f"docker build -t {tag} -f {dockerfile_path} ."
-    resultado = subprocess.run(comando, shell=True)
+def build_imagem(
+    dockerfile_path: str,
+    tag: str,
+    contexto: str = ".",
+    pular_inalterado: bool = True
+) -> bool:
+    """
+    Constrói uma imagem Docker.
+
+    Com pular_inalterado, o contexto é resumido por planejar_build e o
+    build é dispensado se já existir uma imagem com o mesmo hash (a
+    imagem existente apenas recebe a tag); imagens novas ganham o rótulo
+    ROTULO_HASH_CONTEXTO.
+
+    Args:
+        dockerfile_path: Caminho do Dockerfile
+        tag: Tag da imagem (ex: app:1.0)
+        contexto: Diretório de contexto do build
+        pular_inalterado: Se False, sempre executa o docker build
+
+    Returns:
+        True se a imagem estiver disponível com a tag
+    """
+    argumentos = ["docker", "build", "-t", tag, "-f", dockerfile_path]
+    if pular_inalterado:
+        plano = planejar_build(contexto, dockerfile_path)
+        if plano["sucesso"] and plano["imagem"]:
+            print(f"Contexto inalterado ({plano['hash'][:12]}): reutilizando imagem {plano['imagem'][:19]}")
+            return _marcar_imagem(plano["imagem"], tag)
+        if plano["sucesso"]:
+            argumentos += ["--label", f"{ROTULO_HASH_CONTEXTO}={plano['hash']}"]
+    resultado = subprocess.run(argumentos + [contexto])
     return resultado.returncode == 0
 
 
-def executar_container(imagem: str, nome: Optional[str] = None, 
+def executar_container(imagem: str, nome: Optional[str] = None,
                        portas: Optional[Dict[str, str]] = None) -> bool:
     """Executa um container Docker."""
-    comando = f"docker run -d"
-    
+    argumentos = ["run", "-d"]
+
     if nome:
-        comando += f" --name {nome}"
-    
+        argumentos += ["--name", nome]
+
     if portas:
         for host, container in portas.items():
-            comando += f" -p {host}:{container}"
-    
-    comando += f" {imagem}"
-    
-    resultado = subprocess.run(comando, shell=True, capture_output=True, text=True)
-    
+            argumentos += ["-p", f"{host}:{container}"]
+
+    argumentos.append(imagem)
+
+    resultado = _docker(*argumentos)
+
     if resultado.returncode == 0:
         print(f"Container iniciado: {resultado.stdout.strip()[:12]}")
         return True
@@ -84,16 +655,482 @@ def executar_container(imagem: str, nome: Optional[str] = None,
 
 def parar_container(container_id: str) -> bool:
     """Para um container Docker."""
-    resultado = subprocess.run(
-        f"docker stop {container_id}",
-        shell=True,
-        capture_output=True
-    )
-    return resultado.returncode == 0
+    try:
+        _chamar_api("parar_container", container_id)
+        return True
+    except LookupError:
+        pass
+    except RuntimeError:
+        return False
+    return _docker("stop", container_id).returncode == 0
 
 
 def remover_container(container_id: str, force: bool = False) -> bool:
     """Remove um container Docker."""
-    comando = f"docker rm {'-f ' if force else ''}{container_id}"
-    resultado = subprocess.run(comando, shell=True, capture_output=True)
-    return resultado.returncode == 0
\ No newline at end of file
+    try:
+        _chamar_api("remover_container", container_id, force)
+        return True
+    except LookupError:
+        pass
+    except RuntimeError:
+        return False
+    argumentos = ["rm", "-f", container_id] if force else ["rm", container_id]
+    return _docker(*argumentos).returncode == 0
+
+
+def _rotulos_cli(texto: str) -> Dict[str, str]:
+    """
+    Rótulos no formato do CLI ("k=v,k2=v2") como dicionário.
+
+    O CLI junta os rótulos com vírgula sem escapar os valores; um trecho
+    sem "=" é tratado como continuação do valor anterior ("hosts=a,b").
+    """
+    rotulos = {}
+    chave = None
+    for item in texto.split(",") if texto else []:
+        nome, sep, valor = item.partition("=")
+        if sep or chave is None:
+            chave = nome
+            rotulos[chave] = valor
+        else:
+            rotulos[chave] += f",{item}"
+    return rotulos
+
+
+def _containers_para_selecao(apenas_ativos: bool) -> List[Tuple[str, List[str], Dict[str, str]]]:
+    """Containers como (ID completo, nomes, rótulos), pela API ou pelo CLI."""
+    try:
+        return [
+            (c["Id"], [nome.lstrip("/") for nome in c.get("Names") or []], c.get("Labels") or {})
+            for c in _chamar_api("listar_containers", apenas_ativos)
+        ]
+    except LookupError:
+        pass
+    except RuntimeError as e:
+        print(f"Erro ao listar containers: {e}")
+        return []
+
+    argumentos = ["ps", "--no-trunc", "--format", "{{json .}}"]
+    if not apenas_ativos:
+        argumentos.insert(1, "-a")
+    try:
+        containers = _json_linhas(_docker(*argumentos).stdout)
+    except Exception as e:
+        print(f"Erro ao listar containers: {e}")
+        return []
+    return [
+        (c["ID"], [nome for nome in c.get("Names", "").split(",") if nome], _rotulos_cli(c.get("Labels", "")))
+        for c in containers
+    ]
+
+
+def _resolver_ids(pedidos: List[str], containers: List[tuple]) -> set:
+    """
+    IDs completos dos containers pedidos por ID, nome ou prefixo de ID.
+
+    Como no docker, ID completo e nome exato têm prioridade; um prefixo só
+    vale se tiver PREFIXO_MINIMO_ID caracteres e apontar um único container.
+    """
+    completos = [container[0] for container in containers]
+    por_nome = {nome: container[0] for container in containers for nome in container[1]}
+    escolhidos = set()
+    for pedido in pedidos:
+        if pedido in completos:
+            escolhidos.add(pedido)
+        elif pedido.lstrip("/") in por_nome:
+            escolhidos.add(por_nome[pedido.lstrip("/")])
+        elif len(pedido) >= PREFIXO_MINIMO_ID:
+            candidatos = [completo for completo in completos if completo.startswith(pedido.lower())]
+            if len(candidatos) == 1:
+                escolhidos.add(candidatos[0])
+    return escolhidos
+
+
+def selecionar_containers(
+    ids: Optional[Iterable[str]] = None,
+    padrao: Optional[str] = None,
+    rotulos: Optional[Iterable[str]] = None,
+    apenas_ativos: bool = False
+) -> List[str]:
+    """
+    Seleciona containers por ID/nome, padrão glob do nome e rótulos.
+
+    Os critérios informados são combinados (todos precisam valer). Só com
+    `ids` a lista é devolvida como está, sem consultar o daemon. Combinados
+    com outros critérios, os `ids` valem por ID completo, nome exato ou
+    prefixo de ID sem ambiguidade (mínimo PREFIXO_MINIMO_ID caracteres);
+    os que não resolvem para um único container são ignorados.
+
+    Args:
+        ids: IDs (completos ou curtos) ou nomes
+        padrao: Padrão glob aplicado aos nomes (ex: 'ci-*')
+        rotulos: Rótulos exigidos, "chave" ou "chave=valor"
+        apenas_ativos: Se True, só containers em execução
+
+    Returns:
+        Lista de IDs curtos (ou os ids informados)
+    """
+    ids = list(ids or [])
+    rotulos = list(rotulos or [])
+    if ids and not padrao and not rotulos and not apenas_ativos:
+        return ids
+
+    containers = _containers_para_selecao(apenas_ativos)
+    pedidos = _resolver_ids(ids, containers) if ids else None
+    selecionados = []
+    for completo, nomes, existentes in containers:
+        if pedidos is not None and completo not in pedidos:
+            continue
+        if padrao and not any(fnmatch.fnmatchcase(nome, padrao) for nome in nomes):
+            continue
+        if any(
+            existentes.get(chave) != valor if sep else chave not in existentes
+            for chave, sep, valor in (rotulo.partition("=") for rotulo in rotulos)
+        ):
+            continue
+        selecionados.append(completo[:12])
+    return selecionados
+
+
+def operar_containers(
+    containers: Iterable[str],
+    operacao: str,
+    concorrencia: int = 10,
+    espera: int = 10,
+    timeout: float = 60,
+    forcar: bool = False
+) -> dict:
+    """
+    Executa uma operação de ciclo de vida em vários containers em paralelo.
+
+    Cada worker usa sua própria conexão com o socket (ou processo do CLI,
+    sem socket), então o tempo total fica limitado pelos containers mais
+    lentos e não pela soma: com 200 containers e concorrencia=50, um stop
+    leva cerca de 4 × `espera` no pior caso, em vez de 200 ×.
+
+    Args:
+        containers: IDs ou nomes (ver selecionar_containers)
+        operacao: Nome em OPERACOES_CONTAINER ("iniciar", "parar", "reiniciar", "remover")
+        concorrencia: Número máximo de operações simultâneas
+        espera: Segundos até o SIGKILL em parar/reiniciar (docker stop -t)
+        timeout: Tempo máximo de espera por container em segundos
+        forcar: Em remover, remove também containers em execução
+
+    Returns:
+        Dicionário com totais e o resultado de cada container
+
+    Raises:
+        ValueError: Se a operação não existir ou, em parar/reiniciar, se
+            `timeout` não for maior que `espera` (todo stop estouraria)
+    """
+    if operacao not in OPERACOES_CONTAINER:
+        raise ValueError(f"Operação desconhecida: {operacao} (use {', '.join(OPERACOES_CONTAINER)})")
+    if operacao in ("parar", "reiniciar") and timeout <= espera:
+        raise ValueError(f"timeout ({timeout}s) deve ser maior que a espera ({espera}s) de {operacao}")
+
+    metodo, rota, parametros, argumentos = OPERACOES_CONTAINER[operacao]
+    opcoes = {"espera": espera, "forcar": forcar}
+    containers = list(dict.fromkeys(containers))
+    caminho = _caminho_socket()
+    usar_api = caminho is not None and os.path.exists(caminho)
+    locais = threading.local()
+    clientes = []
+    clientes_lock = threading.Lock()
+
+    def executar(container_id: str) -> dict:
+        inicio = time.monotonic()
+        resultado = {"sucesso": False, "erro": None, "duracao": 0.0}
+        try:
+            if usar_api:
+                cliente = getattr(locais, "cliente", None)
+                if cliente is None:
+                    # A conexão compartilhada serializaria as chamadas: uma por worker
+                    cliente = locais.cliente = ClienteDocker(caminho, timeout=timeout)
+                    with clientes_lock:
+                        clientes.append(cliente)
+                try:
+                    cliente.requisitar(
+                        metodo, rota.format(quote(container_id, safe="")), parametros(opcoes) or None
+                    )
+                    resultado["sucesso"] = True
+                except (OSError, http.client.HTTPException) as e:
+                    resultado["erro"] = "Timeout" if isinstance(e, socket.timeout) else str(e)
+            else:
+                saida = _docker(*argumentos(opcoes), container_id, timeout=timeout)
+                resultado["sucesso"] = saida.returncode == 0
+                if not resultado["sucesso"]:
+                    resultado["erro"] = saida.stderr.strip()
+        except subprocess.TimeoutExpired:
+            resultado["erro"] = "Timeout"
+        except Exception as e:
+            resultado["erro"] = str(e)
+        resultado["duracao"] = round(time.monotonic() - inicio, 3)
+        return resultado
+
+    inicio = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(concorrencia, len(containers) or 1))) as executor:
+            resultados = dict(zip(containers, executor.map(executar, containers)))
+    finally:
+        for cliente in clientes:
+            cliente.fechar()
+
+    sucessos = sum(1 for r in resultados.values() if r["sucesso"])
+    return {
+        "sucesso": sucessos == len(containers),
+        "operacao": operacao,
+        "total": len(containers),
+        "sucessos": sucessos,
+        "falhas": len(containers) - sucessos,
+        "duracao": round(time.monotonic() - inicio, 3),
+        "resultados": resultados
+    }
+
+
+def _traduzir_padrao(padrao: str) -> "re.Pattern":
+    """Converte um padrão do .dockerignore (filepath.Match do Go + **) em regex."""
+    regex = ""
+    i = 0
+    while i < len(padrao):
+        c = padrao[i]
+        if padrao.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+            continue
+        if padrao.startswith("**", i):
+            regex += ".*"
+            i += 2
+            continue
+        if c == "*":
+            regex += "[^/]*"
+        elif c == "?":
+            regex += "[^/]"
+        elif c == "[" and "]" in padrao[i + 1:]:
+            fim = padrao.index("]", i + 1)
+            classe = padrao[i + 1:fim]
+            if classe[:1] in ("!", "^"):
+                classe = "^" + classe[1:]
+            regex += f"[{classe}]"
+            i = fim
+        elif c == "\\" and i + 1 < len(padrao):
+            i += 1
+            regex += re.escape(padrao[i])
+        else:
+            regex += re.escape(c)
+        i += 1
+    return re.compile(regex + r"\Z")
+
+
+def ler_dockerignore(contexto: str, dockerfile: Optional[str] = None) -> List[Tuple[bool, "re.Pattern"]]:
+    """
+    Lê as regras de exclusão do contexto.
+
+    Usa <Dockerfile>.dockerignore quando existir (como o BuildKit) e,
+    senão, o .dockerignore da raiz do contexto.
+
+    Returns:
+        Lista de (exceção "!", regex) na ordem do arquivo
+    """
+    candidatos = [os.path.join(contexto, ".dockerignore")]
+    if dockerfile:
+        candidatos.insert(0, f"{dockerfile}.dockerignore")
+    regras = []
+    for arquivo in candidatos:
+        try:
+            with open(arquivo, encoding="utf-8") as entrada:
+                linhas = entrada.read().splitlines()
+        except OSError:
+            continue
+        for linha in linhas:
+            linha = linha.strip()
+            if not linha or linha.startswith("#"):
+                continue
+            excecao = linha.startswith("!")
+            linha = os.path.normpath(linha.lstrip("!").strip()).replace(os.sep, "/").lstrip("/")
+            if linha and linha != ".":
+                regras.append((excecao, _traduzir_padrao(linha)))
+        break
+    return regras
+
+
+def _ignorado(relativo: str, regras: List[Tuple[bool, "re.Pattern"]]) -> bool:
+    """Aplica as regras (a última que casar vence; padrões valem para os diretórios acima)."""
+    partes = relativo.split("/")
+    caminhos = ["/".join(partes[:n]) for n in range(len(partes), 0, -1)]
+    ignorado = False
+    for excecao, regex in regras:
+        if any(regex.match(caminho) for caminho in caminhos):
+            ignorado = not excecao
+    return ignorado
+
+
+def _iterar_contexto(contexto: str, regras: List[Tuple[bool, "re.Pattern"]]) -> Iterator[Tuple[str, os.DirEntry]]:
+    """Percorre o contexto efetivo entregando (caminho relativo, entrada)."""
+    # Com exceções (!), um diretório ignorado ainda pode ter arquivos incluídos
+    podar = not any(excecao for excecao, _ in regras)
+    pilha = [""]
+    while pilha:
+        relativo_dir = pilha.pop()
+        try:
+            with os.scandir(os.path.join(contexto, relativo_dir)) as entradas:
+                for entrada in entradas:
+                    relativo = f"{relativo_dir}/{entrada.name}" if relativo_dir else entrada.name
+                    ignorado = _ignorado(relativo, regras)
+                    if entrada.is_dir(follow_symlinks=False):
+                        if not (ignorado and podar):
+                            pilha.append(relativo)
+                        if not ignorado:
+                            yield relativo, entrada
+                    elif not ignorado:
+                        yield relativo, entrada
+        except OSError:
+            continue
+
+
+def planejar_build(
+    contexto: str = ".",
+    dockerfile: Optional[str] = None,
+    limite: int = 10,
+    trabalhadores: int = 8
+) -> dict:
+    """
+    Calcula o hash do contexto efetivo de um build e procura imagem igual.
+
+    Aplica o .dockerignore, resume cada arquivo (reaproveitando hashes em
+    cache enquanto tamanho, mtime, inode e ctime não mudarem) e combina
+    caminhos, permissões de execução, destinos de links e o Dockerfile em
+    um único hash. Imagens construídas por build_imagem levam esse hash
+    no rótulo ROTULO_HASH_CONTEXTO.
+
+    Args:
+        contexto: Diretório de contexto do build
+        dockerfile: Caminho do Dockerfile (padrão: <contexto>/Dockerfile)
+        limite: Quantidade de maiores diretórios e arquivos no relatório
+        trabalhadores: Número de threads de hash
+
+    Returns:
+        Dicionário com hash, tamanho do contexto, maiores contribuintes e
+        imagem (ID da imagem existente com o mesmo hash, ou None)
+    """
+    resultado = {
+        "sucesso": False,
+        "contexto": contexto,
+        "dockerfile": None,
+        "hash": None,
+        "arquivos": 0,
+        "tamanho_total": 0,
+        "recalculados": 0,
+        "maiores_diretorios": [],
+        "maiores_arquivos": [],
+        "imagem": None,
+        "duracao": 0.0,
+        "erro": None
+    }
+    inicio = time.monotonic()
+
+    try:
+        raiz = os.path.abspath(contexto)
+        if not os.path.isdir(raiz):
+            raise NotADirectoryError(f"Contexto não encontrado: {contexto}")
+        dockerfile = dockerfile or os.path.join(contexto, "Dockerfile")
+        resultado["dockerfile"] = dockerfile
+        with open(dockerfile, "rb") as arquivo:
+            conteudo_dockerfile = arquivo.read()
+
+        regras = ler_dockerignore(raiz, dockerfile)
+        arquivo_cache = diretorio_cache("docker_contexto") / f"{chave_cache(raiz)}.json"
+        anteriores = carregar_json(arquivo_cache, {})
+
+        entradas = []
+        atuais = {}
+        pendentes = []
+        por_diretorio: Dict[str, int] = {}
+        for relativo, entrada in _iterar_contexto(raiz, regras):
+            if entrada.is_symlink():
+                entradas.append((relativo, "l", os.readlink(entrada.path)))
+            elif entrada.is_dir(follow_symlinks=False):
+                entradas.append((relativo + "/", "d", ""))
+            elif entrada.is_file(follow_symlinks=False):
+                stat = entrada.stat(follow_symlinks=False)
+                assinatura = [stat.st_size, stat.st_mtime_ns, stat.st_ino, stat.st_ctime_ns]
+                anterior = anteriores.get(relativo)
+                digest = anterior[0] if anterior and anterior[1:] == assinatura else None
+                if digest is None:
+                    pendentes.append(relativo)
+                atuais[relativo] = [digest] + assinatura
+                modo = "x" if stat.st_mode & 0o111 else "f"
+                entradas.append((relativo, modo, None))
+                resultado["arquivos"] += 1
+                resultado["tamanho_total"] += stat.st_size
+                topo = relativo.split("/", 1)[0]
+                por_diretorio[topo] = por_diretorio.get(topo, 0) + stat.st_size
+
+        with ThreadPoolExecutor(max_workers=max(1, trabalhadores)) as executor:
+            for relativo, digest in zip(pendentes, executor.map(
+                lambda relativo: calcular_hash_arquivo(os.path.join(raiz, relativo)), pendentes
+            )):
+                atuais[relativo][0] = digest
+        salvar_json(arquivo_cache, atuais)
+
+        resumo = hashlib.sha256(b"dockerfile\0" + conteudo_dockerfile + b"\n")
+        for relativo, tipo, valor in sorted(entradas):
+            if valor is None:
+                valor = atuais[relativo][0]
+            resumo.update(f"{tipo}\0{relativo}\0{valor}\n".encode("utf-8", errors="surrogateescape"))
+        resultado["hash"] = resumo.hexdigest()
+        resultado["recalculados"] = len(pendentes)
+
+        resultado["maiores_diretorios"] = [
+            {"caminho": caminho, "tamanho": tamanho}
+            for caminho, tamanho in heapq.nlargest(limite, por_diretorio.items(), key=lambda item: item[1])
+        ]
+        resultado["maiores_arquivos"] = [
+            {"caminho": relativo, "tamanho": entrada[1]}
+            for relativo, entrada in heapq.nlargest(limite, atuais.items(), key=lambda item: item[1][1])
+        ]
+        resultado["imagem"] = _imagem_com_hash(resultado["hash"])
+        resultado["sucesso"] = True
+
+    except Exception as e:
+        resultado["erro"] = str(e)
+
+    resultado["duracao"] = round(time.monotonic() - inicio, 3)
+    return resultado
+
+
+def _imagem_com_hash(hash_contexto: str) -> Optional[str]:
+    """ID de uma imagem rotulada com o hash do contexto (None se não houver ou sem Docker)."""
+    rotulo = f"{ROTULO_HASH_CONTEXTO}={hash_contexto}"
+    try:
+        imagens = _chamar_api(
+            "requisitar", "GET", "/images/json", {"filters": json.dumps({"label": [rotulo]})}
+        )
+        return imagens[0]["Id"] if imagens else None
+    except LookupError:
+        pass
+    except RuntimeError:
+        return None
+    try:
+        saida = _docker("images", "-q", "--no-trunc", "--filter", f"label={rotulo}")
+    except OSError:
+        return None
+    ids = saida.stdout.split() if saida.returncode == 0 else []
+    return ids[0] if ids else None
+
+
+def _marcar_imagem(imagem_id: str, tag: str) -> bool:
+    """Aplica a tag a uma imagem existente (docker tag)."""
+    repositorio, separador, versao = tag.rpartition(":")
+    if not separador or "/" in versao:
+        repositorio, versao = tag, "latest"
+    try:
+        _chamar_api(
+            "requisitar", "POST", f"/images/{quote(imagem_id, safe='')}/tag",
+            {"repo": repositorio, "tag": versao}
+        )
+        return True
+    except LookupError:
+        pass
+    except RuntimeError:
+        return False
+    return _docker("tag", imagem_id, tag).returncode == 0
@@ -0,0 +1,216 @@
+"""
+Módulo de detecção de arquivos duplicados para automação DevOps.
+Autor: Patrick
+Data: Dezembro 2025
+
+Contém funções para encontrar arquivos com conteúdo idêntico e,
+opcionalmente, substituí-los por hard links.
+"""
+
+import os
+import time
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from .logger import configurar_logger, log_operacao
+from .projeto import iterar_entradas, calcular_hash_arquivo
+
+# Logger do módulo
+logger = configurar_logger("duplicados")
+
+# Bytes lidos do início e do fim de cada arquivo na etapa de amostragem
+TAMANHO_AMOSTRA = 4096
+
+
+def _hash_amostra(caminho: str, tamanho: int, amostra: int) -> str:
+    """Hash do início e do fim do arquivo (o arquivo inteiro se for pequeno)."""
+    resumo = hashlib.blake2b()
+    with open(caminho, "rb") as arquivo:
+        if tamanho <= 2 * amostra:
+            resumo.update(arquivo.read())
+        else:
+            resumo.update(arquivo.read(amostra))
+            arquivo.seek(-amostra, os.SEEK_END)
+            resumo.update(arquivo.read(amostra))
+    return resumo.hexdigest()
+
+
+def _agrupar_por_hash(
+    executor: ThreadPoolExecutor,
+    grupos: List[List[str]],
+    funcao
+) -> List[List[str]]:
+    """Aplica `funcao` em paralelo e subdivide cada grupo pelo hash obtido."""
+    caminhos = [caminho for grupo in grupos for caminho in grupo]
+    hashes = dict(zip(caminhos, executor.map(funcao, caminhos)))
+
+    novos = []
+    for grupo in grupos:
+        por_hash = defaultdict(list)
+        for caminho in grupo:
+            if hashes[caminho] is not None:
+                por_hash[hashes[caminho]].append(caminho)
+        novos.extend(g for g in por_hash.values() if len(g) > 1)
+    return novos
+
+
+def _seguro(funcao):
+    """Converte erros de leitura em None (arquivo é descartado do grupo)."""
+    def executar(*args):
+        try:
+            return funcao(*args)
+        except OSError as e:
+            logger.warning(f"Não foi possível ler {args[0]}: {e}")
+            return None
+    return executar
+
+
+def _substituir_por_hardlink(original: str, duplicado: str) -> bool:
+    """
+    Troca `duplicado` por um hard link para `original` de forma atômica.
+
+    Returns:
+        True se o caminho era o último link do inode antigo (espaço liberado)
+    """
+    ultimo_link = os.stat(duplicado, follow_symlinks=False).st_nlink == 1
+    temporario = f"{duplicado}.{os.getpid()}.link.tmp"
+    os.link(original, temporario)
+    try:
+        os.replace(temporario, duplicado)
+    except OSError:
+        os.unlink(temporario)
+        raise
+    return ultimo_link
+
+
+def encontrar_duplicados(
+    diretorio: str,
+    tamanho_min: int = 1,
+    trabalhadores: int = 8,
+    criar_hardlinks: bool = False,
+    tamanho_amostra: int = TAMANHO_AMOSTRA
+) -> dict:
+    """
+    Encontra arquivos duplicados em etapas, do mais barato ao mais caro.
+
+    1. Agrupa por tamanho (arquivos com tamanho único são descartados
+       sem leitura);
+    2. Compara um hash do início e do fim dos candidatos;
+    3. Calcula o hash completo (via mmap, em paralelo) só do que restou.
+
+    Links simbólicos são ignorados. Arquivos que já são hard links do
+    mesmo inode não contam como desperdício e os grupos listam um caminho
+    por inode. Ao criar hard links, todos os caminhos encontrados de cada
+    inode duplicado são religados e as cópias passam a compartilhar
+    permissões e dono do arquivo mantido; bytes_recuperados só conta
+    inodes cujo último link foi substituído (links fora do diretório
+    mantêm o espaço ocupado).
+
+    Args:
+        diretorio: Diretório a analisar
+        tamanho_min: Ignorar arquivos menores que este tamanho em bytes
+        trabalhadores: Número de threads de leitura/hash
+        criar_hardlinks: Se True, substitui duplicados por hard links
+        tamanho_amostra: Bytes lidos do início e do fim na etapa 2
+
+    Returns:
+        Dicionário com os grupos de duplicados e o espaço desperdiçado
+    """
+    resultado = {
+        "sucesso": False,
+        "diretorio": diretorio,
+        "arquivos_analisados": 0,
+        "candidatos_amostra": 0,
+        "hashes_completos": 0,
+        "grupos": [],
+        "bytes_desperdicados": 0,
+        "hardlinks_criados": 0,
+        "bytes_recuperados": 0,
+        "duracao": 0.0,
+        "erro": None
+    }
+    inicio = time.monotonic()
+
+    try:
+        if not os.path.isdir(diretorio):
+            raise NotADirectoryError(f"Diretório não encontrado: {diretorio}")
+
+        # Etapa 1: tamanho, com os caminhos agrupados por inode (o primeiro
+        # em ordem alfabética representa o inode nas etapas de hash)
+        por_tamanho: Dict[int, Dict[tuple, List[str]]] = defaultdict(lambda: defaultdict(list))
+        # Links simbólicos ficam de fora: não ocupam o espaço do alvo e
+        # religá-los trocaria o link por um hard link para fora da árvore
+        entradas = iterar_entradas(
+            diretorio, paralelo=True, trabalhadores=trabalhadores, seguir_links=False
+        )
+        for caminho, stat in entradas:
+            resultado["arquivos_analisados"] += 1
+            if stat.st_size < tamanho_min:
+                continue
+            por_tamanho[stat.st_size][(stat.st_dev, stat.st_ino)].append(caminho)
+
+        links: Dict[str, List[str]] = {}
+        tamanhos = {}
+        grupos = []
+        for tamanho, inodes in por_tamanho.items():
+            if len(inodes) < 2:
+                continue
+            grupo = []
+            for caminhos in inodes.values():
+                caminhos.sort()
+                links[caminhos[0]] = caminhos
+                tamanhos[caminhos[0]] = tamanho
+                grupo.append(caminhos[0])
+            grupos.append(sorted(grupo))
+        del por_tamanho
+
+        with ThreadPoolExecutor(max_workers=max(1, trabalhadores)) as executor:
+            # Etapa 2: início + fim
+            resultado["candidatos_amostra"] = sum(len(g) for g in grupos)
+            grupos = _agrupar_por_hash(
+                executor, grupos,
+                _seguro(lambda c: _hash_amostra(c, tamanhos[c], tamanho_amostra))
+            )
+
+            # Etapa 3: hash completo apenas quando a amostra não cobriu o arquivo
+            pequenos = [g for g in grupos if tamanhos[g[0]] <= 2 * tamanho_amostra]
+            grandes = [g for g in grupos if tamanhos[g[0]] > 2 * tamanho_amostra]
+            resultado["hashes_completos"] = sum(len(g) for g in grandes)
+            grupos = pequenos + _agrupar_por_hash(
+                executor, grandes,
+                _seguro(lambda c: calcular_hash_arquivo(c, "blake2b"))
+            )
+
+        for grupo in sorted(grupos, key=lambda g: tamanhos[g[0]] * (len(g) - 1), reverse=True):
+            grupo.sort()
+            tamanho = tamanhos[grupo[0]]
+            resultado["grupos"].append({"tamanho": tamanho, "arquivos": grupo})
+            resultado["bytes_desperdicados"] += tamanho * (len(grupo) - 1)
+
+            if criar_hardlinks:
+                for representante in grupo[1:]:
+                    for duplicado in links[representante]:
+                        try:
+                            if _substituir_por_hardlink(grupo[0], duplicado):
+                                resultado["bytes_recuperados"] += tamanho
+                            resultado["hardlinks_criados"] += 1
+                        except OSError as e:
+                            logger.warning(f"Não foi possível vincular {duplicado}: {e}")
+
+        resultado["sucesso"] = True
+        resultado["duracao"] = round(time.monotonic() - inicio, 3)
+        log_operacao(
+            logger, "DUPLICADOS",
+            sucesso=True,
+            detalhes=f"{len(resultado['grupos'])} grupos, "
+                     f"{resultado['bytes_desperdicados']} bytes desperdiçados, "
+                     f"{resultado['hashes_completos']}/{resultado['arquivos_analisados']} hashes completos"
+        )
+
+    except Exception as e:
+        resultado["erro"] = str(e)
+        log_operacao(logger, "DUPLICADOS", sucesso=False, detalhes=str(e))
+
+    return resultado
@@ -0,0 +1,244 @@
+"""
+Módulo de análise de histórico Git para automação DevOps.
+Autor: Patrick
+Data: Dezembro 2025
+
+Contém funções para medir a frequência de alteração (churn) de cada
+arquivo de um repositório e apontar os hotspots candidatos a refatoração.
+"""
+
+import os
+import json
+import time
+from datetime import datetime
+from typing import Iterator, Tuple
+
+from .logger import configurar_logger, log_operacao
+from .cache import diretorio_cache, chave_cache, carregar_json, salvar_json
+from .git_utils import FluxoGit, executar_git, campos_nul, hash_da_ref, localizar_git
+
+# Logger do módulo
+logger = configurar_logger("git_analise")
+
+VERSAO_AGREGADOS = 1
+
+# Posições de cada arquivo nos agregados: [commits, linhas adicionadas,
+# linhas removidas, primeira alteração, última alteração, ids de autores]
+COMMITS, ADICIONADAS, REMOVIDAS, PRIMEIRA, ULTIMA, AUTORES = range(6)
+
+# Critérios de ordenação dos hotspots: nome -> chave sobre a entrada
+ORDENACAO_HOTSPOTS = {
+    "commits": lambda e: (e[COMMITS], e[ADICIONADAS] + e[REMOVIDAS]),
+    "linhas": lambda e: (e[ADICIONADAS] + e[REMOVIDAS], e[COMMITS]),
+    "autores": lambda e: (len(e[AUTORES]), e[COMMITS]),
+}
+
+# Início de cada commit na saída (os campos seguintes são as linhas do numstat)
+MARCADOR_COMMIT = b"\x1e"
+
+
+def _iterar_numstat(raiz: str, revisoes: str) -> Iterator[Tuple[str, int, list]]:
+    """
+    Percorre `git log --numstat -z` em fluxo.
+
+    Yields:
+        Tuplas (autor, timestamp, [(adicionadas, removidas, caminho), ...])
+        por commit (merges são ignorados; binários contam 0 linhas)
+    """
+    argumentos = ["git", "log", "-z", "--numstat", "--no-merges", "--no-renames",
+                  "--format=%x1e%H%x00%aN%x00%at", revisoes, "--"]
+    with FluxoGit(argumentos, cwd=raiz) as fluxo:
+        campos = campos_nul(fluxo.stdout)
+        atual = None
+        for campo in campos:
+            if campo.startswith(MARCADOR_COMMIT):
+                if atual:
+                    yield atual
+                autor = next(campos, b"").decode("utf-8", errors="replace")
+                timestamp = int(next(campos, b"0") or 0)
+                atual = (autor, timestamp, [])
+                continue
+            campo = campo.lstrip(b"\n")
+            if not campo or atual is None:
+                continue
+            adicionadas, removidas, caminho = campo.split(b"\t", 2)
+            atual[2].append((
+                int(adicionadas) if adicionadas != b"-" else 0,
+                int(removidas) if removidas != b"-" else 0,
+                caminho.decode("utf-8", errors="replace")
+            ))
+        if atual:
+            yield atual
+        fluxo.concluir()
+
+
+def _agregar(dados: dict, raiz: str, revisoes: str) -> int:
+    """Soma os commits de `revisoes` aos agregados; retorna quantos foram lidos."""
+    arquivos = dados["arquivos"]
+    meses = dados["meses"]
+    autores = dados["autores"]
+    ids = {nome: indice for indice, nome in enumerate(autores)}
+    processados = 0
+
+    for autor, timestamp, alteracoes in _iterar_numstat(raiz, revisoes):
+        processados += 1
+        id_autor = ids.get(autor)
+        if id_autor is None:
+            id_autor = ids[autor] = len(autores)
+            autores.append(autor)
+
+        mes = datetime.fromtimestamp(timestamp).strftime("%Y-%m")
+        serie = meses.setdefault(mes, [0, 0, 0])
+        serie[0] += 1
+        for adicionadas, removidas, caminho in alteracoes:
+            serie[1] += adicionadas
+            serie[2] += removidas
+            entrada = arquivos.get(caminho)
+            if entrada is None:
+                entrada = arquivos[caminho] = [0, 0, 0, timestamp, timestamp, []]
+            entrada[COMMITS] += 1
+            entrada[ADICIONADAS] += adicionadas
+            entrada[REMOVIDAS] += removidas
+            entrada[PRIMEIRA] = min(entrada[PRIMEIRA], timestamp)
+            entrada[ULTIMA] = max(entrada[ULTIMA], timestamp)
+            if id_autor not in entrada[AUTORES]:
+                entrada[AUTORES].append(id_autor)
+
+    dados["commits"] += processados
+    return processados
+
+
+def _arquivos_existentes(raiz: str, objeto: str) -> set:
+    """Caminhos presentes na árvore do commit (hotspots de arquivos apagados não interessam)."""
+    resultado = executar_git("ls-tree", "-r", "-z", "--name-only", objeto, cwd=raiz, texto=False)
+    if resultado.returncode != 0:
+        raise RuntimeError(resultado.stderr.decode("utf-8", errors="replace").strip())
+    return {
+        caminho.decode("utf-8", errors="replace")
+        for caminho in resultado.stdout.split(b"\0") if caminho
+    }
+
+
+def analisar_hotspots(
+    caminho: str = ".",
+    limite: int = 20,
+    ordenar: str = "commits",
+    ref: str = "HEAD",
+    apenas_existentes: bool = True,
+    usar_cache: bool = True
+) -> dict:
+    """
+    Calcula o churn por arquivo e retorna os hotspots do repositório.
+
+    O histórico é lido uma única vez (git log --numstat em fluxo) e
+    resumido em contadores por arquivo, gravados no cache junto com o
+    último commit processado. As execuções seguintes leem apenas os
+    commits novos (ultimo..ref); se o histórico foi reescrito e o commit
+    anterior não é mais ancestral, os agregados são refeitos do zero.
+    Renomeações não são seguidas: cada caminho é contado separadamente.
+
+    Args:
+        caminho: Diretório do repositório
+        limite: Quantidade de hotspots retornados
+        ordenar: Critério em ORDENACAO_HOTSPOTS ("commits", "linhas", "autores")
+        ref: Revisão analisada
+        apenas_existentes: Se True, ignora arquivos que não existem mais em `ref`
+        usar_cache: Se False, recalcula sem ler nem gravar o cache
+
+    Returns:
+        Dicionário com os hotspots, a série mensal de alterações e
+        estatísticas da execução
+    """
+    if ordenar not in ORDENACAO_HOTSPOTS:
+        raise ValueError(f"Critério inválido: {ordenar} (use {', '.join(ORDENACAO_HOTSPOTS)})")
+
+    resultado = {
+        "sucesso": False,
+        "repositorio": caminho,
+        "commit": None,
+        "commits_total": 0,
+        "commits_processados": 0,
+        "arquivos": 0,
+        "autores": 0,
+        "hotspots": [],
+        "meses": [],
+        "duracao": 0.0,
+        "erro": None
+    }
+    inicio = time.monotonic()
+
+    try:
+        repositorio = localizar_git(caminho)
+        if repositorio is None:
+            raise FileNotFoundError(f"Repositório Git não encontrado: {caminho}")
+        raiz = repositorio["raiz"]
+
+        objeto = hash_da_ref(ref, raiz)
+        if not objeto:
+            raise ValueError(f"Revisão não encontrada: {ref}")
+        resultado["commit"] = objeto
+
+        arquivo_cache = diretorio_cache("git_hotspots") / (
+            f"{chave_cache(json.dumps([os.path.abspath(repositorio['comum']), ref]))}.json"
+        )
+        dados = carregar_json(arquivo_cache) if usar_cache else None
+        if not dados or dados.get("versao") != VERSAO_AGREGADOS:
+            dados = None
+        elif dados["ultimo"] != objeto:
+            ancestral = executar_git("merge-base", "--is-ancestor", dados["ultimo"], objeto, cwd=raiz)
+            if ancestral.returncode != 0:
+                logger.info(f"Histórico de {ref} reescrito em '{raiz}'; recalculando agregados")
+                dados = None
+
+        if dados is None:
+            dados = {
+                "versao": VERSAO_AGREGADOS, "ultimo": None, "commits": 0,
+                "autores": [], "arquivos": {}, "meses": {}
+            }
+        if dados["ultimo"] != objeto:
+            revisoes = f"{dados['ultimo']}..{objeto}" if dados["ultimo"] else objeto
+            resultado["commits_processados"] = _agregar(dados, raiz, revisoes)
+            dados["ultimo"] = objeto
+            if usar_cache:
+                salvar_json(arquivo_cache, dados)
+
+        arquivos = dados["arquivos"]
+        if apenas_existentes:
+            existentes = _arquivos_existentes(raiz, objeto)
+            arquivos = {c: e for c, e in arquivos.items() if c in existentes}
+
+        chave = ORDENACAO_HOTSPOTS[ordenar]
+        ordenados = sorted(arquivos.items(), key=lambda item: chave(item[1]), reverse=True)
+        resultado["hotspots"] = [
+            {
+                "caminho": caminho_arquivo,
+                "commits": entrada[COMMITS],
+                "linhas_adicionadas": entrada[ADICIONADAS],
+                "linhas_removidas": entrada[REMOVIDAS],
+                "autores": len(entrada[AUTORES]),
+                "primeira_alteracao": datetime.fromtimestamp(entrada[PRIMEIRA]).isoformat(),
+                "ultima_alteracao": datetime.fromtimestamp(entrada[ULTIMA]).isoformat()
+            }
+            for caminho_arquivo, entrada in ordenados[:limite]
+        ]
+        resultado["meses"] = [
+            {"mes": mes, "commits": serie[0], "linhas_adicionadas": serie[1], "linhas_removidas": serie[2]}
+            for mes, serie in sorted(dados["meses"].items())
+        ]
+        resultado["commits_total"] = dados["commits"]
+        resultado["arquivos"] = len(arquivos)
+        resultado["autores"] = len(dados["autores"])
+        resultado["sucesso"] = True
+        resultado["duracao"] = round(time.monotonic() - inicio, 3)
+        log_operacao(
+            logger, "HOTSPOTS",
+            sucesso=True,
+            detalhes=f"{raiz}: {resultado['commits_processados']} commits novos "
+                     f"({dados['commits']} no total) em {resultado['duracao']}s"
+        )
+
+    except Exception as e:
+        resultado["erro"] = str(e)
+        log_operacao(logger, "HOTSPOTS", sucesso=False, detalhes=str(e))
+
+    return resultado
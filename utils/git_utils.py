@@ -4,108 +4,826 @@ Utilitários para automação Git.
 
 import subprocess
 import os
-from typing import Optional, List
+import sys
+import json
+import stat
+import time
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+from .cache import diretorio_cache, chave_cache, carregar_json, salvar_json
 
-def verificar_repositorio() -> bool:
-    """Verifica se o diretório atual é um repositório Git."""
-    resultado = subprocess.run(
-        "git rev-parse --is-inside-work-tree",
-        shell=True,
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+# Quantidade de consultas por ida e volta ao cat-file (as consultas são
+# escritas por uma thread enquanto as respostas são lidas, então o lote
+# não precisa caber no buffer do pipe)
+LOTE_CAT_FILE = 256
+
+# Variáveis que mudam a forma como o git localiza o repositório; com
+# qualquer uma definida, os atalhos em Python cedem lugar ao git
+VARIAVEIS_AMBIENTE_GIT = (
+    "GIT_DIR", "GIT_WORK_TREE", "GIT_COMMON_DIR", "GIT_CEILING_DIRECTORIES",
+    "GIT_DISCOVERY_ACROSS_FILESYSTEM"
+)
+
+# Campos do git log, separados por NUL (%x00) e um commit por registro -z
+CAMPOS_LOG = ("hash", "pais", "autor", "email", "timestamp", "data", "mensagem")
+FORMATO_LOG = "%H%x00%P%x00%an%x00%ae%x00%at%x00%ci%x00%s"
+
+# Arquivo gravado dentro de cada espelho após uma atualização bem-sucedida
+MARCADOR_ESPELHO = "devops-atualizado"
+
+# caminho -> ((mtime_ns, tamanho, inode), valor interpretado)
+_cache_arquivos: Dict[str, tuple] = {}
+
+
+def executar_git(
+    *argumentos: str,
+    cwd: Optional[str] = None,
+    texto: bool = True,
+    entrada: Optional[str] = None
+) -> subprocess.CompletedProcess:
+    """
+    Executa um comando git sem passar pelo shell.
+
+    Args:
+        *argumentos: Argumentos do git (sem o "git" inicial)
+        cwd: Diretório onde executar (padrão: diretório atual)
+        texto: Se False, stdout/stderr vêm em bytes (ex: saídas com -z)
+        entrada: Texto enviado ao stdin
+
+    Returns:
+        CompletedProcess com returncode, stdout e stderr capturados
+    """
+    return subprocess.run(
+        ["git", *argumentos],
+        cwd=cwd,
+        input=entrada,
         capture_output=True,
-        text=True
+        text=texto
     )
+
+
+class FluxoGit:
+    """
+    Processo git com o stdout lido em fluxo.
+
+    O stderr vai para um arquivo temporário: um pipe que ninguém lê enche
+    com avisos (CRLF, safe.directory, ...) e trava o git no meio da saída.
+    Use como gerenciador de contexto; fechar() mata o processo se a
+    leitura for interrompida antes do fim.
+    """
+
+    def __init__(self, argumentos: List[str], cwd: Optional[str] = None):
+        self.argumentos = argumentos
+        self._erros = tempfile.TemporaryFile()
+        try:
+            self.processo = subprocess.Popen(
+                argumentos, cwd=cwd, stdout=subprocess.PIPE, stderr=self._erros
+            )
+        except BaseException:
+            self._erros.close()
+            raise
+        self.stdout = self.processo.stdout
+
+    def concluir(self):
+        """
+        Aguarda o término (depois de ler todo o stdout).
+
+        Raises:
+            RuntimeError: Com a mensagem do git, se o código de saída não for 0
+        """
+        codigo = self.processo.wait()
+        if codigo != 0:
+            self._erros.seek(0)
+            erro = self._erros.read().decode("utf-8", errors="replace").strip()
+            raise RuntimeError(erro or f"{' '.join(self.argumentos[:2])} terminou com código {codigo}")
+
+    def fechar(self):
+        """Encerra o processo, se ainda estiver rodando, e libera os arquivos."""
+        if self.processo.poll() is None:
+            self.processo.kill()
+            self.processo.wait()
+        self.stdout.close()
+        self._erros.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+
+class _ProcessoBatch:
+    """Processo git de longa duração que responde uma consulta por linha."""
+
+    def __init__(self, caminho: str, argumentos: List[str]):
+        self.caminho = caminho
+        self.argumentos = argumentos
+        self.processo = None
+        self.lock = threading.Lock()
+
+    def obter(self) -> subprocess.Popen:
+        """Retorna o processo, iniciando-o (ou reiniciando-o) se necessário."""
+        if self.processo is None or self.processo.poll() is not None:
+            self.processo = subprocess.Popen(
+                ["git", *self.argumentos],
+                cwd=self.caminho,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        return self.processo
+
+    def fechar(self, timeout: float = 5):
+        """Fecha a entrada do processo e aguarda o término."""
+        processo, self.processo = self.processo, None
+        if processo is None:
+            return
+        try:
+            processo.stdin.close()
+            processo.wait(timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            processo.kill()
+            processo.wait()
+        finally:
+            processo.stdout.close()
+
+
+def _escrever_consultas(entrada, dados: bytes):
+    """Envia as consultas ao cat-file (executado em thread própria)."""
+    try:
+        entrada.write(dados)
+        entrada.flush()
+    except (OSError, ValueError):
+        # Processo encerrado: a leitura das respostas reporta a falha
+        pass
+
+
+class RepositorioGit:
+    """
+    Sessão de consultas a um repositório Git.
+
+    Mantém processos `git cat-file --batch` e `--batch-check` abertos e
+    os reutiliza entre chamadas, evitando criar um processo por consulta.
+    Use como gerenciador de contexto ou chame fechar() ao terminar.
+
+    Exemplo:
+        with RepositorioGit(".") as repo:
+            print(repo.resolver("HEAD"), repo.ler_commit("HEAD")["mensagem"])
+    """
+
+    def __init__(self, caminho: str = "."):
+        self.caminho = os.path.abspath(caminho)
+        self._objetos = _ProcessoBatch(self.caminho, ["cat-file", "--batch"])
+        self._verificacao = _ProcessoBatch(self.caminho, ["cat-file", "--batch-check"])
+
+    def __enter__(self) -> "RepositorioGit":
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def fechar(self):
+        """Encerra os processos auxiliares."""
+        self._objetos.fechar()
+        self._verificacao.fechar()
+
+    def git(self, *argumentos: str) -> subprocess.CompletedProcess:
+        """Executa um comando git avulso no repositório (sem shell)."""
+        return executar_git(*argumentos, cwd=self.caminho)
+
+    @staticmethod
+    def _ler_respostas(processo: subprocess.Popen, quantidade: int, ler_conteudo: bool) -> list:
+        """Lê `quantidade` respostas do cat-file, na ordem das consultas."""
+        respostas = []
+        for _ in range(quantidade):
+            cabecalho = processo.stdout.readline().decode("utf-8").rstrip("\n")
+            if not cabecalho:
+                raise BrokenPipeError("git cat-file encerrou inesperadamente")
+            if cabecalho.endswith((" missing", " ambiguous")):
+                respostas.append(None)
+                continue
+            objeto, tipo, tamanho = cabecalho.split(" ")
+            tamanho = int(tamanho)
+            conteudo = None
+            if ler_conteudo:
+                conteudo = processo.stdout.read(tamanho + 1)[:-1]
+            respostas.append((objeto, tipo, tamanho, conteudo))
+        return respostas
+
+    def _consultar(self, sessao: _ProcessoBatch, refs: List[str], ler_conteudo: bool) -> list:
+        """Envia um lote de consultas e lê as respostas na mesma ordem."""
+        dados = "".join(f"{ref}\n" for ref in refs).encode("utf-8")
+        with sessao.lock:
+            for tentativa in range(2):
+                processo = sessao.obter()
+                # Escrever e ler ao mesmo tempo: com as consultas maiores que
+                # o buffer do stdin e objetos grandes enchendo o stdout, uma
+                # escrita completa antes da leitura travaria os dois lados
+                escritor = threading.Thread(
+                    target=_escrever_consultas, args=(processo.stdin, dados), daemon=True
+                )
+                escritor.start()
+                try:
+                    try:
+                        return self._ler_respostas(processo, len(refs), ler_conteudo)
+                    except BaseException:
+                        # Libera o escritor bloqueado antes de fechar o stdin
+                        processo.kill()
+                        raise
+                    finally:
+                        escritor.join()
+                except (BrokenPipeError, ValueError):
+                    sessao.fechar()
+                    if tentativa:
+                        raise
+        return []
+
+    def _consultar_varios(self, sessao: _ProcessoBatch, refs: Iterable[str], ler_conteudo: bool) -> list:
+        """Divide as consultas em lotes de LOTE_CAT_FILE."""
+        refs = list(refs)
+        for ref in refs:
+            if "\n" in ref:
+                raise ValueError(f"Referência inválida: {ref!r}")
+        respostas = []
+        for inicio in range(0, len(refs), LOTE_CAT_FILE):
+            respostas.extend(self._consultar(sessao, refs[inicio:inicio + LOTE_CAT_FILE], ler_conteudo))
+        return respostas
+
+    def info_objeto(self, ref: str) -> Optional[dict]:
+        """
+        Retorna hash, tipo e tamanho de um objeto sem ler o conteúdo.
+
+        Args:
+            ref: Qualquer expressão de revisão (HEAD, main~2, HEAD:README.md, hash)
+
+        Returns:
+            Dicionário com hash, tipo e tamanho, ou None se não existir
+        """
+        return self.info_objetos([ref])[ref]
+
+    def info_objetos(self, refs: Iterable[str]) -> Dict[str, Optional[dict]]:
+        """Versão em lote de info_objeto (uma ida e volta por LOTE_CAT_FILE refs)."""
+        refs = list(refs)
+        respostas = self._consultar_varios(self._verificacao, refs, ler_conteudo=False)
+        return {
+            ref: {"hash": r[0], "tipo": r[1], "tamanho": r[2]} if r else None
+            for ref, r in zip(refs, respostas)
+        }
+
+    def resolver(self, ref: str) -> Optional[str]:
+        """Resolve uma referência para o hash do objeto (None se não existir)."""
+        info = self.info_objeto(ref)
+        return info["hash"] if info else None
+
+    def resolver_varios(self, refs: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Resolve várias referências de uma vez."""
+        return {
+            ref: info["hash"] if info else None
+            for ref, info in self.info_objetos(refs).items()
+        }
+
+    def ler_objeto(self, ref: str) -> Optional[Tuple[str, bytes]]:
+        """
+        Lê o conteúdo bruto de um objeto.
+
+        Args:
+            ref: Expressão de revisão do objeto
+
+        Returns:
+            Tupla (tipo, conteúdo) ou None se não existir
+        """
+        return self.ler_objetos([ref])[ref]
+
+    def ler_objetos(self, refs: Iterable[str]) -> Dict[str, Optional[Tuple[str, bytes]]]:
+        """Versão em lote de ler_objeto."""
+        refs = list(refs)
+        respostas = self._consultar_varios(self._objetos, refs, ler_conteudo=True)
+        return {ref: (r[1], r[3]) if r else None for ref, r in zip(refs, respostas)}
+
+    def ler_arquivo(self, caminho: str, ref: str = "HEAD") -> Optional[bytes]:
+        """Lê o conteúdo de um arquivo em uma revisão (ex: ler_arquivo('setup.py', 'v1.0'))."""
+        objeto = self.ler_objeto(f"{ref}:{caminho}")
+        return objeto[1] if objeto and objeto[0] == "blob" else None
+
+    def ler_commit(self, ref: str = "HEAD") -> Optional[dict]:
+        """
+        Lê e interpreta um commit.
+
+        Args:
+            ref: Expressão de revisão do commit
+
+        Returns:
+            Dicionário com hash, tree, pais, autor, email, data (timestamp),
+            committer e mensagem, ou None se não for um commit
+        """
+        info = self.info_objeto(f"{ref}^{{commit}}")
+        if info is None:
+            return None
+        _, conteudo = self.ler_objeto(info["hash"])
+        return _interpretar_commit(info["hash"], conteudo)
+
+    def obter_status(self, **opcoes) -> dict:
+        """Status do repositório da sessão (mesmas opções de obter_status)."""
+        return obter_status(self.caminho, **opcoes)
+
+    def verificar_repositorio(self) -> bool:
+        """Verifica se o caminho da sessão está dentro de um repositório Git."""
+        return verificar_repositorio(self.caminho)
+
+    def obter_branch_atual(self) -> Optional[str]:
+        """Retorna o nome da branch atual (None em HEAD destacado)."""
+        return obter_branch_atual(self.caminho) or None
+
+
+def _interpretar_commit(objeto: str, conteudo: bytes) -> dict:
+    """Converte o conteúdo bruto de um commit em dicionário."""
+    cabecalho, _, mensagem = conteudo.decode("utf-8", errors="replace").partition("\n\n")
+    commit = {"hash": objeto, "tree": None, "pais": [], "mensagem": mensagem.rstrip("\n")}
+    for linha in cabecalho.split("\n"):
+        chave, _, valor = linha.partition(" ")
+        if chave == "tree":
+            commit["tree"] = valor
+        elif chave == "parent":
+            commit["pais"].append(valor)
+        elif chave in ("author", "committer"):
+            # "Nome <email> 1700000000 -0300"
+            nome, _, resto = valor.partition(" <")
+            email, _, data = resto.partition("> ")
+            timestamp = int(data.split(" ")[0]) if data else 0
+            if chave == "author":
+                commit.update(autor=nome, email=email, data=timestamp)
+            else:
+                commit.update(committer=nome, email_committer=email, data_commit=timestamp)
+    return commit
+
+
+def _ler_com_cache(caminho: str, interpretar: Callable[[bytes], object]):
+    """
+    Lê e interpreta um arquivo, reaproveitando o resultado enquanto
+    mtime, tamanho e inode não mudarem (o git grava HEAD, refs e
+    packed-refs via rename, o que sempre troca o inode).
+
+    Returns:
+        Valor interpretado ou None se o arquivo não existir
+    """
+    try:
+        info = os.stat(caminho)
+    except OSError:
+        _cache_arquivos.pop(caminho, None)
+        return None
+    chave = (info.st_mtime_ns, info.st_size, info.st_ino)
+    item = _cache_arquivos.get(caminho)
+    if item is not None and item[0] == chave:
+        return item[1]
+    try:
+        with open(caminho, "rb") as arquivo:
+            valor = interpretar(arquivo.read())
+    except OSError:
+        return None
+    _cache_arquivos[caminho] = (chave, valor)
+    return valor
+
+
+def _interpretar_ref(conteudo: bytes) -> Tuple[Optional[str], Optional[str]]:
+    """Interpreta HEAD ou um ref solto: (ref simbólico, hash)."""
+    texto = conteudo.decode("utf-8", errors="replace").strip()
+    if texto.startswith("ref: "):
+        return texto[5:].strip(), None
+    if len(texto) in (40, 64) and all(c in "0123456789abcdef" for c in texto):
+        return None, texto
+    return None, None
+
+
+def _interpretar_packed_refs(conteudo: bytes) -> Dict[str, str]:
+    """Interpreta packed-refs ignorando comentários e linhas ^ (tags anotadas)."""
+    refs = {}
+    for linha in conteudo.decode("utf-8", errors="replace").splitlines():
+        if linha and linha[0] not in "#^":
+            objeto, _, nome = linha.partition(" ")
+            refs[nome] = objeto
+    return refs
+
+
+def _interpretar_arquivo_texto(conteudo: bytes) -> str:
+    """Conteúdo de arquivos de uma linha (.git de worktree, commondir)."""
+    return conteudo.decode("utf-8", errors="replace").strip()
+
+
+def localizar_git(caminho: Optional[str] = None) -> Optional[dict]:
+    """
+    Localiza o repositório que contém um diretório sem executar o git.
+
+    Sobe pelos diretórios procurando .git, que pode ser um diretório ou
+    um arquivo "gitdir: ..." (worktrees e submódulos).
+
+    Args:
+        caminho: Diretório inicial (padrão: diretório atual)
+
+    Returns:
+        Dicionário com raiz (árvore de trabalho), git_dir (HEAD desta
+        árvore) e comum (refs e packed-refs), ou None fora de um repositório
+    """
+    atual = os.path.abspath(caminho or os.getcwd())
+    while True:
+        candidato = os.path.join(atual, ".git")
+        try:
+            modo = os.stat(candidato).st_mode
+        except OSError:
+            modo = None
+        if modo is not None:
+            git_dir = None
+            if stat.S_ISDIR(modo):
+                git_dir = candidato
+            else:
+                conteudo = _ler_com_cache(candidato, _interpretar_arquivo_texto) or ""
+                if conteudo.startswith("gitdir:"):
+                    git_dir = os.path.normpath(os.path.join(atual, conteudo[7:].strip()))
+            if git_dir and os.path.isfile(os.path.join(git_dir, "HEAD")):
+                comum = _ler_com_cache(os.path.join(git_dir, "commondir"), _interpretar_arquivo_texto)
+                comum = os.path.normpath(os.path.join(git_dir, comum)) if comum else git_dir
+                return {"raiz": atual, "git_dir": git_dir, "comum": comum}
+        pai = os.path.dirname(atual)
+        if pai == atual:
+            return None
+        atual = pai
+
+
+def _ler_ref(repositorio: dict, nome: str) -> Tuple[Optional[str], Optional[str]]:
+    """Lê um ref solto ou empacotado: (ref simbólico, hash)."""
+    base = repositorio["git_dir"] if nome == "HEAD" else repositorio["comum"]
+    solto = _ler_com_cache(os.path.join(base, *nome.split("/")), _interpretar_ref)
+    if solto is not None:
+        return solto
+    empacotados = _ler_com_cache(
+        os.path.join(repositorio["comum"], "packed-refs"), _interpretar_packed_refs
+    ) or {}
+    return None, empacotados.get(nome)
+
+
+def ler_head(caminho: Optional[str] = None) -> Optional[dict]:
+    """
+    Lê o HEAD diretamente dos arquivos do repositório.
+
+    Args:
+        caminho: Diretório dentro do repositório (padrão: diretório atual)
+
+    Returns:
+        Dicionário com ref (ex: "refs/heads/main", None se destacado) e
+        hash (None em branch ainda sem commits), ou None fora de um repositório
+    """
+    repositorio = localizar_git(caminho)
+    if repositorio is None:
+        return None
+    ref, objeto = _ler_ref(repositorio, "HEAD")
+    if ref is not None:
+        objeto = resolver_ref_local(ref, caminho, repositorio)
+    return {"ref": ref, "hash": objeto}
+
+
+def resolver_ref_local(
+    nome: str,
+    caminho: Optional[str] = None,
+    repositorio: Optional[dict] = None
+) -> Optional[str]:
+    """
+    Resolve um ref (HEAD, main, v1.0, origin/main, refs/...) sem executar o git.
+
+    Nomes curtos seguem a mesma ordem do git: refs/, refs/tags/,
+    refs/heads/, refs/remotes/. Expressões como HEAD~1 não são
+    suportadas (use RepositorioGit.resolver).
+
+    Args:
+        nome: Nome do ref
+        caminho: Diretório dentro do repositório (padrão: diretório atual)
+        repositorio: Resultado de localizar_git já obtido (evita nova busca)
+
+    Returns:
+        Hash do objeto ou None se o ref não existir
+    """
+    repositorio = repositorio or localizar_git(caminho)
+    if repositorio is None:
+        return None
+    if nome == "HEAD" or nome.startswith("refs/"):
+        candidatos = [nome]
+    else:
+        candidatos = [nome, f"refs/{nome}", f"refs/tags/{nome}", f"refs/heads/{nome}", f"refs/remotes/{nome}"]
+
+    for candidato in candidatos:
+        # Segue refs simbólicos (ex: HEAD -> refs/heads/main), no máximo 5 níveis
+        for _ in range(5):
+            ref, objeto = _ler_ref(repositorio, candidato)
+            if ref is None:
+                break
+            candidato = ref
+        if objeto:
+            return objeto
+    return None
+
+
+def _usar_cli() -> bool:
+    """Indica se o ambiente exige o git para localizar o repositório."""
+    return any(variavel in os.environ for variavel in VARIAVEIS_AMBIENTE_GIT)
+
+
+def verificar_repositorio(caminho: Optional[str] = None) -> bool:
+    """Verifica se o diretório atual (ou caminho) é um repositório Git."""
+    if not _usar_cli():
+        return localizar_git(caminho) is not None
+    resultado = executar_git("rev-parse", "--is-inside-work-tree", cwd=caminho)
     return resultado.returncode == 0
 
 
-def obter_branch_atual() -> Optional[str]:
-    """Retorna o nome da branch atual."""
-    resultado = subprocess.run(
-        "git branch --show-current",
-        shell=True,
-        capture_output=True,
-        text=True
-    )
+def obter_branch_atual(caminho: Optional[str] = None) -> Optional[str]:
+    """Retorna o nome da branch atual ("" com HEAD destacado)."""
+    if not _usar_cli():
+        repositorio = localizar_git(caminho)
+        if repositorio is None:
+            return None
+        ref, objeto = _ler_ref(repositorio, "HEAD")
+        if ref is not None and ref.startswith("refs/heads/") and ref != "refs/heads/.invalid":
+            return ref[len("refs/heads/"):]
+        if ref is None and objeto:
+            return ""
+        # Formato incomum (ex: reftable): perguntar ao git
+    resultado = executar_git("branch", "--show-current", cwd=caminho)
     if resultado.returncode == 0:
         return resultado.stdout.strip()
     return None
 
 
-def obter_status() -> dict:
-    """Obtém o status do repositório."""
-    resultado = subprocess.run(
-        "git status --porcelain",
-        shell=True,
-        capture_output=True,
-        text=True
-    )
-    
-    arquivos_modificados = []
-    arquivos_novos = []
-    arquivos_deletados = []
-    
-    for linha in resultado.stdout.strip().split('\n'):
-        if linha:
-            status = linha[:2]
-            arquivo = linha[3:]
-            
-            if 'M' in status:
-                arquivos_modificados.append(arquivo)
-            elif '?' in status:
-                arquivos_novos.append(arquivo)
-            elif 'D' in status:
-                arquivos_deletados.append(arquivo)
-    
-    return {
-        "modificados": arquivos_modificados,
-        "novos": arquivos_novos,
-        "deletados": arquivos_deletados,
-        "limpo": len(resultado.stdout.strip()) == 0
+def campos_nul(fluxo, tamanho_bloco: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Lê um fluxo binário em blocos e entrega cada campo terminado em NUL.
+
+    Args:
+        fluxo: Arquivo binário (ex: FluxoGit.stdout de um comando com -z)
+        tamanho_bloco: Bytes lidos por vez
+
+    Yields:
+        Cada campo, sem o NUL (o último é entregue mesmo sem terminador)
+    """
+    resto = b""
+    while True:
+        bloco = fluxo.read(tamanho_bloco)
+        if not bloco:
+            break
+        campos = (resto + bloco).split(b"\0")
+        resto = campos.pop()
+        yield from campos
+    if resto:
+        yield resto
+
+
+def argumentos_status(
+    pathspecs: Optional[List[str]] = None,
+    nao_rastreados: bool = True,
+    untracked_cache: bool = False,
+    fsmonitor: bool = False
+) -> List[str]:
+    """
+    Monta a linha de comando do git status em porcelain v2 (-z, --branch).
+
+    Args:
+        pathspecs: Limitar o status a estes caminhos/padrões do git
+        nao_rastreados: Se False, não procura arquivos não rastreados
+        untracked_cache: Habilita core.untrackedCache nesta execução
+        fsmonitor: Habilita core.fsmonitor
+
+    Returns:
+        Lista de argumentos para subprocess (a saída é lida por interpretar_status)
+    """
+    argumentos = ["git"]
+    if untracked_cache:
+        argumentos += ["-c", "core.untrackedCache=true"]
+    if fsmonitor:
+        argumentos += ["-c", "core.fsmonitor=true"]
+    argumentos += [
+        "status", "--porcelain=v2", "-z", "--branch",
+        f"--untracked-files={'normal' if nao_rastreados else 'no'}"
+    ]
+    if pathspecs:
+        argumentos += ["--", *pathspecs]
+    return argumentos
+
+
+def interpretar_status(campos: Iterator[bytes]) -> Iterator[dict]:
+    """
+    Converte os campos da saída porcelain v2 -z em entradas.
+
+    Args:
+        campos: Campos terminados em NUL (ex: campos_nul sobre o stdout)
+
+    Yields:
+        Entradas no formato de iterar_status
+    """
+    for campo in campos:
+        tipo = campo[:1]
+        if tipo == b"#":
+            chave, _, valor = os.fsdecode(campo[2:]).partition(" ")
+            yield {"tipo": "branch", "chave": chave, "valor": valor}
+        elif tipo == b"?":
+            yield {"tipo": "nao_rastreado", "caminho": os.fsdecode(campo[2:])}
+        elif tipo in (b"1", b"2", b"u"):
+            # 1 XY sub mH mI mW hH hI caminho
+            # 2 XY sub mH mI mW hH hI Xpontuação caminho\0origem
+            # u XY sub m1 m2 m3 mW h1 h2 h3 caminho
+            divisoes = {b"1": 8, b"2": 9, b"u": 10}[tipo]
+            partes = campo.split(b" ", divisoes)
+            xy = partes[1].decode()
+            entrada = {
+                "tipo": {b"1": "alterado", b"2": "renomeado", b"u": "conflito"}[tipo],
+                "caminho": os.fsdecode(partes[-1]),
+                "indice": xy[0],
+                "arvore": xy[1],
+                "submodulo": partes[2].startswith(b"S")
+            }
+            if tipo == b"2":
+                entrada["origem"] = os.fsdecode(next(campos, b""))
+                entrada["similaridade"] = int(partes[8][1:] or 0)
+            yield entrada
+
+
+def iterar_status(
+    caminho: Optional[str] = None,
+    pathspecs: Optional[List[str]] = None,
+    nao_rastreados: bool = True,
+    untracked_cache: bool = False,
+    fsmonitor: bool = False
+) -> Iterator[dict]:
+    """
+    Percorre o status do repositório sem carregar toda a saída na memória.
+
+    Usa `git status --porcelain=v2 -z --branch`, que separa os caminhos
+    por NUL (nomes com quebra de linha ou espaços chegam intactos) e
+    informa índice e árvore de trabalho separadamente.
+
+    Args:
+        caminho: Diretório do repositório (padrão: diretório atual)
+        pathspecs: Limitar o status a estes caminhos/padrões do git
+        nao_rastreados: Se False, não procura arquivos não rastreados (mais rápido)
+        untracked_cache: Habilita core.untrackedCache nesta execução
+        fsmonitor: Habilita core.fsmonitor (daemon embutido do git >= 2.36)
+
+    Yields:
+        Um dicionário por entrada: tipo ("branch", "alterado", "renomeado",
+        "conflito", "nao_rastreado"), caminho, origem (renomeações),
+        indice e arvore (códigos X e Y, "." quando inalterado) e submodulo.
+        Entradas "branch" trazem chave e valor dos cabeçalhos "# branch.*".
+    """
+    argumentos = argumentos_status(pathspecs, nao_rastreados, untracked_cache, fsmonitor)
+    with FluxoGit(argumentos, cwd=caminho) as fluxo:
+        yield from interpretar_status(campos_nul(fluxo.stdout))
+        fluxo.concluir()
+
+
+def agregar_status(entradas: Iterable[dict]) -> dict:
+    """
+    Agrupa as entradas de iterar_status no dicionário de obter_status.
+
+    Args:
+        entradas: Entradas de iterar_status/interpretar_status
+
+    Returns:
+        Dicionário com branch, listas por tipo de alteração e "limpo"
+    """
+    status = {
+        "modificados": [],
+        "novos": [],
+        "deletados": [],
+        "adicionados": [],
+        "renomeados": [],
+        "conflitos": [],
+        "submodulos": [],
+        "preparados": [],
+        "nao_preparados": [],
+        "branch": None,
+        "upstream": None,
+        "a_frente": 0,
+        "atras": 0,
+        "limpo": False,
+        "erro": None
     }
 
+    for entrada in entradas:
+        tipo = entrada["tipo"]
+        if tipo == "branch":
+            if entrada["chave"] == "branch.head" and entrada["valor"] != "(detached)":
+                status["branch"] = entrada["valor"]
+            elif entrada["chave"] == "branch.upstream":
+                status["upstream"] = entrada["valor"]
+            elif entrada["chave"] == "branch.ab":
+                a_frente, atras = entrada["valor"].split()
+                status["a_frente"], status["atras"] = int(a_frente), -int(atras)
+            continue
+        
+        arquivo = entrada["caminho"]
+        if tipo == "nao_rastreado":
+            status["novos"].append(arquivo)
+            continue
+        if tipo == "conflito":
+            status["conflitos"].append(arquivo)
+            continue
+        
+        codigos = entrada["indice"] + entrada["arvore"]
+        if tipo == "renomeado":
+            status["renomeados"].append({"de": entrada["origem"], "para": arquivo})
+        if "M" in codigos or "T" in codigos:
+            status["modificados"].append(arquivo)
+        if "D" in codigos:
+            status["deletados"].append(arquivo)
+        if entrada["indice"] == "A":
+            status["adicionados"].append(arquivo)
+        if entrada["indice"] != ".":
+            status["preparados"].append(arquivo)
+        if entrada["arvore"] != ".":
+            status["nao_preparados"].append(arquivo)
+        if entrada["submodulo"]:
+            status["submodulos"].append(arquivo)
+    
+    status["limpo"] = not any(
+        status[chave] for chave in ("novos", "conflitos", "preparados", "nao_preparados")
+    )
+    return status
+
+
+def obter_status(
+    caminho: Optional[str] = None,
+    pathspecs: Optional[List[str]] = None,
+    nao_rastreados: bool = True,
+    untracked_cache: bool = False,
+    fsmonitor: bool = False
+) -> dict:
+    """
+    Obtém o status do repositório.
+
+    Um arquivo pode aparecer em mais de uma lista (ex: "AM" está em
+    adicionados e em modificados; preparados/nao_preparados separam o que
+    está no índice do que está só na árvore de trabalho).
+
+    Args:
+        caminho: Diretório do repositório (padrão: diretório atual)
+        pathspecs: Limitar o status a estes caminhos/padrões do git
+        nao_rastreados: Se False, não procura arquivos não rastreados
+        untracked_cache: Habilita core.untrackedCache nesta execução
+        fsmonitor: Habilita core.fsmonitor nesta execução
+
+    Returns:
+        Dicionário com listas por estado, dados da branch e "limpo"
+    """
+    try:
+        return agregar_status(
+            iterar_status(caminho, pathspecs, nao_rastreados, untracked_cache, fsmonitor)
+        )
+    except (OSError, RuntimeError) as e:
+        status = agregar_status([])
+        status["limpo"] = False
+        status["erro"] = str(e)
+        return status
+
 
 def fazer_commit(mensagem: str, adicionar_todos: bool = True) -> bool:
     """Realiza um commit."""
     if adicionar_todos:
-        subprocess.run("git add -A", shell=True)
+        executar_git("add", "-A")
     
-    resultado = subprocess.run(
-        f'git commit -m "{mensagem}"',
-        shell=True,
-        capture_output=True,
-        text=True
-    )
+    resultado = executar_git("commit", "-m", mensagem)
     return resultado.returncode == 0
 
 
 def fazer_push(branch: Optional[str] = None) -> bool:
     """Envia alterações para o remoto."""
-    comando = "git push"
+    argumentos = ["push"]
     if branch:
-        comando += f" origin {branch}"
+        argumentos += ["origin", branch]
     
-    resultado = subprocess.run(comando, shell=True, capture_output=True)
+    resultado = executar_git(*argumentos)
     return resultado.returncode == 0
 
 
 def fazer_pull(branch: Optional[str] = None) -> bool:
     """Puxa alterações do remoto."""
-    comando = "git pull"
+    argumentos = ["pull"]
     if branch:
-        comando += f" origin {branch}"
+        argumentos += ["origin", branch]
     
-    resultado = subprocess.run(comando, shell=True, capture_output=True)
+    resultado = executar_git(*argumentos)
     return resultado.returncode == 0
 
 
 def listar_branches() -> List[str]:
     """Lista todas as branches."""
-    resultado = subprocess.run(
-        "git branch -a",
-        shell=True,
-        capture_output=True,
-        text=True
-    )
+    resultado = executar_git("branch", "-a")
     
     branches = []
     for linha in resultado.stdout.strip().split('\n'):
@@ -115,26 +833,429 @@ def listar_branches() -> List[str]:
     return branches
 
 
-def obter_log(limite: int = 10) -> List[dict]:
-    """Obtém o histórico de commits."""
-    formato = '%H|%an|%ae|%s|%ci'
-    resultado = subprocess.run(
-        f'git log --format="{formato}" -n {limite}',
-        shell=True,
-        capture_output=True,
-        text=True
-    )
-    
-    commits = []
-    for linha in resultado.stdout.strip().split('\n'):
-        if linha:
-            partes = linha.split('|')
-            if len(partes) >= 5:
-                commits.append({
-                    "hash": partes[0],
-                    "autor": partes[1],
-                    "email": partes[2],
-                    "mensagem": partes[3],
-                    "data": partes[4]
-                })
-    return commits
\ No newline at end of file
+def argumentos_log(
+    ref: Union[str, List[str]] = "HEAD",
+    desde: Union[str, int, None] = None,
+    caminhos: Optional[List[str]] = None,
+    limite: Optional[int] = None
+) -> List[str]:
+    """
+    Monta a linha de comando do git log no formato FORMATO_LOG (-z).
+
+    Com caminhos, usa --parents: os pais passam a ser os reescritos pela
+    simplificação do histórico (o commit exibido anterior que também
+    altera os caminhos), que é o que a paginação precisa para retomar.
+
+    Args:
+        ref: Revisão inicial (branch, tag, hash, intervalo "a..b") ou lista
+            de revisões (ex: ["abc123", "^main"])
+        desde: Apenas commits a partir desta data (qualquer formato do
+            --since) ou deste timestamp Unix
+        caminhos: Apenas commits que alteram estes caminhos
+        limite: Número máximo de commits
+
+    Returns:
+        Lista de argumentos para subprocess (a saída é lida por interpretar_log)
+    """
+    argumentos = ["git", "log", "-z", f"--format={FORMATO_LOG}"]
+    if caminhos:
+        argumentos.append("--parents")
+    if isinstance(desde, int):
+        argumentos.append(f"--max-age={desde}")
+    elif desde:
+        argumentos.append(f"--since={desde}")
+    if limite is not None:
+        argumentos += ["-n", str(limite)]
+    argumentos += ([ref] if isinstance(ref, str) else list(ref)) + ["--"]
+    if caminhos:
+        argumentos += caminhos
+    return argumentos
+
+
+def interpretar_log(campos: Iterator[bytes]) -> Iterator[dict]:
+    """
+    Agrupa os campos da saída de argumentos_log em commits.
+
+    Args:
+        campos: Campos terminados em NUL (ex: campos_nul sobre o stdout)
+
+    Yields:
+        Dicionários com hash, pais, autor, email, timestamp, data e mensagem
+    """
+    while True:
+        registro = list(islice(campos, len(CAMPOS_LOG)))
+        if len(registro) < len(CAMPOS_LOG):
+            return
+        commit = dict(zip(CAMPOS_LOG, (campo.decode("utf-8", errors="replace") for campo in registro)))
+        commit["pais"] = commit["pais"].split()
+        commit["timestamp"] = int(commit["timestamp"])
+        yield commit
+
+
+def _exclusoes(ref: str) -> List[str]:
+    """Revisões negativas de `ref` a manter ao retomar a caminhada."""
+    if "..." in ref:
+        raise ValueError(f"Intervalo simétrico não suporta paginação: {ref}")
+    if ".." in ref:
+        return [f"^{ref.split('..', 1)[0] or 'HEAD'}"]
+    return []
+
+
+def _revisoes_do_cursor(ref: str, apos: str, caminho: Optional[str]) -> List[str]:
+    """
+    Converte o cursor de paginação nas revisões onde o git log recomeça.
+
+    Raises:
+        ValueError: Se algum commit do cursor não existir no repositório
+    """
+    inicio = [parte for parte in apos.split(",") if parte]
+    if not inicio or executar_git("rev-list", "--no-walk", *inicio, "--", cwd=caminho).returncode != 0:
+        raise ValueError(f"Cursor de paginação não encontrado: {apos}")
+    return inicio + _exclusoes(ref)
+
+
+def iterar_log(
+    caminho: Optional[str] = None,
+    ref: str = "HEAD",
+    apos: Optional[str] = None,
+    desde: Union[str, int, None] = None,
+    caminhos: Optional[List[str]] = None,
+    limite: Optional[int] = None
+) -> Iterator[dict]:
+    """
+    Percorre o histórico em fluxo, com memória constante.
+
+    Os campos vêm separados por NUL (`git log -z`), então mensagens com
+    "|" ou qualquer outro caractere não quebram a interpretação. Ao parar
+    a iteração o processo do git é encerrado.
+
+    Args:
+        caminho: Diretório do repositório (padrão: diretório atual)
+        ref: Revisão inicial (branch, tag, hash, intervalo "a..b")
+        apos: Cursor da página anterior ("proximo" de obter_log_pagina):
+            a caminhada recomeça nesses commits, sem reler o início
+        desde: Apenas commits a partir desta data (formato do --since ou
+            timestamp Unix)
+        caminhos: Apenas commits que alteram estes caminhos
+        limite: Número máximo de commits
+
+    Yields:
+        Dicionários com hash, pais, autor, email, timestamp, data e mensagem
+
+    Raises:
+        ValueError: Se o cursor `apos` não puder ser resolvido
+        RuntimeError: Se o git log falhar
+    """
+    revisoes = ref if apos is None else _revisoes_do_cursor(ref, apos, caminho)
+    with FluxoGit(argumentos_log(revisoes, desde, caminhos, limite), cwd=caminho) as fluxo:
+        yield from interpretar_log(campos_nul(fluxo.stdout))
+        fluxo.concluir()
+
+
+def escrever_commit_graph(caminho: Optional[str] = None) -> bool:
+    """
+    Grava o commit-graph do repositório (com filtros de caminhos alterados).
+
+    Acelera o git log em históricos grandes, principalmente com filtros
+    de caminho. Pode ser repetido; o git só acrescenta o que falta.
+    """
+    resultado = executar_git("commit-graph", "write", "--reachable", "--changed-paths", cwd=caminho)
+    return resultado.returncode == 0
+
+
+def hash_da_ref(ref: str, caminho: Optional[str] = None) -> Optional[str]:
+    """
+    Resolve uma revisão para o hash do commit.
+
+    Tenta primeiro a leitura direta das refs (resolver_ref_local) e só
+    então chama git rev-parse, para expressões como "main~3".
+
+    Args:
+        ref: Branch, tag, hash ou expressão de revisão
+        caminho: Diretório do repositório (padrão: diretório atual)
+
+    Returns:
+        Hash do commit, ou None se a revisão não existir
+    """
+    objeto = resolver_ref_local(ref, caminho)
+    if objeto:
+        return objeto
+    resultado = executar_git("rev-parse", "--verify", "-q", f"{ref}^{{commit}}", cwd=caminho)
+    if resultado.returncode != 0:
+        return None
+    return resultado.stdout.strip() or None
+
+
+def _resolver_desde(desde: str, caminho: Optional[str]) -> int:
+    """Converte uma data do --since ("2 weeks ago", ISO...) em timestamp Unix."""
+    resultado = executar_git("rev-parse", f"--since={desde}", cwd=caminho)
+    saida = resultado.stdout.strip()
+    if resultado.returncode != 0 or not saida.startswith("--max-age="):
+        raise ValueError(f"Data inválida: {desde}")
+    return int(saida.split("=", 1)[1])
+
+
+def _fronteira(commits: List[dict], apos: Optional[str]) -> List[str]:
+    """Commits do cursor anterior e pais da página que ainda não foram exibidos."""
+    exibidos = {commit["hash"] for commit in commits}
+    pendentes = [parte for parte in (apos or "").split(",") if parte]
+    fronteira = []
+    for pai in pendentes + [pai for commit in commits for pai in commit["pais"]]:
+        if pai not in exibidos and pai not in fronteira:
+            fronteira.append(pai)
+    return fronteira
+
+
+def obter_log_pagina(
+    caminho: Optional[str] = None,
+    limite: int = 50,
+    ref: str = "HEAD",
+    apos: Optional[str] = None,
+    desde: Optional[str] = None,
+    caminhos: Optional[List[str]] = None,
+    usar_cache: bool = True,
+    commit_graph: bool = False
+) -> dict:
+    """
+    Retorna uma página do histórico, com cache por hash da revisão.
+
+    A chave do cache inclui o hash para o qual `ref` aponta, então um
+    novo commit (ou checkout) invalida automaticamente as páginas antigas.
+    Datas relativas em `desde` ("2 weeks ago") são convertidas em
+    timestamp antes de montar a chave, para a página não envelhecer no
+    cache.
+
+    O cursor `proximo` lista os commits onde a caminhada parou (os pais
+    ainda não exibidos da página e o que sobrou do cursor anterior), então
+    cada página custa o mesmo independentemente da profundidade, e ramos
+    paralelos de um merge não se perdem entre páginas.
+
+    Args:
+        caminho: Diretório do repositório (padrão: diretório atual)
+        limite: Commits por página
+        ref: Revisão inicial
+        apos: Cursor da página anterior (None para a primeira)
+        desde: Apenas commits a partir desta data
+        caminhos: Apenas commits que alteram estes caminhos
+        usar_cache: Se True, lê/grava a página no cache em disco
+        commit_graph: Se True, grava o commit-graph antes de consultar
+
+    Returns:
+        Dicionário com commits, proximo (valor de `apos` para a próxima
+        página ou None na última), do_cache e erro (inclusive cursor ou
+        data inválidos)
+    """
+    pagina = {"commits": [], "proximo": None, "do_cache": False, "erro": None}
+    try:
+        if commit_graph:
+            escrever_commit_graph(caminho)
+
+        inicio_desde = _resolver_desde(desde, caminho) if desde else None
+
+        arquivo_cache = None
+        if usar_cache and ".." not in ref:
+            # O cursor já é feito de hashes; só a primeira página depende da ref
+            inicio = apos or hash_da_ref(ref, caminho)
+            if inicio:
+                repositorio = localizar_git(caminho)
+                chave = json.dumps([
+                    repositorio["comum"] if repositorio else os.path.abspath(caminho or "."),
+                    inicio, limite, inicio_desde, caminhos
+                ])
+                arquivo_cache = diretorio_cache("git_log") / f"{chave_cache(chave)}.json"
+                salvo = carregar_json(arquivo_cache)
+                if salvo is not None:
+                    salvo["do_cache"] = True
+                    return salvo
+
+        # Um commit a mais indica se existe próxima página
+        commits = list(iterar_log(caminho, ref, apos, inicio_desde, caminhos, limite + 1))
+        pagina["commits"] = commits[:limite]
+        if len(commits) > limite:
+            pagina["proximo"] = ",".join(_fronteira(pagina["commits"], apos))
+
+        if arquivo_cache is not None:
+            salvar_json(arquivo_cache, pagina)
+    except (OSError, RuntimeError, ValueError) as e:
+        pagina["erro"] = str(e)
+    return pagina
+
+
+def obter_log(limite: int = 10, caminho: Optional[str] = None) -> List[dict]:
+    """Obtém o histórico de commits (ver iterar_log e obter_log_pagina)."""
+    try:
+        return list(iterar_log(caminho, limite=limite))
+    except (OSError, RuntimeError):
+        return []
+
+
+@contextmanager
+def _trava_exclusiva(caminho: Path):
+    """Trava de arquivo entre processos (espera até obtê-la)."""
+    with open(caminho, "a+b") as arquivo:
+        if sys.platform == "win32":
+            while True:
+                try:
+                    msvcrt.locking(arquivo.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        else:
+            fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if sys.platform == "win32":
+                arquivo.seek(0)
+                msvcrt.locking(arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(arquivo.fileno(), fcntl.LOCK_UN)
+
+
+def caminho_espelho(url: str) -> Path:
+    """Retorna o caminho do espelho bare de uma URL (dentro do cache)."""
+    return diretorio_cache("git_espelhos") / f"{chave_cache(url)}.git"
+
+
+def atualizar_espelho(url: str, max_idade: float = 0) -> dict:
+    """
+    Cria ou atualiza o espelho local (git clone --mirror) de um remoto.
+
+    Um espelho por URL, protegido por trava de arquivo: processos que
+    chegam durante uma atualização esperam e, com max_idade, reaproveitam
+    o resultado em vez de buscar de novo.
+
+    Args:
+        url: URL do remoto (https, ssh, file://, caminho local)
+        max_idade: Segundos em que um espelho recém-atualizado é considerado atual
+
+    Returns:
+        Dicionário com sucesso, espelho, atualizado (False se reaproveitado),
+        duracao e erro
+    """
+    espelho = caminho_espelho(url)
+    resultado = {"sucesso": False, "espelho": str(espelho), "atualizado": False, "duracao": 0.0, "erro": None}
+    inicio = time.monotonic()
+    try:
+        with _trava_exclusiva(espelho.with_suffix(".lock")):
+            marcador = espelho / MARCADOR_ESPELHO
+            if marcador.exists() and time.time() - marcador.stat().st_mtime < max_idade:
+                resultado["sucesso"] = True
+            else:
+                if (espelho / "HEAD").exists():
+                    saida = executar_git("fetch", "--prune", "--quiet", cwd=str(espelho))
+                else:
+                    # Clone interrompido deixa só o temporário, descartado aqui
+                    temporario = espelho.with_suffix(".tmp")
+                    shutil.rmtree(temporario, ignore_errors=True)
+                    saida = executar_git("clone", "--mirror", "--quiet", url, str(temporario))
+                    if saida.returncode == 0:
+                        os.replace(temporario, espelho)
+                if saida.returncode != 0:
+                    raise RuntimeError(saida.stderr.strip() or f"Falha ao atualizar o espelho de {url}")
+                marcador.touch()
+                resultado["atualizado"] = True
+                resultado["sucesso"] = True
+    except (OSError, RuntimeError) as e:
+        resultado["erro"] = str(e)
+    resultado["duracao"] = round(time.monotonic() - inicio, 3)
+    return resultado
+
+
+def clonar(
+    url: str,
+    destino: str,
+    branch: Optional[str] = None,
+    modo: str = "referencia",
+    max_idade: float = 0
+) -> dict:
+    """
+    Clona um repositório usando o espelho local como fonte de objetos.
+
+    Modos:
+        referencia: git clone --reference (objetos compartilhados via
+            alternates; o clone depende do espelho continuar existindo)
+        hardlink: clone local do espelho (objetos em hard links, sem
+            acesso à rede) com origin apontando de volta para a URL
+        independente: como referencia, mas copia os objetos usados
+            (--dissociate), sem depender do espelho depois
+
+    Args:
+        url: URL do remoto
+        destino: Diretório do novo clone
+        branch: Branch a fazer checkout (padrão: HEAD do remoto)
+        modo: "referencia", "hardlink" ou "independente"
+        max_idade: Segundos em que o espelho não precisa ser atualizado de novo
+
+    Returns:
+        Dicionário com sucesso, destino, espelho, duracao e erro
+    """
+    if modo not in ("referencia", "hardlink", "independente"):
+        raise ValueError(f"Modo de clone desconhecido: {modo}")
+
+    inicio = time.monotonic()
+    espelho = atualizar_espelho(url, max_idade)
+    resultado = {
+        "sucesso": False,
+        "destino": destino,
+        "espelho": espelho["espelho"],
+        "duracao": 0.0,
+        "erro": espelho["erro"]
+    }
+    if espelho["sucesso"]:
+        opcoes = ["--branch", branch] if branch else []
+        if modo == "hardlink":
+            saida = executar_git("clone", "--local", "--quiet", *opcoes, espelho["espelho"], destino)
+            if saida.returncode == 0:
+                saida = executar_git("remote", "set-url", "origin", url, cwd=destino)
+        else:
+            if modo == "independente":
+                opcoes.append("--dissociate")
+            saida = executar_git("clone", "--quiet", "--reference", espelho["espelho"], *opcoes, url, destino)
+        if saida.returncode == 0:
+            resultado["sucesso"] = True
+        else:
+            resultado["erro"] = saida.stderr.strip() or f"git clone {url} falhou"
+    resultado["duracao"] = round(time.monotonic() - inicio, 3)
+    return resultado
+
+
+def buscar(caminho: Optional[str] = None, remoto: str = "origin", max_idade: float = 0) -> dict:
+    """
+    Atualiza um clone a partir do espelho local do seu remoto.
+
+    O espelho busca na rede (uma vez para todos os clones da mesma URL)
+    e o clone copia localmente os refs do espelho para refs/remotes/<remoto>
+    e refs/tags, como um git fetch do remoto faria.
+
+    Args:
+        caminho: Diretório do clone (padrão: diretório atual)
+        remoto: Nome do remoto cuja URL identifica o espelho
+        max_idade: Segundos em que o espelho não precisa ser atualizado de novo
+
+    Returns:
+        Dicionário com sucesso, espelho, duracao e erro
+    """
+    inicio = time.monotonic()
+    resultado = {"sucesso": False, "espelho": None, "duracao": 0.0, "erro": None}
+    url = executar_git("remote", "get-url", remoto, cwd=caminho)
+    if url.returncode != 0:
+        resultado["erro"] = url.stderr.strip()
+        return resultado
+
+    espelho = atualizar_espelho(url.stdout.strip(), max_idade)
+    resultado["espelho"] = espelho["espelho"]
+    if not espelho["sucesso"]:
+        resultado["erro"] = espelho["erro"]
+    else:
+        saida = executar_git(
+            "fetch", "--quiet", "--prune", espelho["espelho"],
+            # --tags em vez de refspec: --prune não apaga tags locais
+            "--tags", f"+refs/heads/*:refs/remotes/{remoto}/*",
+            cwd=caminho
+        )
+        resultado["sucesso"] = saida.returncode == 0
+        if not resultado["sucesso"]:
+            resultado["erro"] = saida.stderr.strip()
+    resultado["duracao"] = round(time.monotonic() - inicio, 3)
+    return resultado
@@ -0,0 +1,216 @@
+"""
+Módulo de operações Git em vários repositórios para automação DevOps.
+Autor: Patrick
+Data: Dezembro 2025
+
+Contém funções para descobrir repositórios sob um diretório raiz e
+executar status/fetch/pull/log em todos eles com concorrência limitada.
+"""
+
+import os
+import sys
+import time
+import asyncio
+from typing import Callable, Dict, List, Tuple
+
+from .logger import configurar_logger, log_operacao
+from .sistema import matar_grupo
+from .git_utils import (
+    argumentos_status, interpretar_status, agregar_status, argumentos_log, interpretar_log
+)
+
+# Logger do módulo
+logger = configurar_logger("git_workspace")
+
+
+def _repositorio_bare(caminho: str) -> bool:
+    """Reconhece um repositório bare pela estrutura (HEAD, objects/ e refs/)."""
+    return (
+        os.path.isfile(os.path.join(caminho, "HEAD"))
+        and os.path.isdir(os.path.join(caminho, "objects"))
+        and os.path.isdir(os.path.join(caminho, "refs"))
+    )
+
+
+def descobrir_repositorios(raiz: str, profundidade_max: int = 4) -> List[str]:
+    """
+    Procura repositórios Git sob um diretório raiz.
+
+    Reconhece clones (diretórios com .git) e repositórios bare (ex: os
+    remotos locais usados em testes). Não desce dentro de repositórios
+    encontrados nem em diretórios ocultos. Operações que precisam de
+    working tree (status, pull) falham nos bare, isoladas por repositório.
+
+    Args:
+        raiz: Diretório onde procurar
+        profundidade_max: Níveis abaixo da raiz a examinar
+
+    Returns:
+        Lista ordenada de caminhos absolutos dos repositórios
+    """
+    repositorios = []
+    pilha = [(os.path.abspath(raiz), 0)]
+    while pilha:
+        caminho, profundidade = pilha.pop()
+        if os.path.exists(os.path.join(caminho, ".git")) or _repositorio_bare(caminho):
+            repositorios.append(caminho)
+            continue
+        if profundidade >= profundidade_max:
+            continue
+        try:
+            with os.scandir(caminho) as entradas:
+                for entrada in entradas:
+                    if not entrada.name.startswith(".") and entrada.is_dir(follow_symlinks=False):
+                        pilha.append((entrada.path, profundidade + 1))
+        except OSError as e:
+            logger.warning(f"Não foi possível ler {caminho}: {e}")
+    return sorted(repositorios)
+
+
+def _interpretar_log_bytes(saida: bytes, opcoes: dict) -> dict:
+    """Reaproveita o parser de iterar_log sobre a saída completa."""
+    return {"commits": list(interpretar_log(iter(saida.split(b"\0"))))}
+
+
+def _interpretar_status_bytes(saida: bytes, opcoes: dict) -> dict:
+    """Reaproveita o parser de obter_status sobre a saída completa."""
+    return agregar_status(interpretar_status(iter(saida.split(b"\0"))))
+
+
+# Operações disponíveis: nome -> (argumentos(opcoes), interpretar(stdout, opcoes))
+OPERACOES_GIT: Dict[str, Tuple[Callable[[dict], List[str]], Callable[[bytes, dict], dict]]] = {
+    "status": (
+        lambda opcoes: argumentos_status(nao_rastreados=opcoes.get("nao_rastreados", True)),
+        _interpretar_status_bytes
+    ),
+    "fetch": (
+        lambda opcoes: ["git", "fetch", "--all", "--prune", "--quiet"],
+        lambda saida, opcoes: {}
+    ),
+    "pull": (
+        lambda opcoes: ["git", "pull", "--ff-only", "--quiet"],
+        lambda saida, opcoes: {}
+    ),
+    "log": (
+        lambda opcoes: argumentos_log(limite=opcoes.get("limite", 5)),
+        _interpretar_log_bytes
+    ),
+}
+
+
+async def _executar_no_repositorio(
+    repositorio: str,
+    operacao: str,
+    opcoes: dict,
+    timeout: float,
+    semaforo: asyncio.Semaphore
+) -> dict:
+    """Executa a operação em um repositório respeitando o semáforo."""
+    montar, interpretar = OPERACOES_GIT[operacao]
+    async with semaforo:
+        inicio = time.monotonic()
+        resultado = {"sucesso": False, "erro": None, "duracao": 0.0}
+        # Sem prompts de credenciais: um repositório não pode travar o lote
+        env = dict(os.environ, GIT_TERMINAL_PROMPT="0", GIT_SSH_COMMAND="ssh -o BatchMode=yes")
+        opcoes_processo = (
+            {} if sys.platform == "win32" else {"start_new_session": True}
+        )
+        try:
+            processo = await asyncio.create_subprocess_exec(
+                *montar(opcoes),
+                cwd=repositorio,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+                **opcoes_processo
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(processo.communicate(), timeout)
+            except asyncio.TimeoutError:
+                matar_grupo(processo)
+                await processo.wait()
+                resultado["erro"] = "Timeout"
+            else:
+                resultado["codigo_retorno"] = processo.returncode
+                if processo.returncode == 0:
+                    resultado.update(interpretar(stdout, opcoes))
+                    resultado["sucesso"] = True
+                else:
+                    resultado["erro"] = stderr.decode("utf-8", errors="replace").strip()
+        except Exception as e:
+            resultado["erro"] = str(e)
+        resultado["duracao"] = round(time.monotonic() - inicio, 3)
+        return resultado
+
+
+async def executar_em_repositorios_async(
+    repositorios: List[str],
+    operacao: str,
+    concorrencia: int = 10,
+    timeout: float = 60,
+    **opcoes
+) -> Dict[str, dict]:
+    """Versão assíncrona de executar_em_repositorios (retorna só os resultados)."""
+    semaforo = asyncio.Semaphore(max(1, concorrencia))
+    respostas = await asyncio.gather(*(
+        _executar_no_repositorio(repositorio, operacao, opcoes, timeout, semaforo)
+        for repositorio in repositorios
+    ))
+    return dict(zip(repositorios, respostas))
+
+
+def executar_em_repositorios(
+    repositorios: List[str],
+    operacao: str,
+    concorrencia: int = 10,
+    timeout: float = 60,
+    **opcoes
+) -> dict:
+    """
+    Executa uma operação Git em vários repositórios em paralelo.
+
+    Cada repositório roda em um subprocesso assíncrono; no máximo
+    `concorrencia` rodam ao mesmo tempo e cada um tem seu próprio timeout
+    (o grupo de processos é encerrado ao estourar).
+
+    Args:
+        repositorios: Caminhos dos repositórios (ver descobrir_repositorios)
+        operacao: Nome em OPERACOES_GIT ("status", "fetch", "pull", "log")
+        concorrencia: Número máximo de repositórios processados ao mesmo tempo
+        timeout: Tempo máximo por repositório em segundos
+        **opcoes: Opções da operação (ex: limite=10 para log,
+            nao_rastreados=False para status)
+
+    Returns:
+        Dicionário com totais e o resultado de cada repositório
+    """
+    if operacao not in OPERACOES_GIT:
+        raise ValueError(f"Operação desconhecida: {operacao} (use {', '.join(OPERACOES_GIT)})")
+
+    inicio = time.monotonic()
+    resultados = asyncio.run(
+        executar_em_repositorios_async(repositorios, operacao, concorrencia, timeout, **opcoes)
+    )
+    sucessos = sum(1 for r in resultados.values() if r["sucesso"])
+
+    resumo = {
+        "sucesso": sucessos == len(repositorios),
+        "operacao": operacao,
+        "total": len(repositorios),
+        "sucessos": sucessos,
+        "falhas": len(repositorios) - sucessos,
+        "duracao": round(time.monotonic() - inicio, 3),
+        "resultados": resultados
+    }
+    if operacao == "status":
+        resumo["sujos"] = sorted(
+            repositorio for repositorio, r in resultados.items()
+            if r["sucesso"] and not r["limpo"]
+        )
+    log_operacao(
+        logger, f"GIT_{operacao.upper()}",
+        sucesso=resumo["sucesso"],
+        detalhes=f"{sucessos}/{len(repositorios)} repositórios OK em {resumo['duracao']}s"
+    )
+    return resumo
@@ -0,0 +1,269 @@
+"""
+Módulo de índice persistente de arquivos para automação DevOps.
+Autor: Patrick
+Data: Dezembro 2025
+
+Contém funções para manter um índice SQLite (caminho, tamanho, mtime,
+extensão) de uma árvore de diretórios e consultá-lo sem nova varredura.
+"""
+
+import os
+import time
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .logger import configurar_logger, log_operacao
+from .cache import diretorio_cache, chave_cache
+from .projeto import varrer_diretorio, converter_timestamp
+
+# Logger do módulo
+logger = configurar_logger("indice")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS diretorios (
+    caminho TEXT PRIMARY KEY,
+    pai TEXT,
+    mtime_ns INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_diretorios_pai ON diretorios(pai);
+CREATE TABLE IF NOT EXISTS arquivos (
+    caminho TEXT PRIMARY KEY,
+    diretorio TEXT NOT NULL,
+    nome TEXT NOT NULL,
+    extensao TEXT NOT NULL,
+    tamanho INTEGER NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_arquivos_diretorio ON arquivos(diretorio);
+CREATE INDEX IF NOT EXISTS idx_arquivos_extensao ON arquivos(extensao, tamanho);
+CREATE INDEX IF NOT EXISTS idx_arquivos_tamanho ON arquivos(tamanho);
+CREATE INDEX IF NOT EXISTS idx_arquivos_mtime ON arquivos(mtime);
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
+
+
+# Critérios de listar_arquivos_ordenados -> ORDER BY (usam os índices da tabela)
+ORDENACAO_SQL = {
+    "tamanho": "tamanho DESC",
+    "modificado": "mtime DESC",
+    "nome": "nome",
+}
+
+
+def caminho_indice(diretorio: str) -> Path:
+    """Retorna o caminho padrão do índice de um diretório (dentro do cache)."""
+    return diretorio_cache("indices") / f"{chave_cache(os.path.abspath(diretorio))}.db"
+
+
+def _conectar(banco: Union[str, Path]) -> sqlite3.Connection:
+    """Abre o banco do índice garantindo o esquema."""
+    conexao = sqlite3.connect(str(banco))
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.execute("PRAGMA synchronous=NORMAL")
+    conexao.executescript(ESQUEMA)
+    return conexao
+
+
+def atualizar_indice(
+    diretorio: str,
+    banco: Optional[str] = None,
+    completo: bool = False
+) -> dict:
+    """
+    Cria ou atualiza incrementalmente o índice de uma árvore.
+
+    Só diretórios cujo mtime mudou desde a última atualização são relidos
+    (scandir + stat dos arquivos); os demais custam um único stat. Como o
+    mtime do diretório não muda quando apenas o conteúdo de um arquivo
+    existente é alterado, use completo=True para reler tudo.
+
+    Args:
+        diretorio: Diretório raiz a indexar
+        banco: Arquivo SQLite do índice (padrão: dentro do cache)
+        completo: Se True, relê todos os diretórios
+
+    Returns:
+        Dicionário com estatísticas da atualização
+    """
+    resultado = {
+        "sucesso": False,
+        "diretorio": diretorio,
+        "indice": None,
+        "diretorios": 0,
+        "diretorios_relidos": 0,
+        "diretorios_removidos": 0,
+        "arquivos": 0,
+        "duracao": 0.0,
+        "erro": None
+    }
+    inicio = time.monotonic()
+
+    try:
+        raiz = os.path.abspath(diretorio)
+        if not os.path.isdir(raiz):
+            raise NotADirectoryError(f"Diretório não encontrado: {diretorio}")
+
+        banco = Path(banco) if banco else caminho_indice(raiz)
+        resultado["indice"] = str(banco)
+        conexao = _conectar(banco)
+        try:
+            with conexao:
+                conexao.execute(
+                    "INSERT OR REPLACE INTO meta (chave, valor) VALUES ('raiz', ?)", (raiz,)
+                )
+                conhecidos = dict(conexao.execute("SELECT caminho, mtime_ns FROM diretorios"))
+                vistos = set()
+                pilha = [raiz]
+
+                while pilha:
+                    caminho = pilha.pop()
+                    try:
+                        mtime = os.stat(caminho).st_mtime_ns
+                    except OSError:
+                        continue
+                    vistos.add(caminho)
+
+                    if not completo and conhecidos.get(caminho) == mtime:
+                        pilha.extend(
+                            linha[0] for linha in conexao.execute(
+                                "SELECT caminho FROM diretorios WHERE pai = ?", (caminho,)
+                            )
+                        )
+                        continue
+
+                    arquivos, subdiretorios = varrer_diretorio(caminho)
+                    conexao.execute("DELETE FROM arquivos WHERE diretorio = ?", (caminho,))
+                    conexao.executemany(
+                        "INSERT OR REPLACE INTO arquivos "
+                        "(caminho, diretorio, nome, extensao, tamanho, mtime) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            (
+                                arquivo,
+                                caminho,
+                                os.path.basename(arquivo),
+                                os.path.splitext(arquivo)[1],
+                                stat.st_size,
+                                stat.st_mtime
+                            )
+                            for arquivo, stat in arquivos
+                        )
+                    )
+                    conexao.execute(
+                        "INSERT OR REPLACE INTO diretorios (caminho, pai, mtime_ns) VALUES (?, ?, ?)",
+                        (caminho, os.path.dirname(caminho) if caminho != raiz else None, mtime)
+                    )
+                    resultado["diretorios_relidos"] += 1
+                    pilha.extend(subdiretorios)
+
+                # Diretórios que sumiram desde a última atualização
+                removidos = [(caminho,) for caminho in conhecidos if caminho not in vistos]
+                conexao.executemany("DELETE FROM arquivos WHERE diretorio = ?", removidos)
+                conexao.executemany("DELETE FROM diretorios WHERE caminho = ?", removidos)
+
+                resultado["diretorios_removidos"] = len(removidos)
+                resultado["diretorios"] = len(vistos)
+                resultado["arquivos"] = conexao.execute("SELECT COUNT(*) FROM arquivos").fetchone()[0]
+        finally:
+            conexao.close()
+
+        resultado["sucesso"] = True
+        resultado["duracao"] = round(time.monotonic() - inicio, 3)
+        log_operacao(
+            logger, "INDEXAR",
+            sucesso=True,
+            detalhes=f"{resultado['arquivos']} arquivos, "
+                     f"{resultado['diretorios_relidos']}/{resultado['diretorios']} diretórios relidos "
+                     f"em {resultado['duracao']}s"
+        )
+
+    except Exception as e:
+        resultado["erro"] = str(e)
+        log_operacao(logger, "INDEXAR", sucesso=False, detalhes=str(e))
+
+    return resultado
+
+
+def consultar_indice(
+    diretorio: str,
+    banco: Optional[str] = None,
+    extensao: Optional[str] = None,
+    tamanho_min: Optional[int] = None,
+    tamanho_max: Optional[int] = None,
+    modificado_desde: Union[None, float, str, datetime] = None,
+    padrao: Optional[str] = None,
+    limite: Optional[int] = None,
+    ordenar: Optional[str] = None
+) -> List[dict]:
+    """
+    Consulta o índice sem percorrer o sistema de arquivos.
+
+    Args:
+        diretorio: Diretório raiz indexado (localiza o índice padrão)
+        banco: Arquivo SQLite do índice (sobrepõe o padrão)
+        extensao: Filtrar por extensão (ex: '.py')
+        tamanho_min: Tamanho mínimo em bytes
+        tamanho_max: Tamanho máximo em bytes
+        modificado_desde: Data mínima de modificação (datetime, ISO ou timestamp)
+        padrao: Padrão glob aplicado ao nome do arquivo (ex: 'test_*.py')
+        limite: Número máximo de resultados
+        ordenar: 'tamanho', 'modificado' (maiores/mais recentes primeiro),
+            'nome' ou None, como em listar_arquivos_ordenados
+
+    Returns:
+        Lista de arquivos no mesmo formato de gerenciar_arquivos
+    """
+    if ordenar is not None and ordenar not in ORDENACAO_SQL:
+        raise ValueError(f"Critério de ordenação inválido: {ordenar}")
+    banco = Path(banco) if banco else caminho_indice(diretorio)
+    if not banco.exists():
+        logger.error(f"Índice não encontrado: {banco} (execute atualizar_indice antes)")
+        return []
+
+    condicoes = []
+    parametros = []
+    if extensao is not None:
+        condicoes.append("extensao = ?")
+        parametros.append(extensao)
+    if tamanho_min is not None:
+        condicoes.append("tamanho >= ?")
+        parametros.append(tamanho_min)
+    if tamanho_max is not None:
+        condicoes.append("tamanho <= ?")
+        parametros.append(tamanho_max)
+    if modificado_desde is not None:
+        condicoes.append("mtime >= ?")
+        parametros.append(converter_timestamp(modificado_desde))
+    if padrao is not None:
+        condicoes.append("nome GLOB ?")
+        parametros.append(padrao)
+
+    sql = "SELECT nome, caminho, tamanho, mtime FROM arquivos"
+    if condicoes:
+        sql += " WHERE " + " AND ".join(condicoes)
+    if ordenar is not None:
+        sql += f" ORDER BY {ORDENACAO_SQL[ordenar]}"
+    if limite is not None:
+        sql += " LIMIT ?"
+        parametros.append(limite)
+
+    conexao = _conectar(banco)
+    try:
+        linhas = conexao.execute(sql, parametros).fetchall()
+    finally:
+        conexao.close()
+
+    return [
+        {
+            "nome": nome,
+            "caminho": caminho,
+            "tamanho": tamanho,
+            "modificado": datetime.fromtimestamp(mtime).isoformat()
+        }
+        for nome, caminho, tamanho, mtime in linhas
+    ]
@@ -0,0 +1,280 @@
+"""
+Módulo de monitoramento de integridade de arquivos para automação DevOps.
+Autor: Patrick
+Data: Dezembro 2025
+
+Contém funções para gravar uma linha de base com o hash de cada arquivo
+de uma árvore (ex: /etc, diretórios de deploy) e detectar alterações
+inesperadas, no estilo do tripwire.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+from .logger import configurar_logger, log_operacao
+from .cache import diretorio_cache, chave_cache, carregar_json, salvar_json
+from .projeto import iterar_entradas, calcular_hash_arquivo
+
+# Logger do módulo
+logger = configurar_logger("integridade")
+
+VERSAO_LINHA_BASE = 1
+
+# Posições de cada entrada: [hash da linha de base, último hash visto,
+# tamanho, mtime_ns, inode, ctime_ns]
+BASE, HASH, ASSINATURA = 0, 1, slice(2, 6)
+
+
+def caminho_linha_base(diretorio: str) -> Path:
+    """Retorna o caminho padrão da linha de base de um diretório (dentro do cache)."""
+    return diretorio_cache("integridade") / f"{chave_cache(os.path.abspath(diretorio))}.json"
+
+
+def _assinatura(stat: os.stat_result) -> list:
+    """Campos do stat que, inalterados, dispensam recalcular o hash."""
+    # ctime não pode ser ajustado pelo usuário (touch -d só altera mtime)
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino, stat.st_ctime_ns]
+
+
+def _hashear(caminho: str, algoritmo: str) -> Tuple[Optional[str], Optional[str]]:
+    """Calcula o hash retornando (hash, erro) sem propagar exceções."""
+    try:
+        return calcular_hash_arquivo(caminho, algoritmo), None
+    except OSError as e:
+        return None, str(e)
+
+
+def _varrer_arvore(
+    raiz: str,
+    anteriores: dict,
+    algoritmo: str,
+    completo: bool,
+    excluir: Optional[Iterable[str]],
+    trabalhadores: int
+) -> Tuple[dict, dict, int]:
+    """
+    Lê a árvore e obtém o hash de cada arquivo.
+
+    Arquivos cuja assinatura (tamanho, mtime, inode, ctime) é igual à da
+    entrada anterior reaproveitam o hash sem abrir o arquivo; os demais
+    são recalculados em paralelo.
+
+    Returns:
+        Tupla (atuais {caminho: [hash, tamanho, mtime_ns, inode, ctime_ns]},
+        erros {caminho: mensagem}, quantidade de hashes recalculados)
+    """
+    atuais = {}
+    pendentes = []
+    for caminho, stat in iterar_entradas(raiz, excluir=excluir):
+        relativo = os.path.relpath(caminho, raiz).replace(os.sep, "/")
+        assinatura = _assinatura(stat)
+        anterior = anteriores.get(relativo)
+        if not completo and anterior and anterior[HASH] and anterior[ASSINATURA] == assinatura:
+            atuais[relativo] = [anterior[HASH]] + assinatura
+        else:
+            atuais[relativo] = [None] + assinatura
+            pendentes.append(relativo)
+
+    erros = {}
+    with ThreadPoolExecutor(max_workers=max(1, trabalhadores)) as executor:
+        hashes = executor.map(
+            lambda relativo: _hashear(os.path.join(raiz, relativo), algoritmo), pendentes
+        )
+        for relativo, (digest, erro) in zip(pendentes, hashes):
+            if erro:
+                erros[relativo] = erro
+                del atuais[relativo]
+            else:
+                atuais[relativo][0] = digest
+
+    return atuais, erros, len(pendentes)
+
+
+def criar_linha_base(
+    diretorio: str,
+    arquivo: Optional[str] = None,
+    excluir: Optional[Iterable[str]] = None,
+    algoritmo: str = "sha256",
+    trabalhadores: int = 8,
+    completo: bool = False
+) -> dict:
+    """
+    Grava (ou aceita novamente) a linha de base de integridade de uma árvore.
+
+    Se já existir uma linha de base, arquivos com stat inalterado
+    reaproveitam o hash anterior; use completo=True para recalcular tudo.
+
+    Args:
+        diretorio: Diretório monitorado
+        arquivo: Arquivo JSON da linha de base (padrão: dentro do cache)
+        excluir: Padrões glob de nomes a ignorar
+        algoritmo: Algoritmo de hash do hashlib
+        trabalhadores: Número de threads de hash
+        completo: Se True, recalcula o hash de todos os arquivos
+
+    Returns:
+        Dicionário com o resultado da operação
+    """
+    resultado = {
+        "sucesso": False,
+        "diretorio": diretorio,
+        "linha_base": None,
+        "arquivos": 0,
+        "recalculados": 0,
+        "erros": {},
+        "duracao": 0.0,
+        "erro": None
+    }
+    inicio = time.monotonic()
+
+    try:
+        raiz = os.path.abspath(diretorio)
+        if not os.path.isdir(raiz):
+            raise NotADirectoryError(f"Diretório não encontrado: {diretorio}")
+
+        destino = Path(arquivo) if arquivo else caminho_linha_base(raiz)
+        resultado["linha_base"] = str(destino)
+        dados = carregar_json(destino, {})
+        anteriores = dados.get("arquivos", {}) if dados.get("algoritmo") == algoritmo else {}
+
+        atuais, erros, recalculados = _varrer_arvore(
+            raiz, anteriores, algoritmo, completo, excluir, trabalhadores
+        )
+        salvar_json(destino, {
+            "versao": VERSAO_LINHA_BASE,
+            "raiz": raiz,
+            "algoritmo": algoritmo,
+            "criado": datetime.now().isoformat(),
+            "arquivos": {relativo: [entrada[0]] + entrada for relativo, entrada in atuais.items()}
+        })
+
+        resultado["arquivos"] = len(atuais)
+        resultado["recalculados"] = recalculados
+        resultado["erros"] = erros
+        resultado["sucesso"] = True
+        resultado["duracao"] = round(time.monotonic() - inicio, 3)
+        log_operacao(
+            logger, "LINHA_BASE",
+            sucesso=True,
+            detalhes=f"{len(atuais)} arquivos ({recalculados} hashes calculados) "
+                     f"em {resultado['duracao']}s"
+        )
+
+    except Exception as e:
+        resultado["erro"] = str(e)
+        log_operacao(logger, "LINHA_BASE", sucesso=False, detalhes=str(e))
+
+    return resultado
+
+
+def verificar_integridade(
+    diretorio: str,
+    arquivo: Optional[str] = None,
+    excluir: Optional[Iterable[str]] = None,
+    trabalhadores: int = 8,
+    completo: bool = False
+) -> dict:
+    """
+    Compara a árvore atual com a linha de base.
+
+    Arquivos com stat inalterado desde a última verificação são
+    confirmados sem leitura; os demais têm o hash recalculado em paralelo.
+    O último estado visto é gravado na linha de base (sem alterar os
+    hashes de referência), então alterações continuam sendo reportadas
+    até que uma nova linha de base seja aceita com criar_linha_base.
+
+    Args:
+        diretorio: Diretório monitorado
+        arquivo: Arquivo JSON da linha de base (padrão: dentro do cache)
+        excluir: Padrões glob de nomes a ignorar (use os mesmos da linha de base)
+        trabalhadores: Número de threads de hash
+        completo: Se True, recalcula o hash de todos os arquivos
+
+    Returns:
+        Dicionário com adicionados, removidos e modificados e o indicador
+        "alterado" (True se houver qualquer diferença)
+    """
+    resultado = {
+        "sucesso": False,
+        "diretorio": diretorio,
+        "linha_base": None,
+        "alterado": False,
+        "adicionados": [],
+        "removidos": [],
+        "modificados": [],
+        "verificados": 0,
+        "recalculados": 0,
+        "erros": {},
+        "duracao": 0.0,
+        "erro": None
+    }
+    inicio = time.monotonic()
+
+    try:
+        raiz = os.path.abspath(diretorio)
+        if not os.path.isdir(raiz):
+            raise NotADirectoryError(f"Diretório não encontrado: {diretorio}")
+
+        origem = Path(arquivo) if arquivo else caminho_linha_base(raiz)
+        resultado["linha_base"] = str(origem)
+        dados = carregar_json(origem)
+        if not dados or dados.get("versao") != VERSAO_LINHA_BASE:
+            raise FileNotFoundError(f"Linha de base não encontrada ou inválida: {origem}")
+
+        anteriores = dados["arquivos"]
+        atuais, erros, recalculados = _varrer_arvore(
+            raiz, anteriores, dados["algoritmo"], completo, excluir, trabalhadores
+        )
+
+        entradas = {}
+        for relativo, entrada in atuais.items():
+            referencia = anteriores.get(relativo, [None])[BASE]
+            if referencia is None:
+                resultado["adicionados"].append(relativo)
+            elif referencia != entrada[0]:
+                resultado["modificados"].append(relativo)
+            entradas[relativo] = [referencia] + entrada
+
+        for relativo, entrada in anteriores.items():
+            if relativo in erros:
+                # Ilegível agora: preservar a referência para a próxima verificação
+                entradas[relativo] = entrada
+                continue
+            if relativo in atuais:
+                continue
+            if entrada[BASE] is not None:
+                resultado["removidos"].append(relativo)
+                # Mantido para continuar reportando até nova linha de base
+                entradas[relativo] = [entrada[BASE], None, 0, 0, 0, 0]
+
+        dados["arquivos"] = entradas
+        dados["verificado"] = datetime.now().isoformat()
+        salvar_json(origem, dados)
+
+        for chave in ("adicionados", "removidos", "modificados"):
+            resultado[chave].sort()
+        resultado["alterado"] = bool(
+            resultado["adicionados"] or resultado["removidos"] or resultado["modificados"]
+        )
+        resultado["verificados"] = len(atuais)
+        resultado["recalculados"] = recalculados
+        resultado["erros"] = erros
+        resultado["sucesso"] = True
+        resultado["duracao"] = round(time.monotonic() - inicio, 3)
+        log_operacao(
+            logger, "INTEGRIDADE",
+            sucesso=not resultado["alterado"],
+            detalhes=f"{raiz}: +{len(resultado['adicionados'])} -{len(resultado['removidos'])} "
+                     f"~{len(resultado['modificados'])} ({len(atuais)} verificados, "
+                     f"{recalculados} hashes calculados em {resultado['duracao']}s)"
+        )
+
+    except Exception as e:
+        resultado["erro"] = str(e)
+        log_operacao(logger, "INTEGRIDADE", sucesso=False, detalhes=str(e))
+
+    return resultado
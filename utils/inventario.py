@@ -0,0 +1,207 @@
+"""
+Módulo de inventário e execução distribuída para automação DevOps.
+Autor: Patrick
+Data: Dezembro 2025
+
+Contém funções para carregar um inventário de hosts e executar um
+comando em todos eles em paralelo, com transportes plugáveis.
+"""
+
+import json
+import time
+import shlex
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .logger import configurar_logger, log_operacao
+from .sistema import executar_comando
+
+# Logger do módulo
+logger = configurar_logger("inventario")
+
+
+def _validar_hosts(hosts: List[dict]) -> List[dict]:
+    """Garante nomes únicos (os resultados de executar_em_hosts são indexados por host)."""
+    vistos = set()
+    for item in hosts:
+        if item["host"] in vistos:
+            raise ValueError(f"Host duplicado no inventário: {item['host']}")
+        vistos.add(item["host"])
+    return hosts
+
+
+def _dividir_linha(linha: str) -> List[str]:
+    """
+    Divide uma linha do inventário como o shell.
+
+    "#" só inicia um comentário no começo de um campo (início da linha ou
+    depois de espaço), então valores como "rotulo=a#b" ficam inteiros.
+    """
+    lexer = shlex.shlex(linha, posix=True)
+    lexer.whitespace_split = True
+    lexer.commenters = ""
+    partes = []
+    for parte in lexer:
+        if parte.startswith("#"):
+            break
+        partes.append(parte)
+    return partes
+
+
+def carregar_inventario(arquivo: str) -> List[dict]:
+    """
+    Carrega um inventário de hosts.
+
+    Aceita JSON (lista de objetos com pelo menos "host") ou texto com um
+    host por linha seguido de pares chave=valor opcionais:
+
+        web01 usuario=deploy porta=2222
+        web02 transporte=local
+        # comentários e linhas vazias são ignorados
+
+    Args:
+        arquivo: Caminho do arquivo de inventário
+
+    Returns:
+        Lista de hosts (dicionários com "host" e atributos opcionais)
+
+    Raises:
+        ValueError: Se houver entrada inválida, JSON que não seja uma lista
+            de objetos ou host repetido
+    """
+    path = Path(arquivo)
+    if not path.exists():
+        raise FileNotFoundError(f"Inventário não encontrado: {arquivo}")
+
+    conteudo = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        hosts = json.loads(conteudo)
+        if not isinstance(hosts, list):
+            raise ValueError(f"Inventário JSON deve ser uma lista de hosts: {arquivo}")
+        for item in hosts:
+            if not isinstance(item, dict) or "host" not in item:
+                raise ValueError(f"Entrada de inventário sem 'host': {item}")
+        return _validar_hosts(hosts)
+
+    hosts = []
+    for numero, linha in enumerate(conteudo.splitlines(), start=1):
+        partes = _dividir_linha(linha)
+        if not partes:
+            continue
+        host = {"host": partes[0]}
+        for par in partes[1:]:
+            if "=" not in par:
+                raise ValueError(f"Linha {numero}: atributo inválido '{par}' (use chave=valor)")
+            chave, valor = par.split("=", 1)
+            host[chave] = valor
+        hosts.append(host)
+    return _validar_hosts(hosts)
+
+
+def transporte_local(host: dict, comando: str, timeout: int) -> dict:
+    """Executa o comando localmente (útil para testes e para o próprio host)."""
+    return executar_comando(comando, timeout=timeout)
+
+
+def transporte_ssh(host: dict, comando: str, timeout: int) -> dict:
+    """Executa o comando remotamente usando o binário ssh do sistema."""
+    argumentos = [
+        "ssh",
+        "-o", "BatchMode=yes",
+        "-o", f"ConnectTimeout={min(int(timeout), 30)}",
+    ]
+    if host.get("porta"):
+        argumentos += ["-p", str(host["porta"])]
+    if host.get("usuario"):
+        argumentos += ["-l", host["usuario"]]
+    if host.get("chave"):
+        argumentos += ["-i", host["chave"]]
+    argumentos += [host.get("endereco", host["host"]), "--", comando]
+
+    try:
+        resultado = subprocess.run(
+            argumentos,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+        return {
+            "sucesso": resultado.returncode == 0,
+            "stdout": resultado.stdout.strip(),
+            "stderr": resultado.stderr.strip(),
+            "codigo_retorno": resultado.returncode
+        }
+    except subprocess.TimeoutExpired:
+        return {"sucesso": False, "erro": "Timeout"}
+    except Exception as e:
+        return {"sucesso": False, "erro": str(e)}
+
+
+# Transportes disponíveis: nome -> função(host, comando, timeout) -> dict
+TRANSPORTES: Dict[str, Callable[[dict, str, int], dict]] = {
+    "local": transporte_local,
+    "ssh": transporte_ssh,
+}
+
+
+def executar_em_hosts(
+    hosts: List[dict],
+    comando: str,
+    concorrencia: int = 10,
+    timeout: int = 60,
+    transporte: Optional[str] = None
+) -> dict:
+    """
+    Executa um comando em vários hosts com concorrência limitada.
+
+    Args:
+        hosts: Lista de hosts (ver carregar_inventario)
+        comando: Comando a ser executado em cada host
+        concorrencia: Número máximo de hosts processados ao mesmo tempo
+        timeout: Tempo máximo por host em segundos
+        transporte: Transporte padrão ("ssh" se omitido); cada host pode
+            sobrescrever com o atributo "transporte"
+
+    Returns:
+        Dicionário com totais e o resultado de cada host
+    """
+    _validar_hosts(hosts)
+    inicio = time.monotonic()
+
+    def executar(host: dict) -> dict:
+        nome_transporte = host.get("transporte", transporte or "ssh")
+        funcao = TRANSPORTES.get(nome_transporte)
+        if funcao is None:
+            return {"sucesso": False, "erro": f"Transporte desconhecido: {nome_transporte}"}
+        inicio_host = time.monotonic()
+        try:
+            resultado = funcao(host, comando, int(host.get("timeout", timeout)))
+        except Exception as e:
+            resultado = {"sucesso": False, "erro": str(e)}
+        resultado["duracao"] = round(time.monotonic() - inicio_host, 3)
+        return resultado
+
+    with ThreadPoolExecutor(max_workers=max(1, concorrencia)) as executor:
+        respostas = list(executor.map(executar, hosts))
+
+    resultados = {host["host"]: resposta for host, resposta in zip(hosts, respostas)}
+    sucessos = sum(1 for r in respostas if r.get("sucesso"))
+
+    resumo = {
+        "sucesso": sucessos == len(hosts),
+        "comando": comando,
+        "total": len(hosts),
+        "sucessos": sucessos,
+        "falhas": len(hosts) - sucessos,
+        "duracao": round(time.monotonic() - inicio, 3),
+        "resultados": resultados
+    }
+    log_operacao(
+        logger, "EXECUTAR_HOSTS",
+        sucesso=resumo["sucesso"],
+        detalhes=f"{sucessos}/{len(hosts)} hosts OK em {resumo['duracao']}s"
+    )
+    return resumo
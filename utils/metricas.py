@@ -0,0 +1,299 @@
+"""
+Módulo de métricas no formato Prometheus para automação DevOps.
+Autor: Patrick
+Data: Dezembro 2025
+
+Contém o registro de métricas internas (comandos, backups, recursos) e
+um servidor HTTP que expõe /metrics no formato texto do Prometheus.
+"""
+
+import os
+import sys
+import time
+import shutil
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from .logger import configurar_logger
+
+# Logger do módulo
+logger = configurar_logger("metricas")
+
+TIPO_CONTEUDO = "text/plain; version=0.0.4; charset=utf-8"
+
+BUCKETS_COMANDO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# nome -> (tipo, descrição, buckets)
+METRICAS = {
+    "devops_comando_duracao_segundos": (
+        "histogram", "Duração dos comandos executados por executar_comando", BUCKETS_COMANDO
+    ),
+    "devops_comando_falhas_total": (
+        "counter", "Comandos que terminaram com erro ou timeout", None
+    ),
+    "devops_backups_total": ("counter", "Backups realizados por resultado", None),
+    "devops_backup_bytes_total": ("counter", "Bytes copiados por backups", None),
+    "devops_backup_duracao_segundos": ("gauge", "Duração do último backup", None),
+    "devops_backup_bytes": ("gauge", "Tamanho do último backup", None),
+    "devops_backup_arquivos_por_segundo": ("gauge", "Vazão do último backup", None),
+    "devops_backup_ultimo_timestamp_segundos": ("gauge", "Horário do último backup", None),
+    "devops_cpu_percent": ("gauge", "Uso de CPU do host (requer psutil)", None),
+    "devops_carga_media": ("gauge", "Carga média do host", None),
+    "devops_memoria_total_bytes": ("gauge", "Memória total do host", None),
+    "devops_memoria_disponivel_bytes": ("gauge", "Memória disponível do host", None),
+    "devops_disco_total_bytes": ("gauge", "Espaço total do disco raiz", None),
+    "devops_disco_usado_bytes": ("gauge", "Espaço usado do disco raiz", None),
+    "devops_amostra_timestamp_segundos": ("gauge", "Horário da última amostra de recursos", None),
+}
+
+_lock = threading.Lock()
+_valores: Dict[str, dict] = {}
+_versao = 0
+# (versão, conteúdo) trocados juntos sob _lock
+_exposicao = (-1, b"")
+
+
+def _chave_rotulos(rotulos: Optional[dict]) -> tuple:
+    """Converte um dicionário de rótulos em chave ordenada e imutável."""
+    if not rotulos:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in rotulos.items()))
+
+
+def _registro(nome: str, tipo: str) -> dict:
+    """Retorna o dicionário de séries da métrica validando o tipo."""
+    if nome not in METRICAS or METRICAS[nome][0] != tipo:
+        raise ValueError(f"Métrica {tipo} não registrada: {nome}")
+    return _valores.setdefault(nome, {})
+
+
+def incrementar(nome: str, valor: float = 1, rotulos: Optional[dict] = None):
+    """Incrementa um contador."""
+    global _versao
+    chave = _chave_rotulos(rotulos)
+    with _lock:
+        series = _registro(nome, "counter")
+        series[chave] = series.get(chave, 0) + valor
+        _versao += 1
+
+
+def definir(nome: str, valor: float, rotulos: Optional[dict] = None):
+    """Define o valor de um gauge."""
+    global _versao
+    chave = _chave_rotulos(rotulos)
+    with _lock:
+        _registro(nome, "gauge")[chave] = valor
+        _versao += 1
+
+
+def observar(nome: str, valor: float, rotulos: Optional[dict] = None):
+    """Registra uma observação em um histograma."""
+    global _versao
+    chave = _chave_rotulos(rotulos)
+    buckets = METRICAS.get(nome, (None, None, ()))[2]
+    with _lock:
+        series = _registro(nome, "histogram")
+        # [contagens por bucket..., soma, total]
+        dados = series.get(chave)
+        if dados is None:
+            dados = series[chave] = [0] * (len(buckets) + 2)
+        for i, limite in enumerate(buckets):
+            if valor <= limite:
+                dados[i] += 1
+        dados[-2] += valor
+        dados[-1] += 1
+        _versao += 1
+
+
+def limpar_metricas():
+    """Remove todos os valores registrados."""
+    global _versao
+    with _lock:
+        _valores.clear()
+        _versao += 1
+
+
+def _formatar_rotulos(chave: tuple, extra: Optional[tuple] = None) -> str:
+    """Formata rótulos no padrão {a="1",b="2"} com escape de caracteres."""
+    pares = chave + (extra or ())
+    if not pares:
+        return ""
+    partes = []
+    for k, v in pares:
+        v = v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        partes.append(f'{k}="{v}"')
+    return "{" + ",".join(partes) + "}"
+
+
+def _formatar_valor(valor: float) -> str:
+    """Formata um número no estilo Prometheus."""
+    if isinstance(valor, int):
+        return str(valor)
+    return repr(float(valor))
+
+
+def renderizar_metricas() -> str:
+    """
+    Gera a exposição completa no formato texto do Prometheus.
+
+    Returns:
+        Texto com HELP, TYPE e amostras de todas as métricas com valores
+    """
+    with _lock:
+        return _renderizar()
+
+
+def _renderizar() -> str:
+    """Corpo de renderizar_metricas; exige _lock adquirido."""
+    linhas = []
+    for nome, (tipo, ajuda, buckets) in METRICAS.items():
+        series = _valores.get(nome)
+        if not series:
+            continue
+        linhas.append(f"# HELP {nome} {ajuda}")
+        linhas.append(f"# TYPE {nome} {tipo}")
+        for chave, valor in sorted(series.items()):
+            if tipo != "histogram":
+                linhas.append(f"{nome}{_formatar_rotulos(chave)} {_formatar_valor(valor)}")
+                continue
+            # Buckets já são cumulativos: cada observação conta em todos os le >= valor
+            for limite, contagem in zip(buckets, valor):
+                rotulos = _formatar_rotulos(chave, (("le", _formatar_valor(limite)),))
+                linhas.append(f"{nome}_bucket{rotulos} {contagem}")
+            rotulos = _formatar_rotulos(chave, (("le", "+Inf"),))
+            linhas.append(f"{nome}_bucket{rotulos} {valor[-1]}")
+            linhas.append(f"{nome}_sum{_formatar_rotulos(chave)} {_formatar_valor(valor[-2])}")
+            linhas.append(f"{nome}_count{_formatar_rotulos(chave)} {valor[-1]}")
+    return "\n".join(linhas) + "\n"
+
+
+def obter_exposicao() -> bytes:
+    """
+    Retorna a exposição pré-renderizada, renderizando apenas se algo mudou.
+
+    A versão e o texto são lidos e gravados sob o mesmo lock das
+    atualizações, então o conteúdo servido sempre corresponde à versão
+    registrada com ele.
+
+    Returns:
+        Conteúdo de /metrics codificado em UTF-8
+    """
+    global _exposicao
+    with _lock:
+        if _exposicao[0] != _versao:
+            _exposicao = (_versao, _renderizar().encode("utf-8"))
+        return _exposicao[1]
+
+
+def amostrar_recursos():
+    """Atualiza os gauges de recursos do host (CPU, carga, memória e disco)."""
+    try:
+        import psutil
+        definir("devops_cpu_percent", psutil.cpu_percent(interval=None))
+        memoria = psutil.virtual_memory()
+        definir("devops_memoria_total_bytes", memoria.total)
+        definir("devops_memoria_disponivel_bytes", memoria.available)
+    except ImportError:
+        # Sem psutil: usar /proc/meminfo quando disponível (Linux)
+        if os.path.exists("/proc/meminfo"):
+            with open("/proc/meminfo", encoding="utf-8") as arquivo:
+                campos = dict(linha.split(":", 1) for linha in arquivo if ":" in linha)
+            definir("devops_memoria_total_bytes", int(campos["MemTotal"].split()[0]) * 1024)
+            if "MemAvailable" in campos:
+                definir(
+                    "devops_memoria_disponivel_bytes",
+                    int(campos["MemAvailable"].split()[0]) * 1024
+                )
+
+    if hasattr(os, "getloadavg"):
+        for periodo, carga in zip(("1m", "5m", "15m"), os.getloadavg()):
+            definir("devops_carga_media", carga, {"periodo": periodo})
+
+    disco = shutil.disk_usage("C:\\" if sys.platform == "win32" else "/")
+    definir("devops_disco_total_bytes", disco.total)
+    definir("devops_disco_usado_bytes", disco.used)
+    definir("devops_amostra_timestamp_segundos", time.time())
+
+
+class _HandlerMetricas(BaseHTTPRequestHandler):
+    """Handler HTTP que responde /metrics com a exposição em cache."""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        conteudo = obter_exposicao()
+        self.send_response(200)
+        self.send_header("Content-Type", TIPO_CONTEUDO)
+        self.send_header("Content-Length", str(len(conteudo)))
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    def log_message(self, formato, *args):
+        logger.debug(f"{self.address_string()} - {formato % args}")
+
+
+def _loop_amostragem(parar: threading.Event, intervalo: float):
+    """Amostra recursos periodicamente e pré-renderiza a exposição."""
+    while not parar.is_set():
+        try:
+            amostrar_recursos()
+            obter_exposicao()
+        except Exception as e:
+            logger.error(f"Erro ao amostrar recursos: {e}")
+        parar.wait(intervalo)
+
+
+def criar_servidor_metricas(
+    host: str = "127.0.0.1",
+    porta: int = 9108,
+    intervalo: float = 15.0
+) -> ThreadingHTTPServer:
+    """
+    Cria o servidor HTTP de métricas e inicia a amostragem em segundo plano.
+
+    Args:
+        host: Endereço de escuta
+        porta: Porta de escuta (0 escolhe uma porta livre)
+        intervalo: Intervalo entre amostras de recursos em segundos
+
+    Returns:
+        Servidor pronto para serve_forever(); encerre com parar_servidor_metricas()
+    """
+    servidor = ThreadingHTTPServer((host, porta), _HandlerMetricas)
+    servidor.daemon_threads = True
+    servidor.evento_parada = threading.Event()
+    threading.Thread(
+        target=_loop_amostragem,
+        args=(servidor.evento_parada, intervalo),
+        daemon=True
+    ).start()
+    return servidor
+
+
+def parar_servidor_metricas(servidor: ThreadingHTTPServer):
+    """Encerra o servidor de métricas e a amostragem."""
+    servidor.evento_parada.set()
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def servir_metricas(host: str = "127.0.0.1", porta: int = 9108, intervalo: float = 15.0):
+    """
+    Serve /metrics até ser interrompido (Ctrl+C).
+
+    Args:
+        host: Endereço de escuta
+        porta: Porta de escuta
+        intervalo: Intervalo entre amostras de recursos em segundos
+    """
+    servidor = criar_servidor_metricas(host, porta, intervalo)
+    logger.info(f"Servindo métricas em http://{host}:{servidor.server_address[1]}/metrics")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Servidor de métricas interrompido")
+    finally:
+        servidor.evento_parada.set()
+        servidor.server_close()
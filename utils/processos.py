@@ -0,0 +1,164 @@
+"""
+Módulo de monitoramento de processos para automação DevOps.
+Autor: Patrick
+Data: Dezembro 2025
+
+Contém funções para identificar os processos que mais consomem CPU,
+memória e I/O lendo diretamente o /proc (Linux).
+"""
+
+import os
+import time
+import heapq
+from typing import Dict, Optional, Tuple
+
+from .logger import configurar_logger
+
+# Logger do módulo
+logger = configurar_logger("processos")
+
+PROC = "/proc"
+
+
+def _ler_arquivo(caminho: str) -> bytes:
+    """Lê um arquivo pequeno do /proc com uma única chamada de sistema."""
+    fd = os.open(caminho, os.O_RDONLY)
+    try:
+        return os.read(fd, 4096)
+    finally:
+        os.close(fd)
+
+
+def _ler_io(pid: str) -> Optional[int]:
+    """Retorna bytes lidos + escritos em disco pelo processo (None se sem permissão)."""
+    try:
+        dados = _ler_arquivo(f"{PROC}/{pid}/io")
+    except OSError:
+        return None
+
+    total = 0
+    for linha in dados.split(b"\n"):
+        if linha.startswith(b"read_bytes:") or linha.startswith(b"write_bytes:"):
+            total += int(linha.split(b":", 1)[1])
+    return total
+
+
+def _varrer_processos(incluir_io: bool = True) -> Dict[str, Tuple]:
+    """
+    Faz uma única passagem por /proc/[pid] coletando contadores brutos.
+
+    Returns:
+        Dicionário pid -> (inicio, nome, ticks_cpu, rss_bytes, io_bytes)
+    """
+    pagina = os.sysconf("SC_PAGE_SIZE")
+    processos = {}
+
+    with os.scandir(PROC) as entradas:
+        for entrada in entradas:
+            pid = entrada.name
+            if not pid.isdigit():
+                continue
+            try:
+                dados = _ler_arquivo(f"{PROC}/{pid}/stat")
+            except OSError:
+                # Processo terminou durante a varredura
+                continue
+
+            # O nome pode conter espaços e parênteses: usar o último ')'
+            inicio_nome = dados.find(b"(")
+            fim_nome = dados.rfind(b")")
+            campos = dados[fim_nome + 2:].split()
+
+            # Campos a partir de 'state' (campo 3 do stat)
+            ticks = int(campos[11]) + int(campos[12])
+            rss = int(campos[21]) * pagina
+            inicio = campos[19]
+
+            processos[pid] = (
+                inicio,
+                dados[inicio_nome + 1:fim_nome].decode("utf-8", errors="replace"),
+                ticks,
+                rss,
+                _ler_io(pid) if incluir_io else None
+            )
+
+    return processos
+
+
+def monitorar_processos(
+    limite: int = 10,
+    intervalo: float = 1.0,
+    incluir_io: bool = True
+) -> dict:
+    """
+    Lista os processos que mais consomem CPU, memória e I/O.
+
+    Faz duas varreduras do /proc separadas por `intervalo` segundos e
+    calcula as taxas pela diferença entre elas. O top-N é obtido com um
+    heap, sem ordenar todos os processos.
+
+    Args:
+        limite: Quantidade de processos em cada ranking
+        intervalo: Tempo entre as duas amostras em segundos
+        incluir_io: Se True, lê também /proc/[pid]/io
+
+    Returns:
+        Dicionário com os rankings de cpu, memoria e io
+    """
+    if not os.path.isdir(PROC):
+        logger.warning("/proc não disponível neste sistema")
+        return {"erro": "/proc não disponível"}
+
+    ticks_por_segundo = os.sysconf("SC_CLK_TCK")
+
+    inicio_cpu = time.process_time()
+    anterior = _varrer_processos(incluir_io)
+    duracao_varredura = time.process_time() - inicio_cpu
+
+    inicio_amostra = time.monotonic()
+    time.sleep(intervalo)
+
+    inicio_cpu = time.process_time()
+    atual = _varrer_processos(incluir_io)
+    duracao_varredura = max(duracao_varredura, time.process_time() - inicio_cpu)
+    decorrido = max(time.monotonic() - inicio_amostra, 1e-6)
+
+    amostras = []
+    for pid, (inicio, nome, ticks, rss, io) in atual.items():
+        antes = anterior.get(pid)
+        # Ignorar PIDs reutilizados entre as duas varreduras
+        if antes is None or antes[0] != inicio:
+            antes = (inicio, nome, ticks, rss, io)
+
+        io_por_segundo = None
+        if io is not None and antes[4] is not None:
+            io_por_segundo = (io - antes[4]) / decorrido
+
+        amostras.append({
+            "pid": int(pid),
+            "nome": nome,
+            "cpu_percent": round(
+                (ticks - antes[2]) / ticks_por_segundo / decorrido * 100, 1
+            ),
+            "memoria_rss": rss,
+            "io_bytes_s": io_por_segundo
+        })
+
+    resultado = {
+        "total_processos": len(amostras),
+        "intervalo": round(decorrido, 3),
+        "duracao_varredura_ms": round(duracao_varredura * 1000, 2),
+        "cpu": heapq.nlargest(limite, amostras, key=lambda p: p["cpu_percent"]),
+        "memoria": heapq.nlargest(limite, amostras, key=lambda p: p["memoria_rss"]),
+        "io": heapq.nlargest(
+            limite,
+            (p for p in amostras if p["io_bytes_s"] is not None),
+            key=lambda p: p["io_bytes_s"]
+        )
+    }
+
+    logger.info(
+        f"Processos analisados: {resultado['total_processos']} "
+        f"(varredura: {resultado['duracao_varredura_ms']} ms de CPU)"
+    )
+    return resultado
@@ -6,123 +6,559 @@ Data: Dezembro 2025
 Contém funções para criar e gerenciar estruturas de projeto.
 """
 
+import os
+import time
+import mmap
+import queue
+import heapq
+import fnmatch
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
+from string import Template
+from typing import Iterable, Iterator, Optional, Tuple, Union
 
-from .logger import configurar_logger
+from .logger import configurar_logger, log_operacao
 
 # Logger do módulo
 logger = configurar_logger("projeto")
 
+# Templates de projeto embutidos (um subdiretório por template)
+DIRETORIO_TEMPLATES = Path(__file__).parent / "templates"
 
-def gerenciar_arquivos(diretorio: str, extensao: str = None) -> list:
+# Variáveis disponíveis em todos os templates (além de ${projeto})
+VARIAVEIS_PADRAO = {"python_versao": "3.11"}
+
+# Quantidade de arquivos enviados por vez pelas threads de varredura
+TAMANHO_LOTE = 256
+
+# Critérios de ordenação: nome -> (chave sobre (caminho, stat), maiores primeiro)
+CRITERIOS_ORDENACAO = {
+    "tamanho": (lambda item: item[1].st_size, True),
+    "modificado": (lambda item: item[1].st_mtime, True),
+    "nome": (lambda item: os.path.basename(item[0]), False),
+}
+
+
+def _aceitar(nome: str, extensao: Optional[str]) -> bool:
+    """Verifica a extensão pelo nome, antes de qualquer stat."""
+    return extensao is None or os.path.splitext(nome)[1] == extensao
+
+
+def _excluido(nome: str, excluir: Optional[Iterable[str]]) -> bool:
+    """Verifica se o nome casa com algum padrão glob de exclusão."""
+    return bool(excluir) and any(fnmatch.fnmatch(nome, padrao) for padrao in excluir)
+
+
+def varrer_diretorio(
+    caminho: str,
+    extensao: Optional[str] = None,
+    excluir: Optional[Iterable[str]] = None,
+    seguir_links: bool = True
+) -> Tuple[list, list]:
+    """
+    Lê as entradas diretas de um diretório (um scandir e um stat por arquivo).
+
+    Links simbólicos para diretórios não entram em subdiretórios; erros de
+    leitura do diretório são registrados no log e retornam listas vazias.
+
+    Args:
+        caminho: Diretório a ler
+        extensao: Aceitar apenas arquivos com esta extensão (ex: '.py')
+        excluir: Padrões glob de nomes de arquivos e diretórios a ignorar
+        seguir_links: Se False, links simbólicos para arquivos são ignorados
+            (com True entram com o stat do alvo)
+
+    Returns:
+        Tupla (arquivos [(caminho, stat)], subdiretórios [caminho])
+    """
+    arquivos = []
+    subdiretorios = []
+    try:
+        with os.scandir(caminho) as entradas:
+            for entrada in entradas:
+                try:
+                    if _excluido(entrada.name, excluir):
+                        continue
+                    if entrada.is_dir(follow_symlinks=False):
+                        subdiretorios.append(entrada.path)
+                    elif not seguir_links and entrada.is_symlink():
+                        continue
+                    elif _aceitar(entrada.name, extensao) and entrada.is_file():
+                        arquivos.append((entrada.path, entrada.stat()))
+                except OSError:
+                    continue
+    except OSError as e:
+        logger.warning(f"Não foi possível ler {caminho}: {e}")
+    return arquivos, subdiretorios
+
+
+def _iterar_sequencial(
+    raiz: str,
+    extensao: Optional[str],
+    excluir: Optional[Iterable[str]],
+    seguir_links: bool
+) -> Iterator[Tuple[str, os.stat_result]]:
+    """Percorre a árvore em profundidade, um diretório por vez."""
+    pilha = [raiz]
+    while pilha:
+        arquivos, subdiretorios = varrer_diretorio(pilha.pop(), extensao, excluir, seguir_links)
+        yield from arquivos
+        pilha.extend(reversed(subdiretorios))
+
+
+def _iterar_paralelo(
+    raiz: str,
+    extensao: Optional[str],
+    trabalhadores: int,
+    excluir: Optional[Iterable[str]],
+    seguir_links: bool
+) -> Iterator[Tuple[str, os.stat_result]]:
+    """Percorre a árvore com subdiretórios varridos em paralelo."""
+    saida = queue.Queue(maxsize=64)
+    parar = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max(1, trabalhadores))
+
+    def enviar(mensagem):
+        while not parar.is_set():
+            try:
+                saida.put(mensagem, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def tarefa(caminho):
+        try:
+            if parar.is_set():
+                return
+            arquivos, subdiretorios = varrer_diretorio(caminho, extensao, excluir, seguir_links)
+            # Anunciar os filhos antes de agendá-los, para que a contagem
+            # de pendentes do consumidor nunca chegue a zero antes da hora
+            if subdiretorios:
+                enviar(([], len(subdiretorios)))
+            for subdiretorio in subdiretorios:
+                try:
+                    executor.submit(tarefa, subdiretorio)
+                except RuntimeError:
+                    # Executor encerrado: o consumidor parou de iterar
+                    return
+            for i in range(0, len(arquivos), TAMANHO_LOTE):
+                enviar((arquivos[i:i + TAMANHO_LOTE], 0))
+        finally:
+            enviar(([], -1))
+
+    try:
+        executor.submit(tarefa, raiz)
+        pendentes = 1
+        while pendentes:
+            lote, variacao = saida.get()
+            yield from lote
+            pendentes += variacao
+    finally:
+        parar.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iterar_entradas(
+    diretorio: str,
+    extensao: Optional[str] = None,
+    paralelo: bool = False,
+    trabalhadores: int = 8,
+    excluir: Optional[Iterable[str]] = None,
+    seguir_links: bool = True
+) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Gera (caminho, stat) dos arquivos de uma árvore usando os.scandir.
+
+    A extensão e as exclusões (globs aplicados ao nome de arquivos e
+    diretórios) são testadas antes do stat e cada arquivo recebe um único
+    stat. Links simbólicos para diretórios não são seguidos. É o percurso
+    usado por busca, duplicados, snapshot e integridade.
+
+    Args:
+        diretorio: Diretório raiz
+        extensao: Aceitar apenas arquivos com esta extensão (ex: '.py')
+        paralelo: Se True, varre subdiretórios em paralelo (ordem não garantida)
+        trabalhadores: Número de threads no modo paralelo
+        excluir: Padrões glob de nomes a ignorar (ex: ['.git', '*.tmp'])
+        seguir_links: Se False, links simbólicos para arquivos são ignorados
+            (sem custo extra: o tipo vem do próprio scandir)
+
+    Yields:
+        Tuplas (caminho, os.stat_result) de cada arquivo
+    """
+    raiz = str(Path(diretorio))
+    if paralelo:
+        return _iterar_paralelo(raiz, extensao, trabalhadores, excluir, seguir_links)
+    return _iterar_sequencial(raiz, extensao, excluir, seguir_links)
+
+
+def _info_arquivo(caminho: str, stat: os.stat_result) -> dict:
+    """Monta o dicionário de informações de um arquivo."""
+    return {
+        "nome": os.path.basename(caminho),
+        "caminho": caminho,
+        "tamanho": stat.st_size,
+        "modificado": datetime.fromtimestamp(stat.st_mtime).isoformat()
+    }
+
+
+def iterar_arquivos(
+    diretorio: str,
+    extensao: str = None,
+    paralelo: bool = False,
+    trabalhadores: int = 8,
+    excluir: Optional[Iterable[str]] = None
+) -> Iterator[dict]:
+    """
+    Gera os arquivos de um diretório sob demanda.
+
+    Interromper a iteração interrompe a varredura, então listar os
+    primeiros N arquivos não exige percorrer a árvore inteira.
+
+    Args:
+        diretorio: Caminho do diretório
+        extensao: Filtrar por extensão (ex: '.py')
+        paralelo: Se True, varre subdiretórios em paralelo (ordem não garantida)
+        trabalhadores: Número de threads no modo paralelo
+        excluir: Padrões glob de nomes a ignorar (ex: ['.git', '*.tmp'])
+
+    Yields:
+        Dicionários com nome, caminho, tamanho e data de modificação
+    """
+    if not os.path.isdir(diretorio):
+        logger.error(f"Diretório não encontrado: {diretorio}")
+        return
+
+    for caminho, stat in iterar_entradas(diretorio, extensao, paralelo, trabalhadores, excluir):
+        yield _info_arquivo(caminho, stat)
+
+
+def converter_timestamp(valor: Union[None, float, str, datetime]) -> Optional[float]:
+    """
+    Converte datetime, texto ISO ou número em timestamp.
+
+    Args:
+        valor: Data (datetime ou texto ISO 8601), timestamp ou None
+
+    Returns:
+        Timestamp em segundos (None se valor for None)
+    """
+    if valor is None or isinstance(valor, (int, float)):
+        return valor
+    if isinstance(valor, str):
+        valor = datetime.fromisoformat(valor)
+    return valor.timestamp()
+
+
+def listar_arquivos_ordenados(
+    diretorio: str,
+    ordenar: Optional[str] = None,
+    limite: Optional[int] = 10,
+    extensao: Optional[str] = None,
+    tamanho_min: Optional[int] = None,
+    tamanho_max: Optional[int] = None,
+    modificado_desde: Union[None, float, str, datetime] = None,
+    paralelo: bool = False,
+    usar_indice: bool = False,
+    banco: Optional[str] = None
+) -> list:
+    """
+    Lista os K primeiros arquivos segundo um critério, sem guardar a árvore.
+
+    Os filtros são aplicados durante a varredura e o top-K é mantido em
+    um heap de tamanho `limite`, então a memória é O(K) e não O(arquivos).
+    Com usar_indice, a lista sai do índice SQLite (ver atualizar_indice)
+    sem percorrer a árvore; os resultados refletem a última atualização
+    do índice e os caminhos são absolutos. Sem índice, a árvore é varrida.
+
+    Args:
+        diretorio: Caminho do diretório
+        ordenar: 'tamanho' e 'modificado' (maiores/mais recentes primeiro),
+            'nome' (ordem alfabética) ou None (ordem da varredura)
+        limite: Quantidade de arquivos retornados (None = todos)
+        extensao: Filtrar por extensão (ex: '.py')
+        tamanho_min: Tamanho mínimo em bytes
+        tamanho_max: Tamanho máximo em bytes
+        modificado_desde: Data mínima de modificação (datetime, ISO ou timestamp)
+        paralelo: Se True, varre subdiretórios em paralelo
+        usar_indice: Se True, consulta o índice persistente quando existir
+        banco: Arquivo SQLite do índice (padrão: dentro do cache)
+
+    Returns:
+        Lista de arquivos no formato de gerenciar_arquivos
+    """
+    if ordenar is not None and ordenar not in CRITERIOS_ORDENACAO:
+        raise ValueError(f"Critério de ordenação inválido: {ordenar}")
+    if not os.path.isdir(diretorio):
+        logger.error(f"Diretório não encontrado: {diretorio}")
+        return []
+    if usar_indice:
+        arquivos = _listar_do_indice(
+            diretorio, banco, ordenar=ordenar, limite=limite, extensao=extensao,
+            tamanho_min=tamanho_min, tamanho_max=tamanho_max, modificado_desde=modificado_desde
+        )
+        if arquivos is not None:
+            return arquivos
+
+    desde = converter_timestamp(modificado_desde)
+    itens = (
+        (caminho, stat)
+        for caminho, stat in iterar_entradas(diretorio, extensao, paralelo)
+        if (tamanho_min is None or stat.st_size >= tamanho_min)
+        and (tamanho_max is None or stat.st_size <= tamanho_max)
+        and (desde is None or stat.st_mtime >= desde)
+    )
+
+    if ordenar is None:
+        selecionados = list(islice(itens, limite))
+    else:
+        chave, decrescente = CRITERIOS_ORDENACAO[ordenar]
+        if limite is None:
+            selecionados = sorted(itens, key=chave, reverse=decrescente)
+        elif decrescente:
+            selecionados = heapq.nlargest(limite, itens, key=chave)
+        else:
+            selecionados = heapq.nsmallest(limite, itens, key=chave)
+
+    return [_info_arquivo(caminho, stat) for caminho, stat in selecionados]
+
+
+def _listar_do_indice(diretorio: str, banco: Optional[str], **filtros) -> Optional[list]:
+    """Consulta o índice persistente; None se ele ainda não existir."""
+    # Importado aqui: indice depende de varrer_diretorio deste módulo
+    from .indice import caminho_indice, consultar_indice
+
+    if not Path(banco or caminho_indice(diretorio)).exists():
+        logger.info(f"Sem índice para {diretorio}; varrendo a árvore")
+        return None
+    return consultar_indice(diretorio, banco=banco, **filtros)
+
+
+def calcular_hash_arquivo(
+    caminho: str,
+    algoritmo: str = "sha256",
+    tamanho_bloco: int = 1024 * 1024
+) -> str:
+    """
+    Calcula o hash do conteúdo de um arquivo lendo via mmap.
+
+    O hashlib libera o GIL em blocos grandes, então várias chamadas em
+    threads diferentes executam em paralelo.
+
+    Args:
+        caminho: Caminho do arquivo
+        algoritmo: Algoritmo do hashlib (ex: 'sha256', 'blake2b')
+        tamanho_bloco: Tamanho de cada bloco entregue ao hash
+
+    Returns:
+        Hash hexadecimal do conteúdo
+    """
+    resumo = hashlib.new(algoritmo)
+    with open(caminho, "rb") as arquivo:
+        tamanho = os.fstat(arquivo.fileno()).st_size
+        if tamanho == 0:
+            return resumo.hexdigest()
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            with memoryview(mapa) as visao:
+                for inicio in range(0, len(visao), tamanho_bloco):
+                    resumo.update(visao[inicio:inicio + tamanho_bloco])
+    return resumo.hexdigest()
+
+
+def gerenciar_arquivos(
+    diretorio: str,
+    extensao: str = None,
+    limite: Optional[int] = None,
+    paralelo: bool = False,
+    usar_indice: bool = False,
+    banco: Optional[str] = None
+) -> list:
     """
     Lista e gerencia arquivos em um diretório.
     
     Args:
         diretorio: Caminho do diretório
         extensao: Filtrar por extensão (ex: '.py')
+        limite: Número máximo de arquivos (a varredura para ao atingi-lo)
+        paralelo: Se True, varre subdiretórios em paralelo
+        usar_indice: Se True, consulta o índice persistente quando existir
+        banco: Arquivo SQLite do índice (padrão: dentro do cache)
         
     Returns:
         Lista de arquivos encontrados
     """
-    path = Path(diretorio)
-    
-    if not path.exists():
+    if not os.path.isdir(diretorio):
         logger.error(f"Diretório não encontrado: {diretorio}")
         return []
     
-    arquivos = []
-    for arquivo in path.rglob("*"):
-        if arquivo.is_file():
-            if extensao is None or arquivo.suffix == extensao:
-                arquivos.append({
-                    "nome": arquivo.name,
-                    "caminho": str(arquivo),
-                    "tamanho": arquivo.stat().st_size,
-                    "modificado": datetime.fromtimestamp(
-                        arquivo.stat().st_mtime
-                    ).isoformat()
-                })
+    arquivos = None
+    if usar_indice:
+        arquivos = _listar_do_indice(diretorio, banco, extensao=extensao, limite=limite)
+    if arquivos is None:
+        arquivos = list(islice(iterar_arquivos(diretorio, extensao, paralelo), limite))
     
     logger.info(f"Encontrados {len(arquivos)} arquivos em {diretorio}")
     return arquivos
 
 
-def criar_estrutura_projeto(nome_projeto: str) -> bool:
+def _resolver_template(template: str) -> str:
+    """Aceita o nome de um template embutido ou o caminho de um diretório."""
+    embutido = DIRETORIO_TEMPLATES / template
+    if embutido.is_dir():
+        return str(embutido.resolve())
+    if os.path.isdir(template):
+        return os.path.abspath(template)
+    raise FileNotFoundError(f"Template não encontrado: {template}")
+
+
+@lru_cache(maxsize=32)
+def _compilar_template(caminho: str) -> Tuple[tuple, tuple]:
+    """
+    Lê e compila um diretório de template uma única vez por processo.
+
+    Returns:
+        Tupla (diretórios [Template], arquivos [(Template caminho, Template conteúdo)])
+    """
+    diretorios = []
+    arquivos = []
+    for atual, subdiretorios, nomes in os.walk(caminho):
+        subdiretorios.sort()
+        relativo = os.path.relpath(atual, caminho).replace(os.sep, "/")
+        prefixo = "" if relativo == "." else relativo + "/"
+        if prefixo:
+            diretorios.append(Template(relativo))
+        for nome in sorted(nomes):
+            conteudo = Path(atual, nome).read_text(encoding="utf-8")
+            arquivos.append((Template(prefixo + nome), Template(conteudo)))
+    return tuple(diretorios), tuple(arquivos)
+
+
+def carregar_template(template: str = "padrao") -> Tuple[tuple, tuple]:
+    """
+    Retorna o template compilado (lido do disco só na primeira chamada).
+
+    Variáveis usam a sintaxe ${nome} tanto no conteúdo quanto nos nomes
+    de arquivos e diretórios. Diretórios vazios são marcados com .gitkeep.
+
+    Args:
+        template: Nome de um template em utils/templates ou caminho de diretório
+
+    Returns:
+        Tupla (diretórios, arquivos) pronta para _gerar_projeto
+    """
+    return _compilar_template(_resolver_template(template))
+
+
+def _gerar_projeto(destino: Path, compilado: Tuple[tuple, tuple], variaveis: dict) -> int:
+    """Materializa um template compilado em destino e retorna o número de arquivos."""
+    diretorios, arquivos = compilado
+    destino.mkdir(parents=True, exist_ok=True)
+    for diretorio in diretorios:
+        (destino / diretorio.safe_substitute(variaveis)).mkdir(parents=True, exist_ok=True)
+    for caminho, conteudo in arquivos:
+        (destino / caminho.safe_substitute(variaveis)).write_text(
+            conteudo.safe_substitute(variaveis), encoding="utf-8"
+        )
+    return len(arquivos)
+
+
+def criar_estrutura_projeto(
+    nome_projeto: str,
+    template: str = "padrao",
+    variaveis: Optional[dict] = None
+) -> bool:
     """
     Cria estrutura padrão de um projeto DevOps.
     
     Args:
         nome_projeto: Nome do projeto a ser criado
+        template: Nome do template embutido ou caminho de um diretório de template
+        variaveis: Variáveis extras para substituição (${nome})
         
     Returns:
         True se criado com sucesso
     """
-    estrutura = [
-        f"{nome_projeto}/src",
-        f"{nome_projeto}/tests",
-        f"{nome_projeto}/docs",
-        f"{nome_projeto}/scripts",
-        f"{nome_projeto}/config",
-        f"{nome_projeto}/.github/workflows"
-    ]
-    
-    arquivos = {
-        f"{nome_projeto}/README.md": f"# {nome_projeto}\n\nProjeto de automação DevOps.\n",
-        f"{nome_projeto}/requirements.txt": "# Dependências do projeto\npytest>=7.0.0\nrequests>=2.28.0\npython-dotenv>=1.0.0\n",
-        f"{nome_projeto}/.gitignore": "*.pyc\n__pycache__/\n.env\nvenv/\n*.log\n.pytest_cache/\n",
-        f"{nome_projeto}/Dockerfile": """FROM python:3.11-slim
-
-WORKDIR /app
-
-COPY requirements.txt .
-RUN pip install --no-cache-dir -r requirements.txt
-
-COPY . .
-
-CMD ["python", "src/main.py"]
-""",
-        f"{nome_projeto}/.github/workflows/ci.yml": """name: CI Pipeline
-
-on:
-  push:
-    branches: [ main ]
-  pull_request:
-    branches: [ main ]
-
-jobs:
-  test:
-    runs-on: ubuntu-latest
-    steps:
-    - uses: actions/checkout@v4
-    - name: Set up Python
-      uses: actions/setup-python@v5
-      with:
-        python-version: '3.11'
-    - name: Install dependencies
-      run: |
-        python -m pip install --upgrade pip
-        pip install -r requirements.txt
-    - name: Run tests
-      run: pytest tests/
-"""
-    }
-    
     try:
-        # Criar diretórios
-        for pasta in estrutura:
-            Path(pasta).mkdir(parents=True, exist_ok=True)
-            logger.info(f"Criado diretório: {pasta}")
-        
-        # Criar arquivos
-        for arquivo, conteudo in arquivos.items():
-            Path(arquivo).write_text(conteudo, encoding='utf-8')
-            logger.info(f"Criado arquivo: {arquivo}")
+        destino = Path(nome_projeto)
+        valores = {**VARIAVEIS_PADRAO, **(variaveis or {}), "projeto": destino.name}
+        total = _gerar_projeto(destino, carregar_template(template), valores)
         
-        logger.info(f"✓ Projeto '{nome_projeto}' criado com sucesso!")
+        logger.info(f"✓ Projeto '{nome_projeto}' criado com sucesso! ({total} arquivos)")
         return True
         
     except Exception as e:
         logger.error(f"Erro ao criar projeto: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+def criar_projetos_em_lote(
+    nomes: Iterable[str],
+    diretorio: str = ".",
+    template: str = "padrao",
+    variaveis: Optional[dict] = None,
+    trabalhadores: int = 8
+) -> dict:
+    """
+    Cria vários projetos a partir do mesmo template.
+
+    O template é compilado uma vez e os projetos são escritos em paralelo
+    por um pool de threads; o log é consolidado em uma única linha.
+
+    Args:
+        nomes: Nomes dos projetos
+        diretorio: Diretório onde os projetos serão criados
+        template: Nome do template embutido ou caminho de um diretório de template
+        variaveis: Variáveis extras para substituição (${nome})
+        trabalhadores: Número de threads de escrita
+
+    Returns:
+        Dicionário com projetos criados, falhas e estatísticas
+    """
+    resultado = {
+        "sucesso": False,
+        "criados": [],
+        "falhas": {},
+        "arquivos": 0,
+        "duracao": 0.0,
+        "erro": None
+    }
+    inicio = time.monotonic()
+
+    try:
+        compilado = carregar_template(template)
+        base = Path(diretorio)
+        comuns = {**VARIAVEIS_PADRAO, **(variaveis or {})}
+
+        def gerar(nome: str) -> int:
+            return _gerar_projeto(base / nome, compilado, {**comuns, "projeto": nome})
+
+        nomes = list(dict.fromkeys(nomes))
+        with ThreadPoolExecutor(max_workers=max(1, trabalhadores)) as executor:
+            futuros = {nome: executor.submit(gerar, nome) for nome in nomes}
+            for nome, futuro in futuros.items():
+                try:
+                    resultado["arquivos"] += futuro.result()
+                    resultado["criados"].append(nome)
+                except Exception as e:
+                    resultado["falhas"][nome] = str(e)
+
+        resultado["sucesso"] = not resultado["falhas"]
+        resultado["duracao"] = round(time.monotonic() - inicio, 3)
+        log_operacao(
+            logger, "CRIAR_PROJETOS",
+            sucesso=resultado["sucesso"],
+            detalhes=f"{len(resultado['criados'])}/{len(nomes)} projetos, "
+                     f"{resultado['arquivos']} arquivos em {resultado['duracao']}s"
+                     + (f"; falhas: {', '.join(resultado['falhas'])}" if resultado["falhas"] else "")
+        )
+
+    except Exception as e:
+        resultado["erro"] = str(e)
+        log_operacao(logger, "CRIAR_PROJETOS", sucesso=False, detalhes=str(e))
+
+    return resultado
@@ -8,11 +8,18 @@ Contém funções para obter informações do sistema e executar comandos.
 
 import sys
 import os
+import time
+import queue
+import signal
+import threading
 import subprocess
+from collections import deque
 from datetime import datetime
 from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple
 
 from .logger import configurar_logger
+from . import metricas
 
 # Logger do módulo
 logger = configurar_logger("sistema")
@@ -42,6 +49,12 @@ def obter_informacoes_sistema() -> dict:
     return info
 
 
+def _nome_programa(comando: str) -> str:
+    """Retorna o nome do programa de um comando (usado como rótulo de métricas)."""
+    partes = comando.split()
+    return os.path.basename(partes[0]) if partes else ""
+
+
 def executar_comando(comando: str, timeout: int = 60) -> dict:
     """
     Executa um comando no shell e retorna o resultado.
@@ -54,6 +67,8 @@ def executar_comando(comando: str, timeout: int = 60) -> dict:
         Dicionário com stdout, stderr e código de retorno
     """
     logger.info(f"Executando comando: {comando}")
+    rotulos = {"programa": _nome_programa(comando)}
+    inicio = time.perf_counter()
     try:
         resultado = subprocess.run(
             comando,
@@ -62,6 +77,9 @@ def executar_comando(comando: str, timeout: int = 60) -> dict:
             text=True,
             timeout=timeout
         )
+        metricas.observar("devops_comando_duracao_segundos", time.perf_counter() - inicio, rotulos)
+        if resultado.returncode != 0:
+            metricas.incrementar("devops_comando_falhas_total", rotulos=rotulos)
         return {
             "sucesso": resultado.returncode == 0,
             "stdout": resultado.stdout.strip(),
@@ -69,13 +87,224 @@ def executar_comando(comando: str, timeout: int = 60) -> dict:
             "codigo_retorno": resultado.returncode
         }
     except subprocess.TimeoutExpired:
+        metricas.observar("devops_comando_duracao_segundos", time.perf_counter() - inicio, rotulos)
+        metricas.incrementar("devops_comando_falhas_total", rotulos=rotulos)
         logger.error(f"Timeout ao executar: {comando}")
         return {"sucesso": False, "erro": "Timeout"}
     except Exception as e:
+        metricas.incrementar("devops_comando_falhas_total", rotulos=rotulos)
         logger.error(f"Erro ao executar comando: {e}")
         return {"sucesso": False, "erro": str(e)}
 
 
+# Marcador de fim de fluxo usado pelas threads leitoras
+_FIM_FLUXO = object()
+
+
+def _ler_fluxo(pipe, nome: str, fila: queue.Queue, tamanho_max_linha: int):
+    """Lê um pipe linha a linha (no máximo tamanho_max_linha bytes por item)."""
+    try:
+        for bloco in iter(lambda: pipe.readline(tamanho_max_linha), b""):
+            fila.put((nome, bloco))
+    except (OSError, ValueError):
+        pass
+    finally:
+        fila.put((nome, _FIM_FLUXO))
+
+
+def matar_grupo(processo):
+    """
+    Mata o processo e todos os filhos do seu grupo.
+
+    O processo precisa ter sido iniciado em sessão própria
+    (start_new_session=True, ou CREATE_NEW_PROCESS_GROUP no Windows).
+
+    Args:
+        processo: subprocess.Popen ou asyncio.subprocess.Process
+    """
+    try:
+        if sys.platform == "win32":
+            subprocess.run(
+                f"taskkill /F /T /PID {processo.pid}",
+                shell=True,
+                capture_output=True
+            )
+        else:
+            os.killpg(processo.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    processo.kill()
+
+
+def executar_comando_stream(
+    comando: str,
+    timeout: int = 60,
+    tamanho_max_linha: int = 64 * 1024,
+    tamanho_fila: int = 1000
+) -> Iterator[Tuple[str, Optional[object]]]:
+    """
+    Executa um comando no shell entregando a saída à medida que é produzida.
+
+    Gera tuplas ("stdout" | "stderr", linha). O último item é
+    ("fim", codigo_retorno) ou ("timeout", None). Linhas maiores que
+    tamanho_max_linha são entregues em partes e a fila entre leitores e
+    consumidor é limitada, então a memória não cresce com a saída. No
+    timeout, ou se o consumidor parar de iterar, o grupo de processos
+    inteiro é encerrado.
+
+    Args:
+        comando: Comando a ser executado
+        timeout: Tempo máximo de execução em segundos
+        tamanho_max_linha: Tamanho máximo de cada linha entregue em bytes
+        tamanho_fila: Número máximo de linhas aguardando consumo
+
+    Yields:
+        Tuplas (fluxo, linha)
+    """
+    logger.info(f"Executando comando (stream): {comando}")
+    rotulos = {"programa": _nome_programa(comando)}
+    inicio = time.perf_counter()
+
+    if sys.platform == "win32":
+        opcoes = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        opcoes = {"start_new_session": True}
+
+    processo = subprocess.Popen(
+        comando,
+        shell=True,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        **opcoes
+    )
+    fila = queue.Queue(maxsize=tamanho_fila)
+    leitores = [
+        threading.Thread(
+            target=_ler_fluxo,
+            args=(pipe, nome, fila, tamanho_max_linha),
+            daemon=True
+        )
+        for pipe, nome in ((processo.stdout, "stdout"), (processo.stderr, "stderr"))
+    ]
+    for leitor in leitores:
+        leitor.start()
+
+    limite = time.monotonic() + timeout
+    abertos = len(leitores)
+    concluido = False
+    try:
+        while abertos:
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                nome, bloco = fila.get(timeout=restante)
+            except queue.Empty:
+                continue
+            if bloco is _FIM_FLUXO:
+                abertos -= 1
+                continue
+            yield nome, bloco.decode("utf-8", errors="replace").rstrip("\r\n")
+
+        # Pipes ainda abertos no prazo (ex: neto em segundo plano herdou a
+        # saída) também contam como timeout, mesmo que o shell já tenha saído
+        codigo = None
+        if not abertos:
+            try:
+                codigo = processo.wait(timeout=max(limite - time.monotonic(), 0))
+            except subprocess.TimeoutExpired:
+                pass
+
+        metricas.observar("devops_comando_duracao_segundos", time.perf_counter() - inicio, rotulos)
+        if codigo is None:
+            metricas.incrementar("devops_comando_falhas_total", rotulos=rotulos)
+            logger.error(f"Timeout ao executar: {comando}")
+            matar_grupo(processo)
+            yield "timeout", None
+        else:
+            if codigo != 0:
+                metricas.incrementar("devops_comando_falhas_total", rotulos=rotulos)
+            concluido = True
+            yield "fim", codigo
+    finally:
+        if not concluido:
+            # killpg mesmo com o shell já encerrado: o grupo pode ter netos vivos
+            matar_grupo(processo)
+        # Esvaziar a fila para liberar leitores bloqueados em put(); um
+        # descendente fora do grupo (setsid) pode manter o pipe aberto, então
+        # a espera é limitada e os leitores (daemon) ficam para trás
+        prazo_leitores = time.monotonic() + 2
+        while any(leitor.is_alive() for leitor in leitores) and time.monotonic() < prazo_leitores:
+            try:
+                fila.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        if not any(leitor.is_alive() for leitor in leitores):
+            processo.stdout.close()
+            processo.stderr.close()
+        processo.wait()
+
+
+def executar_comando_limitado(
+    comando: str,
+    timeout: int = 60,
+    manter_inicio: int = 100,
+    manter_fim: int = 100,
+    ao_receber: Optional[Callable[[str, str], None]] = None
+) -> dict:
+    """
+    Executa um comando guardando apenas o início e o fim da saída.
+
+    Args:
+        comando: Comando a ser executado
+        timeout: Tempo máximo de execução em segundos
+        manter_inicio: Linhas iniciais mantidas de cada fluxo
+        manter_fim: Linhas finais mantidas de cada fluxo
+        ao_receber: Função chamada com (fluxo, linha) para cada linha recebida
+
+    Returns:
+        Dicionário com stdout, stderr, código de retorno e linhas descartadas
+    """
+    inicio = {"stdout": [], "stderr": []}
+    fim = {"stdout": deque(maxlen=manter_fim), "stderr": deque(maxlen=manter_fim)}
+    total = {"stdout": 0, "stderr": 0}
+    codigo = None
+
+    for fluxo, linha in executar_comando_stream(comando, timeout=timeout):
+        if fluxo in ("fim", "timeout"):
+            codigo = linha
+            break
+        total[fluxo] += 1
+        if ao_receber:
+            ao_receber(fluxo, linha)
+        if len(inicio[fluxo]) < manter_inicio:
+            inicio[fluxo].append(linha)
+        elif manter_fim:
+            fim[fluxo].append(linha)
+
+    saida = {}
+    descartadas = {}
+    for fluxo in ("stdout", "stderr"):
+        descartadas[fluxo] = total[fluxo] - len(inicio[fluxo]) - len(fim[fluxo])
+        linhas = list(inicio[fluxo])
+        if descartadas[fluxo]:
+            linhas.append(f"... [{descartadas[fluxo]} linhas omitidas] ...")
+        linhas.extend(fim[fluxo])
+        saida[fluxo] = "\n".join(linhas).strip()
+
+    resultado = {
+        "sucesso": codigo == 0,
+        "stdout": saida["stdout"],
+        "stderr": saida["stderr"],
+        "codigo_retorno": codigo,
+        "linhas_descartadas": descartadas
+    }
+    if codigo is None:
+        resultado["erro"] = "Timeout"
+    return resultado
+
+
 def verificar_ferramentas_devops() -> dict:
     """Verifica se as ferramentas comuns de DevOps estão instaladas."""
     ferramentas = {
@@ -0,0 +1,250 @@
+"""
+Módulo de snapshots de diretórios para automação DevOps.
+Autor: Patrick
+Data: Dezembro 2025
+
+Contém funções para gravar o manifesto de uma árvore (caminho, tamanho,
+mtime e hash opcional) e comparar dois momentos sem fazer backup.
+"""
+
+import os
+import json
+import gzip
+import time
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Tuple
+
+from .logger import configurar_logger, log_operacao
+from .projeto import iterar_entradas, calcular_hash_arquivo
+
+# Logger do módulo
+logger = configurar_logger("snapshot")
+
+VERSAO_MANIFESTO = 1
+
+# (caminho relativo, tamanho, mtime_ns, hash ou None)
+Entrada = Tuple[str, int, int, Optional[str]]
+
+
+def _relativo(raiz: str, caminho: str) -> str:
+    """Caminho relativo com '/' como separador (manifestos portáveis)."""
+    return os.path.relpath(caminho, raiz).replace(os.sep, "/")
+
+
+def _entradas_arvore(
+    diretorio: str,
+    com_hash: bool = False,
+    excluir: Optional[Iterable[str]] = None
+) -> list:
+    """Lê a árvore e retorna as entradas ordenadas por caminho."""
+    raiz = os.path.abspath(diretorio)
+    entradas = [
+        (_relativo(raiz, caminho), stat.st_size, stat.st_mtime_ns, None)
+        for caminho, stat in iterar_entradas(raiz, excluir=excluir)
+    ]
+    entradas.sort()
+    if com_hash:
+        entradas = [
+            (caminho, tamanho, mtime, calcular_hash_arquivo(os.path.join(raiz, caminho)))
+            for caminho, tamanho, mtime, _ in entradas
+        ]
+    return entradas
+
+
+def criar_snapshot(
+    diretorio: str,
+    arquivo: str,
+    com_hash: bool = False,
+    excluir: Optional[Iterable[str]] = None
+) -> dict:
+    """
+    Grava o manifesto ordenado de uma árvore.
+
+    O manifesto é um JSON Lines compactado com gzip: a primeira linha é o
+    cabeçalho e cada linha seguinte é [caminho, tamanho, mtime_ns, hash].
+
+    Args:
+        diretorio: Diretório a registrar
+        arquivo: Caminho do manifesto a gravar (ex: deploy.snap.gz)
+        com_hash: Se True, inclui o SHA-256 de cada arquivo
+        excluir: Padrões glob de nomes a ignorar
+
+    Returns:
+        Dicionário com o resultado da operação
+    """
+    resultado = {
+        "sucesso": False,
+        "diretorio": diretorio,
+        "manifesto": arquivo,
+        "arquivos": 0,
+        "tamanho_total": 0,
+        "duracao": 0.0,
+        "erro": None
+    }
+    inicio = time.monotonic()
+
+    try:
+        if not os.path.isdir(diretorio):
+            raise NotADirectoryError(f"Diretório não encontrado: {diretorio}")
+
+        entradas = _entradas_arvore(diretorio, com_hash, excluir)
+        cabecalho = {
+            "versao": VERSAO_MANIFESTO,
+            "raiz": os.path.abspath(diretorio),
+            "criado": datetime.now().isoformat(),
+            "hash": com_hash
+        }
+
+        temporario = f"{arquivo}.tmp"
+        with gzip.open(temporario, "wt", encoding="utf-8", compresslevel=6) as saida:
+            saida.write(json.dumps(cabecalho) + "\n")
+            for entrada in entradas:
+                saida.write(json.dumps(entrada, ensure_ascii=False, separators=(",", ":")) + "\n")
+        os.replace(temporario, arquivo)
+
+        resultado["arquivos"] = len(entradas)
+        resultado["tamanho_total"] = sum(entrada[1] for entrada in entradas)
+        resultado["sucesso"] = True
+        resultado["duracao"] = round(time.monotonic() - inicio, 3)
+        log_operacao(
+            logger, "SNAPSHOT",
+            sucesso=True,
+            detalhes=f"{resultado['arquivos']} arquivos em {arquivo} ({resultado['duracao']}s)"
+        )
+
+    except Exception as e:
+        resultado["erro"] = str(e)
+        log_operacao(logger, "SNAPSHOT", sucesso=False, detalhes=str(e))
+
+    return resultado
+
+
+def ler_manifesto(arquivo: str) -> Tuple[dict, Iterator[Entrada]]:
+    """
+    Abre um manifesto gravado por criar_snapshot.
+
+    Args:
+        arquivo: Caminho do manifesto
+
+    Returns:
+        Tupla (cabeçalho, iterador de entradas em ordem de caminho)
+    """
+    entrada = gzip.open(arquivo, "rt", encoding="utf-8")
+    try:
+        cabecalho = json.loads(entrada.readline())
+    except Exception:
+        entrada.close()
+        raise
+    if cabecalho.get("versao") != VERSAO_MANIFESTO:
+        entrada.close()
+        raise ValueError(f"Versão de manifesto não suportada: {cabecalho.get('versao')}")
+
+    def iterar():
+        with entrada:
+            for linha in entrada:
+                caminho, tamanho, mtime, digest = json.loads(linha)
+                yield caminho, tamanho, mtime, digest
+
+    return cabecalho, iterar()
+
+
+def _abrir_lado(origem: str, excluir) -> Tuple[dict, Iterator[Entrada]]:
+    """Abre um lado da comparação: diretório vivo ou manifesto."""
+    if os.path.isdir(origem):
+        cabecalho = {"raiz": os.path.abspath(origem), "hash": False, "vivo": True}
+        return cabecalho, iter(_entradas_arvore(origem, False, excluir))
+    return ler_manifesto(origem)
+
+
+def comparar_snapshots(
+    antes: str,
+    depois: str,
+    excluir: Optional[Iterable[str]] = None
+) -> dict:
+    """
+    Compara dois manifestos, ou um manifesto com a árvore atual.
+
+    Os dois lados estão ordenados por caminho, então a comparação é uma
+    única passada de merge (sem carregar um dos lados em dicionário).
+    Arquivos com tamanho ou mtime diferentes são modificados; quando um
+    manifesto tem hashes, arquivos de mesmo tamanho com mtime diferente
+    são confirmados pelo hash (o do lado vivo só é calculado nesse caso).
+
+    Args:
+        antes: Manifesto (ou diretório) do estado anterior
+        depois: Manifesto ou diretório do estado atual
+        excluir: Padrões glob ignorados ao ler um diretório vivo
+
+    Returns:
+        Dicionário com listas de adicionados, removidos e modificados
+    """
+    resultado = {
+        "sucesso": False,
+        "antes": antes,
+        "depois": depois,
+        "adicionados": [],
+        "removidos": [],
+        "modificados": [],
+        "inalterados": 0,
+        "duracao": 0.0,
+        "erro": None
+    }
+    inicio = time.monotonic()
+
+    try:
+        cab_antes, itens_antes = _abrir_lado(antes, excluir)
+        cab_depois, itens_depois = _abrir_lado(depois, excluir)
+
+        def hash_de(cabecalho, entrada):
+            if entrada[3] is None and cabecalho.get("vivo"):
+                return calcular_hash_arquivo(os.path.join(cabecalho["raiz"], entrada[0]))
+            return entrada[3]
+
+        usar_hash = cab_antes.get("hash") or cab_depois.get("hash")
+        adicionados = resultado["adicionados"]
+        removidos = resultado["removidos"]
+        modificados = resultado["modificados"]
+
+        a = next(itens_antes, None)
+        d = next(itens_depois, None)
+        while a is not None and d is not None:
+            if a[0] < d[0]:
+                removidos.append(a[0])
+                a = next(itens_antes, None)
+            elif a[0] > d[0]:
+                adicionados.append(d[0])
+                d = next(itens_depois, None)
+            else:
+                if a[1] != d[1]:
+                    modificados.append(d[0])
+                elif a[2] == d[2]:
+                    resultado["inalterados"] += 1
+                elif usar_hash and hash_de(cab_antes, a) == hash_de(cab_depois, d):
+                    # Só o mtime mudou (touch, checkout): conteúdo igual
+                    resultado["inalterados"] += 1
+                else:
+                    modificados.append(d[0])
+                a = next(itens_antes, None)
+                d = next(itens_depois, None)
+
+        while a is not None:
+            removidos.append(a[0])
+            a = next(itens_antes, None)
+        while d is not None:
+            adicionados.append(d[0])
+            d = next(itens_depois, None)
+
+        resultado["sucesso"] = True
+        resultado["duracao"] = round(time.monotonic() - inicio, 3)
+        log_operacao(
+            logger, "DIFF_SNAPSHOT",
+            sucesso=True,
+            detalhes=f"+{len(adicionados)} -{len(removidos)} ~{len(modificados)} "
+                     f"em {resultado['duracao']}s"
+        )
+
+    except Exception as e:
+        resultado["erro"] = str(e)
+        log_operacao(logger, "DIFF_SNAPSHOT", sucesso=False, detalhes=str(e))
+
+    return resultado